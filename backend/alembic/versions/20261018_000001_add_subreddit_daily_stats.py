@@ -0,0 +1,56 @@
+"""add subreddit_daily_stats rollup table
+
+Revision ID: 20261018_000001
+Revises: 20260513_000002
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+from alembic import op
+
+
+revision: str = "20261018_000001"
+down_revision: str | None = "20260513_000002"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS subreddit_daily_stats (
+            subreddit VARCHAR(100) NOT NULL,
+            day DATE NOT NULL,
+            posts INTEGER NOT NULL DEFAULT 0,
+            comments INTEGER NOT NULL DEFAULT 0,
+            pain_labels INTEGER NOT NULL DEFAULT 0,
+            solution_labels INTEGER NOT NULL DEFAULT 0,
+            brand_comments INTEGER NOT NULL DEFAULT 0,
+            pain_aspects JSONB NOT NULL DEFAULT '{}'::jsonb,
+            latest_post_title TEXT,
+            latest_post_at TIMESTAMPTZ,
+            refreshed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT pk_subreddit_daily_stats PRIMARY KEY (subreddit, day)
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_subreddit_daily_stats_day
+        ON subreddit_daily_stats (day);
+        """
+    )
+    op.execute(
+        """
+        COMMENT ON TABLE subreddit_daily_stats IS
+        '按天按社区预聚合的 T1 统计（维护任务增量刷新，键为 lower(subreddit)）';
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_subreddit_daily_stats_day;")
+    op.execute("DROP TABLE IF EXISTS subreddit_daily_stats;")
@@ -0,0 +1,41 @@
+"""add subreddit_daily_stats coverage watermark
+
+Revision ID: 20261018_000002
+Revises: 20261018_000001
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+from alembic import op
+
+
+revision: str = "20261018_000002"
+down_revision: str | None = "20261018_000001"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS subreddit_daily_stats_coverage (
+            id SMALLINT PRIMARY KEY DEFAULT 1,
+            covered_since DATE NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT ck_subreddit_daily_stats_coverage_single_row CHECK (id = 1)
+        );
+        """
+    )
+    op.execute(
+        """
+        COMMENT ON TABLE subreddit_daily_stats_coverage IS
+        'subreddit_daily_stats 回填水位：[covered_since, 今天] 已完整回填，读路径据此决定是否走日汇总';
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS subreddit_daily_stats_coverage;")
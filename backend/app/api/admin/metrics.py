@@ -13,6 +13,7 @@ from app.core.config import get_settings
 from app.core.security import TokenPayload
 from app.interfaces.semantic_provider import SemanticProvider
 from app.middleware.route_metrics import DEFAULT_ROUTE_METRICS_KEY_PREFIX
+from app.services.report.report_cache import get_report_cache
 from app.services.semantic.provider_factory import get_semantic_provider as _get_provider
 
 router = APIRouter(prefix="/admin/metrics", tags=["admin"])
@@ -50,6 +51,13 @@ async def get_semantic_metrics(
     }
 
 
+@router.get("/report-cache", summary="报告缓存命中/淘汰指标（当前 worker 进程）")
+async def get_report_cache_metrics(
+    payload: TokenPayload = Depends(require_admin),
+) -> dict[str, object]:
+    return get_report_cache().metrics()
+
+
 @router.get("/routes", summary="路由调用统计（golden vs legacy）")
 async def get_route_metrics(
     request: Request,
@@ -5,18 +5,20 @@ import logging
 import os
 import platform
 import sys
+import uuid
 from datetime import datetime, timezone
 from typing import Any
 
 import psutil
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
-from sqlalchemy import text
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import require_admin
 from app.core.security import TokenPayload
 from app.db.session import get_session
+from app.models import Analysis, Task
 
 router = APIRouter(prefix="/diag", tags=["diagnostics"])
 logger = logging.getLogger(__name__)
@@ -34,6 +36,13 @@ class RuntimeDiagnostics(BaseModel):
     database: DBStatus
 
 
+class AnalysisStageDiagnostics(BaseModel):
+    task_id: uuid.UUID
+    stage_timings: dict[str, Any] | None = Field(
+        default=None, description="run_analysis 阶段计时（sources.stage_timings）"
+    )
+
+
 @router.get("/runtime", summary="运行时诊断信息")
 async def get_runtime_diagnostics(
     _payload: TokenPayload = Depends(require_admin),
@@ -96,3 +105,33 @@ async def get_runtime_diagnostics(
         process=process_info,
         database=DBStatus(**db_status),
     )
+
+
+@router.get("/analysis/{task_id}/stages", summary="分析任务阶段耗时")
+async def get_analysis_stage_diagnostics(
+    task_id: uuid.UUID,
+    _payload: TokenPayload = Depends(require_admin),
+    db: AsyncSession = Depends(get_session),
+) -> AnalysisStageDiagnostics:
+    """
+    获取单个分析任务各阶段的耗时、DB 查询数/行数、Reddit 与 LLM 调用数（需要管理员权限）。
+
+    开启 ANALYSIS_PROFILE_TASK_ID 的任务额外带 profile 摘要与产物路径。
+    """
+    task = await db.get(Task, task_id)
+    if task is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+
+    # 临时切换 RLS 到任务所属用户，确保能读取 analyses
+    await db.execute(
+        text("SELECT set_config('app.current_user_id', :uid, true)"),
+        {"uid": str(task.user_id)},
+    )
+    analysis = await db.scalar(select(Analysis).where(Analysis.task_id == task.id))
+    if analysis is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Analysis not found")
+
+    return AnalysisStageDiagnostics(
+        task_id=task.id,
+        stage_timings=(analysis.sources or {}).get("stage_timings"),
+    )
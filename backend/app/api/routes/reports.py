@@ -16,7 +16,7 @@ from app.schemas.community_export import CommunityExportResponse
 from app.schemas.entity_export import EntityExportResponse
 from app.schemas.report_payload import ReportPayload
 from app.services.report.report_export_service import ExportFormat
-from app.services.report.report_service import InMemoryReportCache
+from app.services.report.report_cache import get_report_cache
 
 
 class SlidingWindowRateLimiter:
@@ -46,7 +46,7 @@ class SlidingWindowRateLimiter:
 
 router = APIRouter(prefix="/report", tags=["analysis"])
 
-REPORT_CACHE = InMemoryReportCache(settings.report_cache_ttl_seconds)
+REPORT_CACHE = get_report_cache()
 REPORT_RATE_LIMITER = SlidingWindowRateLimiter(
     max_requests=settings.report_rate_limit_per_minute,
     window_seconds=settings.report_rate_limit_window_seconds,
@@ -71,7 +71,7 @@ async def get_analysis_report(
     payload: TokenPayload = Depends(decode_jwt_token),
     request: Request = None,
     db: AsyncSession = Depends(get_session),
-) -> ReportPayload:
+) -> ReportPayload | Response:
     del request  # legacy signature compatibility only
     return await _v1_reports().get_analysis_report(
         task_id=task_id,
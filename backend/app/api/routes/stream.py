@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+import logging
 import os
 from datetime import datetime, timezone
 from time import monotonic
@@ -14,12 +15,23 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import Settings, get_settings
 from app.core.security import TokenPayload, decode_jwt_token
-from app.db.session import get_session
+from app.db.session import SessionFactory, get_session
 from app.models.task import Task, TaskStatus
-from app.services.infrastructure.task_status_cache import TaskStatusCache, TaskStatusPayload
+from app.services.infrastructure.task_status_cache import (
+    TaskStatusCache,
+    TaskStatusPayload,
+    TaskStatusSubscription,
+)
+
+logger = logging.getLogger(__name__)
 
+# 轮询间隔：仅在 pub/sub 不可用时使用
 POLL_INTERVAL_SECONDS = float(os.getenv("TASK_STREAM_POLL_INTERVAL", "1.0"))
 HEARTBEAT_INTERVAL_SECONDS = float(os.getenv("TASK_STREAM_HEARTBEAT_INTERVAL", "30.0"))
+# 订阅模式下的兜底对账间隔：pub/sub 不保证送达，定期读一次缓存防止漏事件
+FALLBACK_POLL_INTERVAL_SECONDS = float(
+    os.getenv("TASK_STREAM_FALLBACK_POLL_INTERVAL", "15.0")
+)
 
 router = APIRouter(prefix="/analyze", tags=["analysis"])
 STATUS_CACHE = TaskStatusCache()
@@ -83,10 +95,43 @@ def _task_to_payload(task: Task) -> TaskStatusPayload:
     )
 
 
+async def _read_status(
+    task_id: str, db: AsyncSession | None
+) -> TaskStatusPayload | None:
+    """Poll the status cache; only touch the DB pool (briefly) on a cache miss."""
+    if db is not None:
+        return await STATUS_CACHE.get_status(task_id, session=db)
+    payload = await STATUS_CACHE.get_status(task_id)
+    if payload is not None:
+        return payload
+    async with SessionFactory() as session:
+        return await STATUS_CACHE.get_status(task_id, session=session)
+
+
+async def _open_subscription(task_id: str) -> TaskStatusSubscription | None:
+    subscribe = getattr(STATUS_CACHE, "subscribe", None)
+    if subscribe is None:
+        return None
+    try:
+        return await subscribe(task_id)
+    except Exception as exc:
+        logger.warning("SSE pub/sub unavailable for task %s, polling instead: %s", task_id, exc)
+        return None
+
+
 async def _event_generator(
     task: Task,
-    db: AsyncSession,
+    db: AsyncSession | None = None,
 ) -> AsyncIterator[str]:
+    """
+    SSE events for one task.
+
+    Updates are pushed via `STATUS_CACHE.subscribe` (Redis pub/sub); the cache
+    is still read once after subscribing and every FALLBACK_POLL_INTERVAL_SECONDS
+    to cover missed events. Without pub/sub it polls every POLL_INTERVAL_SECONDS.
+    `db` is optional: the routes release their request session before
+    streaming, and cache misses open a short-lived session instead.
+    """
     task_id_str = str(task.id)
     baseline_payload = _task_to_payload(task)
     last_signature: str | None = None
@@ -103,9 +148,34 @@ async def _event_generator(
         yield _format_event("close", {"task_id": task_id_str})
         return
 
-    while True:
-        try:
-            payload = await STATUS_CACHE.get_status(task_id_str, session=db)
+    subscription = await _open_subscription(task_id_str)
+    try:
+        next_poll = monotonic()  # 订阅建立后立即对账一次，覆盖订阅前的状态变化
+        while True:
+            payload: TaskStatusPayload | None = None
+            now = monotonic()
+            if now >= next_poll:
+                payload = await _read_status(task_id_str, db)
+                interval = (
+                    FALLBACK_POLL_INTERVAL_SECONDS
+                    if subscription is not None
+                    else POLL_INTERVAL_SECONDS
+                )
+                next_poll = now + interval
+            elif subscription is not None:
+                wait = min(next_poll, last_heartbeat + HEARTBEAT_INTERVAL_SECONDS) - now
+                try:
+                    payload = await subscription.next(timeout=wait)
+                except Exception as exc:
+                    logger.warning("SSE subscription dropped for task %s: %s", task_id_str, exc)
+                    await subscription.close()
+                    subscription = None
+                    next_poll = monotonic()
+            else:
+                await asyncio.sleep(
+                    max(0.0, min(next_poll, last_heartbeat + HEARTBEAT_INTERVAL_SECONDS) - now)
+                )
+
             if payload is not None:
                 signature = payload.encode()
                 if signature != last_signature:
@@ -127,10 +197,9 @@ async def _event_generator(
                         "timestamp": datetime.now(timezone.utc).isoformat(),
                     },
                 )
-
-            await asyncio.sleep(POLL_INTERVAL_SECONDS)
-        except asyncio.CancelledError:
-            raise
+    finally:
+        if subscription is not None:
+            await subscription.close()
 
 
 @router.get(
@@ -163,7 +232,9 @@ async def stream_task_progress(
             detail="Not authorised to access this task",
         )
 
-    generator = _event_generator(task, db)
+    # 鉴权完成即归还连接：SSE 可能挂几十分钟，不能一直占着连接池
+    await db.close()
+    generator = _event_generator(task)
     return StreamingResponse(
         generator,
         media_type="text/event-stream",
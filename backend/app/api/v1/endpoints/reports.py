@@ -26,8 +26,8 @@ from app.schemas.analysis import AnalysisRead, CommunitySourceDetail
 from app.schemas.community_export import CommunityExportItem, CommunityExportResponse
 from app.schemas.entity_export import EntityExportItem, EntityExportResponse
 from app.schemas.report_payload import ReportPayload
+from app.services.report.report_cache import build_report_cache_key, get_report_cache
 from app.services.report.report_service import (
-    InMemoryReportCache,
     ReportAccessDeniedError,
     ReportDataValidationError,
     ReportNotFoundError,
@@ -67,7 +67,7 @@ class SlidingWindowRateLimiter:
 
 router = APIRouter()
 
-REPORT_CACHE = InMemoryReportCache(settings.report_cache_ttl_seconds)
+REPORT_CACHE = get_report_cache()
 # 与 legacy /api/report 路由共享同一限流桶，保证测试与运行时一致
 REPORT_RATE_LIMITER = SHARED_REPORT_RATE_LIMITER
 
@@ -224,7 +224,7 @@ async def get_analysis_report(
     response: Response,
     payload: TokenPayload = Depends(decode_jwt_token),
     db: AsyncSession = Depends(get_session),
-) -> ReportPayload:
+) -> ReportPayload | Response:
     service = ReportService(db, cache=REPORT_CACHE)
     try:
         user_id = UUID(payload.sub)
@@ -243,7 +243,6 @@ async def get_analysis_report(
     # 默认关闭，需显式 FAST_E2E_REPORT=1 才生效，防止误绕过主业务逻辑
     fast_e2e_enabled = os.getenv("FAST_E2E_REPORT", "0").lower() in {"1", "true", "yes"}
     if fast_e2e_enabled and settings.environment.lower() != "production":
-        cache_key = f"report:{task_id}:{user_id}"
         repo = ReportRepository(db)
         task = await repo.get_task_with_analysis(task_id)
         if task is None:
@@ -311,18 +310,23 @@ async def get_analysis_report(
             "data_source": getattr(task.analysis, "data_source", "real"),
         }
         fast_report = ReportPayload.model_validate(payload_fast)
+        cache_key = build_report_cache_key(task_id, task.analysis)
         # 热缓存一份，后续调用直接命中
         await REPORT_CACHE.set(cache_key, fast_report)
         response.headers["X-Data-Source"] = "Synthetic" if str(getattr(task.analysis, "data_source", "")).lower() != "real" else "Real"
         return fast_report
 
     try:
-        report = await service.get_report(task_id, user_id)
+        report = await service.get_report_serialized(task_id, user_id)
     except ReportServiceError as exc:
         raise HTTPException(status_code=exc.status_code, detail=exc.detail) from exc
     data_source = (report.data_source or "real").lower()
-    response.headers["X-Data-Source"] = "Synthetic" if data_source != "real" else "Real"
-    return report
+    # 直接输出缓存里的序列化字节，跳过 response_model 的再校验与再序列化
+    return Response(
+        content=report.body,
+        media_type="application/json",
+        headers={"X-Data-Source": "Synthetic" if data_source != "real" else "Real"},
+    )
 
 
 @router.get("/report/{task_id}/download", summary="Download report in specified format")
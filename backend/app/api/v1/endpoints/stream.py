@@ -56,8 +56,10 @@ async def stream_task_progress(
             detail="Not authorised to access this task",
         )
 
+    # 鉴权完成即归还连接：SSE 可能挂几十分钟，不能一直占着连接池
+    await db.close()
     # Delegate to legacy stream generator to keep behavior identical and monkeypatchable
-    generator = legacy_stream._event_generator(task, db)  # type: ignore[attr-defined]
+    generator = legacy_stream._event_generator(task)  # type: ignore[attr-defined]
     return StreamingResponse(
         generator,
         media_type="text/event-stream",
@@ -119,6 +119,9 @@ def _build_conf() -> Dict[str, Any]:
     task_routes.setdefault(
         "tasks.maintenance.check_storage_capacity", {"queue": "maintenance_queue"}
     )
+    task_routes.setdefault(
+        "tasks.maintenance.refresh_subreddit_daily_stats", {"queue": "maintenance_queue"}
+    )
     task_routes.setdefault(
         "tasks.embedding.backfill_posts_batch", {"queue": "maintenance_queue"}
     )
@@ -311,6 +314,17 @@ celery_app.conf.beat_schedule = {
         "schedule": crontab(minute="35", hour="2"),
         "options": {"queue": "maintenance_queue", "expires": 1800},
     },
+    "refresh-subreddit-daily-stats": {
+        "task": "tasks.maintenance.refresh_subreddit_daily_stats",
+        "schedule": crontab(minute="50"),
+        "options": {"queue": "maintenance_queue", "expires": 1800},
+    },
+    "reconcile-subreddit-daily-stats": {
+        "task": "tasks.maintenance.refresh_subreddit_daily_stats",
+        "schedule": crontab(minute="55", hour="2"),
+        "kwargs": {"reconcile": True},
+        "options": {"queue": "maintenance_queue", "expires": 7200},
+    },
     "cleanup-expired-posts-hot": {
         "task": "tasks.maintenance.cleanup_expired_posts_hot",
         "schedule": crontab(minute="0", hour="4"),
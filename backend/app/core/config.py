@@ -151,6 +151,10 @@ class Settings(BaseModel):
     reddit_max_concurrency: int = Field(default=2)  # 降低并发避免突发流量  # 降低并发以避免多 Worker 场景下超限
     reddit_cache_redis_url: str = Field(default_factory=_default_redis_cache_url)
     reddit_cache_ttl_seconds: int = Field(default=24 * 60 * 60)
+    # 帖子缓存编码：json = 旧格式（默认，老 worker 也能读）；binary = 列式 + 压缩（兼容读旧 JSON），
+    # 所有 worker 都升级到能解码 binary 之后再切换
+    reddit_cache_codec: str = Field(default="json")
+    reddit_cache_compression: str = Field(default="auto")
     sociavault_api_key: str = Field(default="")
     sociavault_base_url: str = Field(default="https://api.sociavault.com/v1")
     sociavault_reddit_fallback_enabled: bool = Field(default=False)
@@ -165,6 +169,11 @@ class Settings(BaseModel):
     incremental_comments_backfill_max_posts: int = Field(default=5)
     incremental_comments_backfill_limit: int = Field(default=50)
     incremental_comments_backfill_depth: int = Field(default=2)
+    # mode=full 的单帖默认上限（plan.meta 未给 full_* 时生效）
+    incremental_comments_full_max_comments: int = Field(default=5000)
+    incremental_comments_full_time_budget_seconds: float = Field(default=120.0)
+    # ingest_posts_batch 走集合式批量写入（一次查询解析存量/版本/重复/作者）
+    incremental_bulk_ingest_enabled: bool = Field(default=True)
     # 补跑补偿（延迟分批 + 抖动）
     compensation_delay_enabled: bool = Field(default=True)
     compensation_base_delay_seconds: int = Field(default=30)
@@ -180,11 +189,24 @@ class Settings(BaseModel):
     enable_vector_dedup: bool = Field(default=True)
     vector_dedup_threshold: float = Field(default=0.92)
     report_cache_ttl_seconds: int = Field(default=60 * 60)
+    # 报告缓存：进程内 LRU 按序列化字节数设上限；Redis 层跨 worker 共享（空 URL = 复用 reddit cache）
+    report_cache_max_bytes: int = Field(default=64 * 1024 * 1024)
+    report_cache_redis_enabled: bool = Field(default=True)
+    report_cache_redis_url: str = Field(default="")
     report_community_members_raw: str = Field(default="")
     report_target_analysis_version: str = Field(default="1.0")
     report_rate_limit_per_minute: int = Field(default=30)
     report_rate_limit_window_seconds: int = Field(default=60)
     report_export_dir: str = Field(default="reports/exports")
+    # run_analysis 单任务 profiling：命中该 task id 时包一层 cProfile（装了 pyinstrument 则用它）
+    analysis_profile_task_id: str = Field(default="")
+    analysis_profile_dir: str = Field(default="reports/profiles")
+    # run_analysis 阶段 DAG 单次分析的并发上限（每个并发阶段占一条 DB 连接）
+    analysis_stage_max_concurrency: int = Field(default=2)
+    # 查询 / 主题向量缓存（进程内 LRU；目录非空时落盘，跨进程复用）与批量编码的 token 上限
+    embedding_query_cache_size: int = Field(default=512)
+    embedding_query_cache_dir: str = Field(default="")
+    embedding_max_tokens_per_batch: int = Field(default=16384)
     default_membership_level: str = Field(default="free")
     # LLM 增益（必开：可回退）
     enable_llm_summary: bool = Field(default=True)
@@ -200,6 +222,17 @@ class Settings(BaseModel):
     llm_label_body_chars: int = Field(default=800)
     llm_label_comment_chars: int = Field(default=400)
     llm_label_prompt_version: str = Field(default="v1")
+    # 打标流水线：同时在途的 LLM 批次数（1 = 逐批串行）与每分钟 token 预算（0 = 不限）
+    llm_label_concurrency: int = Field(default=4)
+    llm_label_tokens_per_minute: int = Field(default=0)
+    # LLM 响应缓存（按 模型 + 模板版本 + 归一化输入哈希 寻址，本地 SQLite）
+    llm_response_cache_enabled: bool = Field(default=True)
+    llm_response_cache_path: str = Field(default="backend/data/llm_response_cache.sqlite3")
+    llm_response_cache_ttl_seconds: int = Field(default=30 * 24 * 60 * 60)
+    llm_response_cache_max_bytes: int = Field(default=256 * 1024 * 1024)
+    # 异步 LLM HTTP 客户端：每个事件循环共享的连接池上限与 429/5xx 重试次数
+    llm_http_max_connections: int = Field(default=32)
+    llm_http_max_retries: int = Field(default=3)
     # LLM 候选回流语义库
     llm_semantic_lookback_days: int = Field(default=90)
     llm_semantic_post_limit: int = Field(default=5000)
@@ -217,6 +250,17 @@ class Settings(BaseModel):
     market_report_template_path: str = Field(default="backend/config/report_templates/market_insight_v1.md")
     # Comments retention (days) for TTL cleanup
     comments_retention_days: int = Field(default=180)
+    # 保留期清理（comments / posts_hot / facts 审计）：每批行数、单次时间预算（0=不限）、批间停顿
+    retention_cleanup_batch_size: int = Field(default=5000)
+    retention_cleanup_time_budget_seconds: int = Field(default=600)
+    retention_cleanup_pause_ms: int = Field(default=50)
+    # subreddit_daily_stats 日汇总：每小时刷新最近 N 天；夜间对账最近 N 天（覆盖 LLM 标签补打窗口）
+    t1_stats_rollup_refresh_days: int = Field(default=3)
+    t1_stats_rollup_reconcile_days: int = Field(default=90)
+    # 统一抓取优先级队列（Redis ZSET）：巡航按到期时间领取前 N 个社区，租约内不重复派发
+    crawl_priority_queue_enabled: bool = Field(default=False)
+    crawl_priority_batch_size: int = Field(default=50)
+    crawl_priority_lease_seconds: int = Field(default=1800)
     # 报告模式（可选）：executive / market
     report_mode: str = Field(default="executive")
     # 报告质量等级：basic | standard | premium
@@ -340,6 +384,18 @@ def get_settings() -> Settings:
                 Settings.model_fields["reddit_cache_ttl_seconds"].default,
             )
         ),
+        reddit_cache_codec=os.getenv(
+            "REDDIT_CACHE_CODEC",
+            Settings.model_fields["reddit_cache_codec"].default,
+        )
+        .strip()
+        .lower(),
+        reddit_cache_compression=os.getenv(
+            "REDDIT_CACHE_COMPRESSION",
+            Settings.model_fields["reddit_cache_compression"].default,
+        )
+        .strip()
+        .lower(),
         sociavault_api_key=os.getenv(
             "SOCIAVAULT_API_KEY",
             Settings.model_fields["sociavault_api_key"].default,
@@ -410,6 +466,25 @@ def get_settings() -> Settings:
                 Settings.model_fields["incremental_comments_backfill_depth"].default,
             )
         ),
+        incremental_comments_full_max_comments=int(
+            os.getenv(
+                "INCREMENTAL_COMMENTS_FULL_MAX_COMMENTS",
+                Settings.model_fields["incremental_comments_full_max_comments"].default,
+            )
+        ),
+        incremental_comments_full_time_budget_seconds=float(
+            os.getenv(
+                "INCREMENTAL_COMMENTS_FULL_TIME_BUDGET_SECONDS",
+                Settings.model_fields["incremental_comments_full_time_budget_seconds"].default,
+            )
+        ),
+        incremental_bulk_ingest_enabled=os.getenv(
+            "INCREMENTAL_BULK_INGEST_ENABLED",
+            str(Settings.model_fields["incremental_bulk_ingest_enabled"].default).lower(),
+        )
+        .strip()
+        .lower()
+        in {"1", "true", "yes"},
         compensation_delay_enabled=os.getenv(
             "COMPENSATION_DELAY_ENABLED",
             str(Settings.model_fields["compensation_delay_enabled"].default).lower(),
@@ -455,6 +530,20 @@ def get_settings() -> Settings:
                 Settings.model_fields["report_cache_ttl_seconds"].default,
             )
         ),
+        report_cache_max_bytes=int(
+            os.getenv(
+                "REPORT_CACHE_MAX_BYTES",
+                Settings.model_fields["report_cache_max_bytes"].default,
+            )
+        ),
+        report_cache_redis_enabled=os.getenv("REPORT_CACHE_REDIS_ENABLED", "true")
+        .strip()
+        .lower()
+        in {"1", "true", "yes"},
+        report_cache_redis_url=os.getenv(
+            "REPORT_CACHE_REDIS_URL",
+            Settings.model_fields["report_cache_redis_url"].default,
+        ),
         report_rate_limit_per_minute=int(
             os.getenv(
                 "REPORT_RATE_LIMIT_PER_MINUTE",
@@ -471,6 +560,36 @@ def get_settings() -> Settings:
             "REPORT_EXPORT_DIR",
             Settings.model_fields["report_export_dir"].default,
         ),
+        analysis_profile_task_id=os.getenv(
+            "ANALYSIS_PROFILE_TASK_ID",
+            Settings.model_fields["analysis_profile_task_id"].default,
+        ).strip(),
+        analysis_profile_dir=os.getenv(
+            "ANALYSIS_PROFILE_DIR",
+            Settings.model_fields["analysis_profile_dir"].default,
+        ),
+        analysis_stage_max_concurrency=int(
+            os.getenv(
+                "ANALYSIS_STAGE_MAX_CONCURRENCY",
+                Settings.model_fields["analysis_stage_max_concurrency"].default,
+            )
+        ),
+        embedding_query_cache_size=int(
+            os.getenv(
+                "EMBEDDING_QUERY_CACHE_SIZE",
+                Settings.model_fields["embedding_query_cache_size"].default,
+            )
+        ),
+        embedding_query_cache_dir=os.getenv(
+            "EMBEDDING_QUERY_CACHE_DIR",
+            Settings.model_fields["embedding_query_cache_dir"].default,
+        ).strip(),
+        embedding_max_tokens_per_batch=int(
+            os.getenv(
+                "EMBEDDING_MAX_TOKENS_PER_BATCH",
+                Settings.model_fields["embedding_max_tokens_per_batch"].default,
+            )
+        ),
         report_community_members_raw=os.getenv(
             "REPORT_COMMUNITY_MEMBERS",
             Settings.model_fields["report_community_members_raw"].default,
@@ -532,6 +651,50 @@ def get_settings() -> Settings:
             "LLM_LABEL_PROMPT_VERSION",
             Settings.model_fields["llm_label_prompt_version"].default,
         ),
+        llm_label_concurrency=int(
+            os.getenv(
+                "LLM_LABEL_CONCURRENCY",
+                Settings.model_fields["llm_label_concurrency"].default,
+            )
+        ),
+        llm_label_tokens_per_minute=int(
+            os.getenv(
+                "LLM_LABEL_TOKENS_PER_MINUTE",
+                Settings.model_fields["llm_label_tokens_per_minute"].default,
+            )
+        ),
+        llm_response_cache_enabled=os.getenv("LLM_RESPONSE_CACHE_ENABLED", "true")
+        .strip()
+        .lower()
+        in {"1", "true", "yes", "on"},
+        llm_response_cache_path=os.getenv(
+            "LLM_RESPONSE_CACHE_PATH",
+            Settings.model_fields["llm_response_cache_path"].default,
+        ),
+        llm_response_cache_ttl_seconds=int(
+            os.getenv(
+                "LLM_RESPONSE_CACHE_TTL_SECONDS",
+                Settings.model_fields["llm_response_cache_ttl_seconds"].default,
+            )
+        ),
+        llm_response_cache_max_bytes=int(
+            os.getenv(
+                "LLM_RESPONSE_CACHE_MAX_BYTES",
+                Settings.model_fields["llm_response_cache_max_bytes"].default,
+            )
+        ),
+        llm_http_max_connections=int(
+            os.getenv(
+                "LLM_HTTP_MAX_CONNECTIONS",
+                Settings.model_fields["llm_http_max_connections"].default,
+            )
+        ),
+        llm_http_max_retries=int(
+            os.getenv(
+                "LLM_HTTP_MAX_RETRIES",
+                Settings.model_fields["llm_http_max_retries"].default,
+            )
+        ),
         llm_semantic_lookback_days=int(
             os.getenv(
                 "LLM_SEMANTIC_LOOKBACK_DAYS",
@@ -602,6 +765,55 @@ def get_settings() -> Settings:
                 Settings.model_fields["comments_retention_days"].default,
             )
         ),
+        retention_cleanup_batch_size=int(
+            os.getenv(
+                "RETENTION_CLEANUP_BATCH_SIZE",
+                Settings.model_fields["retention_cleanup_batch_size"].default,
+            )
+        ),
+        retention_cleanup_time_budget_seconds=int(
+            os.getenv(
+                "RETENTION_CLEANUP_TIME_BUDGET_SECONDS",
+                Settings.model_fields["retention_cleanup_time_budget_seconds"].default,
+            )
+        ),
+        retention_cleanup_pause_ms=int(
+            os.getenv(
+                "RETENTION_CLEANUP_PAUSE_MS",
+                Settings.model_fields["retention_cleanup_pause_ms"].default,
+            )
+        ),
+        t1_stats_rollup_refresh_days=int(
+            os.getenv(
+                "T1_STATS_ROLLUP_REFRESH_DAYS",
+                Settings.model_fields["t1_stats_rollup_refresh_days"].default,
+            )
+        ),
+        t1_stats_rollup_reconcile_days=int(
+            os.getenv(
+                "T1_STATS_ROLLUP_RECONCILE_DAYS",
+                Settings.model_fields["t1_stats_rollup_reconcile_days"].default,
+            )
+        ),
+        crawl_priority_queue_enabled=os.getenv(
+            "CRAWL_PRIORITY_QUEUE_ENABLED",
+            str(Settings.model_fields["crawl_priority_queue_enabled"].default).lower(),
+        )
+        .strip()
+        .lower()
+        in {"1", "true", "yes"},
+        crawl_priority_batch_size=int(
+            os.getenv(
+                "CRAWL_PRIORITY_BATCH_SIZE",
+                Settings.model_fields["crawl_priority_batch_size"].default,
+            )
+        ),
+        crawl_priority_lease_seconds=int(
+            os.getenv(
+                "CRAWL_PRIORITY_LEASE_SECONDS",
+                Settings.model_fields["crawl_priority_lease_seconds"].default,
+            )
+        ),
         report_mode=os.getenv(
             "REPORT_MODE", Settings.model_fields["report_mode"].default
         ).strip().lower(),
@@ -39,6 +39,7 @@ from app.core.config import Settings, get_settings
 from app.db.session import DATABASE_URL, engine
 from app.db.rls_sanity import should_run_rls_startup_sanity_check, verify_rls_startup_sanity
 from app.middleware.route_metrics import ENABLE_ROUTE_METRICS_ENV, RouteMetricsMiddleware
+from app.services.llm.clients.async_openai_client import close_llm_http_pools
 
 
 async def _verify_database_identity(expected_name: str) -> None:
@@ -71,7 +72,7 @@ def create_application(settings: Settings) -> FastAPI:
                 required_user=required_user,
             )
         yield  # 应用运行期间
-        # teardown 逻辑如有可在此展开
+        await close_llm_http_pools()
 
     app = FastAPI(
         title=settings.app_name,
@@ -267,6 +267,9 @@ class HotpostDebugInfo(ORMModel):
     filtered_posts: int | None = None
     relevance_filtered: int | None = None
     response_source: str | None = None
+    cache_status: str | None = None
+    cache_counters: dict[str, int] = Field(default_factory=dict)
+    evidence_deadline_hit: bool | None = None
     summary_source: str | None = None
     summary_degraded_reason: str | None = None
     report_source: str | None = None
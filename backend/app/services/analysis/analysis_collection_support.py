@@ -800,8 +800,15 @@ async def try_cache_only_collection(
     posts_by_subreddit: Dict[str, List[RedditPost]] = {}
     cached_subreddits: set[str] = set()
 
+    # 一次 MGET 读完整个社区池，避免逐社区往返；只有单 key 接口的缓存实现逐个读取
+    names = [profile.name for profile in profiles]
+    get_many = getattr(cache, "get_many_cached_posts", None)
+    if get_many is not None:
+        cached_by_name = await get_many(names)
+    else:
+        cached_by_name = {name: await cache.get_cached_posts(name) for name in names}
     for profile in profiles:
-        posts = await cache.get_cached_posts(profile.name)
+        posts = cached_by_name.get(profile.name)
         if posts:
             logger.info(f"[缓存优先] ✅ 缓存命中: {profile.name} ({len(posts)}个帖子)")
             posts_by_subreddit[profile.name] = posts
@@ -78,6 +78,12 @@ from app.services.facts_v2.quality import quality_check_facts_v2
 from app.services.facts_v2.slice import build_facts_slice_for_report
 from app.services.mock.demo_data_provider import generate_demo_posts
 from app.services.infrastructure.reddit_client import RedditAPIClient, RedditPost
+from app.services.analysis.analysis_stage_graph import AnalysisStageGraph
+from app.services.infrastructure.stage_timing import (
+    StageTimer,
+    activate_stage_timer,
+    capture_profile,
+)
 from app.services.report.opportunity_report import build_opportunity_reports
 from app.services.analysis.t1_stats import build_trend_analysis, fetch_topic_relevant_communities
 from app.services.semantic.embedding_service import MODEL_NAME
@@ -101,7 +107,7 @@ from app.services.community.blacklist_loader import get_blacklist_config
 # ╔══════════════════════════════════════════════════════════════════════════════╗
 # ║                         FUNCTION CALL GRAPH                                ║
 # ║                                                                            ║
-# ║  Entry Point: run_analysis() (line ~3330)                                  ║
+# ║  Entry Point: run_analysis() → _run_analysis_stages() (阶段计时包装)         ║
 # ║                                                                            ║
 # ║  Phase 1 - Preparation:                                                   ║
 # ║    run_analysis                                                            ║
@@ -2960,11 +2966,139 @@ def _backfill_cache_misses(
 # ── Section 6: Main Entry Point ────────────────────────────────────────────
 
 
+# 阶段 DAG 节点：每个节点自开 session，输入 / 输出在 _build_analysis_stage_graph 中声明
+async def _stage_post_scores(
+    candidate_posts: List[Dict[str, Any]],
+) -> tuple[List[Dict[str, Any]], dict[str, Any]]:
+    try:
+        async with SessionFactory() as session:
+            return await _attach_post_scores(session, candidate_posts)
+    except Exception as exc:  # pragma: no cover - defensive fallback
+        logger.warning("Post score attach skipped: %s", exc)
+        return list(candidate_posts), {}
+
+
+async def _stage_post_embeddings(
+    candidate_posts: List[Dict[str, Any]],
+) -> dict[str, list[float]]:
+    try:
+        async with SessionFactory() as session:
+            return await _fetch_post_embeddings(session, candidate_posts)
+    except Exception as exc:  # pragma: no cover - defensive fallback
+        logger.warning("Post embedding fetch skipped: %s", exc)
+        return {}
+
+
+async def _stage_label_signals(numeric_ids: List[int]) -> BusinessSignals | None:
+    return await _extract_business_signals_from_labels(numeric_ids)
+
+
+async def _stage_trend_series(trend_tokens: List[str]) -> list[dict[str, Any]]:
+    if not trend_tokens:
+        return []
+    try:
+        async with SessionFactory() as session:
+            return await build_trend_analysis(session, topic_tokens=trend_tokens, months=12)
+    except Exception:
+        return []
+
+
+async def _stage_coverage_summary(collected: List[CollectedCommunity]) -> dict[str, Any]:
+    return await _fetch_coverage_summary([entry.profile.name for entry in collected])
+
+
+async def _stage_trend_freshness() -> tuple[bool, list[str]]:
+    return await _check_trend_views_freshness()
+
+
+async def _stage_discovered_communities(
+    task: TaskSummary,
+    collected: List[CollectedCommunity],
+    keywords: List[str],
+    report_tier: str | None,
+) -> DiscoveredCommunityRecordResult:
+    # report_tier 只作门控：走到报告渲染才写库（早退路径不落 discovered_communities）
+    return await _record_discovered_communities(task, collected, keywords)
+
+
+def _build_analysis_stage_graph(settings: Settings) -> AnalysisStageGraph:
+    graph = AnalysisStageGraph(
+        max_concurrency=int(getattr(settings, "analysis_stage_max_concurrency", 2) or 2)
+    )
+    # critical：主流程 provide 输入后立即 await；其余旁路阶段在 start() 时就绪，结果很久之后才用
+    graph.add("post_scores", _stage_post_scores, inputs=("candidate_posts",), critical=True)
+    if getattr(settings, "enable_vector_dedup", False):
+        graph.add(
+            "post_embeddings", _stage_post_embeddings, inputs=("candidate_posts",), critical=True
+        )
+    graph.add("label_signals", _stage_label_signals, inputs=("numeric_ids",), critical=True)
+    graph.add("trend_series", _stage_trend_series, inputs=("trend_tokens",))
+    graph.add("coverage_summary", _stage_coverage_summary, inputs=("collected",))
+    graph.add("trend_freshness", _stage_trend_freshness)
+    graph.add(
+        "discovered_communities",
+        _stage_discovered_communities,
+        inputs=("task", "collected", "keywords", "report_tier"),
+    )
+    return graph
+
+
 async def run_analysis(
     task: TaskSummary,
     *,
     data_collection: DataCollectionService | None = None,
 ) -> AnalysisResult:
+    """分析入口：阶段计时（可选单任务 profiling）+ 阶段 DAG 包住 _run_analysis_stages，结果写入 sources。"""
+    settings = get_settings()
+    stage_timer = StageTimer()
+    stage_graph = _build_analysis_stage_graph(settings)
+    task_id = getattr(task, "id", None)
+    profile_target = str(getattr(settings, "analysis_profile_task_id", "") or "").strip()
+    profile_info: dict[str, Any] | None = None
+    try:
+        with activate_stage_timer(stage_timer):
+            if profile_target and task_id is not None and str(task_id) == profile_target:
+                with capture_profile(
+                    f"analysis-{task_id}",
+                    output_dir=str(getattr(settings, "analysis_profile_dir", "reports/profiles")),
+                ) as profile_info:
+                    result = await _run_analysis_stages(
+                        task,
+                        data_collection=data_collection,
+                        stage_timer=stage_timer,
+                        stage_graph=stage_graph,
+                    )
+            else:
+                result = await _run_analysis_stages(
+                    task,
+                    data_collection=data_collection,
+                    stage_timer=stage_timer,
+                    stage_graph=stage_graph,
+                )
+    finally:
+        await stage_graph.aclose()
+        stage_timer.finish()
+        logger.info(
+            "analysis stage timings task=%s %s",
+            task_id,
+            json.dumps(stage_timer.as_dict(), ensure_ascii=False),
+        )
+    stage_timings = stage_timer.as_dict()
+    if profile_info:
+        stage_timings["profile"] = profile_info
+    result.sources["stage_timings"] = stage_timings
+    result.sources["stage_graph"] = stage_graph.describe()
+    return result
+
+
+async def _run_analysis_stages(
+    task: TaskSummary,
+    *,
+    data_collection: DataCollectionService | None,
+    stage_timer: StageTimer,
+    stage_graph: AnalysisStageGraph,
+) -> AnalysisResult:
+    stage_timer.enter("keywords")
     # 🔀 分支 0: TopicProfile 模式选择
     #    路径 A: topic_profile_id 存在 → 使用 profile 的关键词/社区/时间窗 (精准模式)
     #    路径 B: topic_profile_id 不存在 → 默认 NLP 提取关键词 (通用模式)
@@ -3016,6 +3150,7 @@ async def run_analysis(
         except Exception:  # pragma: no cover - best effort
             data_readiness = None
 
+    stage_timer.enter("sample_guard")
     # 🔀 分支 1: Sample Guard 前置门禁 ⛔ (EARLY RETURN #1)
     #    路径 A: remaining_shortfall > 0 → 触发 backfill (Redis budget 三层限流) + 返回 blocked
     #    路径 B: remaining_shortfall == 0 → 继续; guard 异常时返回 None 也继续
@@ -3059,6 +3194,7 @@ async def run_analysis(
         allow_mock_fallback = False
     data_source_label = "real"
 
+    stage_timer.enter("community_selection")
     # 1) 从数据库加载真实的社区池
     from app.models.community_pool import CommunityPool as CommunityPoolModel
 
@@ -3173,6 +3309,7 @@ async def run_analysis(
         logger.warning(f"Failed to load communities from database: {e}")
         db_communities = []
 
+    stage_timer.enter("reddit_search")
     # 2) 使用组合查询提高搜索精度
     # 注意：如果 data_collection 参数被显式提供（测试场景），跳过 Reddit 搜索
     # 🔀 分支 4: 数据采集三条路径
@@ -3235,6 +3372,7 @@ async def run_analysis(
         logger.warning(f"Reddit API initialization failed: {e}")
         search_posts = []
 
+    stage_timer.enter("community_selection")
     # 3) 基于搜索结果和数据库社区池选择最相关的社区
     discovered_selected: List[CommunityProfile] = []
 
@@ -3446,6 +3584,7 @@ async def run_analysis(
 
     logger.info(f"Final selected communities: {[c.name for c in selected]}")
 
+    stage_timer.enter("collection")
     collection_result: CollectionResult | None = None
     cache_only_result: CollectionResult | None = None
     service = data_collection
@@ -3541,6 +3680,13 @@ async def run_analysis(
         cache_hit_rate = cache_hit_rate or 0.0
 
     all_posts = [post for entry in collected for post in entry.posts]
+    # 采集完成后放开阶段 DAG：趋势 / 覆盖度 / 视图新鲜度等旁路查询与主流程并发
+    stage_graph.provide("task", task)
+    stage_graph.provide("keywords", keywords)
+    stage_graph.provide("collected", collected)
+    stage_graph.provide("trend_tokens", list(dict.fromkeys(fetch_keywords or keywords)))
+    stage_graph.start()
+    stage_timer.enter("hybrid_retrieval")
     hybrid_posts: list[dict[str, Any]] = []
     hybrid_retrieval_status: str | None = None
     hybrid_retrieval_reason: str | None = None
@@ -3567,6 +3713,7 @@ async def run_analysis(
     if hybrid_posts:
         all_posts = _merge_posts_by_id(all_posts, hybrid_posts)
 
+    stage_timer.enter("filter_dedup")
     filter_keywords = fetch_keywords if topic_profile is not None else keywords
     filtered_posts = _filter_posts_by_keywords(all_posts, filter_keywords)
     filtered_posts = _filter_posts_by_blacklist_config(filtered_posts, blacklist_config)
@@ -3683,18 +3830,16 @@ async def run_analysis(
                     confidence_score=0.0,
                 )
 
+    stage_timer.enter("scoring")
     post_score_stats: dict[str, Any] = {}
     noise_pool_stats: dict[str, Any] = {}
     embedding_map: dict[str, list[float]] = {}
-    try:
-        async with SessionFactory() as session:
-            deduped_posts, post_score_stats = await _attach_post_scores(
-                session, deduped_posts
-            )
-            if settings.enable_vector_dedup:
-                embedding_map = await _fetch_post_embeddings(session, deduped_posts)
-    except Exception as exc:  # pragma: no cover - defensive fallback
-        logger.warning("Post score attach skipped: %s", exc)
+    # 评分与向量读取只依赖过滤后的帖子 id，各自开 session 并发
+    stage_graph.provide("candidate_posts", list(deduped_posts))
+    deduped_posts, post_score_stats = await stage_graph.result("post_scores")
+    if settings.enable_vector_dedup:
+        stage_timer.enter("embeddings")
+        embedding_map = await stage_graph.result("post_embeddings")
     if settings.enable_vector_dedup and embedding_map:
         deduped_posts = deduplicate_posts_by_embeddings(
             deduped_posts,
@@ -3721,10 +3866,12 @@ async def run_analysis(
             except Exception:
                 continue
 
+    stage_timer.enter("signal_extraction")
     # 🔀 分支 6: 信号提取策略
     #    路径 A: DB labels 可用 (content_labels/content_entities) → 精准结构化信号
     #    路径 B: DB labels 不可用 (返回 None) → SIGNAL_EXTRACTOR 启发式 (TF-IDF + 正则)
-    business_signals = await _extract_business_signals_from_labels(numeric_ids)
+    stage_graph.provide("numeric_ids", numeric_ids)
+    business_signals = await stage_graph.result("label_signals")
     if business_signals is None:
         logger.debug("Label-based signals unavailable; falling back to heuristic extraction.")
         business_signals = SIGNAL_EXTRACTOR.extract(deduped_posts, keywords)
@@ -3918,6 +4065,7 @@ async def run_analysis(
 
     competitors_payload = assign_competitor_layers(competitors_payload)
 
+    stage_timer.enter("clustering")
     # Prepare helper views for linking
     clusters = []
     try:
@@ -4069,18 +4217,8 @@ async def run_analysis(
             }
         )
 
-    trend_series: list[dict[str, Any]] = []
-    trend_tokens = list(dict.fromkeys(fetch_keywords or keywords))
-    if trend_tokens:
-        try:
-            async with SessionFactory() as _s:
-                trend_series = await build_trend_analysis(
-                    _s,
-                    topic_tokens=trend_tokens,
-                    months=12,
-                )
-        except Exception:
-            trend_series = []
+    stage_timer.enter("trend_analysis")
+    trend_series: list[dict[str, Any]] = await stage_graph.result("trend_series")
 
     market_saturation_payload: list[dict[str, Any]] = []
     competitor_names = [
@@ -4245,6 +4383,7 @@ async def run_analysis(
     # NOTE: high_value_pains / brand_pain / solutions 将在 sample_comments_db 加载后生成，
     # 以保证评论能真正进入证据链（Task 8 / P1）。
 
+    stage_timer.enter("comments_evidence")
     # --- P0.5: comments must be part of the facts package (no more hard-coded 0) ---
     sample_comments_db: list[dict[str, Any]] = []
     comment_counts_by_subreddit: Counter[str] = Counter()
@@ -4488,9 +4627,8 @@ async def run_analysis(
         *post_remediation_actions,
         *comment_remediation_actions,
     ]
-    coverage_summary = await _fetch_coverage_summary(
-        [entry.profile.name for entry in collected]
-    )
+    stage_timer.enter("coverage_summary")
+    coverage_summary = await stage_graph.result("coverage_summary")
     data_lineage = _build_data_lineage(
         source_range=source_range,
         coverage=coverage_summary,
@@ -4525,6 +4663,7 @@ async def run_analysis(
     }
     if facts_diagnostics:
         facts_v2_package["diagnostics"] = dict(facts_diagnostics)
+    stage_timer.enter("facts_quality")
     # 🔀 分支 7: Facts V2 质量门禁 (Serena 验证: _determine_report_tier in facts_v2/quality.py)
     #    → X_blocked:  topic_mismatch 或 range_mismatch (报告拦截)
     #    → C_scouting: comments_low 或 comments_not_used (侦察简报)
@@ -4579,7 +4718,7 @@ async def run_analysis(
         stale_cache_fallback_subreddits,
         api_failure_details,
     )
-    trend_degraded, trend_sources = await _check_trend_views_freshness()
+    trend_degraded, trend_sources = await stage_graph.result("trend_freshness")
     coverage_tier = (
         facts_v2_quality.get("metrics", {}).get("coverage_tier")
         if isinstance(facts_v2_quality, dict)
@@ -4708,21 +4847,9 @@ async def run_analysis(
     if report_tier == "C_scouting":
         sources.setdefault("analysis_blocked", "scouting_brief")
 
-    # 将本次分析涉及的社区写入 discovered_communities，便于后续查询/回溯
-    try:
-        discovered_record = await _record_discovered_communities(task, collected, keywords)
-        if discovered_record is not None and discovered_record.status != "completed":
-            logger.info(
-                "Skipped discovered communities persistence",
-                extra={
-                    "task_id": str(task.id),
-                    "reason": discovered_record.reason,
-                    "status": discovered_record.status,
-                },
-            )
-    except Exception:
-        logger.warning("Failed to record discovered communities", exc_info=True)
-
+    # 将本次分析涉及的社区写入 discovered_communities，便于后续查询/回溯（与报告渲染并发，渲染后取结果）
+    stage_graph.provide("report_tier", report_tier)
+    stage_timer.enter("rendering")
     flags: list[str] = []
     suggestion = ""
     if report_tier == "X_blocked":
@@ -4754,6 +4881,22 @@ async def run_analysis(
     sources["llm_model"] = structured_render.model
     sources["llm_rounds"] = structured_render.rounds
 
+    stage_timer.enter("persist_communities")
+    try:
+        discovered_record = await stage_graph.result("discovered_communities")
+        if discovered_record is not None and discovered_record.status != "completed":
+            logger.info(
+                "Skipped discovered communities persistence",
+                extra={
+                    "task_id": str(task.id),
+                    "reason": discovered_record.reason,
+                    "status": discovered_record.status,
+                },
+            )
+    except Exception:
+        logger.warning("Failed to record discovered communities", exc_info=True)
+
+    stage_timer.enter("finalize")
     # 🔀 分支 9: 置信度评分 + 最终清理
     #    基于 cache_hit_rate + posts + communities + signals 六维度计算 0.0-1.0 分数
     # 从 sources 和 insights 中提取数据（使用类型断言）
@@ -4884,8 +5027,15 @@ async def _try_cache_only_collection(
     posts_by_subreddit: Dict[str, List[RedditPost]] = {}
     cached_subreddits: set[str] = set()
 
+    # 一次 MGET 读完整个社区池，避免逐社区往返；只有单 key 接口的缓存实现逐个读取
+    names = [profile.name for profile in profiles]
+    get_many = getattr(cache, "get_many_cached_posts", None)
+    if get_many is not None:
+        cached_by_name = await get_many(names)
+    else:
+        cached_by_name = {name: await cache.get_cached_posts(name) for name in names}
     for profile in profiles:
-        posts = await cache.get_cached_posts(profile.name)
+        posts = cached_by_name.get(profile.name)
         if posts:
             logger.info(f"[缓存优先] ✅ 缓存命中: {profile.name} ({len(posts)}个帖子)")
             posts_by_subreddit[profile.name] = posts
@@ -0,0 +1,298 @@
+"""
+分析阶段 DAG：声明每个阶段的输入 / 输出，输入齐备的阶段并发执行。
+
+- 主流程用 provide(key, value) 交出中间结果，用 await result(output) 在真正需要的位置取值
+- start() 之前只登记不调度（样本门禁等早退路径不会白跑查询）
+- 并发数由 per-analysis 槽位限制，保护 DB 连接池；每个阶段自开 session，互不共享
+- critical 阶段（主流程紧接着 await 的）优先拿槽位；还有 critical 阶段未完成时，非 critical 阶段
+  最多占 max_concurrency - 1 个，避免 start() 时先就绪的旁路查询占满槽位、把关键路径挤到队尾
+- 每个阶段在自己的 StageTimer 下执行：DB / Reddit / LLM 计数记在阶段节点上，不串到主流程当前 span
+- aclose() 取消仍在跑的阶段；describe() 输出节点、依赖边、状态与耗时，便于排查
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.services.infrastructure.stage_timing import StageTimer, activate_stage_timer
+
+logger = logging.getLogger(__name__)
+
+StageFn = Callable[..., Awaitable[Any]]
+
+STAGE_PENDING = "pending"
+STAGE_RUNNING = "running"
+STAGE_DONE = "done"
+STAGE_FAILED = "failed"
+STAGE_CANCELLED = "cancelled"
+
+
+@dataclass(slots=True)
+class StageNode:
+    name: str
+    fn: StageFn
+    inputs: tuple[str, ...]
+    output: str
+    critical: bool = False
+    status: str = STAGE_PENDING
+    queued_at: float | None = None
+    started_at: float | None = None
+    finished_at: float | None = None
+    error: str | None = None
+    db_queries: int = 0
+    reddit_calls: int = 0
+    llm_calls: int = 0
+    task: asyncio.Task[Any] | None = field(default=None, repr=False)
+
+
+class AnalysisStageGraph:
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 2,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self._max_concurrency = max(1, int(max_concurrency))
+        # 给 critical 阶段预留一个槽位（并发上限为 1 时只能靠优先级）
+        self._side_limit = max(1, self._max_concurrency - 1)
+        self._slots = asyncio.Condition()
+        self._side_running = 0
+        self._critical_waiting = 0
+        self._clock = clock
+        self._nodes: dict[str, StageNode] = {}
+        self._producers: dict[str, StageNode] = {}
+        self._values: dict[str, Any] = {}
+        self._outputs: dict[str, Any] = {}
+        self._started = False
+        self._origin = clock()
+        self._running = 0
+        self._peak_running = 0
+
+    def add(
+        self,
+        name: str,
+        fn: StageFn,
+        *,
+        inputs: Sequence[str] = (),
+        output: str | None = None,
+        critical: bool = False,
+    ) -> None:
+        """登记阶段；fn 以关键字参数接收 inputs，返回值作为 output（默认同名）。
+
+        critical=True 表示主流程产出输入后马上 await 它（关键路径），调度时优先。
+        """
+        output_key = output or name
+        if name in self._nodes:
+            raise ValueError(f"duplicate stage {name!r}")
+        if output_key in self._producers:
+            raise ValueError(f"output {output_key!r} already produced by {self._producers[output_key].name!r}")
+        node = StageNode(
+            name=name, fn=fn, inputs=tuple(inputs), output=output_key, critical=critical
+        )
+        self._nodes[name] = node
+        self._producers[output_key] = node
+        self._check_acyclic()
+        self._schedule_ready()
+
+    def provide(self, key: str, value: Any) -> None:
+        if key in self._producers:
+            raise ValueError(f"{key!r} is produced by stage {self._producers[key].name!r}")
+        self._values[key] = value
+        self._schedule_ready()
+
+    def start(self) -> None:
+        self._started = True
+        self._schedule_ready()
+
+    async def result(self, output: str) -> Any:
+        """等待产出 output 的阶段完成并返回结果；阶段失败时抛出其异常。"""
+        node = self._producers.get(output)
+        if node is None:
+            if output in self._values:
+                return self._values[output]
+            raise KeyError(f"no stage produces {output!r}")
+        if node.task is None and self._started:
+            # 只缺上游阶段的产出：先等上游（其完成时会调度本阶段）
+            for key in node.inputs:
+                if not self._available(key) and key in self._producers:
+                    await self.result(key)
+        if node.task is None:
+            missing = [key for key in node.inputs if not self._available(key)]
+            raise RuntimeError(
+                f"stage {node.name!r} not scheduled (started={self._started}, missing inputs={missing})"
+            )
+        return await asyncio.shield(node.task)
+
+    async def aclose(self) -> None:
+        tasks = [node.task for node in self._nodes.values() if node.task is not None and not node.task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for node in self._nodes.values():
+            if node.task is not None and node.task.done() and not node.task.cancelled():
+                # 取走异常，避免未 await 的失败阶段在 GC 时告警
+                node.task.exception()
+
+    def describe(self) -> dict[str, Any]:
+        def _offset(value: float | None) -> float | None:
+            return None if value is None else round((value - self._origin) * 1000, 1)
+
+        nodes: list[dict[str, Any]] = []
+        for node in self._nodes.values():
+            wall_ms = None
+            wait_ms = None
+            if node.started_at is not None and node.finished_at is not None:
+                wall_ms = round((node.finished_at - node.started_at) * 1000, 1)
+            if node.queued_at is not None and node.started_at is not None:
+                wait_ms = round((node.started_at - node.queued_at) * 1000, 1)
+            nodes.append(
+                {
+                    "name": node.name,
+                    "inputs": list(node.inputs),
+                    "output": node.output,
+                    "depends_on": sorted(
+                        {self._producers[key].name for key in node.inputs if key in self._producers}
+                    ),
+                    "critical": node.critical,
+                    "status": node.status,
+                    "started_ms": _offset(node.started_at),
+                    "finished_ms": _offset(node.finished_at),
+                    "wall_ms": wall_ms,
+                    "semaphore_wait_ms": wait_ms,
+                    "db_queries": node.db_queries,
+                    "reddit_calls": node.reddit_calls,
+                    "llm_calls": node.llm_calls,
+                    "error": node.error,
+                }
+            )
+        return {
+            "max_concurrency": self._max_concurrency,
+            "peak_concurrency": self._peak_running,
+            "external_inputs": sorted(
+                {key for node in self._nodes.values() for key in node.inputs if key not in self._producers}
+            ),
+            "stages": nodes,
+        }
+
+    def _available(self, key: str) -> bool:
+        return key in self._values or key in self._outputs
+
+    def _value(self, key: str) -> Any:
+        return self._values[key] if key in self._values else self._outputs[key]
+
+    def _schedule_ready(self) -> None:
+        if not self._started:
+            return
+        for node in self._nodes.values():
+            if node.task is None and all(self._available(key) for key in node.inputs):
+                kwargs = {key: self._value(key) for key in node.inputs}
+                node.queued_at = self._clock()
+                node.task = asyncio.create_task(self._run(node, kwargs), name=f"analysis-stage:{node.name}")
+
+    def _slot_free(self, node: StageNode) -> bool:
+        if self._running >= self._max_concurrency:
+            return False
+        if node.critical:
+            return True
+        if self._critical_waiting:
+            return False
+        # 只在还有未完成的 critical 阶段时预留槽位；关键路径跑完后旁路阶段可用满并发
+        critical_pending = any(
+            other.critical and other.status in (STAGE_PENDING, STAGE_RUNNING)
+            for other in self._nodes.values()
+        )
+        return not critical_pending or self._side_running < self._side_limit
+
+    async def _acquire_slot(self, node: StageNode) -> None:
+        async with self._slots:
+            if node.critical:
+                self._critical_waiting += 1
+            try:
+                await self._slots.wait_for(lambda: self._slot_free(node))
+            finally:
+                if node.critical:
+                    self._critical_waiting -= 1
+            self._running += 1
+            if not node.critical:
+                self._side_running += 1
+            elif self._critical_waiting == 0:
+                # 没有 critical 在排队了：让被优先级挡住的旁路阶段重新检查剩余槽位
+                self._slots.notify_all()
+            self._peak_running = max(self._peak_running, self._running)
+
+    async def _release_slot(self, node: StageNode) -> None:
+        async with self._slots:
+            self._running -= 1
+            if not node.critical:
+                self._side_running -= 1
+            self._slots.notify_all()
+
+    async def _run(self, node: StageNode, kwargs: dict[str, Any]) -> Any:
+        try:
+            await self._acquire_slot(node)
+        except asyncio.CancelledError:
+            node.status = STAGE_CANCELLED
+            raise
+        try:
+            node.status = STAGE_RUNNING
+            node.started_at = self._clock()
+            # 阶段自带 timer：本任务（context 副本）内的查询 / 调用不再计入主流程当前阶段
+            stage_timer = StageTimer(clock=self._clock)
+            span = stage_timer.enter(node.name)
+            try:
+                with activate_stage_timer(stage_timer):
+                    value = await node.fn(**kwargs)
+            finally:
+                stage_timer.finish()
+                node.finished_at = self._clock()
+                node.db_queries = span.db_queries
+                node.reddit_calls = span.reddit_calls
+                node.llm_calls = span.llm_calls
+        except asyncio.CancelledError:
+            node.status = STAGE_CANCELLED
+            raise
+        except Exception as exc:
+            node.status = STAGE_FAILED
+            node.error = str(exc)[:200] or exc.__class__.__name__
+            logger.warning("analysis stage %s failed: %s", node.name, exc)
+            raise
+        else:
+            node.status = STAGE_DONE
+            self._outputs[node.output] = value
+        finally:
+            # 终态先落定再释放槽位：被唤醒的旁路阶段据此判断是否还需为关键路径预留
+            await self._release_slot(node)
+        # 下游阶段在本阶段完成的同一轮调度，不等主流程 await
+        self._schedule_ready()
+        return value
+
+    def _check_acyclic(self) -> None:
+        visiting: set[str] = set()
+        done: set[str] = set()
+
+        def _visit(node: StageNode, path: list[str]) -> None:
+            if node.name in done:
+                return
+            if node.name in visiting:
+                raise ValueError(f"stage cycle: {' -> '.join([*path, node.name])}")
+            visiting.add(node.name)
+            for key in node.inputs:
+                producer = self._producers.get(key)
+                if producer is not None:
+                    _visit(producer, [*path, node.name])
+            visiting.discard(node.name)
+            done.add(node.name)
+
+        for node in list(self._nodes.values()):
+            _visit(node, [])
+
+
+__all__ = [
+    "AnalysisStageGraph",
+    "StageNode",
+]
@@ -7,6 +7,7 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.read_scopes import get_comments_core_lab_relation
+from app.services.analysis.subreddit_daily_stats import fetch_rollup_totals, rollup_available
 
 
 async def _ps_ratio_by_subreddit(session: AsyncSession, subs: Sequence[str], since_days: int) -> Dict[str, float]:
@@ -94,6 +95,34 @@ async def _brand_penetration(session: AsyncSession, subs: Sequence[str], since_d
     return {str(sub): float(pen or 0.0) for sub, pen in res.fetchall()}
 
 
+async def _rollup_comment_signals(
+    session: AsyncSession, subs: Sequence[str], since_days: int
+) -> tuple[Dict[str, float], Dict[str, float], Dict[str, float]] | None:
+    """P/S 比、痛点密度、品牌渗透率一次从日汇总表读出；表不可用时返回 None。"""
+    today = datetime.now(timezone.utc).date()
+    since_day = today - timedelta(days=max(1, since_days))
+    if not await rollup_available(session, since_day=since_day):
+        return None
+    totals = await fetch_rollup_totals(
+        session,
+        subs=subs,
+        since_day=since_day,
+        until_day=today,
+    )
+    ps: Dict[str, float] = {}
+    density: Dict[str, float] = {}
+    brand: Dict[str, float] = {}
+    for sub, t in totals.items():
+        if t.pain_labels or t.solution_labels:
+            ps[sub] = t.pain_labels / max(1.0, float(t.solution_labels))
+        else:
+            ps[sub] = 0.0
+        if t.comments:
+            density[sub] = t.pain_labels / float(t.comments)
+            brand[sub] = t.brand_comments / float(t.comments)
+    return ps, density, brand
+
+
 async def _moderation_score(session: AsyncSession, subs: Sequence[str]) -> Dict[str, float]:
     # Use latest snapshot if present; otherwise 0.5 baseline (50/100)
     res = await session.execute(
@@ -202,9 +231,13 @@ async def compute_ranking_scores(
         return {}
 
     # Fetch Metrics
-    ps = await _ps_ratio_by_subreddit(session, subs, since_days_30)
-    density = await _pain_density(session, subs, since_days_30) # Used as secondary pain metric
-    brand = await _brand_penetration(session, subs, since_days_30)
+    rollup = await _rollup_comment_signals(session, subs, since_days_30)
+    if rollup is not None:
+        ps, density, brand = rollup
+    else:
+        ps = await _ps_ratio_by_subreddit(session, subs, since_days_30)
+        density = await _pain_density(session, subs, since_days_30) # Used as secondary pain metric
+        brand = await _brand_penetration(session, subs, since_days_30)
     mod = await _moderation_score(session, subs)
     
     # Fetch Base Volume (Total Posts in 30d)
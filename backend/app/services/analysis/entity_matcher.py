@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import re
 from collections import Counter
 from pathlib import Path
 from typing import Any, Dict, Iterable, Mapping
 
 import yaml
 
+from app.services.semantic.term_automaton import compile_term_automaton
+
 
 class EntityMatcher:
     """Lightweight entity dictionary matcher for Phase 8 entity highlighting."""
@@ -38,19 +39,15 @@ class EntityMatcher:
             if normalized:
                 self._dictionary[str(category)] = normalized
 
-        # Precompile regex patterns for faster matching (case-insensitive, word-boundary safe for latin tokens)
-        self._patterns: dict[str, tuple[tuple[str, re.Pattern], ...]] = {}
-        for category, entities in self._dictionary.items():
-            compiled: list[tuple[str, re.Pattern]] = []
-            for entity in entities:
-                token = re.escape(entity)
-                # Allow partial matches for multi-word or non-latin words by falling back to simple search
-                if re.search(r"[A-Za-z]", entity):
-                    pattern = re.compile(rf"\b{token}\b", re.IGNORECASE)
-                else:
-                    pattern = re.compile(token, re.IGNORECASE)
-                compiled.append((entity, pattern))
-            self._patterns[category] = tuple(compiled)
+        # 所有分类的实体共用一个自动机：每段文本只扫描一遍
+        # （拉丁词条保持词边界，非拉丁词条按子串匹配，均不区分大小写）
+        entries = [
+            (category, entity)
+            for category, entities in self._dictionary.items()
+            for entity in entities
+        ]
+        self._entries: tuple[tuple[str, str], ...] = tuple(entries)
+        self._automaton = compile_term_automaton([entity for _, entity in entries])
 
     def match_text(self, text: str | None) -> dict[str, list[str]]:
         """Match dictionary entities against the provided text."""
@@ -60,10 +57,9 @@ class EntityMatcher:
         matches: dict[str, set[str]] = {
             category: set() for category in self._dictionary
         }
-        for category, patterns in self._patterns.items():
-            for entity, pattern in patterns:
-                if pattern.search(text):
-                    matches[category].add(entity)
+        for index in self._automaton.matched(text):
+            category, entity = self._entries[index]
+            matches[category].add(entity)
 
         return {category: sorted(values) for category, values in matches.items()}
 
@@ -9,10 +9,16 @@ Hybrid Matcher - 支持 exact/phrase/semantic 三种匹配策略
 
 from __future__ import annotations
 
-import re
 from dataclasses import dataclass
 from typing import Dict, List, Set, Tuple
 
+from app.services.semantic.term_automaton import (
+    BOUNDARY_SUBSTRING,
+    BOUNDARY_WORD,
+    TermPattern,
+    compile_term_automaton,
+)
+
 # 可选：如果需要语义匹配，可以引入 sentence-transformers
 # from sentence_transformers import SentenceTransformer
 # import numpy as np
@@ -64,9 +70,20 @@ class HybridMatcher:
             elif term.precision_tag == "semantic":
                 self.semantic_terms.append(term)
         
-        # 预编译正则
+        # 预编译：exact + phrase 的全部变体共用一个自动机，每篇文本单遍扫描
         self._exact_patterns = self._compile_exact_patterns(self.exact_terms)
         self._phrase_patterns = self._compile_phrase_patterns(self.phrase_terms)
+        self._variants: List[Tuple[str, Term, str]] = [
+            (variant, term, "exact") for variant, term in self._exact_patterns.items()
+        ] + [
+            (variant, term, "phrase") for variant, term in self._phrase_patterns.items()
+        ]
+        self._automaton = compile_term_automaton(
+            [
+                TermPattern(variant, BOUNDARY_WORD if match_type == "exact" else BOUNDARY_SUBSTRING)
+                for variant, _term, match_type in self._variants
+            ]
+        )
         
         # 语义模型（可选）
         self._semantic_model = None
@@ -77,9 +94,9 @@ class HybridMatcher:
             except ImportError:
                 print("⚠️  sentence-transformers not installed, semantic matching disabled")
     
-    def _compile_exact_patterns(self, terms: List[Term]) -> Dict[str, Tuple[Term, re.Pattern]]:
+    def _compile_exact_patterns(self, terms: List[Term]) -> Dict[str, Term]:
         """
-        编译 exact 匹配模式
+        收集 exact 匹配变体
         
         exact 匹配规则：
         - 完全匹配词边界
@@ -90,16 +107,13 @@ class HybridMatcher:
         for term in terms:
             all_variants = [term.canonical] + term.aliases
             for variant in all_variants:
-                # 转义特殊字符
-                escaped = re.escape(variant)
-                # 词边界匹配
-                pattern = re.compile(rf'\b{escaped}\b', re.IGNORECASE)
-                patterns[variant] = (term, pattern)
+                if variant:
+                    patterns[variant] = term
         return patterns
     
-    def _compile_phrase_patterns(self, terms: List[Term]) -> Dict[str, Tuple[Term, re.Pattern]]:
+    def _compile_phrase_patterns(self, terms: List[Term]) -> Dict[str, Term]:
         """
-        编译 phrase 匹配模式
+        收集 phrase 匹配变体
         
         phrase 匹配规则：
         - 短语匹配（可以跨词）
@@ -110,11 +124,9 @@ class HybridMatcher:
         for term in terms:
             all_variants = [term.canonical] + term.aliases
             for variant in all_variants:
-                # 转义特殊字符
-                escaped = re.escape(variant)
-                # 不要求词边界（允许作为子串）
-                pattern = re.compile(escaped, re.IGNORECASE)
-                patterns[variant] = (term, pattern)
+                if variant:
+                    # 不要求词边界（允许作为子串）
+                    patterns[variant] = term
         return patterns
     
     def match_text(self, text: str) -> List[MatchResult]:
@@ -129,30 +141,18 @@ class HybridMatcher:
         """
         results = []
         
-        # 1. exact 匹配
-        for variant, (term, pattern) in self._exact_patterns.items():
-            matches = list(pattern.finditer(text))
-            if matches:
-                results.append(MatchResult(
-                    term=variant,
-                    canonical=term.canonical,
-                    category=term.category,
-                    count=len(matches),
-                    positions=[m.start() for m in matches],
-                    match_type="exact",
-                ))
-        
-        # 2. phrase 匹配
-        for variant, (term, pattern) in self._phrase_patterns.items():
-            matches = list(pattern.finditer(text))
-            if matches:
+        # 1+2. exact / phrase 匹配（单遍扫描；结果顺序与变体登记顺序一致）
+        positions = self._automaton.find_all(text)
+        for index, (variant, term, match_type) in enumerate(self._variants):
+            starts = positions.get(index)
+            if starts:
                 results.append(MatchResult(
                     term=variant,
                     canonical=term.canonical,
                     category=term.category,
-                    count=len(matches),
-                    positions=[m.start() for m in matches],
-                    match_type="phrase",
+                    count=len(starts),
+                    positions=starts,
+                    match_type=match_type,
                 ))
         
         # 3. semantic 匹配（可选）
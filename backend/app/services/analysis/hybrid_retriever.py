@@ -191,7 +191,7 @@ async def run_hybrid_retrieval(
         degraded_reasons.append("fulltext_query_failed")
 
     try:
-        topic_embedding = embedding_service.encode(topic)
+        topic_embedding = embedding_service.encode_query(topic)
     except Exception:
         topic_embedding = None
         degraded_reasons.append("embedding_unavailable")
@@ -0,0 +1,317 @@
+"""按天、按社区预聚合的统计表（subreddit_daily_stats）。
+
+T1 统计 / 社区排序原来每次请求都在 posts_raw + comments 上做 365 天全量聚合，
+且 `lower(subreddit) = ANY(:subs)` 用不上 (subreddit, created_at) 索引。
+这里把每天每个社区的帖子数、评论数、pain/solution 标签数、品牌评论数、pain 维度分布
+和当天最新帖子标题预先算好，由维护任务增量刷新最近 N 天；读路径只扫 (subreddit, day) 主键。
+
+- 键统一为 lower(subreddit)（保留 r/ 前缀，与 posts_raw / comments 的存储口径一致）
+- 日期按 UTC 切分；窗口以天为粒度
+- 回填水位 covered_since 单独存一行（subreddit_daily_stats_coverage）：[covered_since, 今天] 已完整回填；
+  水位未覆盖读窗口（未迁移 / 回填未完成 / 回填中途失败）时 rollup_available() 返回 False，调用方回退到实时聚合
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.read_scopes import get_comments_core_lab_relation
+
+ROLLUP_TABLE = "subreddit_daily_stats"
+ROLLUP_COVERAGE_TABLE = "subreddit_daily_stats_coverage"
+
+
+@dataclass(slots=True)
+class SubredditRollupTotals:
+    posts: int = 0
+    comments: int = 0
+    recent_posts: int = 0
+    recent_comments: int = 0
+    pain_labels: int = 0
+    solution_labels: int = 0
+    brand_comments: int = 0
+
+
+def _subs_params(subs: Sequence[str]) -> dict[str, Any]:
+    normalized = sorted({s.lower() for s in subs if s})
+    return {"has_subs": bool(normalized), "subs": normalized or [""]}
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+async def rollup_table_exists(session: AsyncSession) -> bool:
+    present = (
+        await session.execute(
+            text(
+                f"SELECT to_regclass('public.{ROLLUP_TABLE}') IS NOT NULL"
+                f" AND to_regclass('public.{ROLLUP_COVERAGE_TABLE}') IS NOT NULL"
+            )
+        )
+    ).fetchall()
+    return bool(present and present[0][0])
+
+
+async def fetch_rollup_covered_since(session: AsyncSession) -> date | None:
+    """回填水位：返回已完整回填区间的起始日；从未回填（或表不存在）时返回 None。"""
+    if not await rollup_table_exists(session):
+        return None
+    rows = (
+        await session.execute(text(f"SELECT covered_since FROM {ROLLUP_COVERAGE_TABLE} WHERE id = 1"))
+    ).fetchall()
+    return rows[0][0] if rows else None
+
+
+async def mark_rollup_covered_since(session: AsyncSession, covered_since: date) -> None:
+    """推进回填水位（与对应回填片段同一事务；调用方负责提交）。"""
+    await session.execute(
+        text(
+            f"""
+            INSERT INTO {ROLLUP_COVERAGE_TABLE} (id, covered_since, updated_at)
+            VALUES (1, :covered_since, NOW())
+            ON CONFLICT (id) DO UPDATE SET
+                covered_since = EXCLUDED.covered_since,
+                updated_at = EXCLUDED.updated_at
+            """
+        ),
+        {"covered_since": covered_since},
+    )
+
+
+async def rollup_available(session: AsyncSession, *, since_day: date | None = None) -> bool:
+    """回填水位覆盖 since_day 才走 rollup（未迁移 / 回填未完成的库继续用实时聚合）。"""
+    covered_since = await fetch_rollup_covered_since(session)
+    if covered_since is None:
+        return False
+    return since_day is None or covered_since <= since_day
+
+
+async def refresh_subreddit_daily_stats(
+    session: AsyncSession,
+    *,
+    start_day: date,
+    end_day: date,
+    subreddits: Sequence[str] | None = None,
+) -> int:
+    """重算 [start_day, end_day] 区间内的日汇总行（先删后插，同一事务；调用方负责提交）。"""
+    if end_day < start_day:
+        return 0
+    comments_rel = await get_comments_core_lab_relation(session)
+    params = {
+        "start_day": start_day,
+        "end_day": end_day,
+        "start_ts": _day_start(start_day),
+        "end_ts": _day_start(end_day + timedelta(days=1)),
+        **_subs_params(subreddits or []),
+    }
+    await session.execute(
+        text(
+            f"""
+            DELETE FROM {ROLLUP_TABLE}
+            WHERE day BETWEEN :start_day AND :end_day
+              AND (:has_subs = FALSE OR subreddit = ANY(:subs))
+            """
+        ),
+        params,
+    )
+    result = await session.execute(
+        text(
+            f"""
+            WITH posts AS (
+                SELECT lower(subreddit) AS sr,
+                       (created_at AT TIME ZONE 'UTC')::date AS day,
+                       COUNT(*) AS posts,
+                       (ARRAY_AGG(title ORDER BY created_at DESC))[1] AS latest_post_title,
+                       MAX(created_at) AS latest_post_at
+                FROM posts_raw
+                WHERE is_current = true
+                  AND COALESCE(is_duplicate, false) = false
+                  AND created_at >= :start_ts AND created_at < :end_ts
+                  AND (:has_subs = FALSE OR lower(subreddit) = ANY(:subs))
+                GROUP BY 1, 2
+            ),
+            target_comments AS (
+                SELECT id, lower(subreddit) AS sr, (created_utc AT TIME ZONE 'UTC')::date AS day
+                FROM {comments_rel}
+                WHERE created_utc >= :start_ts AND created_utc < :end_ts
+                  AND (:has_subs = FALSE OR lower(subreddit) = ANY(:subs))
+            ),
+            comment_counts AS (
+                SELECT sr, day, COUNT(*) AS comments
+                FROM target_comments
+                GROUP BY 1, 2
+            ),
+            labels AS (
+                SELECT tc.sr, tc.day,
+                       COUNT(*) FILTER (WHERE cl.category = 'pain') AS pain_labels,
+                       COUNT(*) FILTER (WHERE cl.category = 'solution') AS solution_labels
+                FROM target_comments tc
+                JOIN content_labels cl ON cl.content_type = 'comment' AND cl.content_id = tc.id
+                GROUP BY 1, 2
+            ),
+            aspects AS (
+                SELECT sr, day, jsonb_object_agg(aspect, cnt) AS pain_aspects
+                FROM (
+                    SELECT tc.sr, tc.day, COALESCE(cl.aspect::text, 'other') AS aspect, COUNT(*) AS cnt
+                    FROM target_comments tc
+                    JOIN content_labels cl ON cl.content_type = 'comment' AND cl.content_id = tc.id
+                    WHERE cl.category = 'pain'
+                    GROUP BY 1, 2, 3
+                ) per_aspect
+                GROUP BY 1, 2
+            ),
+            brands AS (
+                SELECT tc.sr, tc.day, COUNT(DISTINCT ce.content_id) AS brand_comments
+                FROM target_comments tc
+                JOIN content_entities ce
+                  ON ce.content_type = 'comment' AND ce.content_id = tc.id AND ce.entity_type = 'brand'
+                GROUP BY 1, 2
+            ),
+            keys AS (
+                SELECT sr, day FROM posts
+                UNION
+                SELECT sr, day FROM comment_counts
+            )
+            INSERT INTO {ROLLUP_TABLE} (
+                subreddit, day, posts, comments, pain_labels, solution_labels, brand_comments,
+                pain_aspects, latest_post_title, latest_post_at, refreshed_at
+            )
+            SELECT k.sr, k.day,
+                   COALESCE(p.posts, 0), COALESCE(c.comments, 0),
+                   COALESCE(l.pain_labels, 0), COALESCE(l.solution_labels, 0),
+                   COALESCE(b.brand_comments, 0),
+                   COALESCE(a.pain_aspects, '{{}}'::jsonb),
+                   p.latest_post_title, p.latest_post_at, NOW()
+            FROM keys k
+            LEFT JOIN posts p ON p.sr = k.sr AND p.day = k.day
+            LEFT JOIN comment_counts c ON c.sr = k.sr AND c.day = k.day
+            LEFT JOIN labels l ON l.sr = k.sr AND l.day = k.day
+            LEFT JOIN aspects a ON a.sr = k.sr AND a.day = k.day
+            LEFT JOIN brands b ON b.sr = k.sr AND b.day = k.day
+            ON CONFLICT (subreddit, day) DO UPDATE SET
+                posts = EXCLUDED.posts,
+                comments = EXCLUDED.comments,
+                pain_labels = EXCLUDED.pain_labels,
+                solution_labels = EXCLUDED.solution_labels,
+                brand_comments = EXCLUDED.brand_comments,
+                pain_aspects = EXCLUDED.pain_aspects,
+                latest_post_title = EXCLUDED.latest_post_title,
+                latest_post_at = EXCLUDED.latest_post_at,
+                refreshed_at = EXCLUDED.refreshed_at
+            """
+        ),
+        params,
+    )
+    return int(result.rowcount or 0)
+
+
+async def fetch_rollup_totals(
+    session: AsyncSession,
+    *,
+    subs: Sequence[str],
+    since_day: date,
+    until_day: date,
+    recent_since_day: date | None = None,
+) -> dict[str, SubredditRollupTotals]:
+    rows = await session.execute(
+        text(
+            f"""
+            SELECT subreddit,
+                   SUM(posts) AS posts,
+                   SUM(comments) AS comments,
+                   SUM(posts) FILTER (WHERE day >= :recent_since_day) AS recent_posts,
+                   SUM(comments) FILTER (WHERE day >= :recent_since_day) AS recent_comments,
+                   SUM(pain_labels) AS pain_labels,
+                   SUM(solution_labels) AS solution_labels,
+                   SUM(brand_comments) AS brand_comments
+            FROM {ROLLUP_TABLE}
+            WHERE day BETWEEN :since_day AND :until_day
+              AND (:has_subs = FALSE OR subreddit = ANY(:subs))
+            GROUP BY subreddit
+            """
+        ),
+        {
+            "since_day": since_day,
+            "until_day": until_day,
+            "recent_since_day": recent_since_day or since_day,
+            **_subs_params(subs),
+        },
+    )
+    return {
+        str(row.subreddit): SubredditRollupTotals(
+            posts=int(row.posts or 0),
+            comments=int(row.comments or 0),
+            recent_posts=int(row.recent_posts or 0),
+            recent_comments=int(row.recent_comments or 0),
+            pain_labels=int(row.pain_labels or 0),
+            solution_labels=int(row.solution_labels or 0),
+            brand_comments=int(row.brand_comments or 0),
+        )
+        for row in rows.fetchall()
+    }
+
+
+async def fetch_rollup_pain_aspects(
+    session: AsyncSession,
+    *,
+    subs: Sequence[str],
+    since_day: date,
+    until_day: date,
+) -> list[tuple[str, int]]:
+    rows = await session.execute(
+        text(
+            f"""
+            SELECT kv.key AS aspect, SUM(kv.value::bigint) AS pain_cnt
+            FROM {ROLLUP_TABLE} s
+            CROSS JOIN LATERAL jsonb_each_text(s.pain_aspects) AS kv
+            WHERE s.day BETWEEN :since_day AND :until_day
+              AND (:has_subs = FALSE OR s.subreddit = ANY(:subs))
+            GROUP BY kv.key
+            ORDER BY pain_cnt DESC
+            """
+        ),
+        {"since_day": since_day, "until_day": until_day, **_subs_params(subs)},
+    )
+    return [(str(row.aspect), int(row.pain_cnt or 0)) for row in rows.fetchall()]
+
+
+async def fetch_rollup_latest_titles(
+    session: AsyncSession,
+    *,
+    subs: Sequence[str],
+    since_day: date,
+) -> dict[str, str]:
+    rows = await session.execute(
+        text(
+            f"""
+            SELECT DISTINCT ON (subreddit) subreddit, latest_post_title
+            FROM {ROLLUP_TABLE}
+            WHERE day >= :since_day
+              AND latest_post_title IS NOT NULL
+              AND (:has_subs = FALSE OR subreddit = ANY(:subs))
+            ORDER BY subreddit, day DESC
+            """
+        ),
+        {"since_day": since_day, **_subs_params(subs)},
+    )
+    return {str(row.subreddit): str(row.latest_post_title) for row in rows.fetchall()}
+
+
+__all__ = [
+    "ROLLUP_COVERAGE_TABLE",
+    "ROLLUP_TABLE",
+    "SubredditRollupTotals",
+    "fetch_rollup_covered_since",
+    "fetch_rollup_latest_titles",
+    "fetch_rollup_pain_aspects",
+    "fetch_rollup_totals",
+    "mark_rollup_covered_since",
+    "refresh_subreddit_daily_stats",
+    "rollup_available",
+    "rollup_table_exists",
+]
@@ -26,9 +26,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.analysis.search_query import build_websearch_query
 from app.services.semantic.embedding_service import embedding_service
 from app.db.read_scopes import get_comments_core_lab_relation
+from app.services.analysis.subreddit_daily_stats import (
+    fetch_rollup_latest_titles,
+    fetch_rollup_pain_aspects,
+    fetch_rollup_totals,
+    rollup_available,
+)
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_COMMUNITY_KEYWORDS = ("General Discussion", "Business")
+
 
 def _resolve_anchor_ts(anchor_ts: datetime | None = None) -> datetime:
     if anchor_ts is None:
@@ -104,35 +112,33 @@ class T1StatsService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_overview_stats(self, days: int = 365) -> dict[str, Any]:
+    async def get_overview_stats(self, days: int = 365, *, brand_limit: int = 0) -> dict[str, Any]:
         """
         Returns high-level stats for the report header and decision card.
+
+        社区计数 / P/S / 痛点维度读 subreddit_daily_stats 日汇总；top 社区的关键词与样例标题
+        各一次批量查询。品牌-痛点共现需要扫评论明细，默认不算（brand_limit > 0 时才算）。
         """
-        snapshot = await build_stats_snapshot(self.session, days=days)
+        snapshot = await build_stats_snapshot(self.session, days=days, brand_limit=brand_limit)
         
         # Calculate aggregates
         total_posts = sum(c.posts for c in snapshot.community_stats)
         total_comments = sum(c.comments for c in snapshot.community_stats)
         
-        # Prepare top communities with richer info (mocking keywords/sample for now if not in stats)
-        # In a real scenario, we might want to fetch keywords here or join with other tables.
-        # For now, we will let the Agent fetch keywords or use placeholders if not available.
-        # However, to support the new prompt, we need keywords.
-        # Let's do a quick fetch for top keywords for top communities.
-        
-        top_comms = []
-        for c in snapshot.community_stats[:5]: # Top 5
-            # Fetch sample title & keywords
-            keywords = await self._fetch_community_keywords(c.subreddit)
-            sample = await self._fetch_sample_title(c.subreddit)
-            
-            top_comms.append({
+        top_stats = snapshot.community_stats[:5]  # Top 5
+        names = [c.subreddit for c in top_stats]
+        keywords = await self._fetch_community_keywords(names)
+        samples = await self._fetch_sample_titles(names)
+        top_comms = [
+            {
                 "name": c.subreddit,
                 "posts": c.posts,
                 "comments": c.comments,
-                "top_keywords": keywords,
-                "sample_title": sample
-            })
+                "top_keywords": keywords.get(_pool_key(c.subreddit)) or list(_DEFAULT_COMMUNITY_KEYWORDS),
+                "sample_title": samples.get(_pool_key(c.subreddit), "No recent posts"),
+            }
+            for c in top_stats
+        ]
 
         return {
             "community_count": len(snapshot.subreddits),
@@ -143,37 +149,53 @@ class T1StatsService:
             "raw_snapshot": snapshot
         }
 
-    async def _fetch_community_keywords(self, subreddit: str) -> list[str]:
-        # Quick hack: get keywords from community pool description or just use static ones
-        # Better: query semantic terms frequency? 
-        # For speed, let's query description_keywords from pool if available, 
-        # or just return some generics.
-        sql = "SELECT description_keywords FROM community_pool WHERE lower(name) = lower(:name)"
-        res = await self.session.execute(text(sql), {"name": "r/"+subreddit if not subreddit.startswith("r/") else subreddit})
-        row = res.fetchone()
-        if row and row.description_keywords:
-            return row.description_keywords
-        return ["General Discussion", "Business"]
-
-    async def _fetch_sample_title(self, subreddit: str, anchor_ts: datetime | None = None) -> str:
-        # Get one recent high-engagement post title
+    async def _fetch_community_keywords(self, subreddits: Sequence[str]) -> dict[str, list[str]]:
+        # description_keywords from community pool; callers fall back to generic keywords
+        if not subreddits:
+            return {}
         sql = """
-        SELECT title FROM posts_raw 
-        WHERE lower(subreddit) = lower(:name) 
+        SELECT lower(name) AS name, description_keywords
+        FROM community_pool
+        WHERE lower(name) = ANY(:names)
+        """
+        res = await self.session.execute(
+            text(sql), {"names": sorted({_pool_key(s) for s in subreddits})}
+        )
+        return {
+            str(row.name): list(row.description_keywords)
+            for row in res.fetchall()
+            if row.description_keywords
+        }
+
+    async def _fetch_sample_titles(
+        self, subreddits: Sequence[str], anchor_ts: datetime | None = None
+    ) -> dict[str, str]:
+        # One recent post title per community (rollup keeps the latest title of each day)
+        if not subreddits:
+            return {}
+        names = sorted({_pool_key(s) for s in subreddits})
+        year_window_start = _resolve_anchor_ts(anchor_ts) - timedelta(days=365)
+        if await rollup_available(self.session, since_day=year_window_start.date()):
+            return await fetch_rollup_latest_titles(
+                self.session, subs=names, since_day=year_window_start.date()
+            )
+        sql = """
+        SELECT DISTINCT ON (lower(subreddit)) lower(subreddit) AS name, title
+        FROM posts_raw
+        WHERE lower(subreddit) = ANY(:names)
           AND is_current = true
           AND created_at >= :year_window_start
-        ORDER BY created_at DESC 
-        LIMIT 1
+        ORDER BY lower(subreddit), created_at DESC
         """
         res = await self.session.execute(
-            text(sql),
-            {
-                "name": "r/" + subreddit if not subreddit.startswith("r/") else subreddit,
-                "year_window_start": _resolve_anchor_ts(anchor_ts) - timedelta(days=365),
-            },
+            text(sql), {"names": names, "year_window_start": year_window_start}
         )
-        row = res.fetchone()
-        return row.title if row else "No recent posts"
+        return {str(row.name): str(row.title) for row in res.fetchall()}
+
+
+def _pool_key(subreddit: str) -> str:
+    name = subreddit.strip().lower()
+    return name if name.startswith("r/") else f"r/{name}"
 
 
 # --- Internal Logic (Kept from original file) ---
@@ -244,6 +266,33 @@ async def _fetch_posts_comments(
     }
 
 
+async def _fetch_rollup_stats(
+    session: AsyncSession, *, subs: Sequence[str], since_dt: datetime, anchor_ts: datetime
+) -> tuple[dict[str, tuple[int, int, int, int]], dict[str, tuple[int, int]], list[AspectBreakdown]]:
+    """从 subreddit_daily_stats 读社区计数、P/S 计数与痛点维度（按天粒度的窗口）。"""
+    since_day = since_dt.date()
+    until_day = anchor_ts.date()
+    totals = await fetch_rollup_totals(
+        session,
+        subs=subs,
+        since_day=since_day,
+        until_day=until_day,
+        recent_since_day=(anchor_ts - timedelta(days=30)).date(),
+    )
+    posts_comments = {
+        sr: (t.posts, t.comments, t.recent_posts, t.recent_comments) for sr, t in totals.items()
+    }
+    ps_counts = {sr: (t.pain_labels, t.solution_labels) for sr, t in totals.items()}
+    aspects = await fetch_rollup_pain_aspects(
+        session, subs=subs, since_day=since_day, until_day=until_day
+    )
+    return (
+        posts_comments,
+        ps_counts,
+        [AspectBreakdown(aspect=aspect, pain=count, total=count) for aspect, count in aspects],
+    )
+
+
 async def _fetch_ps_ratio_by_sub(
     session: AsyncSession, *, subs: Sequence[str], since_dt: datetime
 ) -> dict[str, tuple[int, int]]:
@@ -613,7 +662,7 @@ async def fetch_topic_relevant_communities(
 
     # [NEW] Generate topic embedding
     try:
-        topic_embedding = embedding_service.encode(topic)
+        topic_embedding = embedding_service.encode_query(topic)
         has_embedding = True
     except Exception as e:
         logger.warning("Semantic embedding failed for topic %s", topic, exc_info=True)
@@ -754,13 +803,22 @@ async def build_stats_snapshot(
     # Do not remove prefix, just lower
     subs = list({s.lower() for s in (subreddits or []) if s}) or await _fetch_t1_subreddits(session)
 
-    posts_comments = await _fetch_posts_comments(
-        session,
-        subs=subs,
-        since_dt=since_dt,
-        anchor_ts=anchor_value,
-    )
-    ps_counts = await _fetch_ps_ratio_by_sub(session, subs=subs, since_dt=since_dt)
+    aspect_breakdown: list[AspectBreakdown] | None = None
+    if await rollup_available(session, since_day=since_dt.date()):
+        posts_comments, ps_counts, aspect_breakdown = await _fetch_rollup_stats(
+            session,
+            subs=subs,
+            since_dt=since_dt,
+            anchor_ts=anchor_value,
+        )
+    else:
+        posts_comments = await _fetch_posts_comments(
+            session,
+            subs=subs,
+            since_dt=since_dt,
+            anchor_ts=anchor_value,
+        )
+        ps_counts = await _fetch_ps_ratio_by_sub(session, subs=subs, since_dt=since_dt)
 
     community_stats: list[CommunityStat] = []
     total_pain = 0
@@ -788,10 +846,13 @@ async def build_stats_snapshot(
     if total_pain + total_sol > 0:
         global_ps_ratio = float(total_pain) / float(max(1, total_sol))
 
-    aspect_breakdown = await _fetch_aspect_breakdown(session, subs=subs, since_dt=since_dt)
-    brand_pain = await _fetch_brand_pain_cooccurrence(
-        session, subs=subs, since_dt=since_dt, limit=brand_limit
-    )
+    if aspect_breakdown is None:
+        aspect_breakdown = await _fetch_aspect_breakdown(session, subs=subs, since_dt=since_dt)
+    brand_pain: list[BrandPainCooccurrence] = []
+    if brand_limit > 0:
+        brand_pain = await _fetch_brand_pain_cooccurrence(
+            session, subs=subs, since_dt=since_dt, limit=brand_limit
+        )
 
     return T1StatsSnapshot(
         generated_at=anchor_value.isoformat(),
@@ -7,6 +7,7 @@ from typing import Any, Awaitable, Callable
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.services.crawl.plan_contract import CrawlPlanContract
 from app.services.infrastructure.reddit_client import RedditAPIClient
 from app.utils.subreddit import subreddit_key
@@ -176,6 +177,22 @@ def build_smart_shallow_config(
         comments_limit = max(
             1, min(500, int(smart_config.get("smart_total_limit") or comments_limit))
         )
+    elif mode == "full":
+        # full 树展开的单帖上限（depth / 条数 / 时间），plan.meta 里的 full_* 优先
+        smart_config = {
+            key: value
+            for key, value in dict(plan.meta or {}).items()
+            if key.startswith("full_") and value is not None
+        }
+        settings = get_settings()
+        smart_config.setdefault("full_max_depth", depth)
+        smart_config.setdefault(
+            "full_max_comments", int(settings.incremental_comments_full_max_comments)
+        )
+        smart_config.setdefault(
+            "full_time_budget_seconds",
+            float(settings.incremental_comments_full_time_budget_seconds),
+        )
 
     return comments_limit, smart_config, depth, sort, mode
 
@@ -239,23 +256,41 @@ async def execute_backfill_comments_workflow(
         post_created_at=post_created_at,
     )
 
-    items = await workflow_input.reddit_client.fetch_post_comments(
-        post_id,
+    processed = 0
+    streamed_ids: set[str] = set()
+
+    async def _persist_page(page: list[dict[str, Any]]) -> None:
+        nonlocal processed
+        if not page:
+            return
+        processed += int(
+            await deps.persist_comments(
+                workflow_input.session,
+                source_post_id=post_id,
+                subreddit=subreddit,
+                comments=page,
+                crawl_run_id=workflow_input.crawl_run_id,
+                community_run_id=workflow_input.community_run_id,
+                source_track="backfill_comments",
+                default_business_pool="lab",
+            )
+            or 0
+        )
+        streamed_ids.update(str(comment.get("id")) for comment in page if comment.get("id"))
+
+    fetch_kwargs: dict[str, Any] = dict(
         sort=sort,
         depth=depth,
         limit=comments_limit,
         mode=mode,
         smart_config=smart_config,
     )
-    processed = await deps.persist_comments(
-        workflow_input.session,
-        source_post_id=post_id,
-        subreddit=subreddit,
-        comments=items,
-        crawl_run_id=workflow_input.crawl_run_id,
-        community_run_id=workflow_input.community_run_id,
-        source_track="backfill_comments",
-        default_business_pool="lab",
+    if mode == "full":
+        # 大帖全树展开：边拉 morechildren 边入库，不等整棵树拼完
+        fetch_kwargs["on_page"] = _persist_page
+    items = await workflow_input.reddit_client.fetch_post_comments(post_id, **fetch_kwargs)
+    await _persist_page(
+        [comment for comment in items if str(comment.get("id")) not in streamed_ids]
     )
 
     labeled = 0
@@ -269,7 +304,7 @@ async def execute_backfill_comments_workflow(
         payload={
             "plan_kind": "backfill_comments",
             "status": "completed",
-            "processed": int(processed or 0),
+            "processed": processed,
             "labeled": int(labeled or 0),
         }
     )
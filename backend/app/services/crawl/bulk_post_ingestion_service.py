@@ -0,0 +1,627 @@
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Mapping, Sequence
+
+from sqlalchemy import Boolean, Integer, String, Text, column, table, text
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import TIMESTAMP
+
+from app.services.crawl.crawler_runs_service import ensure_crawler_run
+from app.services.infrastructure.reddit_client import RedditPost
+from app.utils.subreddit import subreddit_key
+
+logger = logging.getLogger(__name__)
+
+# Postgres caps a statement at 32767 bind params; posts_raw rows carry ~22.
+BULK_INSERT_CHUNK_SIZE = 1000
+_VALID_TO_OPEN = datetime(9999, 12, 31, tzinfo=timezone.utc)
+
+_posts_raw_table = table(
+    "posts_raw",
+    column("source", String),
+    column("source_post_id", String),
+    column("version", Integer),
+    column("edit_count", Integer),
+    column("created_at", TIMESTAMP(timezone=True)),
+    column("fetched_at", TIMESTAMP(timezone=True)),
+    column("first_seen_at", TIMESTAMP(timezone=True)),
+    column("source_track", String),
+    column("author_id", String),
+    column("author_name", String),
+    column("title", Text),
+    column("body", Text),
+    column("url", Text),
+    column("subreddit", String),
+    column("score", Integer),
+    column("num_comments", Integer),
+    column("is_current", Boolean),
+    column("valid_from", TIMESTAMP(timezone=True)),
+    column("valid_to", TIMESTAMP(timezone=True)),
+    column("metadata", JSONB),
+    column("crawl_run_id", String),
+    column("community_run_id", String),
+)
+
+_posts_hot_table = table(
+    "posts_hot",
+    column("source", String),
+    column("source_post_id", String),
+    column("created_at", TIMESTAMP(timezone=True)),
+    column("cached_at", TIMESTAMP(timezone=True)),
+    column("expires_at", TIMESTAMP(timezone=True)),
+    column("author_id", String),
+    column("author_name", String),
+    column("title", Text),
+    column("body", Text),
+    column("subreddit", String),
+    column("score", Integer),
+    column("num_comments", Integer),
+    column("metadata", JSONB),
+)
+
+
+@dataclass(slots=True)
+class BulkIngestInput:
+    community_name: str
+    posts: Sequence[RedditPost]
+    source_track: str
+    crawl_run_id: str | None
+    community_run_id: str | None
+    duplicate_mode: str
+    spam_categories: Mapping[str, str | None]
+    crawler_run_row_ensured: bool
+    hot_cache_ttl_hours: int
+    trigger_comments_fetch: bool = False
+    refresh_posts_latest_after_write: bool = False
+
+
+@dataclass(slots=True)
+class BulkIngestDeps:
+    db: AsyncSession
+    unix_to_datetime: Callable[[float], datetime]
+    text_norm_hash_available: Callable[[], Awaitable[bool]]
+    posts_raw_has_crawl_run_id: Callable[[AsyncSession], Awaitable[bool]]
+    posts_raw_has_community_run_id: Callable[[AsyncSession], Awaitable[bool]]
+    # Per-row fallbacks, used when a bulk statement trips a concurrent-writer conflict.
+    fallback_dual_write: Callable[[str, list[RedditPost]], Awaitable[tuple[int, int, int]]]
+    fallback_hot_upsert: Callable[[str, RedditPost], Awaitable[None]]
+    schedule_posts_latest_refresh: Callable[[], None]
+    enqueue_comment_backfill: Callable[[str, list[RedditPost]], None]
+
+
+@dataclass(slots=True)
+class BulkIngestResult:
+    new_count: int
+    updated_count: int
+    duplicate_count: int
+    crawler_run_row_ensured: bool
+    round_trips: int = 0
+    used_fallback: bool = False
+    new_post_ids: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _ExistingPost:
+    version: int
+    score: int | None
+    num_comments: int | None
+    title: str | None
+    body: str | None
+    edit_count: int | None
+
+
+def _content_of(post: RedditPost) -> str:
+    return f"{post.title or ''} {post.selftext or ''}".strip()
+
+
+def _collapse_by_id(posts: Sequence[RedditPost]) -> tuple[list[RedditPost], int]:
+    """Keep the last occurrence of each post id; earlier copies count as duplicates."""
+    latest: dict[str, RedditPost] = {}
+    for post in posts:
+        latest.pop(str(post.id), None)
+        latest[str(post.id)] = post
+    return list(latest.values()), len(posts) - len(latest)
+
+
+def _chunks(rows: list[dict[str, Any]], size: int = BULK_INSERT_CHUNK_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+async def _ensure_authors(db: AsyncSession, posts: Sequence[RedditPost]) -> bool:
+    authors = sorted({str(post.author) for post in posts if post.author})
+    if not authors:
+        return False
+    await db.execute(
+        text(
+            """
+            INSERT INTO authors (author_id, author_name, created_utc, first_seen_at_global)
+            SELECT a, a, NOW(), NOW()
+            FROM unnest(CAST(:authors AS text[])) AS a
+            ON CONFLICT (author_id) DO NOTHING
+            """
+        ),
+        {"authors": authors},
+    )
+    return True
+
+
+async def _load_existing_posts(
+    db: AsyncSession,
+    post_ids: list[str],
+) -> dict[str, _ExistingPost]:
+    result = await db.execute(
+        text(
+            """
+            SELECT DISTINCT ON (source_post_id)
+                source_post_id, version, score, num_comments, title, body, edit_count
+            FROM posts_raw
+            WHERE source = 'reddit' AND source_post_id = ANY(:pids)
+            ORDER BY source_post_id, version DESC
+            """
+        ),
+        {"pids": post_ids},
+    )
+    existing: dict[str, _ExistingPost] = {}
+    for row in result.mappings().all():
+        existing[str(row["source_post_id"])] = _ExistingPost(
+            version=int(row["version"] or 0),
+            score=row["score"],
+            num_comments=row["num_comments"],
+            title=row["title"],
+            body=row["body"],
+            edit_count=row.get("edit_count"),
+        )
+    return existing
+
+
+async def _resolve_content_duplicates(
+    db: AsyncSession,
+    *,
+    subreddit: str,
+    posts: Sequence[RedditPost],
+) -> dict[str, str]:
+    """Map post id -> duplicate_of for posts whose normalized text already exists.
+
+    A single query hashes every incoming text with ``text_norm_hash`` and looks up
+    the most recent stored match; matches *inside* the batch are resolved in Python
+    against the hashes the same query returns, mirroring what the per-row path sees
+    after earlier rows of the batch were inserted.
+    """
+    candidates = [(str(post.id), _content_of(post)) for post in posts]
+    candidates = [(pid, content) for pid, content in candidates if content]
+    if not candidates:
+        return {}
+    try:
+        async with db.begin_nested():
+            result = await db.execute(
+                text(
+                    """
+                    WITH incoming AS (
+                        SELECT ord, text_norm_hash(content) AS hash
+                        FROM unnest(CAST(:contents AS text[])) WITH ORDINALITY AS t(content, ord)
+                    )
+                    SELECT
+                        i.ord,
+                        i.hash,
+                        (
+                            SELECT p.source_post_id
+                            FROM posts_raw p
+                            WHERE p.source = 'reddit'
+                              AND p.subreddit = :subreddit
+                              AND p.text_norm_hash = i.hash
+                            ORDER BY p.fetched_at DESC
+                            LIMIT 1
+                        ) AS duplicate_of
+                    FROM incoming i
+                    ORDER BY i.ord
+                    """
+                ),
+                {
+                    "contents": [content for _, content in candidates],
+                    "subreddit": subreddit,
+                },
+            )
+    except Exception:
+        logger.exception("bulk content dedup query failed; skip")
+        return {}
+
+    duplicates: dict[str, str] = {}
+    last_seen_by_hash: dict[str, str] = {}
+    for row in result.mappings().all():
+        pid = candidates[int(row["ord"]) - 1][0]
+        content_hash = row["hash"]
+        duplicate_of = row["duplicate_of"] or (
+            last_seen_by_hash.get(content_hash) if content_hash else None
+        )
+        if duplicate_of and duplicate_of != pid:
+            duplicates[pid] = str(duplicate_of)
+        if content_hash:
+            last_seen_by_hash[content_hash] = pid
+    return duplicates
+
+
+def _has_changes(existing: _ExistingPost, post: RedditPost) -> bool:
+    return any(
+        [
+            existing.score != post.score,
+            existing.num_comments != post.num_comments,
+            existing.title != post.title,
+            (existing.body or "") != (post.selftext or ""),
+        ]
+    )
+
+
+def _metadata_for(
+    post: RedditPost,
+    write_input: BulkIngestInput,
+) -> dict[str, Any]:
+    metadata_payload: dict[str, Any] = {
+        "permalink": post.permalink,
+        "upvote_ratio": getattr(post, "upvote_ratio", None),
+    }
+    spam_category = getattr(post, "spam_category", None)
+    if not spam_category:
+        spam_category = write_input.spam_categories.get(str(post.id))
+    if spam_category:
+        metadata_payload["spam_category"] = spam_category
+    if write_input.crawl_run_id:
+        metadata_payload["run_id"] = write_input.crawl_run_id
+    if write_input.community_run_id:
+        metadata_payload["community_run_id"] = write_input.community_run_id
+    return metadata_payload
+
+
+async def bulk_ingest_posts(
+    write_input: BulkIngestInput,
+    deps: BulkIngestDeps,
+) -> BulkIngestResult:
+    """Set-based dual write: one lookup per concern, multi-row upserts per table.
+
+    Reports the same new/updated/duplicate counts as ``execute_dual_write``; if a
+    bulk statement hits the ``ux_posts_raw_current`` race with a concurrent writer
+    the whole batch is replayed through the per-row path instead.
+    """
+    db = deps.db
+    if not write_input.posts:
+        return BulkIngestResult(
+            new_count=0,
+            updated_count=0,
+            duplicate_count=0,
+            crawler_run_row_ensured=write_input.crawler_run_row_ensured,
+        )
+
+    posts, duplicate_count = _collapse_by_id(write_input.posts)
+    now = datetime.now(timezone.utc)
+    norm_sub = subreddit_key(write_input.community_name)
+    round_trips = 0
+
+    if not db.in_transaction():
+        await db.begin()
+
+    has_run_col = await deps.posts_raw_has_crawl_run_id(db)
+    include_run_id = bool(has_run_col and write_input.crawl_run_id)
+    has_community_run_col = await deps.posts_raw_has_community_run_id(db)
+    include_community_run_id = bool(has_community_run_col and write_input.community_run_id)
+
+    crawler_run_row_ensured = write_input.crawler_run_row_ensured
+    if include_run_id and write_input.crawl_run_id and not crawler_run_row_ensured:
+        await ensure_crawler_run(
+            db,
+            crawl_run_id=write_input.crawl_run_id,
+            config={"mode": "incremental", "source_track": write_input.source_track},
+        )
+        crawler_run_row_ensured = True
+
+    new_count = 0
+    updated_count = 0
+    new_posts: list[RedditPost] = []
+    try:
+        async with db.begin_nested():
+            if await _ensure_authors(db, posts):
+                round_trips += 1
+
+            existing = await _load_existing_posts(db, [str(post.id) for post in posts])
+            round_trips += 1
+
+            fresh_posts = [post for post in posts if str(post.id) not in existing]
+            duplicates_of: dict[str, str] = {}
+            if (
+                fresh_posts
+                and write_input.duplicate_mode != "allow"
+                and await deps.text_norm_hash_available()
+            ):
+                duplicates_of = await _resolve_content_duplicates(
+                    db,
+                    subreddit=norm_sub,
+                    posts=fresh_posts,
+                )
+                round_trips += 1
+
+            insert_rows: list[dict[str, Any]] = []
+            touch_rows: list[tuple[str, int, str]] = []
+            changed_ids: list[str] = []
+
+            def _row(
+                post: RedditPost,
+                *,
+                version: int,
+                edit_count: int,
+                metadata: dict[str, Any],
+            ) -> dict[str, Any]:
+                row: dict[str, Any] = {
+                    "source": "reddit",
+                    "source_post_id": post.id,
+                    "version": version,
+                    "edit_count": edit_count,
+                    "created_at": deps.unix_to_datetime(post.created_utc),
+                    "fetched_at": now,
+                    "first_seen_at": now,
+                    "source_track": write_input.source_track,
+                    "author_id": post.author or None,
+                    "author_name": post.author or None,
+                    "title": post.title,
+                    "body": post.selftext or "",
+                    "url": post.url,
+                    "subreddit": norm_sub,
+                    "score": post.score,
+                    "num_comments": post.num_comments,
+                    "is_current": True,
+                    "valid_from": now,
+                    "valid_to": _VALID_TO_OPEN,
+                    "metadata": metadata,
+                }
+                if include_run_id:
+                    row["crawl_run_id"] = write_input.crawl_run_id
+                if include_community_run_id:
+                    row["community_run_id"] = write_input.community_run_id
+                return row
+
+            for post in posts:
+                pid = str(post.id)
+                metadata_payload = _metadata_for(post, write_input)
+                current = existing.get(pid)
+                if current is None:
+                    duplicate_of = duplicates_of.get(pid)
+                    if duplicate_of:
+                        if write_input.duplicate_mode == "drop":
+                            duplicate_count += 1
+                            continue
+                        metadata_payload["duplicate_of"] = duplicate_of
+                        metadata_payload["is_duplicate"] = True
+                        duplicate_count += 1
+                    else:
+                        new_count += 1
+                        new_posts.append(post)
+                    insert_rows.append(
+                        _row(post, version=1, edit_count=0, metadata=metadata_payload)
+                    )
+                elif _has_changes(current, post):
+                    updated_count += 1
+                    changed_ids.append(pid)
+                    insert_rows.append(
+                        _row(
+                            post,
+                            version=current.version + 1,
+                            edit_count=(current.edit_count or 0) + 1,
+                            metadata=metadata_payload,
+                        )
+                    )
+                else:
+                    duplicate_count += 1
+                    touch_rows.append((pid, current.version, json.dumps(metadata_payload)))
+
+            if touch_rows:
+                extra_update = ""
+                if include_run_id:
+                    extra_update += ", crawl_run_id = :crawl_run_id"
+                if include_community_run_id:
+                    extra_update += ", community_run_id = :community_run_id"
+                await db.execute(
+                    text(
+                        f"""
+                        UPDATE posts_raw AS p
+                        SET fetched_at = :fetched_at,
+                            metadata = CAST(v.metadata AS jsonb){extra_update}
+                        FROM unnest(
+                            CAST(:pids AS text[]),
+                            CAST(:versions AS int[]),
+                            CAST(:metadatas AS text[])
+                        ) AS v(pid, version, metadata)
+                        WHERE p.source = 'reddit'
+                          AND p.source_post_id = v.pid
+                          AND p.version = v.version
+                        """
+                    ),
+                    {
+                        "fetched_at": now,
+                        "pids": [row[0] for row in touch_rows],
+                        "versions": [row[1] for row in touch_rows],
+                        "metadatas": [row[2] for row in touch_rows],
+                        "crawl_run_id": write_input.crawl_run_id,
+                        "community_run_id": write_input.community_run_id,
+                    },
+                )
+                round_trips += 1
+
+            if changed_ids:
+                await db.execute(
+                    text(
+                        """
+                        UPDATE posts_raw
+                        SET is_current = FALSE, valid_to = :valid_to
+                        WHERE source = 'reddit'
+                          AND source_post_id = ANY(:pids)
+                          AND is_current = TRUE
+                        """
+                    ),
+                    {"valid_to": now, "pids": changed_ids},
+                )
+                round_trips += 1
+
+            for chunk in _chunks(insert_rows):
+                stmt = pg_insert(_posts_raw_table).values(chunk)
+                excluded = stmt.excluded
+                set_: dict[str, Any] = {
+                    "fetched_at": excluded.fetched_at,
+                    "is_current": excluded.is_current,
+                    "valid_from": excluded.valid_from,
+                    "valid_to": excluded.valid_to,
+                    "edit_count": excluded.edit_count,
+                    "score": excluded.score,
+                    "num_comments": excluded.num_comments,
+                    "title": excluded.title,
+                    "body": excluded.body,
+                    "metadata": excluded.metadata,
+                }
+                if include_run_id:
+                    set_["crawl_run_id"] = excluded.crawl_run_id
+                if include_community_run_id:
+                    set_["community_run_id"] = excluded.community_run_id
+                await db.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=["source", "source_post_id", "version"],
+                        set_=set_,
+                    )
+                )
+                round_trips += 1
+    except IntegrityError as exc:
+        raw = str(getattr(exc, "orig", "") or exc)
+        if "ux_posts_raw_current" not in raw:
+            await db.rollback()
+            raise
+        logger.warning(
+            "bulk ingest for %s raced a concurrent writer; replaying %d posts per-row",
+            norm_sub,
+            len(write_input.posts),
+        )
+        new_count, updated_count, duplicate_count = await deps.fallback_dual_write(
+            write_input.community_name,
+            list(write_input.posts),
+        )
+        return BulkIngestResult(
+            new_count=new_count,
+            updated_count=updated_count,
+            duplicate_count=duplicate_count,
+            crawler_run_row_ensured=crawler_run_row_ensured,
+            used_fallback=True,
+        )
+
+    try:
+        await db.flush()
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    round_trips += await _bulk_upsert_hot_cache(
+        posts,
+        norm_sub=norm_sub,
+        community_name=write_input.community_name,
+        hot_cache_ttl_hours=write_input.hot_cache_ttl_hours,
+        deps=deps,
+    )
+
+    if write_input.refresh_posts_latest_after_write and (new_count or updated_count):
+        deps.schedule_posts_latest_refresh()
+
+    if write_input.trigger_comments_fetch:
+        deps.enqueue_comment_backfill(write_input.community_name, new_posts)
+
+    return BulkIngestResult(
+        new_count=new_count,
+        updated_count=updated_count,
+        duplicate_count=duplicate_count,
+        crawler_run_row_ensured=crawler_run_row_ensured,
+        round_trips=round_trips,
+        new_post_ids=[str(post.id) for post in new_posts],
+    )
+
+
+async def _bulk_upsert_hot_cache(
+    posts: Sequence[RedditPost],
+    *,
+    norm_sub: str,
+    community_name: str,
+    hot_cache_ttl_hours: int,
+    deps: BulkIngestDeps,
+) -> int:
+    db = deps.db
+    cached_at = datetime.now(timezone.utc)
+    expires_at = cached_at + timedelta(hours=hot_cache_ttl_hours)
+    rows = [
+        {
+            "source": "reddit",
+            "source_post_id": post.id,
+            "created_at": deps.unix_to_datetime(post.created_utc),
+            "cached_at": cached_at,
+            "expires_at": expires_at,
+            "author_id": post.author,
+            "author_name": post.author,
+            "title": post.title,
+            "body": post.selftext or "",
+            "subreddit": norm_sub,
+            "score": post.score,
+            "num_comments": post.num_comments,
+            "metadata": {"permalink": post.permalink},
+        }
+        for post in posts
+    ]
+    round_trips = 0
+    try:
+        for chunk in _chunks(rows):
+            stmt = pg_insert(_posts_hot_table).values(chunk)
+            excluded = stmt.excluded
+            await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["source", "source_post_id"],
+                    set_={
+                        "cached_at": excluded.cached_at,
+                        "expires_at": excluded.expires_at,
+                        "author_id": excluded.author_id,
+                        "author_name": excluded.author_name,
+                        "score": excluded.score,
+                        "num_comments": excluded.num_comments,
+                        "title": excluded.title,
+                        "body": excluded.body,
+                        "metadata": excluded.metadata,
+                    },
+                )
+            )
+            round_trips += 1
+        await db.commit()
+        return round_trips
+    except Exception:
+        await db.rollback()
+        logger.warning(
+            "bulk hot cache upsert failed for %s; falling back to per-row writes",
+            norm_sub,
+            exc_info=True,
+        )
+
+    for post in posts:
+        try:
+            await deps.fallback_hot_upsert(community_name, post)
+        except Exception:
+            await db.rollback()
+        else:
+            try:
+                await db.commit()
+            except Exception:
+                await db.rollback()
+    return round_trips + len(posts)
+
+
+__all__ = [
+    "BULK_INSERT_CHUNK_SIZE",
+    "BulkIngestDeps",
+    "BulkIngestInput",
+    "BulkIngestResult",
+    "bulk_ingest_posts",
+]
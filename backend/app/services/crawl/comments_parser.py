@@ -112,6 +112,75 @@ def parse_morechildren_things(payload: Dict[str, Any]) -> Tuple[List[Dict[str, A
     return comments, mores
 
 
+def collect_more_stubs(listing: Any) -> List[Tuple[List[str], int]]:
+    """Collect every `more` placeholder in a /comments listing, including nested ones.
+
+    Returns `(children_ids, depth)` pairs where depth is the depth of the hidden
+    children. "Continue this thread" stubs (no children ids) are skipped.
+    """
+    children: Iterable[Dict[str, Any]]
+    if isinstance(listing, dict):
+        children = listing.get("data", {}).get("children", [])
+    else:
+        children = list(listing or [])
+
+    stubs: List[Tuple[List[str], int]] = []
+
+    def walk(nodes: Iterable[Dict[str, Any]], depth: int) -> None:
+        for node in nodes:
+            kind = node.get("kind")
+            data = node.get("data", {}) or {}
+            if kind == "more":
+                ids = [str(x) for x in (data.get("children") or []) if x]
+                if ids:
+                    stubs.append((ids, _node_depth(data, depth)))
+                continue
+            if kind != "t1":
+                continue
+            replies = data.get("replies") or {}
+            if isinstance(replies, dict):
+                walk(replies.get("data", {}).get("children", []), depth + 1)
+
+    walk(children, 0)
+    return stubs
+
+
+def parse_morechildren_page(
+    payload: Dict[str, Any],
+) -> Tuple[List[Dict[str, Any]], List[Tuple[List[str], int]]]:
+    """Like `parse_morechildren_things`, but keeps the depth Reddit reports.
+
+    Used by the full-tree expansion so per-post depth caps can be applied to
+    comments and to the `more` stubs that still need fetching.
+    """
+    comments: List[Dict[str, Any]] = []
+    stubs: List[Tuple[List[str], int]] = []
+
+    try:
+        things = payload.get("json", {}).get("data", {}).get("things", [])
+    except Exception:
+        things = []
+
+    for thing in things:
+        kind = thing.get("kind")
+        data = thing.get("data", {}) or {}
+        if kind == "t1":
+            comments.append(_extract_comment_node(thing, _node_depth(data, 0)))
+        elif kind == "more":
+            ids = [str(x) for x in (data.get("children") or []) if x]
+            if ids:
+                stubs.append((ids, _node_depth(data, 0)))
+
+    return comments, stubs
+
+
+def _node_depth(data: Dict[str, Any], fallback: int) -> int:
+    try:
+        return int(data.get("depth"))
+    except (TypeError, ValueError):
+        return fallback
+
+
 def compute_smart_shallow_limits(
     *,
     total_limit: int,
@@ -353,22 +353,27 @@ async def run_backfill_high_value_comments(
                     total_posts += len(posts)
                     for post in posts:
                         try:
+
+                            async def _persist_page(page: list[dict[str, Any]]) -> None:
+                                await deps.persist_comments(
+                                    session,
+                                    source_post_id=post.id,
+                                    subreddit=sub,
+                                    comments=page,
+                                    crawl_run_id=crawl_run_id,
+                                )
+
+                            # morechildren 分页到达即入库（同一事务，帖子结束再 commit）
                             items = await reddit.fetch_post_comments(
                                 post.id,
                                 sort="confidence",
                                 depth=8,
                                 limit=500,
                                 mode="full",
+                                on_page=_persist_page,
                             )
                             if not items:
                                 continue
-                            await deps.persist_comments(
-                                session,
-                                source_post_id=post.id,
-                                subreddit=sub,
-                                comments=items,
-                                crawl_run_id=crawl_run_id,
-                            )
                             ids = [item.get("id") for item in items if item.get("id")]
                             total_labeled += await deps.classify_and_label_comments(session, ids)
                             total_labeled += await deps.extract_and_label_entities_for_comments(
@@ -63,15 +63,16 @@ class Submission:
 
 
 class JSONLWriter:
-    """流式 JSONL 写入器"""
+    """流式 JSONL 写入器（resume=True 时续写已有文件，用于断点续跑）"""
     
-    def __init__(self, path: Path, stream: bool = False):
+    def __init__(self, path: Path, stream: bool = False, resume: bool = False):
         self.path = path
         self.stream = stream
+        self.resume = resume
         self._file = None
         if stream:
             self.path.parent.mkdir(parents=True, exist_ok=True)
-            self._file = open(self.path, "w", encoding="utf-8")
+            self._file = open(self.path, "a" if resume else "w", encoding="utf-8")
     
     def append(self, submission: Submission):
         """追加一条记录"""
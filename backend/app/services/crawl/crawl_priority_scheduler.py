@@ -0,0 +1,453 @@
+"""
+统一抓取优先级调度（patrol 巡航用）。
+
+原来 TieredScheduler 按 avg_valid_posts 定频率、AdaptiveScheduler 逐社区算 pain density 排序，
+再由 beat 每 30 分钟整批下单；两套优先级互不相干，额度消耗也是一阵一阵的。
+这里把优先级收敛成一个"下次到期时间"：
+
+- 基准间隔 = community_cache.crawl_frequency_hours（由分层调度写入，即 tier 频率）
+- 连续空命中：间隔按 2^n 退避（n = 最近几次 patrol 抓取末尾连续 new_posts=0 的次数，封顶；
+  取自 crawler_run_targets，一次有产出就清零）
+- 单请求产出（新增有效帖 / 请求数）：高于目标值缩短间隔，低于目标值拉长（封顶 2 倍）
+- 到期时间 = last_crawled_at + 有效间隔；从未抓过的社区排在最前
+
+到期时间不随当前时间变化，可以直接作为 Redis ZSET 的 score 持久化；
+next_batch(n) 取出已到期、最逾期的 n 个并加租约，防止重复下单。
+simulate_day() 用一天的 crawler_run_targets 记录回放，对比按额度持续派发和实际记录的效果。
+"""
+from __future__ import annotations
+
+import logging
+import math
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.community_cache import CommunityCache
+from app.models.community_pool import CommunityPool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRIORITY_QUEUE_KEY = "crawl:priority:due"
+DEFAULT_PRIORITY_LEASE_KEY = "crawl:priority:leases"
+DEFAULT_PRIORITY_LEASE_SECONDS = 1800
+DEFAULT_FREQUENCY_HOURS = 2.0
+# 连续空命中只看每个社区最近 N 次 patrol 抓取（且不早于回看窗口）
+RECENT_RUNS_FOR_EMPTY_STREAK = 8
+RECENT_RUNS_LOOKBACK_DAYS = 14
+# listing 单页上限（模拟时估算单次抓取能拿到的最多帖子数）
+LISTING_PAGE_SIZE = 100
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(slots=True)
+class CrawlCandidate:
+    name: str
+    frequency_hours: float = DEFAULT_FREQUENCY_HOURS
+    last_crawled_at: datetime | None = None
+    empty_hit: int = 0
+    success_hit: int = 0
+    avg_valid_posts: float = 0.0
+    requests_per_crawl: float = 1.0
+    # 最近 patrol 抓取末尾连续空命中次数（见 load_crawl_candidates）
+    empty_streak: int = 0
+
+    @property
+    def yield_per_request(self) -> float:
+        return float(self.avg_valid_posts) / max(1.0, float(self.requests_per_crawl))
+
+
+@dataclass(frozen=True, slots=True)
+class CrawlPriorityPolicy:
+    empty_backoff_base: float = 2.0
+    max_empty_backoff_steps: float = 4.0
+    target_yield_per_request: float = 10.0
+    min_yield_factor: float = 0.5
+    max_yield_factor: float = 2.0
+    max_interval_hours: float = 7 * 24.0
+
+    def yield_factor(self, candidate: CrawlCandidate) -> float:
+        if candidate.success_hit <= 0 or self.target_yield_per_request <= 0:
+            return 1.0  # 没有成功样本时不奖不罚
+        ratio = candidate.yield_per_request / self.target_yield_per_request
+        return min(self.max_yield_factor, max(self.min_yield_factor, ratio))
+
+    def interval_hours(self, candidate: CrawlCandidate) -> float:
+        base = max(0.25, float(candidate.frequency_hours or DEFAULT_FREQUENCY_HOURS))
+        steps = min(self.max_empty_backoff_steps, candidate.empty_streak)
+        interval = base * (self.empty_backoff_base**steps) / self.yield_factor(candidate)
+        return min(self.max_interval_hours, interval)
+
+    def due_at(self, candidate: CrawlCandidate) -> datetime:
+        if candidate.last_crawled_at is None:
+            return _EPOCH
+        return _as_utc(candidate.last_crawled_at) + timedelta(
+            hours=self.interval_hours(candidate)
+        )
+
+    def score(self, candidate: CrawlCandidate) -> float:
+        """ZSET score：到期时间（epoch 秒），越小越优先。"""
+        return self.due_at(candidate).timestamp()
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def rank_crawl_candidates(
+    candidates: Iterable[CrawlCandidate],
+    *,
+    policy: CrawlPriorityPolicy | None = None,
+) -> list[CrawlCandidate]:
+    active_policy = policy or CrawlPriorityPolicy()
+    return sorted(candidates, key=lambda c: (active_policy.score(c), c.name))
+
+
+async def load_crawl_candidates(
+    db: AsyncSession,
+    *,
+    names: Sequence[str] | None = None,
+) -> list[CrawlCandidate]:
+    """一次查询取出活跃社区的调度信号（community_pool LEFT JOIN community_cache）。"""
+    stmt = (
+        select(
+            CommunityPool.name,
+            CommunityCache.crawl_frequency_hours,
+            CommunityCache.last_crawled_at,
+            CommunityCache.empty_hit,
+            CommunityCache.success_hit,
+            CommunityCache.avg_valid_posts,
+        )
+        .join(CommunityCache, CommunityPool.name == CommunityCache.community_name, isouter=True)
+        .where(CommunityPool.is_active == True)  # noqa: E712
+        .where(CommunityPool.is_blacklisted == False)  # noqa: E712
+        .where(func.coalesce(CommunityCache.is_active, True) == True)  # noqa: E712
+        .order_by(CommunityCache.last_crawled_at.asc().nullsfirst(), CommunityPool.name)
+    )
+    if names is not None:
+        stmt = stmt.where(CommunityPool.name.in_(list(names)))
+    rows = (await db.execute(stmt)).all()
+    streaks = await load_recent_empty_streaks(db, names=[str(row.name) for row in rows])
+    return [
+        CrawlCandidate(
+            name=str(row.name),
+            frequency_hours=float(row.crawl_frequency_hours or DEFAULT_FREQUENCY_HOURS),
+            last_crawled_at=row.last_crawled_at,
+            empty_hit=int(row.empty_hit or 0),
+            success_hit=int(row.success_hit or 0),
+            avg_valid_posts=float(row.avg_valid_posts or 0),
+            empty_streak=streaks.get(str(row.name).lower(), 0),
+        )
+        for row in rows
+    ]
+
+
+async def load_recent_empty_streaks(
+    db: AsyncSession,
+    *,
+    names: Sequence[str],
+    recent_runs: int = RECENT_RUNS_FOR_EMPTY_STREAK,
+    lookback_days: int = RECENT_RUNS_LOOKBACK_DAYS,
+    now: datetime | None = None,
+) -> dict[str, int]:
+    """每个社区最近 recent_runs 次 patrol 抓取里，从最新一次往回数连续 new_posts=0 的次数。
+
+    返回 lower(subreddit) -> 次数；没有近期记录的社区不出现（按 0 处理）。
+    """
+    keys = sorted({name.lower() for name in names if name})
+    if not keys:
+        return {}
+    since = _as_utc(now or datetime.now(timezone.utc)) - timedelta(days=max(1, lookback_days))
+    rows = await db.execute(
+        text(
+            """
+            SELECT subreddit, new_posts
+            FROM (
+                SELECT lower(subreddit) AS subreddit,
+                       COALESCE(NULLIF(metrics->>'new_posts', '')::int, 0) AS new_posts,
+                       row_number() OVER (
+                           PARTITION BY lower(subreddit) ORDER BY started_at DESC
+                       ) AS rn
+                FROM crawler_run_targets
+                WHERE started_at >= :since
+                  AND lower(subreddit) = ANY(:keys)
+                  AND status IN ('completed', 'partial')
+                  AND COALESCE(plan_kind, config->>'plan_kind') = 'patrol'
+            ) recent
+            WHERE rn <= :recent_runs
+            ORDER BY subreddit, rn
+            """
+        ),
+        {"since": since, "keys": keys, "recent_runs": max(1, int(recent_runs))},
+    )
+    streaks: dict[str, int] = {}
+    broken: set[str] = set()
+    for row in rows.fetchall():
+        key = str(row.subreddit)
+        streaks.setdefault(key, 0)
+        if key in broken:
+            continue
+        if int(row.new_posts or 0) > 0:
+            broken.add(key)
+        else:
+            streaks[key] += 1
+    return streaks
+
+
+def _decode(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+class RedisCrawlPriorityQueue:
+    """持久化优先级队列：ZSET(name -> 到期时间) + 租约 ZSET(name -> 租约到期)。
+
+    sync() 只改到期时间，不动租约：已派发但尚未完成的社区在租约内不会被重复派发，
+    抓取完成后 last_crawled_at 前移，下一次 sync 自然把它排到后面。
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        *,
+        key: str = DEFAULT_PRIORITY_QUEUE_KEY,
+        lease_key: str = DEFAULT_PRIORITY_LEASE_KEY,
+        lease_seconds: int = DEFAULT_PRIORITY_LEASE_SECONDS,
+        policy: CrawlPriorityPolicy | None = None,
+    ) -> None:
+        self._redis = redis_client
+        self._key = key
+        self._lease_key = lease_key
+        self._lease_seconds = max(1, int(lease_seconds))
+        self.policy = policy or CrawlPriorityPolicy()
+
+    async def sync(self, candidates: Sequence[CrawlCandidate]) -> int:
+        """用最新信号重写全部 score，并移除已下线的社区；返回队列长度。"""
+        scores = {c.name: self.policy.score(c) for c in candidates}
+        existing = {_decode(raw) for raw in await self._redis.zrange(self._key, 0, -1)}
+        stale = existing - set(scores)
+        pipe = self._redis.pipeline(transaction=True)
+        if stale:
+            pipe.zrem(self._key, *sorted(stale))
+            pipe.zrem(self._lease_key, *sorted(stale))
+        if scores:
+            pipe.zadd(self._key, scores)
+        await pipe.execute()
+        return len(scores)
+
+    async def next_batch(self, limit: int, *, now: datetime | None = None) -> list[str]:
+        """按到期时间取出最多 limit 个已到期社区，并逐个加租约（ZADD NX，多 worker 不会重复领取）。"""
+        if limit <= 0:
+            return []
+        now_ts = _as_utc(now or datetime.now(timezone.utc)).timestamp()
+        await self._redis.zremrangebyscore(self._lease_key, "-inf", now_ts)
+        claimed: list[str] = []
+        offset = 0
+        page = max(limit * 2, 50)
+        while len(claimed) < limit:
+            due = await self._redis.zrangebyscore(
+                self._key, "-inf", now_ts, start=offset, num=page
+            )
+            if not due:
+                break
+            offset += len(due)
+            for raw in due:
+                name = _decode(raw)
+                if await self._redis.zadd(
+                    self._lease_key, {name: now_ts + self._lease_seconds}, nx=True
+                ):
+                    claimed.append(name)
+                    if len(claimed) >= limit:
+                        break
+        return claimed
+
+    async def aclose(self) -> None:
+        """关闭底层 Redis 连接（队列由 build_crawl_priority_queue 按次创建时调用）。"""
+        await self._redis.aclose()
+
+    async def release(self, names: Iterable[str]) -> None:
+        """提前释放租约（例如下单失败），让社区在下一次 next_batch 重新可领。"""
+        items = list(names)
+        if items:
+            await self._redis.zrem(self._lease_key, *items)
+
+    async def peek(self, limit: int = 20) -> list[tuple[str, datetime]]:
+        rows = await self._redis.zrange(self._key, 0, max(0, limit - 1), withscores=True)
+        return [
+            (_decode(name), datetime.fromtimestamp(float(score), tz=timezone.utc))
+            for name, score in rows
+        ]
+
+
+@dataclass(slots=True)
+class RecordedCrawl:
+    subreddit: str
+    started_at: datetime
+    new_posts: int = 0
+    api_calls: int = 1
+
+
+async def load_recorded_crawls(db: AsyncSession, day: date) -> list[RecordedCrawl]:
+    """读取某天（UTC）patrol 目标的实际执行记录，作为模拟的产出样本与对照基线。"""
+    start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    rows = await db.execute(
+        text(
+            """
+            SELECT subreddit,
+                   started_at,
+                   COALESCE(NULLIF(metrics->>'new_posts', '')::int, 0) AS new_posts,
+                   COALESCE(NULLIF(metrics->>'api_calls_total', '')::int, 1) AS api_calls
+            FROM crawler_run_targets
+            WHERE started_at >= :start AND started_at < :end
+              AND status IN ('completed', 'partial')
+              AND COALESCE(plan_kind, config->>'plan_kind') = 'patrol'
+            ORDER BY started_at
+            """
+        ),
+        {"start": start, "end": start + timedelta(days=1)},
+    )
+    return [
+        RecordedCrawl(
+            subreddit=str(row.subreddit),
+            started_at=row.started_at,
+            new_posts=int(row.new_posts or 0),
+            api_calls=max(1, int(row.api_calls or 1)),
+        )
+        for row in rows.fetchall()
+    ]
+
+
+@dataclass(slots=True)
+class CrawlSimulationReport:
+    crawls: int = 0
+    requests: int = 0
+    new_posts: float = 0.0
+    empty_crawls: int = 0
+    baseline_crawls: int = 0
+    baseline_requests: int = 0
+    baseline_new_posts: int = 0
+    requests_by_hour: list[int] = field(default_factory=lambda: [0] * 24)
+    crawls_by_community: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        def _per_request(posts: float, requests: int) -> float:
+            return round(posts / requests, 3) if requests else 0.0
+
+        return {
+            "crawls": self.crawls,
+            "requests": self.requests,
+            "new_posts": round(self.new_posts, 1),
+            "empty_crawls": self.empty_crawls,
+            "posts_per_request": _per_request(self.new_posts, self.requests),
+            "baseline_crawls": self.baseline_crawls,
+            "baseline_requests": self.baseline_requests,
+            "baseline_new_posts": self.baseline_new_posts,
+            "baseline_posts_per_request": _per_request(
+                self.baseline_new_posts, self.baseline_requests
+            ),
+            "requests_by_hour": list(self.requests_by_hour),
+            "communities_crawled": len(self.crawls_by_community),
+        }
+
+
+def simulate_day(
+    candidates: Sequence[CrawlCandidate],
+    recorded: Sequence[RecordedCrawl],
+    *,
+    day_start: datetime,
+    request_budget_per_hour: float,
+    tick_minutes: int = 5,
+    policy: CrawlPriorityPolicy | None = None,
+) -> CrawlSimulationReport:
+    """Dry-run：按每小时请求额度持续派发 next_batch，估算一天的请求数与新增帖子数。
+
+    产出模型：每个社区的新帖到达速率取记录当天的 new_posts 总和 / 24h
+    （当天没有记录的社区按 avg_valid_posts / 频率估算）；一次抓取拿到
+    "距上次抓取累计的新帖"，以单页上限 × 请求数封顶。不写 Redis，不改候选对象。
+    """
+    active_policy = policy or CrawlPriorityPolicy()
+    start = _as_utc(day_start)
+    report = CrawlSimulationReport(
+        baseline_crawls=len(recorded),
+        baseline_requests=sum(max(1, r.api_calls) for r in recorded),
+        baseline_new_posts=sum(max(0, r.new_posts) for r in recorded),
+    )
+
+    posts_by_sub: dict[str, int] = {}
+    calls_by_sub: dict[str, list[int]] = {}
+    for item in recorded:
+        key = item.subreddit.lower()
+        posts_by_sub[key] = posts_by_sub.get(key, 0) + max(0, item.new_posts)
+        calls_by_sub.setdefault(key, []).append(max(1, item.api_calls))
+
+    states: dict[str, CrawlCandidate] = {}
+    rates: dict[str, float] = {}
+    for candidate in candidates:
+        key = candidate.name.lower()
+        calls = calls_by_sub.get(key)
+        state = replace(candidate)
+        if state.last_crawled_at is not None and _as_utc(state.last_crawled_at) > start:
+            # 回放历史日期时，当天之后的抓取还没发生：按"当天开始时刚抓过"处理
+            state.last_crawled_at = start
+        if calls:
+            state.requests_per_crawl = sum(calls) / len(calls)
+            rates[candidate.name] = posts_by_sub.get(key, 0) / 24.0
+        else:
+            rates[candidate.name] = candidate.avg_valid_posts / max(
+                1.0, candidate.frequency_hours or DEFAULT_FREQUENCY_HOURS
+            )
+        states[candidate.name] = state
+
+    tick = timedelta(minutes=max(1, int(tick_minutes)))
+    allowance = 0.0
+    per_tick = max(0.0, float(request_budget_per_hour)) * tick.total_seconds() / 3600.0
+    now = start
+    end = start + timedelta(days=1)
+    while now < end:
+        allowance += per_tick
+        for state in rank_crawl_candidates(states.values(), policy=active_policy):
+            if active_policy.due_at(state) > now:
+                break
+            cost = max(1, math.ceil(state.requests_per_crawl))
+            if cost > allowance:
+                break
+            allowance -= cost
+            last = _as_utc(state.last_crawled_at) if state.last_crawled_at else start - timedelta(days=1)
+            elapsed_hours = (now - last).total_seconds() / 3600.0
+            fetched = min(rates[state.name] * elapsed_hours, LISTING_PAGE_SIZE * cost)
+
+            report.crawls += 1
+            report.requests += cost
+            report.new_posts += fetched
+            report.requests_by_hour[min(23, int((now - start).total_seconds() // 3600))] += cost
+            report.crawls_by_community[state.name] = report.crawls_by_community.get(state.name, 0) + 1
+
+            state.last_crawled_at = now
+            if fetched < 1:
+                report.empty_crawls += 1
+                state.empty_hit += 1
+                state.empty_streak += 1
+            else:
+                state.success_hit += 1
+                state.empty_streak = 0
+                state.avg_valid_posts = fetched
+        now += tick
+    return report
+
+
+__all__ = [
+    "CrawlCandidate",
+    "CrawlPriorityPolicy",
+    "CrawlSimulationReport",
+    "RecordedCrawl",
+    "RedisCrawlPriorityQueue",
+    "load_crawl_candidates",
+    "load_recent_empty_streaks",
+    "load_recorded_crawls",
+    "rank_crawl_candidates",
+    "simulate_day",
+]
@@ -11,8 +11,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import Settings
 from app.services.community.community_cache_service import upsert_community_cache
 from app.services.community.community_pool_loader import CommunityPoolLoader, CommunityProfile
-from app.services.crawl.adaptive_scheduler import AdaptiveScheduler
 from app.services.crawl.comments_ingest import persist_comments
+from app.services.crawl.crawl_priority_scheduler import (
+    CrawlPriorityPolicy,
+    RedisCrawlPriorityQueue,
+    load_crawl_candidates,
+    rank_crawl_candidates,
+)
 from app.services.crawl.crawl_plan import CrawlPlanBuilder
 from app.services.crawl.crawler_config import TierSettings
 from app.services.crawl.patrol_planner_workflow import (
@@ -53,7 +58,7 @@ from app.services.crawl.target_planner import (
     plan_patrol_targets,
 )
 from app.services.infrastructure.cache_manager import DEFAULT_CACHE_TTL_SECONDS, CacheManager
-from app.services.infrastructure.global_rate_limiter import GlobalRateLimiter
+from app.services.infrastructure.global_rate_limiter import create_reddit_rate_limiter
 from app.services.infrastructure.reddit_client import RedditAPIClient, RedditPost
 from app.services.infrastructure.subreddit_snapshot import persist_subreddit_snapshot
 from app.services.infrastructure.task_outbox_dispatcher import dispatch_pending_task_outbox
@@ -123,6 +128,7 @@ def build_patrol_planner_workflow_deps(
     plan_patrol_targets_func: Callable[[str, list[CommunityProfile], bool], Awaitable[dict[str, Any]]],
     generate_run_id: Callable[[], str],
     log_warning: Callable[..., None],
+    release_seed_profiles: Callable[[list[CommunityProfile]], Awaitable[None]] | None = None,
 ) -> PatrolPlannerWorkflowDeps:
     return PatrolPlannerWorkflowDeps(
         load_seed_profiles=load_seed_profiles,
@@ -132,6 +138,7 @@ def build_patrol_planner_workflow_deps(
         plan_patrol_targets=plan_patrol_targets_func,
         generate_run_id=generate_run_id,
         log_warning=log_warning,
+        release_seed_profiles=release_seed_profiles,
     )
 
 
@@ -171,7 +178,7 @@ async def build_reddit_client(
     limiter = None
     try:
         redis_client = redis.Redis.from_url(settings.reddit_cache_redis_url)
-        limiter = GlobalRateLimiter(
+        limiter = create_reddit_rate_limiter(
             redis_client,
             limit=max(1, int(settings.reddit_rate_limit)),
             window_seconds=max(1, int(settings.reddit_rate_limit_window_seconds)),
@@ -546,16 +553,63 @@ async def run_task_outbox_dispatch(
     return result.as_dict()
 
 
+def build_crawl_priority_queue(
+    *,
+    settings: Settings,
+    module_logger: Any,
+) -> RedisCrawlPriorityQueue | None:
+    if not settings.crawl_priority_queue_enabled:
+        return None
+    try:
+        redis_client = redis.Redis.from_url(settings.reddit_cache_redis_url)
+    except Exception as exc:
+        module_logger.warning("Crawl priority queue init failed, using due scan: %s", exc)
+        return None
+    return RedisCrawlPriorityQueue(
+        redis_client,
+        lease_seconds=settings.crawl_priority_lease_seconds,
+    )
+
+
+async def _claim_priority_seed_profiles(
+    *,
+    db: AsyncSession,
+    loader: CommunityPoolLoader,
+    priority_queue: RedisCrawlPriorityQueue,
+    batch_size: int,
+) -> list[CommunityProfile]:
+    await priority_queue.sync(await load_crawl_candidates(db))
+    claimed = await priority_queue.next_batch(batch_size)
+    profiles = {profile.name: profile for profile in await loader.load_community_pool()}
+    return [profiles[name] for name in claimed if name in profiles]
+
+
 async def load_incremental_seed_profiles(
     *,
     session_factory: Callable[[], Any],
     force_refresh: bool,
+    priority_queue: RedisCrawlPriorityQueue | None = None,
+    priority_batch_size: int = 50,
+    module_logger: Any = None,
 ) -> tuple[list[CommunityProfile], int]:
     async with session_factory() as db:
         loader = CommunityPoolLoader(db)
         if force_refresh:
             await loader.load_seed_communities()
             seeds = await loader.load_community_pool(force_refresh=True)
+        elif priority_queue is not None:
+            # 统一优先级队列：按到期时间领取最多 N 个（带租约），Redis 故障时回退到期扫描
+            try:
+                seeds = await _claim_priority_seed_profiles(
+                    db=db,
+                    loader=loader,
+                    priority_queue=priority_queue,
+                    batch_size=max(1, int(priority_batch_size)),
+                )
+            except Exception as exc:
+                if module_logger is not None:
+                    module_logger.warning("Crawl priority queue failed, using due scan: %s", exc)
+                seeds = await loader.get_due_communities()
         else:
             seeds = await loader.get_due_communities()
         total_pool_count = (await loader.get_pool_stats())["total_communities"]
@@ -592,24 +646,31 @@ async def rank_patrol_seed_profiles(
     module_logger: Any,
 ) -> list[CommunityProfile]:
     try:
-        async with session_factory() as metrics_session:
-            scheduler = AdaptiveScheduler(metrics_session, lookback_days=30)
-            ordered_names, priority_entries = await scheduler.rank(
-                [profile.name for profile in seed_profiles]
+        async with session_factory() as session:
+            candidates = await load_crawl_candidates(
+                session, names=[profile.name for profile in seed_profiles]
             )
-            profile_map = {profile.name: profile for profile in seed_profiles}
-            ranked = [
-                profile_map[name] for name in ordered_names if name in profile_map
-            ]
-            if priority_entries:
-                top_preview = ", ".join(
-                    f"{entry.name}({entry.priority_score:.2f},pain={entry.pain_density:.2f})"
-                    for entry in priority_entries[:5]
-                )
-                module_logger.info("📈 自适应排序完成（Top5）：%s", top_preview)
-            return ranked
+        policy = CrawlPriorityPolicy()
+        ranked_candidates = rank_crawl_candidates(candidates, policy=policy)
+        profile_map = {profile.name: profile for profile in seed_profiles}
+        ranked = [
+            profile_map[candidate.name]
+            for candidate in ranked_candidates
+            if candidate.name in profile_map
+        ]
+        ranked_names = {profile.name for profile in ranked}
+        # 查询不到调度信号的社区（缓存行缺失 / 刚下线）保持原顺序排在最后
+        ranked.extend(profile for profile in seed_profiles if profile.name not in ranked_names)
+        if ranked_candidates:
+            top_preview = ", ".join(
+                f"{candidate.name}(interval={policy.interval_hours(candidate):.1f}h,"
+                f"empty={candidate.empty_hit})"
+                for candidate in ranked_candidates[:5]
+            )
+            module_logger.info("📈 统一优先级排序完成（Top5）：%s", top_preview)
+        return ranked
     except Exception:
-        module_logger.exception("自适应排序失败，回退原始顺序")
+        module_logger.exception("统一优先级排序失败，回退原始顺序")
         return seed_profiles
 
 
@@ -647,6 +708,7 @@ async def plan_patrol_targets_with_parent_run(
 
 __all__ = [
     "build_cache_manager",
+    "build_crawl_priority_queue",
     "build_patrol_planner_workflow_deps",
     "build_patrol_target_planner_deps",
     "build_planned_target_queue_deps",
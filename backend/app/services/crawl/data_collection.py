@@ -3,7 +3,7 @@ from __future__ import annotations
 import logging
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
-from typing import TYPE_CHECKING, Callable, Dict, List, Sequence, cast
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Sequence, cast
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -56,6 +56,13 @@ class DataCollectionService:
         self._stale_fallback_enabled = self._read_truthy_env(
             "DATA_COLLECTION_STALE_FALLBACK_ENABLED", default="1"
         )
+        # 单社区截止时间（秒，0=不限；不含等待限流令牌的排队时间）：慢社区超时记为失败，不再拖住整次采集
+        self._api_deadline_seconds = self._read_int_env(
+            "DATA_COLLECTION_SUBREDDIT_DEADLINE_SECONDS", 60
+        )
+        self._api_max_attempts = max(
+            1, self._read_int_env("DATA_COLLECTION_API_MAX_ATTEMPTS", 2)
+        )
 
     @staticmethod
     def _read_int_env(name: str, default: int) -> int:
@@ -76,9 +83,16 @@ class DataCollectionService:
         communities: Sequence["Community"] | Sequence[str],
         *,
         limit_per_subreddit: int = 100,
+        on_subreddit_collected: (
+            Callable[[str, List[RedditPost], str], Awaitable[None]] | None
+        ) = None,
     ) -> CollectionResult:
         """
         Collect posts using cached data when available and falling back to live API calls.
+
+        ``on_subreddit_collected(subreddit, posts, source)`` fires as soon as each
+        community's posts are available, so callers can start scoring early arrivals
+        while slower API fetches are still in flight.
         """
         return await collect_posts_with_fallback(
             runtime_input=DataCollectionRuntimeInput(
@@ -86,6 +100,8 @@ class DataCollectionService:
                 limit_per_subreddit=limit_per_subreddit,
                 cache_stale_hours=self._cache_stale_hours,
                 stale_fallback_enabled=self._stale_fallback_enabled,
+                api_deadline_seconds=float(self._api_deadline_seconds),
+                api_max_attempts=self._api_max_attempts,
             ),
             deps=DataCollectionRuntimeDeps(
                 cache_get=self.cache.get_cached_posts,
@@ -94,6 +110,8 @@ class DataCollectionService:
                 load_cold_posts=self._load_cold_posts,
                 fetch_subreddit_posts=self.reddit.fetch_subreddit_posts,
                 logger=self._logger,
+                cache_get_many=self.cache.get_many_cached_posts,
+                on_subreddit_collected=on_subreddit_collected,
             ),
         )
 
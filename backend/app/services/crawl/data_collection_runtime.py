@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import logging
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Sequence
@@ -11,7 +10,7 @@ from app.services.crawl.data_collection_support import (
     is_cache_stale,
     normalise_subreddits,
 )
-from app.services.infrastructure.reddit_client import RedditPost
+from app.services.infrastructure.reddit_client import RedditPost, iter_subreddit_fetches
 
 if TYPE_CHECKING:
     from app.services.analysis import Community
@@ -23,6 +22,9 @@ class DataCollectionRuntimeInput:
     limit_per_subreddit: int
     cache_stale_hours: int
     stale_fallback_enabled: bool
+    # 单社区 API 抓取的截止时间（含重试，0 = 不限）与瞬时错误的最大尝试次数
+    api_deadline_seconds: float = 0.0
+    api_max_attempts: int = 1
 
 
 @dataclass(slots=True)
@@ -33,6 +35,14 @@ class DataCollectionRuntimeDeps:
     load_cold_posts: Callable[[Sequence[str], int], Awaitable[Dict[str, List[RedditPost]]]]
     fetch_subreddit_posts: Callable[[str, int], Awaitable[Sequence[Any]]]
     logger: logging.Logger
+    cache_get_many: (
+        Callable[[Sequence[str]], Awaitable[Dict[str, list[RedditPost] | None]]] | None
+    ) = None
+    # 每个社区拿到帖子后立即回调 (subreddit, posts, source)，source ∈ cache/hot/cold/api/stale_cache；
+    # 调用方可以边收边打分，不必等最慢的社区
+    on_subreddit_collected: (
+        Callable[[str, List[RedditPost], str], Awaitable[None]] | None
+    ) = None
 
 
 async def _fetch_subreddit_posts_compat(
@@ -48,6 +58,24 @@ async def _fetch_subreddit_posts_compat(
         return await fetcher(subreddit, limit)
 
 
+async def _notify_collected(
+    deps: DataCollectionRuntimeDeps,
+    subreddit: str,
+    posts: List[RedditPost],
+    source: str,
+) -> None:
+    if deps.on_subreddit_collected is None:
+        return
+    try:
+        await deps.on_subreddit_collected(subreddit, posts, source)
+    except Exception as exc:
+        deps.logger.warning(
+            "on_subreddit_collected 回调失败，继续采集: subreddit=%s",
+            subreddit,
+            exc_info=exc,
+        )
+
+
 async def collect_posts_with_fallback(
     *,
     runtime_input: DataCollectionRuntimeInput,
@@ -71,16 +99,30 @@ async def collect_posts_with_fallback(
     api_failures: list[dict[str, str]] = []
     posts_by_subreddit: Dict[str, List[RedditPost]] = {}
 
-    for subreddit in subreddits:
+    prefetched: Dict[str, list[RedditPost] | None] | None = None
+    if deps.cache_get_many is not None:
         try:
-            cached = await deps.cache_get(subreddit)
+            prefetched = await deps.cache_get_many(subreddits)
         except Exception as exc:
             deps.logger.warning(
-                "Redis 缓存读取失败，改用后备存储: subreddit=%s",
-                subreddit,
+                "Redis 批量缓存读取失败，改用逐个读取: subreddits=%d",
+                len(subreddits),
                 exc_info=exc,
             )
-            cached = None
+
+    for subreddit in subreddits:
+        if prefetched is not None:
+            cached = prefetched.get(subreddit)
+        else:
+            try:
+                cached = await deps.cache_get(subreddit)
+            except Exception as exc:
+                deps.logger.warning(
+                    "Redis 缓存读取失败，改用后备存储: subreddit=%s",
+                    subreddit,
+                    exc_info=exc,
+                )
+                cached = None
         if not cached:
             continue
         trimmed = list(cached[: runtime_input.limit_per_subreddit])
@@ -93,6 +135,7 @@ async def collect_posts_with_fallback(
             continue
         posts_by_subreddit[subreddit] = trimmed
         cached_subreddits.add(subreddit)
+        await _notify_collected(deps, subreddit, trimmed, "cache")
 
     missing = [name for name in subreddits if name not in posts_by_subreddit]
 
@@ -104,6 +147,7 @@ async def collect_posts_with_fallback(
             trimmed = list(posts[: runtime_input.limit_per_subreddit])
             posts_by_subreddit[subreddit] = trimmed
             cached_subreddits.add(subreddit)
+            await _notify_collected(deps, subreddit, trimmed, "hot")
             try:
                 await deps.cache_set(subreddit, trimmed)
             except Exception as exc:
@@ -125,6 +169,7 @@ async def collect_posts_with_fallback(
             trimmed = list(posts[: runtime_input.limit_per_subreddit])
             posts_by_subreddit[subreddit] = trimmed
             cached_subreddits.add(subreddit)
+            await _notify_collected(deps, subreddit, trimmed, "cold")
             try:
                 await deps.cache_set(subreddit, trimmed)
             except Exception as exc:
@@ -139,38 +184,43 @@ async def collect_posts_with_fallback(
     ]
     api_calls = 0
 
-    fetch_coroutines = [
-        _fetch_subreddit_posts_compat(
+    async def _fetch_one(subreddit: str) -> Sequence[Any]:
+        return await _fetch_subreddit_posts_compat(
             deps.fetch_subreddit_posts,
             subreddit[2:] if subreddit.lower().startswith("r/") else subreddit,
             runtime_input.limit_per_subreddit,
         )
-        for subreddit in missing_after_cold
-    ]
-    results = await asyncio.gather(*fetch_coroutines, return_exceptions=True)
 
-    for subreddit, result in zip(missing_after_cold, results):
-        if isinstance(result, Exception):
-            error_text = str(result)
-            reason = "rate_limit" if "rate limit" in error_text.lower() else "error"
+    # 按完成顺序消费：单个社区失败 / 超时只记入 api_failures，不拖累其他社区
+    async for outcome in iter_subreddit_fetches(
+        _fetch_one,
+        missing_after_cold,
+        deadline_seconds=runtime_input.api_deadline_seconds,
+        max_attempts=runtime_input.api_max_attempts,
+    ):
+        subreddit = outcome.subreddit
+        if not outcome.ok:
+            error_text = str(outcome.error) or outcome.error.__class__.__name__
             api_failures.append(
                 {
                     "subreddit": subreddit,
                     "error": error_text,
-                    "reason": reason,
+                    "reason": outcome.reason or "error",
                 }
             )
             if (
                 runtime_input.stale_fallback_enabled
                 and subreddit in stale_cache_candidates
             ):
-                posts_by_subreddit[subreddit] = list(
+                fallback = list(
                     stale_cache_candidates[subreddit][: runtime_input.limit_per_subreddit]
                 )
+                posts_by_subreddit[subreddit] = fallback
                 stale_cache_fallback_subreddits.add(subreddit)
+                await _notify_collected(deps, subreddit, fallback, "stale_cache")
             continue
 
-        posts = coerce_api_posts(result)
+        posts = coerce_api_posts(outcome.posts or [])
         posts_by_subreddit[subreddit] = posts
         try:
             await deps.cache_set(subreddit, posts)
@@ -181,6 +231,15 @@ async def collect_posts_with_fallback(
                 exc_info=exc,
             )
         api_calls += 1
+        await _notify_collected(deps, subreddit, posts, "api")
+
+    if api_failures:
+        deps.logger.warning(
+            "社区 API 抓取部分失败: failed=%d/%d reasons=%s",
+            len(api_failures),
+            len(missing_after_cold),
+            sorted({item["reason"] for item in api_failures}),
+        )
 
     total_posts = sum(len(posts) for posts in posts_by_subreddit.values())
     cache_hits = len(cached_subreddits)
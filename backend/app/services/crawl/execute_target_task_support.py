@@ -139,7 +139,7 @@ def build_global_rate_limiter(
     try:
         client_id = str(getattr(settings, "reddit_client_id", "") or "default")
         rclient = redis.Redis.from_url(getattr(settings, "reddit_cache_redis_url"))
-        return global_rate_limiter.GlobalRateLimiter(
+        return global_rate_limiter.create_reddit_rate_limiter(
             rclient,
             limit=bucket_limit,
             window_seconds=window_seconds,
@@ -482,15 +482,22 @@ class IncrementalCrawler:
     ) -> dict[str, int]:
         """Public helper to persist a batch of posts already fetched externally.
 
-        Performs dual write (cold + hot) and commits once.
+        Performs dual write (cold + hot) and commits once. By default the batch goes
+        through the set-based bulk path (one lookup per concern, multi-row upserts);
+        INCREMENTAL_BULK_INGEST_ENABLED=false falls back to the per-row path.
         """
+        dual_write = (
+            self._crawler_runtime.bulk_dual_write
+            if settings.incremental_bulk_ingest_enabled
+            else self._dual_write
+        )
         result = await run_ingest_posts_batch(
             workflow_input=IngestPostsBatchInput(
                 community_name=community_name,
                 posts=posts,
             ),
             deps=IngestPostsBatchDeps(
-                execute_dual_write=lambda name, batch: self._dual_write(
+                execute_dual_write=lambda name, batch: dual_write(
                     name,
                     list(batch),
                 ),
@@ -9,6 +9,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.community_cache import CommunityCache
 from app.services.community.blacklist_loader import BlacklistConfig
+from app.services.crawl.bulk_post_ingestion_service import (
+    BulkIngestDeps,
+    BulkIngestInput,
+    bulk_ingest_posts,
+)
 from app.services.crawl.comprehensive_crawl_workflow import ComprehensiveCrawlWorkflowDeps
 from app.services.crawl.crawl_metrics_service import (
     CrawlMetricsDeps,
@@ -204,6 +209,46 @@ class IncrementalCrawlerRuntime:
         )
         return result.new_count, result.updated_count, result.duplicate_count
 
+    async def bulk_dual_write(
+        self,
+        community_name: str,
+        posts: list[RedditPost],
+        *,
+        trigger_comments_fetch: bool = False,
+    ) -> tuple[int, int, int]:
+        result = await bulk_ingest_posts(
+            write_input=BulkIngestInput(
+                community_name=community_name,
+                posts=posts,
+                source_track=self.source_track,
+                crawl_run_id=self.crawl_run_id,
+                community_run_id=self.community_run_id,
+                duplicate_mode=self.duplicate_mode,
+                spam_categories=self._spam_categories,
+                crawler_run_row_ensured=self._crawler_run_row_ensured,
+                hot_cache_ttl_hours=self.hot_cache_ttl_hours,
+                trigger_comments_fetch=trigger_comments_fetch,
+                refresh_posts_latest_after_write=self.refresh_posts_latest_after_write,
+            ),
+            deps=BulkIngestDeps(
+                db=self.db,
+                unix_to_datetime=self.unix_to_datetime,
+                text_norm_hash_available=self.text_norm_hash_available,
+                posts_raw_has_crawl_run_id=self.posts_raw_has_crawl_run_id,
+                posts_raw_has_community_run_id=self.posts_raw_has_community_run_id,
+                fallback_dual_write=lambda name, batch: self.dual_write(
+                    name,
+                    batch,
+                    trigger_comments_fetch=trigger_comments_fetch,
+                ),
+                fallback_hot_upsert=self.upsert_to_hot_cache,
+                schedule_posts_latest_refresh=self.runtime_deps.schedule_posts_latest_refresh,
+                enqueue_comment_backfill=self.runtime_deps.enqueue_comment_backfill,
+            ),
+        )
+        self._crawler_run_row_ensured = result.crawler_run_row_ensured
+        return result.new_count, result.updated_count, result.duplicate_count
+
     async def upsert_to_cold_storage(
         self,
         community_name: str,
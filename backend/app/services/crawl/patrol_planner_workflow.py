@@ -20,6 +20,8 @@ class PatrolPlannerWorkflowDeps:
     plan_patrol_targets: Callable[[str, list[CommunityProfile], bool], Awaitable[dict[str, Any]]]
     generate_run_id: Callable[[], str]
     log_warning: Callable[[str], None]
+    # 优先级队列领取的社区带租约：下单失败时提前释放，下一轮即可重新领取
+    release_seed_profiles: Callable[[list[CommunityProfile]], Awaitable[None]] | None = None
 
 
 @dataclass(slots=True)
@@ -80,13 +82,21 @@ async def run_patrol_planner_workflow(
             total_pool_count=total_pool_count,
         )
 
-    await deps.ensure_parent_run(crawl_run_id, workflow_input.force_refresh)
-    ranked_profiles = await deps.rank_profiles(seed_profiles)
-    plan_stats = await deps.plan_patrol_targets(
-        crawl_run_id,
-        ranked_profiles,
-        workflow_input.force_refresh,
-    )
+    try:
+        await deps.ensure_parent_run(crawl_run_id, workflow_input.force_refresh)
+        ranked_profiles = await deps.rank_profiles(seed_profiles)
+        plan_stats = await deps.plan_patrol_targets(
+            crawl_run_id,
+            ranked_profiles,
+            workflow_input.force_refresh,
+        )
+    except Exception:
+        if deps.release_seed_profiles is not None:
+            try:
+                await deps.release_seed_profiles(seed_profiles)
+            except Exception as exc:
+                deps.log_warning(f"释放巡航租约失败: {exc}")
+        raise
     return PatrolPlannerWorkflowResult(
         status="planned",
         run_id=crawl_run_id,
@@ -2,16 +2,19 @@ from __future__ import annotations
 
 import asyncio
 import json
+import time
+from collections import deque
 from dataclasses import asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from app.services.infrastructure.reddit_client import RedditAPIClient, RedditPost
 from app.services.crawl.common import Submission, JSONLWriter
 
 
 CHARSET_DEFAULT = "abcdefghijklmnopqrstuvwxyz0123456789"
+_KPI_FIELDS = ["prefix", "status", "count", "hits", "pages", "split", "elapsed_ms"]
 
 
 def parse_prefix_chars(spec: str) -> str:
@@ -53,6 +56,57 @@ async def _search_shard(
     return results, pages
 
 
+def _append_progress(progress_path: Path | None, record: Dict[str, Any]) -> None:
+    if progress_path is None:
+        return
+    try:
+        progress_path.parent.mkdir(parents=True, exist_ok=True)
+        with progress_path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except Exception:
+        pass
+
+
+def _reset_progress(progress_path: Path | None) -> None:
+    if progress_path is None:
+        return
+    try:
+        progress_path.unlink(missing_ok=True)
+    except Exception:
+        pass
+
+
+def _load_progress(
+    progress_path: Path | None,
+) -> Tuple[set[str], List[str], set[str], List[Dict[str, Any]]]:
+    """读取追加式进度日志：返回 (已完成前缀, 已分裂出的子前缀, 已见 id, 历史 KPI 行)。"""
+    done: set[str] = set()
+    children: List[str] = []
+    seen_ids: set[str] = set()
+    kpi_rows: List[Dict[str, Any]] = []
+    if progress_path is None or not progress_path.exists():
+        return done, children, seen_ids, kpi_rows
+    try:
+        lines = progress_path.read_text(encoding="utf-8").splitlines()
+    except Exception:
+        return done, children, seen_ids, kpi_rows
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue  # 旧版整文件 JSON 或被截断的最后一行
+        if not isinstance(record, dict) or record.get("event") != "shard":
+            continue
+        if record.get("status") != "ok":
+            continue
+        prefix = str(record.get("prefix") or "")
+        done.add(prefix)
+        children.extend(record.get("children") or [])
+        seen_ids.update(record.get("ids") or [])
+        kpi_rows.append({key: record.get(key) for key in _KPI_FIELDS})
+    return done, children, seen_ids, kpi_rows
+
+
 async def run_search_partition(
     *,
     subreddit: str,
@@ -67,101 +121,142 @@ async def run_search_partition(
     writer: JSONLWriter | None,
     progress_path: Path | None,
     kpi_output_dir: Path,
+    max_concurrency: int = 4,
+    rate_limit: int = 58,
+    rate_limit_window: float = 600.0,
+    global_rate_limiter: Any | None = None,
 ) -> Tuple[int, Path]:
+    """按查询前缀分片搜索一个社区，命中数达到 split_threshold 的前缀继续细分。
+
+    - 前缀 frontier 是 deque，max_concurrency 个 worker 并发消费；所有请求共用一个
+      RedditAPIClient（及可选的全局限流器），吞吐由配额决定而不是单次往返延迟
+    - progress_path 为追加式 JSONL 日志，每完成一个分片写一行（含新增 id 与子前缀）；
+      重跑时跳过已完成前缀、恢复去重集合，从中断处继续。进度与输出文件必须一致：
+      writer 以覆盖模式（resume=False）打开说明输出从头开始，旧进度作废并清空
+    - 返回的 total 只统计本次运行新写入的帖子数
+    """
     charset = parse_prefix_chars(prefix_chars)
-    queue: List[str] = list(charset)  # initial 1-char prefixes
-    seen_ids: set[str] = set()
+    if writer is not None and not writer.resume:
+        _reset_progress(progress_path)
+    done, resumed_children, seen_ids, kpi_rows = _load_progress(progress_path)
+    frontier: Deque[str] = deque(
+        prefix
+        for prefix in dict.fromkeys([*charset, *resumed_children])
+        if prefix not in done
+    )
     total = 0
-    shards_processed = 0
+    in_flight = 0
+    cond = asyncio.Condition()
+    _append_progress(
+        progress_path,
+        {
+            "event": "start",
+            "subreddit": subreddit,
+            "resumed_shards": len(done),
+            "frontier": len(frontier),
+            "at": datetime.now(timezone.utc).isoformat(),
+        },
+    )
+
+    async def _process(api: RedditAPIClient, prefix: str) -> None:
+        nonlocal total
+        started = time.monotonic()
+        try:
+            posts, pages = await _search_shard(
+                api,
+                subreddit,
+                prefix,
+                sort=sort,
+                max_pages=max_pages_per_shard,
+            )
+        except Exception as exc:
+            row: Dict[str, Any] = {
+                "prefix": prefix,
+                "status": f"error:{exc}",
+                "count": 0,
+                "hits": 0,
+                "pages": 0,
+                "split": 0,
+                "elapsed_ms": int((time.monotonic() - started) * 1000),
+            }
+            kpi_rows.append(row)
+            _append_progress(progress_path, {"event": "shard", **row})
+            return
+
+        # 去重与写入（单线程事件循环内，检查与写入之间没有 await）
+        new_ids: List[str] = []
+        for p in posts:
+            if p.id in seen_ids:
+                continue
+            seen_ids.add(p.id)
+            new_ids.append(p.id)
+            if writer is not None:
+                writer.append(Submission.from_reddit_post(p))
+        total += len(new_ids)
 
-    kpi_rows: List[Dict[str, str | int]] = []
+        # 按原始命中数决定是否分裂（不受并发下去重先后的影响）
+        children: List[str] = []
+        if len(posts) >= split_threshold and len(prefix) < max_prefix_len:
+            children = [prefix + ch for ch in charset]
+        row = {
+            "prefix": prefix,
+            "status": "ok",
+            "count": len(new_ids),
+            "hits": len(posts),
+            "pages": pages,
+            "split": 1 if children else 0,
+            "elapsed_ms": int((time.monotonic() - started) * 1000),
+        }
+        kpi_rows.append(row)
+        _append_progress(
+            progress_path,
+            {"event": "shard", **row, "children": children, "ids": new_ids},
+        )
+        if children:
+            async with cond:
+                frontier.extend(children)
+                cond.notify_all()
+
+    async def _worker(api: RedditAPIClient) -> None:
+        nonlocal in_flight
+        while True:
+            async with cond:
+                while not frontier and in_flight:
+                    await cond.wait()
+                if not frontier:
+                    cond.notify_all()
+                    return
+                prefix = frontier.popleft()
+                in_flight += 1
+            try:
+                await _process(api, prefix)
+            finally:
+                async with cond:
+                    in_flight -= 1
+                    cond.notify_all()
 
     async with RedditAPIClient(
         client_id=client_id,
         client_secret=client_secret,
         user_agent=user_agent,
-        rate_limit=58,
-        rate_limit_window=600.0,
-        max_concurrency=2,
+        rate_limit=rate_limit,
+        rate_limit_window=rate_limit_window,
+        max_concurrency=max_concurrency,
+        global_rate_limiter=global_rate_limiter,
     ) as api:
         await api.authenticate()
+        await asyncio.gather(*(_worker(api) for _ in range(max(1, max_concurrency))))
 
-        while queue:
-            prefix = queue.pop(0)
-            shards_processed += 1
-            # 写进度
-            if progress_path is not None:
-                try:
-                    progress_path.parent.mkdir(parents=True, exist_ok=True)
-                    progress_path.write_text(
-                        json.dumps(
-                            {
-                                "subreddit": subreddit,
-                                "status": "running",
-                                "shard": prefix,
-                                "queue_size": len(queue),
-                                "processed": shards_processed,
-                                "total": total,
-                                "updated_at": datetime.now(timezone.utc).isoformat(),
-                            },
-                            ensure_ascii=False,
-                            indent=2,
-                        ),
-                        encoding="utf-8",
-                    )
-                except Exception:
-                    pass
-
-            # 抓该分片
-            try:
-                posts, pages = await _search_shard(
-                    api,
-                    subreddit,
-                    prefix,
-                    sort=sort,
-                    max_pages=max_pages_per_shard,
-                )
-            except Exception as exc:
-                kpi_rows.append(
-                    {
-                        "prefix": prefix,
-                        "status": f"error:{exc}",
-                        "count": 0,
-                        "pages": 0,
-                        "split": 0,
-                    }
-                )
-                continue
-
-            # 去重与写入
-            new_count = 0
-            for p in posts:
-                if p.id in seen_ids:
-                    continue
-                seen_ids.add(p.id)
-                total += 1
-                new_count += 1
-                if writer is not None:
-                    rec = Submission.from_reddit_post(p)
-                    writer.append(rec)
-
-            # KPI & 决策
-            split = 0
-            if new_count >= split_threshold and len(prefix) < max_prefix_len:
-                # 分裂为所有子前缀
-                for ch in charset:
-                    queue.append(prefix + ch)
-                split = 1
-
-            kpi_rows.append(
-                {
-                    "prefix": prefix,
-                    "status": "ok",
-                    "count": new_count,
-                    "pages": pages,
-                    "split": split,
-                }
-            )
+    _append_progress(
+        progress_path,
+        {
+            "event": "done",
+            "subreddit": subreddit,
+            "total": total,
+            "shards": len(kpi_rows),
+            "at": datetime.now(timezone.utc).isoformat(),
+        },
+    )
 
     # 写 KPI 文件
     kpi_path = kpi_output_dir / f"{subreddit}.search_kpi.csv"
@@ -169,7 +264,7 @@ async def run_search_partition(
         import csv
 
         with kpi_path.open("w", encoding="utf-8", newline="") as f:
-            w = csv.DictWriter(f, fieldnames=["prefix", "status", "count", "pages", "split"])
+            w = csv.DictWriter(f, fieldnames=_KPI_FIELDS)
             w.writeheader()
             for r in kpi_rows:
                 w.writerow(r)
@@ -0,0 +1,283 @@
+"""
+时间切片并发调度（timestamp search 回填用）。
+
+- 多个切片在 worker 池里并发抓取；单个请求仍经过 RedditAPIClient 的限流器，
+  并发数只决定同时在途的切片数
+- 单片命中数接近 listing 上限（~1000）时说明被截断：对半拆分后重新入队，直到低于阈值或到最小粒度
+- 每片完成即按 id 合并去重，可选 on_new_posts 回调做增量入库
+- 完成 / 已拆分的切片写入 checkpoint，中断后重跑会跳过已完成切片、直接展开已拆分切片
+- 每片 KPI（抓取数、新增数、耗时、深度、状态）随报告返回
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Protocol
+
+from app.services.crawl.time_slicer import TimeSlice, can_split, needs_split, split_slice
+from app.services.infrastructure.reddit_client import RedditPost
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLICE_CHECKPOINT_PREFIX = "crawl:time_slices:"
+DEFAULT_SLICE_CHECKPOINT_TTL_SECONDS = 7 * 24 * 60 * 60
+SLICE_DONE = "done"
+SLICE_SPLIT = "split"
+
+EpochSlice = tuple[int, int]
+FetchSliceFn = Callable[[int, int], Awaitable[list[RedditPost]]]
+NewPostsFn = Callable[[list[RedditPost]], Awaitable[None]]
+
+
+@dataclass(slots=True)
+class SliceKpi:
+    start: int
+    end: int
+    depth: int
+    status: str = ""
+    fetched: int = 0
+    new_unique: int = 0
+    elapsed_seconds: float = 0.0
+    error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "start": self.start,
+            "end": self.end,
+            "depth": self.depth,
+            "status": self.status,
+            "fetched": self.fetched,
+            "new_unique": self.new_unique,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "error": self.error,
+        }
+
+
+@dataclass(slots=True)
+class SliceCrawlReport:
+    posts: list[RedditPost] = field(default_factory=list)
+    kpis: list[SliceKpi] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    def _count(self, status: str) -> int:
+        return sum(1 for kpi in self.kpis if kpi.status == status)
+
+    @property
+    def failed_slices(self) -> list[EpochSlice]:
+        return [(kpi.start, kpi.end) for kpi in self.kpis if kpi.status == "failed"]
+
+    def as_dict(self) -> dict[str, Any]:
+        fetched = sum(kpi.fetched for kpi in self.kpis)
+        return {
+            "posts": len(self.posts),
+            "fetched": fetched,
+            "duplicate_ratio": round(1 - len(self.posts) / fetched, 4) if fetched else 0.0,
+            "slices_done": self._count(SLICE_DONE),
+            "slices_split": self._count(SLICE_SPLIT),
+            "slices_failed": self._count("failed"),
+            "slices_resumed": self._count("resumed"),
+            "max_depth": max((kpi.depth for kpi in self.kpis), default=0),
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+        }
+
+
+class SliceCheckpointStore(Protocol):
+    async def load(self, key: str) -> dict[EpochSlice, str]: ...
+
+    async def mark(self, key: str, ts: EpochSlice, status: str) -> None: ...
+
+    async def clear(self, key: str) -> None: ...
+
+
+class RedisSliceCheckpointStore:
+    """Redis hash 断点（field = "start:end"，value = done/split）；Redis 故障只记日志。"""
+
+    def __init__(
+        self,
+        redis_client: Any,
+        *,
+        prefix: str = DEFAULT_SLICE_CHECKPOINT_PREFIX,
+        ttl_seconds: int = DEFAULT_SLICE_CHECKPOINT_TTL_SECONDS,
+    ) -> None:
+        self._redis = redis_client
+        self._prefix = prefix
+        self._ttl_seconds = max(1, int(ttl_seconds))
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}{key}"
+
+    async def load(self, key: str) -> dict[EpochSlice, str]:
+        try:
+            raw = await self._redis.hgetall(self._key(key))
+        except Exception:
+            logger.warning("slice checkpoint load failed key=%s", key, exc_info=True)
+            return {}
+        state: dict[EpochSlice, str] = {}
+        for raw_field, raw_status in (raw or {}).items():
+            field_text = raw_field.decode("utf-8") if isinstance(raw_field, bytes) else str(raw_field)
+            status = raw_status.decode("utf-8") if isinstance(raw_status, bytes) else str(raw_status)
+            start, sep, end = field_text.partition(":")
+            if not sep:
+                continue
+            try:
+                state[(int(start), int(end))] = status
+            except ValueError:
+                continue
+        return state
+
+    async def mark(self, key: str, ts: EpochSlice, status: str) -> None:
+        try:
+            await self._redis.hset(self._key(key), f"{ts[0]}:{ts[1]}", status)
+            await self._redis.expire(self._key(key), self._ttl_seconds)
+        except Exception:
+            logger.warning("slice checkpoint save failed key=%s", key, exc_info=True)
+
+    async def clear(self, key: str) -> None:
+        try:
+            await self._redis.delete(self._key(key))
+        except Exception:
+            logger.warning("slice checkpoint clear failed key=%s", key, exc_info=True)
+
+
+def _split_epoch(ts: EpochSlice) -> tuple[EpochSlice, EpochSlice]:
+    left, right = split_slice(
+        TimeSlice(
+            datetime.fromtimestamp(ts[0], tz=timezone.utc),
+            datetime.fromtimestamp(ts[1], tz=timezone.utc),
+        )
+    )
+    return (
+        (int(left.start.timestamp()), int(left.end.timestamp())),
+        (int(right.start.timestamp()), int(right.end.timestamp())),
+    )
+
+
+def _can_split_epoch(ts: EpochSlice, min_slice_seconds: int) -> bool:
+    slice_ = TimeSlice(
+        datetime.fromtimestamp(ts[0], tz=timezone.utc),
+        datetime.fromtimestamp(ts[1], tz=timezone.utc),
+    )
+    return can_split(slice_, min_slice_days=max(1, min_slice_seconds) / 86400)
+
+
+async def crawl_time_slices(
+    fetch_slice: FetchSliceFn,
+    slices: Sequence[EpochSlice],
+    *,
+    max_concurrency: int = 4,
+    split_threshold: int = 900,
+    min_slice_seconds: int = 3600,
+    max_depth: int = 8,
+    checkpoint: SliceCheckpointStore | None = None,
+    checkpoint_key: str | None = None,
+    on_new_posts: NewPostsFn | None = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> SliceCrawlReport:
+    """并发抓取所有切片，截断的切片递归对半拆分；返回去重后的帖子与每片 KPI。
+
+    fetch_slice(start, end) 负责单片抓取（内部自带分页与 per-slice 上限）。
+    失败的切片不写 checkpoint、不中断其他切片，记入 KPI（status=failed）。
+    """
+    report = SliceCrawlReport()
+    seen: dict[str, RedditPost] = {}
+    merge_lock = asyncio.Lock()
+    use_checkpoint = checkpoint is not None and bool(checkpoint_key)
+    state: dict[EpochSlice, str] = {}
+    if use_checkpoint:
+        state = await checkpoint.load(checkpoint_key)  # type: ignore[union-attr,arg-type]
+
+    queue: asyncio.Queue[tuple[EpochSlice, int]] = asyncio.Queue()
+    for ts in dict.fromkeys((int(start), int(end)) for start, end in slices):
+        queue.put_nowait((ts, 0))
+
+    async def _mark(ts: EpochSlice, status: str) -> None:
+        if use_checkpoint:
+            await checkpoint.mark(checkpoint_key, ts, status)  # type: ignore[union-attr,arg-type]
+
+    async def _process(ts: EpochSlice, depth: int) -> None:
+        kpi = SliceKpi(start=ts[0], end=ts[1], depth=depth)
+        report.kpis.append(kpi)
+        previous = state.get(ts)
+        if previous == SLICE_DONE:
+            kpi.status = "resumed"
+            return
+        if previous == SLICE_SPLIT:
+            kpi.status = SLICE_SPLIT
+            for child in _split_epoch(ts):
+                queue.put_nowait((child, depth + 1))
+            return
+
+        started = clock()
+        try:
+            batch = await fetch_slice(ts[0], ts[1])
+        except Exception as exc:
+            kpi.status = "failed"
+            kpi.error = str(exc) or exc.__class__.__name__
+            kpi.elapsed_seconds = clock() - started
+            logger.warning("Slice fetch failed [%s..%s]: %s", ts[0], ts[1], exc)
+            return
+        kpi.elapsed_seconds = clock() - started
+        kpi.fetched = len(batch)
+
+        async with merge_lock:
+            fresh = [post for post in batch if post.id not in seen]
+            for post in fresh:
+                seen[post.id] = post
+        kpi.new_unique = len(fresh)
+        if fresh and on_new_posts is not None:
+            await on_new_posts(fresh)
+
+        if (
+            needs_split(len(batch), split_threshold)
+            and depth < max_depth
+            and _can_split_epoch(ts, min_slice_seconds)
+        ):
+            kpi.status = SLICE_SPLIT
+            for child in _split_epoch(ts):
+                queue.put_nowait((child, depth + 1))
+        else:
+            kpi.status = SLICE_DONE
+        await _mark(ts, kpi.status)
+
+    async def _worker() -> None:
+        while True:
+            ts, depth = await queue.get()
+            try:
+                await _process(ts, depth)
+            finally:
+                queue.task_done()
+
+    started = clock()
+    workers = [asyncio.create_task(_worker()) for _ in range(max(1, int(max_concurrency)))]
+    drained = asyncio.create_task(queue.join())
+    try:
+        # worker 只会因 on_new_posts / checkpoint 异常提前结束：此时整体失败，不再等待队列
+        await asyncio.wait([drained, *workers], return_when=asyncio.FIRST_COMPLETED)
+        for worker in workers:
+            if worker.done() and not worker.cancelled() and worker.exception() is not None:
+                raise worker.exception()  # type: ignore[misc]
+    finally:
+        drained.cancel()
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(drained, *workers, return_exceptions=True)
+    report.elapsed_seconds = clock() - started
+    report.posts = list(seen.values())
+
+    if use_checkpoint and not report.failed_slices:
+        # 全部完成后清掉断点；有失败切片时保留，重跑只补失败部分
+        await checkpoint.clear(checkpoint_key)  # type: ignore[union-attr,arg-type]
+    return report
+
+
+__all__ = [
+    "RedisSliceCheckpointStore",
+    "SliceCheckpointStore",
+    "SliceCrawlReport",
+    "SliceKpi",
+    "crawl_time_slices",
+]
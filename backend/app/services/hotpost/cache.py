@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import logging
 import os
-from typing import Iterable
+import time
+import uuid
+from typing import Any, Iterable
 
 from app.services.hotpost.repository import normalize_query
 from app.utils.subreddit import normalize_subreddit_name
 
+logger = logging.getLogger(__name__)
+
+HOTPOST_CACHE_STATS_KEY = "hotpost:cache:stats"
+HOTPOST_CACHE_EVENTS = ("hit", "stale", "coalesced", "miss", "refresh")
+
 
 def _hash_text(text: str) -> str:
     return hashlib.md5(text.encode("utf-8")).hexdigest()[:8]
@@ -39,4 +48,135 @@ def get_hotpost_cache_ttl_seconds(mode: str) -> int:
     return int(os.getenv("CACHE_TTL_DEFAULT", "3600"))
 
 
-__all__ = ["build_hotpost_cache_key", "get_hotpost_cache_ttl_seconds"]
+def get_hotpost_cache_stale_seconds() -> int:
+    """软过期后仍可返回旧结果的时长（期间后台刷新）；0 = 关闭 stale-while-revalidate。"""
+    return max(0, int(os.getenv("HOTPOST_CACHE_STALE_SECONDS", "3600")))
+
+
+def hotpost_cache_fresh_key(cache_key: str) -> str:
+    # 新鲜度标记：TTL = 软过期时间；结果本体的 TTL = 软过期 + stale 窗口
+    return f"{cache_key}:fresh"
+
+
+def hotpost_cache_lock_key(cache_key: str) -> str:
+    return f"{cache_key}:lock"
+
+
+def _decode(value: Any) -> str | None:
+    if value is None:
+        return None
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+async def read_hotpost_cache(
+    redis_client: Any,
+    cache_key: str,
+    *,
+    stale_seconds: int | None = None,
+) -> tuple[str | None, bool]:
+    """返回 (缓存 JSON, 是否新鲜)；开启 stale 窗口时，没有新鲜度标记的条目视为 stale。"""
+    raw = _decode(await redis_client.get(cache_key))
+    if not raw:
+        return None, False
+    if (get_hotpost_cache_stale_seconds() if stale_seconds is None else stale_seconds) <= 0:
+        return raw, True
+    try:
+        fresh = bool(await redis_client.get(hotpost_cache_fresh_key(cache_key)))
+    except Exception:
+        logger.debug("hotpost cache fresh marker read failed key=%s", cache_key, exc_info=True)
+        fresh = True
+    return raw, fresh
+
+
+async def record_hotpost_cache_event(redis_client: Any, event: str) -> dict[str, int]:
+    """累加 hit/stale/coalesced/miss/refresh 计数并返回当前快照；Redis 故障只记日志。"""
+    try:
+        await redis_client.hincrby(HOTPOST_CACHE_STATS_KEY, event, 1)
+        raw = await redis_client.hgetall(HOTPOST_CACHE_STATS_KEY)
+    except Exception:
+        logger.debug("hotpost cache stats update failed event=%s", event, exc_info=True)
+        return {}
+    counters = {name: 0 for name in HOTPOST_CACHE_EVENTS}
+    for name, value in (raw or {}).items():
+        try:
+            counters[_decode(name) or ""] = int(_decode(value) or 0)
+        except ValueError:
+            continue
+    return counters
+
+
+class HotpostSingleFlight:
+    """按缓存 key 的 Redis 锁（SET NX EX）：同一查询只有一个请求去抓取 + 调 LLM，其余等结果。
+
+    Redis 故障或锁状态异常时放行（宁可重复计算，也不阻塞用户请求）。
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        *,
+        stale_seconds: int = 0,
+        lock_seconds: int = 120,
+        wait_seconds: float | None = None,
+        poll_seconds: float = 0.25,
+    ) -> None:
+        self._redis = redis_client
+        self._stale_seconds = stale_seconds
+        self._lock_seconds = max(1, int(lock_seconds))
+        # 默认等满锁 TTL：实时搜索（证据时限 + 两次 LLM）常超过 30s，等待方提前放弃会绕过锁重复抓取
+        self._wait_seconds = (
+            float(self._lock_seconds) if wait_seconds is None else max(0.0, float(wait_seconds))
+        )
+        self._poll_seconds = max(0.01, float(poll_seconds))
+
+    async def acquire(self, cache_key: str) -> str | None:
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self._redis.set(
+                hotpost_cache_lock_key(cache_key), token, nx=True, ex=self._lock_seconds
+            )
+        except Exception:
+            logger.debug("hotpost single-flight acquire failed key=%s", cache_key, exc_info=True)
+            return None
+        return token if acquired else None
+
+    async def is_locked(self, cache_key: str) -> bool:
+        try:
+            return bool(await self._redis.get(hotpost_cache_lock_key(cache_key)))
+        except Exception:
+            return False
+
+    async def release(self, cache_key: str, token: str) -> None:
+        lock_key = hotpost_cache_lock_key(cache_key)
+        try:
+            if _decode(await self._redis.get(lock_key)) == token:
+                await self._redis.delete(lock_key)
+        except Exception:
+            logger.debug("hotpost single-flight release failed key=%s", cache_key, exc_info=True)
+
+    async def wait_for_result(self, cache_key: str) -> str | None:
+        """持锁期间持续等待持锁请求写入缓存；锁消失（完成 / 失败 / 过期）时返回当时的缓存，等待超时返回 None。"""
+        deadline = time.monotonic() + self._wait_seconds
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self._poll_seconds)
+            raw, fresh = await read_hotpost_cache(
+                self._redis, cache_key, stale_seconds=self._stale_seconds
+            )
+            if raw and fresh:
+                return raw
+            if not await self.is_locked(cache_key):
+                return raw
+        return None
+
+
+__all__ = [
+    "HOTPOST_CACHE_STATS_KEY",
+    "HotpostSingleFlight",
+    "build_hotpost_cache_key",
+    "get_hotpost_cache_stale_seconds",
+    "get_hotpost_cache_ttl_seconds",
+    "hotpost_cache_fresh_key",
+    "hotpost_cache_lock_key",
+    "read_hotpost_cache",
+    "record_hotpost_cache_event",
+]
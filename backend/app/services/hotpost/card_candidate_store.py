@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from app.schemas.hotpost_card_candidates import CandidatePack
 from app.schemas.hotpost_signal import SignalLevel, SourceScopeId
-from app.services.hotpost.card_payload_store import load_candidates, mutate_candidates
+from app.services.hotpost.card_payload_store import load_candidates, record_store
 from app.services.hotpost.card_review_rejection_store import list_rejected_candidate_ids
 
 
@@ -16,7 +16,11 @@ def list_candidates(
     *,
     include_rejected: bool = False,
 ) -> list[CandidatePack]:
-    items = [_load_candidate(item) for item in load_candidates()]
+    if source_scope_id is not None:
+        raw_items = record_store().find_group("candidates", source_scope_id)
+    else:
+        raw_items = load_candidates()
+    items = [_load_candidate(item) for item in raw_items]
     if not include_rejected:
         rejected_ids = list_rejected_candidate_ids()
         items = [item for item in items if item.candidate_id not in rejected_ids]
@@ -28,41 +32,37 @@ def list_candidates(
 
 
 def get_candidate(candidate_id: str) -> CandidatePack:
-    item = next((item for item in load_candidates() if item["candidate_id"] == candidate_id), None)
+    item = record_store().get("candidates", candidate_id)
     if item is None:
         raise LookupError("Candidate not found")
     return _load_candidate(item)
 
 
 def get_candidates(candidate_ids: list[str]) -> list[CandidatePack]:
-    return [get_candidate(candidate_id) for candidate_id in candidate_ids]
+    found = record_store().get_many("candidates", candidate_ids)
+    missing = [candidate_id for candidate_id in candidate_ids if candidate_id not in found]
+    if missing:
+        raise LookupError("Candidate not found")
+    return [_load_candidate(found[candidate_id]) for candidate_id in candidate_ids]
 
 
 def save_candidate(candidate: CandidatePack) -> CandidatePack:
-    def _mutate(candidates: list[dict]) -> CandidatePack:
-        if any(item["candidate_id"] == candidate.candidate_id for item in candidates):
+    with record_store().transaction() as tx:
+        if tx.get("candidates", candidate.candidate_id) is not None:
             raise ValueError("Candidate already exists")
-        candidates.append(candidate.model_dump(mode="json"))
-        return candidate
-
-    return mutate_candidates(_mutate)
+        tx.insert("candidates", candidate.model_dump(mode="json"))
+    return candidate
 
 
 def upsert_candidate(candidate: CandidatePack) -> CandidatePack:
-    def _mutate(candidates: list[dict]) -> CandidatePack:
-        items = [item for item in candidates if item["candidate_id"] != candidate.candidate_id]
-        items.append(candidate.model_dump(mode="json"))
-        candidates[:] = items
-        return candidate
-
-    return mutate_candidates(_mutate)
+    with record_store().transaction() as tx:
+        tx.upsert("candidates", candidate.model_dump(mode="json"))
+    return candidate
 
 
 def replace_scope_candidates(source_scope_id: SourceScopeId, candidates: list[CandidatePack]) -> list[CandidatePack]:
-    def _mutate(current_candidates: list[dict]) -> list[CandidatePack]:
-        items = [item for item in current_candidates if item["source_scope_id"] != source_scope_id]
-        items.extend(candidate.model_dump(mode="json") for candidate in candidates)
-        current_candidates[:] = items
-        return candidates
-
-    return mutate_candidates(_mutate)
+    with record_store().transaction() as tx:
+        tx.delete_group("candidates", source_scope_id)
+        for candidate in candidates:
+            tx.upsert("candidates", candidate.model_dump(mode="json"))
+    return candidates
@@ -3,8 +3,8 @@ from __future__ import annotations
 import os
 from typing import Optional, Any
 
+from app.services.llm.clients.async_openai_client import AsyncOpenAIChatClient
 from app.services.llm.clients.gemini_client import GeminiChatClient
-from app.services.llm.clients.openai_client import OpenAIChatClient
 
 _GOOGLE_PREFIX = "google/"
 _DEEPSEEK_PREFIX = "deepseek/"
@@ -13,17 +13,17 @@ _DEEPSEEK_DEFAULT_BASE_URL = "https://api.deepseek.com"
 
 def build_card_content_client(
     model: str, *, timeout: float
-) -> OpenAIChatClient | GeminiChatClient:
+) -> AsyncOpenAIChatClient | GeminiChatClient:
     if _is_google_model(model):
         return GeminiChatClient(model=_strip_google_prefix(model), timeout=timeout)
     if _is_deepseek_model(model):
-        return OpenAIChatClient(
+        return AsyncOpenAIChatClient(
             model=_strip_deepseek_prefix(model),
             timeout=timeout,
             api_key=os.getenv("DEEPSEEK_API_KEY", "").strip(),
             base_url=_deepseek_base_url(),
         )
-    return OpenAIChatClient(model=model, timeout=timeout)
+    return AsyncOpenAIChatClient(model=model, timeout=timeout)
 
 
 def normalize_card_content_llm_profiles(raw_profiles: Any) -> dict[str, dict[str, Any]]:
@@ -4,7 +4,7 @@ from app.schemas.hotpost_card_drafts import ValidationCardDraft, WritingCardDraf
 from app.schemas.hotpost_clues import CardType
 from app.schemas.hotpost_signal import SourceScopeId
 from app.services.hotpost.card_draft_builder import build_published_card
-from app.services.hotpost.card_payload_store import load_drafts, mutate_drafts, mutate_drafts_and_published
+from app.services.hotpost.card_payload_store import load_drafts, record_store
 from app.services.hotpost.draft_precheck_store import load_draft_precheck
 
 
@@ -24,58 +24,52 @@ def list_drafts(source_scope_id:Optional[ SourceScopeId] = None, card_type:Optio
 
 
 def save_draft(card: ValidationCardDraft | WritingCardDraft) -> ValidationCardDraft | WritingCardDraft:
-    def _mutate(drafts: list[dict], published: list[dict]) -> ValidationCardDraft | WritingCardDraft:
-        if any(item["draft_id"] == card.draft_id for item in drafts):
+    with record_store().transaction() as tx:
+        if tx.get("drafts", card.draft_id) is not None:
             raise ValueError("Draft already exists")
-        if any(item["card_id"] == card.card_id for item in published):
+        if tx.get("published", card.card_id) is not None:
             raise ValueError("Published card already exists")
-        drafts.append(card.model_dump(mode="json"))
-        return card
-
-    return mutate_drafts_and_published(_mutate)
+        tx.insert("drafts", card.model_dump(mode="json"))
+    return card
 
 
 def update_draft(draft_id: str, card: ValidationCardDraft | WritingCardDraft) -> ValidationCardDraft | WritingCardDraft:
-    def _mutate(drafts: list[dict]) -> ValidationCardDraft | WritingCardDraft:
-        index = next((idx for idx, item in enumerate(drafts) if item["draft_id"] == draft_id), None)
-        if index is None:
+    with record_store().transaction() as tx:
+        if tx.get("drafts", draft_id) is None:
             raise LookupError("Draft not found")
         if card.draft_id != draft_id:
             raise ValueError("Draft id mismatch")
-        drafts[index] = card.model_dump(mode="json")
-        return card
-
-    return mutate_drafts(_mutate)
+        tx.update("drafts", card.model_dump(mode="json"))
+    return card
 
 
 def delete_draft(draft_id: str) -> bool:
-    def _mutate(drafts: list[dict]) -> bool:
-        index = next((idx for idx, item in enumerate(drafts) if item["draft_id"] == draft_id), None)
-        if index is None:
-            return False
-        drafts.pop(index)
-        return True
-
-    return mutate_drafts(_mutate)
+    with record_store().transaction() as tx:
+        return tx.delete("drafts", draft_id)
 
 
 def publish_draft(draft_id: str, *, override_precheck_block: bool = False) -> tuple[str, int]:
-    def _mutate(drafts: list[dict], published: list[dict]) -> tuple[str, int]:
-        index = next((idx for idx, item in enumerate(drafts) if item["draft_id"] == draft_id), None)
-        if index is None:
-            raise LookupError("Draft not found")
-        draft = _load_draft(drafts[index])
-        precheck = load_draft_precheck(draft_id)
-        if (
-            isinstance(precheck, dict)
-            and precheck.get("decision") == "BLOCK"
-            and not override_precheck_block
-        ):
-            raise ValueError("precheck BLOCK: publish requires human override")
-        if any(item["card_id"] == draft.card_id for item in published):
+    # 组卡（含热帖争议图）可能较慢，放在写事务之外；事务内只做存在性复核与单条写入
+    item = record_store().get("drafts", draft_id)
+    if item is None:
+        raise LookupError("Draft not found")
+    draft = _load_draft(item)
+    precheck = load_draft_precheck(draft_id)
+    if (
+        isinstance(precheck, dict)
+        and precheck.get("decision") == "BLOCK"
+        and not override_precheck_block
+    ):
+        raise ValueError("precheck BLOCK: publish requires human override")
+    if record_store().get("published", draft.card_id) is not None:
+        raise ValueError("Published card already exists")
+    published_card = build_published_card(draft).model_dump(mode="json")
+
+    with record_store().transaction() as tx:
+        if tx.get("drafts", draft_id) != item:
+            raise LookupError("Draft changed or removed during publish")
+        if tx.get("published", draft.card_id) is not None:
             raise ValueError("Published card already exists")
-        published.append(build_published_card(draft).model_dump(mode="json"))
-        drafts.pop(index)
-        return draft.card_id, len(published)
-
-    return mutate_drafts_and_published(_mutate)
+        tx.insert("published", published_card)
+        tx.delete("drafts", draft_id)
+        return draft.card_id, tx.count("published")
@@ -0,0 +1,360 @@
+"""
+Hotpost 卡片记录存储：candidates / drafts / published 每条记录一行（内嵌 SQLite，主键即 id 索引）。
+
+- 单卡读写走主键，不再整包加载、整包重写
+- 写操作是短事务（BEGIN IMMEDIATE），跨进程 / 跨线程由 SQLite 文件锁协调；WAL 下读不阻塞写
+- 首次写入时从旧布局（单文件 hotpost_clues.json 或 hotpost/ 拆分目录）一次性导入；
+  导入前的读操作仍直接读旧布局，不产生任何落盘副作用
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TypeAlias
+
+from app.services.hotpost.card_storage_layout import load_payload, split_layout_exists, storage_root_for
+
+
+JsonObject: TypeAlias = dict[str, object]
+
+STORE_FILENAME = "cards.sqlite3"
+SCHEMA_VERSION = 1
+_BUSY_TIMEOUT_SECONDS = 30.0
+
+# collection -> (id 字段, 分组字段, 读取顺序)
+_COLLECTIONS: dict[str, tuple[str, str, str]] = {
+    "candidates": ("candidate_id", "source_scope_id", "group_key, rowid"),
+    "drafts": ("draft_id", "card_id", "record_id"),
+    "published": ("card_id", "published_at", "group_key DESC, rowid"),
+}
+COLLECTIONS: tuple[str, ...] = tuple(_COLLECTIONS)
+
+_SCHEMA = "\n".join(
+    [
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);",
+        *(
+            f"CREATE TABLE IF NOT EXISTS {name} ("
+            "record_id TEXT PRIMARY KEY, group_key TEXT NOT NULL DEFAULT '', body TEXT NOT NULL);"
+            f"CREATE INDEX IF NOT EXISTS {name}_group ON {name}(group_key);"
+            for name in _COLLECTIONS
+        ),
+    ]
+)
+
+_local = threading.local()
+_ready_paths: set[str] = set()
+_ready_lock = threading.Lock()
+
+
+def record_store_path_for(legacy_cards_path: Path) -> Path:
+    return storage_root_for(legacy_cards_path) / STORE_FILENAME
+
+
+def _encode(item: JsonObject) -> str:
+    return json.dumps(item, ensure_ascii=False, sort_keys=True)
+
+
+def _keys(collection: str, item: JsonObject) -> tuple[str, str]:
+    id_field, group_field, _ = _COLLECTIONS[collection]
+    return str(item[id_field]), str(item.get(group_field) or "")
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    cache: dict[str, sqlite3.Connection] | None = getattr(_local, "connections", None)
+    if cache is None:
+        cache = _local.connections = {}
+    key = str(db_path)
+    conn = cache.get(key)
+    if conn is not None and not db_path.exists():
+        # 库文件被删除（重建 / 测试目录清理）：丢弃旧连接，重新建库导入
+        conn.close()
+        del cache[key]
+        conn = None
+        with _ready_lock:
+            _ready_paths.discard(key)
+    if conn is None:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(key, timeout=_BUSY_TIMEOUT_SECONDS, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        cache[key] = conn
+    return conn
+
+
+class CardRecordTransaction:
+    """Record-level operations inside one write transaction."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+
+    def get(self, collection: str, record_id: str) -> JsonObject | None:
+        return _get(self._conn, collection, record_id)
+
+    def read(self, collection: str) -> list[JsonObject]:
+        return _read(self._conn, collection)
+
+    def read_raw(self, collection: str) -> list[tuple[str, str]]:
+        order = _COLLECTIONS[collection][2]
+        rows = self._conn.execute(f"SELECT record_id, body FROM {collection} ORDER BY {order}")
+        return [(str(record_id), str(body)) for record_id, body in rows]
+
+    def count(self, collection: str) -> int:
+        return int(self._conn.execute(f"SELECT COUNT(*) FROM {collection}").fetchone()[0])
+
+    def insert(self, collection: str, item: JsonObject) -> None:
+        record_id, group_key = _keys(collection, item)
+        self._conn.execute(
+            f"INSERT INTO {collection} (record_id, group_key, body) VALUES (?, ?, ?)",
+            (record_id, group_key, _encode(item)),
+        )
+
+    def upsert(self, collection: str, item: JsonObject) -> None:
+        # REPLACE = 删除后重插：记录排到同组末尾，与旧实现“先删再 append”一致
+        record_id, group_key = _keys(collection, item)
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO {collection} (record_id, group_key, body) VALUES (?, ?, ?)",
+            (record_id, group_key, _encode(item)),
+        )
+
+    def update(self, collection: str, item: JsonObject) -> bool:
+        """原位更新（保持顺序），记录不存在返回 False。"""
+        record_id, group_key = _keys(collection, item)
+        cursor = self._conn.execute(
+            f"UPDATE {collection} SET group_key = ?, body = ? WHERE record_id = ?",
+            (group_key, _encode(item), record_id),
+        )
+        return cursor.rowcount > 0
+
+    def delete(self, collection: str, record_id: str) -> bool:
+        cursor = self._conn.execute(f"DELETE FROM {collection} WHERE record_id = ?", (record_id,))
+        return cursor.rowcount > 0
+
+    def delete_group(self, collection: str, group_key: str) -> int:
+        cursor = self._conn.execute(f"DELETE FROM {collection} WHERE group_key = ?", (group_key,))
+        return int(cursor.rowcount)
+
+    def replace_all(self, collection: str, items: Iterable[JsonObject]) -> int:
+        self._conn.execute(f"DELETE FROM {collection}")
+        count = 0
+        for item in items:
+            self.upsert(collection, item)
+            count += 1
+        return count
+
+    def sync(self, collection: str, before: Sequence[tuple[str, str]], after: Sequence[JsonObject]) -> None:
+        """
+        Persist a mutated collection by diffing against `before` (read_raw).
+
+        Only inserted / changed / removed records are written; a full rewrite
+        happens only when the mutator reordered surviving records.
+        """
+        before_bodies = dict(before)
+        after_keyed = [(_keys(collection, item)[0], item) for item in after]
+        after_ids = [record_id for record_id, _ in after_keyed]
+        after_set = set(after_ids)
+        survivors_before = [record_id for record_id, _ in before if record_id in after_set]
+        survivors_after = [record_id for record_id in after_ids if record_id in before_bodies]
+        if len(after_set) != len(after_ids) or survivors_before != survivors_after:
+            self.replace_all(collection, after)
+            return
+        for record_id in before_bodies.keys() - after_set:
+            self.delete(collection, record_id)
+        for record_id, item in after_keyed:
+            previous = before_bodies.get(record_id)
+            if previous is None:
+                self.insert(collection, item)
+            elif previous != _encode(item):
+                self.update(collection, item)
+
+    def load_categories(self) -> list[object]:
+        return _load_categories(self._conn)
+
+    def set_categories(self, categories: list[object]) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('categories', ?)",
+            (json.dumps(categories, ensure_ascii=False),),
+        )
+
+
+class CardRecordStore:
+    """Indexed card records stored next to the legacy cards file."""
+
+    def __init__(self, legacy_cards_path: Path) -> None:
+        self.legacy_cards_path = legacy_cards_path
+        self.db_path = record_store_path_for(legacy_cards_path)
+
+    def exists(self) -> bool:
+        return self.db_path.exists()
+
+    def get(self, collection: str, record_id: str) -> JsonObject | None:
+        if not self.exists():
+            id_field = _COLLECTIONS[collection][0]
+            return next(
+                (item for item in self._legacy_collection(collection) if str(item.get(id_field)) == record_id),
+                None,
+            )
+        return _get(self._reader(), collection, record_id)
+
+    def get_many(self, collection: str, record_ids: Sequence[str]) -> dict[str, JsonObject]:
+        if not self.exists():
+            wanted = set(record_ids)
+            id_field = _COLLECTIONS[collection][0]
+            return {
+                str(item[id_field]): item
+                for item in self._legacy_collection(collection)
+                if str(item.get(id_field)) in wanted
+            }
+        found: dict[str, JsonObject] = {}
+        conn = self._reader()
+        unique_ids = list(dict.fromkeys(record_ids))
+        for start in range(0, len(unique_ids), 500):
+            chunk = unique_ids[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT record_id, body FROM {collection} WHERE record_id IN ({placeholders})",
+                chunk,
+            )
+            found.update({str(record_id): json.loads(body) for record_id, body in rows})
+        return found
+
+    def find_group(self, collection: str, group_key: str) -> list[JsonObject]:
+        if not self.exists():
+            group_field = _COLLECTIONS[collection][1]
+            return [
+                item
+                for item in self._legacy_collection(collection)
+                if str(item.get(group_field) or "") == group_key
+            ]
+        order = _COLLECTIONS[collection][2]
+        rows = self._reader().execute(
+            f"SELECT body FROM {collection} WHERE group_key = ? ORDER BY {order}",
+            (group_key,),
+        )
+        return [json.loads(body) for (body,) in rows]
+
+    def read(self, collection: str) -> list[JsonObject]:
+        if not self.exists():
+            return self._legacy_collection(collection)
+        return _read(self._reader(), collection)
+
+    def load_categories(self) -> list[object]:
+        if not self.exists():
+            return list(self._legacy_payload().get("categories", []))  # type: ignore[arg-type]
+        return _load_categories(self._reader())
+
+    def load_payload(self) -> JsonObject:
+        if not self.exists():
+            payload = self._legacy_payload()
+            return {key: list(payload.get(key, [])) for key in ("categories", *COLLECTIONS)}  # type: ignore[arg-type]
+        conn = self._reader()
+        conn.execute("BEGIN")
+        try:
+            payload: JsonObject = {"categories": _load_categories(conn)}
+            for collection in COLLECTIONS:
+                payload[collection] = _read(conn, collection)
+        finally:
+            conn.execute("COMMIT")
+        return payload
+
+    @contextmanager
+    def transaction(self) -> Iterator[CardRecordTransaction]:
+        conn = _connect(self.db_path)
+        self._ensure_ready(conn)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield CardRecordTransaction(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def migrate_from_layout(self, *, overwrite: bool = False) -> dict[str, int | str]:
+        """Import the legacy single-file / split layout; `overwrite` re-imports over existing records."""
+        conn = _connect(self.db_path)
+        conn.executescript(_SCHEMA)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            source = _meta(conn, "migrated_from")
+            if source is None or overwrite:
+                source = self._import_layout(CardRecordTransaction(conn))
+            counts = {collection: CardRecordTransaction(conn).count(collection) for collection in COLLECTIONS}
+            categories = len(_load_categories(conn))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        with _ready_lock:
+            _ready_paths.add(str(self.db_path))
+        return {"categories": categories, **counts, "source": source, "store": str(self.db_path)}
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = _connect(self.db_path)
+        self._ensure_ready(conn)
+        return conn
+
+    def _ensure_ready(self, conn: sqlite3.Connection) -> None:
+        key = str(self.db_path)
+        if key in _ready_paths:
+            return
+        conn.executescript(_SCHEMA)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if _meta(conn, "migrated_from") is None:
+                self._import_layout(CardRecordTransaction(conn))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        with _ready_lock:
+            _ready_paths.add(key)
+
+    def _import_layout(self, tx: CardRecordTransaction) -> str:
+        if split_layout_exists(self.legacy_cards_path):
+            source = "split"
+        elif self.legacy_cards_path.exists():
+            source = "legacy"
+        else:
+            source = "empty"
+        payload = load_payload(self.legacy_cards_path) if source != "empty" else {}
+        tx.set_categories(list(payload.get("categories", [])))  # type: ignore[arg-type]
+        for collection in COLLECTIONS:
+            tx.replace_all(collection, list(payload.get(collection, [])))  # type: ignore[arg-type]
+        conn = tx._conn
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from', ?)", (source,))
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+            (str(SCHEMA_VERSION),),
+        )
+        return source
+
+    def _legacy_payload(self) -> JsonObject:
+        if not split_layout_exists(self.legacy_cards_path) and not self.legacy_cards_path.exists():
+            return {}
+        return load_payload(self.legacy_cards_path)
+
+    def _legacy_collection(self, collection: str) -> list[JsonObject]:
+        return list(self._legacy_payload().get(collection, []))  # type: ignore[arg-type]
+
+
+def _get(conn: sqlite3.Connection, collection: str, record_id: str) -> JsonObject | None:
+    row = conn.execute(f"SELECT body FROM {collection} WHERE record_id = ?", (record_id,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def _read(conn: sqlite3.Connection, collection: str) -> list[JsonObject]:
+    order = _COLLECTIONS[collection][2]
+    return [json.loads(body) for (body,) in conn.execute(f"SELECT body FROM {collection} ORDER BY {order}")]
+
+
+def _meta(conn: sqlite3.Connection, key: str) -> str | None:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return str(row[0]) if row else None
+
+
+def _load_categories(conn: sqlite3.Connection) -> list[object]:
+    raw = _meta(conn, "categories")
+    return list(json.loads(raw)) if raw else []
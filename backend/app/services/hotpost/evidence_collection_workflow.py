@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from collections import Counter
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable
+from typing import Any, Awaitable, Callable, TypeVar
 
 from app.schemas.hotpost import Hotpost, HotpostComment, PainPoint
 from app.services.hotpost.detail_builder import (
@@ -32,6 +34,10 @@ class HotpostEvidenceCollectionInput:
     enable_relevance_filter: bool
     max_posts_per_subreddit: int
     notes: list[str]
+    # 子版块检索 / 评论抓取的并发上限（每个请求仍经过 acquire_rate_budget）；1 = 顺序执行
+    max_concurrency: int = 1
+    # 整体时限（秒，0 = 不限）：到点取消未完成的请求，用已拿到的证据出结果
+    deadline_seconds: float = 0.0
 
 
 @dataclass(slots=True)
@@ -68,6 +74,46 @@ class HotpostEvidenceCollectionResult:
     need_urgency: dict[str, float] | None
     me_too_count: int
     notes: list[str]
+    deadline_hit: bool = False
+    elapsed_seconds: float = 0.0
+
+
+_T = TypeVar("_T")
+
+
+async def _run_bounded(
+    factories: list[Callable[[], Awaitable[_T]]],
+    *,
+    max_concurrency: int,
+    deadline: float | None,
+) -> tuple[list[_T | None], bool]:
+    """并发执行（信号量限流），结果按提交顺序返回；到 deadline 时取消剩余任务，对应位置为 None。"""
+    if not factories:
+        return [], False
+    semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+
+    async def _guarded(factory: Callable[[], Awaitable[_T]]) -> _T:
+        async with semaphore:
+            return await factory()
+
+    tasks = [asyncio.create_task(_guarded(factory)) for factory in factories]
+    timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+    try:
+        done, pending = await asyncio.wait(
+            tasks, timeout=timeout, return_when=asyncio.FIRST_EXCEPTION
+        )
+        for task in done:
+            if task.exception() is not None:
+                raise task.exception()  # type: ignore[misc]
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    results: list[_T | None] = [
+        task.result() if task in done else None for task in tasks
+    ]
+    return results, bool(pending)
 
 
 async def collect_hotpost_evidence(
@@ -76,9 +122,16 @@ async def collect_hotpost_evidence(
     deps: HotpostEvidenceCollectionDeps,
     queue_tracker: Any | None = None,
 ) -> HotpostEvidenceCollectionResult:
+    started = time.monotonic()
+    deadline = (
+        started + workflow_input.deadline_seconds
+        if workflow_input.deadline_seconds > 0
+        else None
+    )
     notes = list(workflow_input.notes)
     subreddits = workflow_input.requested_subreddits
     api_calls = 0
+    deadline_hit = False
 
     if not subreddits and workflow_input.suggest_subreddits_when_missing:
         if deps.search_subreddits is None:
@@ -103,44 +156,77 @@ async def collect_hotpost_evidence(
 
     posts: list[RedditPost] = []
     seen_post_ids: set[str] = set()
+    query_parts = workflow_input.query_parts or [workflow_input.request_query]
     if subreddits:
         if deps.search_subreddit_posts is None:
             raise ValueError(
                 "search_subreddit_posts dependency is required for subreddit search"
             )
-        for query_part in (workflow_input.query_parts or [workflow_input.request_query]):
-            for subreddit in subreddits:
-                batch, calls = await deps.search_subreddit_posts(
-                    subreddit,
-                    query_part,
-                    sort=workflow_input.sort,
-                    time_filter=workflow_input.time_filter,
-                    max_posts=workflow_input.max_posts_per_subreddit,
-                    queue_tracker=queue_tracker,
-                )
-                api_calls += calls
-                for post in batch:
-                    if post.id in seen_post_ids:
-                        continue
-                    seen_post_ids.add(post.id)
-                    posts.append(post)
-    else:
-        if deps.search_posts is None:
-            raise ValueError("search_posts dependency is required for global search")
-        for query_part in (workflow_input.query_parts or [workflow_input.request_query]):
-            await deps.acquire_rate_budget(cost=1, queue_tracker=queue_tracker)
-            batch = await deps.search_posts(
+        search_subreddit_posts = deps.search_subreddit_posts
+
+        def _subreddit_search(
+            subreddit: str, query_part: str
+        ) -> Callable[[], Awaitable[tuple[list[RedditPost], int]]]:
+            return lambda: search_subreddit_posts(
+                subreddit,
                 query_part,
-                limit=min(100, workflow_input.limit),
-                time_filter=workflow_input.time_filter,
                 sort=workflow_input.sort,
+                time_filter=workflow_input.time_filter,
+                max_posts=workflow_input.max_posts_per_subreddit,
+                queue_tracker=queue_tracker,
             )
-            api_calls += 1
-            for post in batch:
-                if post.id in seen_post_ids:
-                    continue
-                seen_post_ids.add(post.id)
-                posts.append(post)
+
+        search_results, search_cut = await _run_bounded(
+            [
+                _subreddit_search(subreddit, query_part)
+                for query_part in query_parts
+                for subreddit in subreddits
+            ],
+            max_concurrency=workflow_input.max_concurrency,
+            deadline=deadline,
+        )
+        batches: list[list[RedditPost] | None] = []
+        for search_result in search_results:
+            if search_result is None:
+                batches.append(None)
+                continue
+            batch, calls = search_result
+            api_calls += calls
+            batches.append(batch)
+    else:
+        if deps.search_posts is None:
+            raise ValueError("search_posts dependency is required for global search")
+        search_posts = deps.search_posts
+
+        def _global_search(query_part: str) -> Callable[[], Awaitable[list[RedditPost]]]:
+            async def _run() -> list[RedditPost]:
+                await deps.acquire_rate_budget(cost=1, queue_tracker=queue_tracker)
+                return await search_posts(
+                    query_part,
+                    limit=min(100, workflow_input.limit),
+                    time_filter=workflow_input.time_filter,
+                    sort=workflow_input.sort,
+                )
+
+            return _run
+
+        batches, search_cut = await _run_bounded(
+            [_global_search(query_part) for query_part in query_parts],
+            max_concurrency=workflow_input.max_concurrency,
+            deadline=deadline,
+        )
+        api_calls += sum(1 for batch in batches if batch is not None)
+
+    for batch in batches:
+        for post in batch or []:
+            if post.id in seen_post_ids:
+                continue
+            seen_post_ids.add(post.id)
+            posts.append(post)
+    if search_cut:
+        deadline_hit = True
+        completed = sum(1 for batch in batches if batch is not None)
+        notes.append(f"检索达到时限，已返回 {completed}/{len(batches)} 个子查询的结果")
 
     filtered: list[Hotpost] = []
     categories: list[str] = []
@@ -178,8 +264,19 @@ async def collect_hotpost_evidence(
         notes.append(f"已过滤 {relevance_filtered} 条低相关帖子")
 
     all_comments: list[HotpostComment] = []
-    for post in top_posts[:30]:
-        comments = await deps.fetch_comments(post.id, queue_tracker=queue_tracker)
+    comment_posts = top_posts[:30]
+
+    def _comment_fetch(post_id: str) -> Callable[[], Awaitable[list[dict[str, Any]]]]:
+        return lambda: deps.fetch_comments(post_id, queue_tracker=queue_tracker)
+
+    comment_results, comments_cut = await _run_bounded(
+        [_comment_fetch(post.id) for post in comment_posts],
+        max_concurrency=workflow_input.max_concurrency,
+        deadline=deadline,
+    )
+    for post, comments in zip(comment_posts, comment_results):
+        if comments is None:
+            continue
         hotpost_comments: list[HotpostComment] = []
         for comment in comments:
             hot_comment = HotpostComment(
@@ -192,6 +289,10 @@ async def collect_hotpost_evidence(
             hotpost_comments.append(hot_comment)
             all_comments.append(hot_comment)
         post.top_comments = hotpost_comments
+    if comments_cut:
+        deadline_hit = True
+        missing = sum(1 for comments in comment_results if comments is None)
+        notes.append(f"评论抓取达到时限，{missing} 条帖子未附带评论")
 
     evidence_count = len(top_posts)
     community_counts = Counter(post.subreddit for post in top_posts)
@@ -260,6 +361,8 @@ async def collect_hotpost_evidence(
         need_urgency=need_urgency,
         me_too_count=me_too_count,
         notes=notes,
+        deadline_hit=deadline_hit,
+        elapsed_seconds=time.monotonic() - started,
     )
 
 
@@ -50,6 +50,7 @@ class HotpostSearchDepsFactoryInput:
     build_pain_points: Callable[[list[Hotpost], list[str]], list[PainPoint]] | None = None
     confidence_level: Callable[[int], str] | None = None
     maybe_llm_summary: Callable[..., Awaitable[Any]] | None = None
+    schedule_refresh: Callable[[Any], None] | None = None
 
 
 def build_hotpost_response_status(
@@ -165,6 +166,7 @@ def build_hotpost_search_deps(factory_input: HotpostSearchDepsFactoryInput) -> H
             maybe_discover_community=factory_input.maybe_discover_community,
             update_hotpost_query=factory_input.update_hotpost_query,
         ),
+        schedule_refresh=factory_input.schedule_refresh,
     )
 
 
@@ -11,6 +11,7 @@ from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.hotpost import Hotpost, HotpostSearchResponse
+from app.services.hotpost.cache import hotpost_cache_fresh_key
 from app.services.hotpost.result_meta import HotpostLLMReportResult
 
 
@@ -29,6 +30,11 @@ class HotpostPersistenceWorkflowInput:
     latency_ms: int
     api_calls: int
     subreddits: list[str] | None
+    # 软过期后继续保留的秒数（stale-while-revalidate 窗口）
+    cache_stale_seconds: int = 0
+    # 证据采集被时限截断：结果只短暂缓存，不覆盖已有结果、不打新鲜标记
+    deadline_hit: bool = False
+    partial_cache_ttl_seconds: int = 60
 
 
 @dataclass(slots=True)
@@ -131,11 +137,27 @@ async def persist_hotpost_search_side_effects(
     )
 
     response_json = workflow_input.response.model_dump_json()
-    await deps.redis_client.setex(
-        workflow_input.cache_key,
-        workflow_input.cache_ttl_seconds,
-        response_json,
-    )
+    if workflow_input.deadline_hit:
+        # 不完整结果：开启 stale 窗口时下一个请求会把它当 stale 返回并触发后台补全；
+        # NX 保证刷新被截断时不覆盖仍在 stale 窗口内的完整结果
+        await deps.redis_client.set(
+            workflow_input.cache_key,
+            response_json,
+            ex=max(1, min(workflow_input.partial_cache_ttl_seconds, workflow_input.cache_ttl_seconds)),
+            nx=True,
+        )
+    else:
+        await deps.redis_client.setex(
+            workflow_input.cache_key,
+            workflow_input.cache_ttl_seconds + max(0, workflow_input.cache_stale_seconds),
+            response_json,
+        )
+    if workflow_input.cache_stale_seconds > 0 and not workflow_input.deadline_hit:
+        await deps.redis_client.setex(
+            hotpost_cache_fresh_key(workflow_input.cache_key),
+            workflow_input.cache_ttl_seconds,
+            "1",
+        )
     await deps.redis_client.setex(
         f"hotpost:result:{workflow_input.query_id}",
         workflow_input.cache_ttl_seconds,
@@ -7,7 +7,8 @@ from typing import Any, Callable
 from app.schemas.hotpost import Hotpost, HotpostComment
 from app.services.hotpost.report_llm import generate_hotpost_llm_report
 from app.services.hotpost.result_meta import HotpostLLMReportResult
-from app.services.llm.clients.openai_client import OpenAIChatClient, resolve_llm_api_key
+from app.services.llm.clients.async_openai_client import AsyncOpenAIChatClient
+from app.services.llm.clients.openai_client import resolve_llm_api_key
 
 
 @dataclass(slots=True)
@@ -23,7 +24,7 @@ class HotpostReportWorkflowInput:
 @dataclass(slots=True)
 class HotpostReportWorkflowDeps:
     resolve_api_key: Callable[[], str | None] = resolve_llm_api_key
-    client_factory: Callable[[str], Any] = lambda model_name: OpenAIChatClient(model=model_name)
+    client_factory: Callable[[str], Any] = lambda model_name: AsyncOpenAIChatClient(model=model_name)
     generate_report: Callable[..., Any] = generate_hotpost_llm_report
     getenv: Callable[[str, str], str] = os.getenv
 
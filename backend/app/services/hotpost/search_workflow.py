@@ -4,12 +4,19 @@ import json
 import os
 import time
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from typing import Any, Awaitable, Callable
 
 from app.schemas.hotpost import HotpostDebugInfo, HotpostSearchRequest, HotpostSearchResponse
-from app.services.hotpost.cache import build_hotpost_cache_key, get_hotpost_cache_ttl_seconds
+from app.services.hotpost.cache import (
+    HotpostSingleFlight,
+    build_hotpost_cache_key,
+    get_hotpost_cache_stale_seconds,
+    get_hotpost_cache_ttl_seconds,
+    read_hotpost_cache,
+    record_hotpost_cache_event,
+)
 from app.services.hotpost.evidence_collection_workflow import (
     HotpostEvidenceCollectionDeps,
     HotpostEvidenceCollectionInput,
@@ -37,6 +44,8 @@ class HotpostSearchWorkflowInput:
     ip_hash: str | None = None
     llm_model_name: str = ""
     comments_ttl_seconds: int = 2 * 60 * 60
+    # 后台刷新 stale 缓存时由前台请求带入已持有的 single-flight 锁（跳过读缓存，完成后释放）
+    refresh_lock_token: str | None = None
 
 
 @dataclass(slots=True)
@@ -59,6 +68,8 @@ class HotpostSearchWorkflowDeps:
     evidence_deps_factory: Callable[[], HotpostEvidenceCollectionDeps] | None = None
     report_deps_factory: Callable[[], HotpostReportWorkflowDeps] | None = None
     persistence_deps_factory: Callable[[], HotpostPersistenceWorkflowDeps] | None = None
+    # 调度后台刷新（stale-while-revalidate）；None 时 stale 结果照常返回但不刷新
+    schedule_refresh: Callable[[HotpostSearchWorkflowInput], None] | None = None
 
 
 @dataclass(slots=True)
@@ -81,7 +92,6 @@ async def run_hotpost_search_workflow(
     assert deps.split_search_queries is not None
     assert deps.resolve_query is not None
     assert deps.create_hotpost_query is not None
-    assert deps.update_hotpost_query is not None
     assert deps.tracker_factory is not None
     assert deps.collect_evidence is not None
     assert deps.maybe_llm_summary is not None
@@ -118,6 +128,98 @@ async def run_hotpost_search_workflow(
     cache_key = build_hotpost_cache_key(search_query, mode, subreddits)
     cache_ttl_seconds = get_hotpost_cache_ttl_seconds(mode)
 
+    cache_stale_seconds = get_hotpost_cache_stale_seconds()
+    lock_seconds = int(deps.getenv("HOTPOST_SINGLE_FLIGHT_LOCK_SECONDS", "120"))
+    single_flight = HotpostSingleFlight(
+        deps.redis_client,
+        stale_seconds=cache_stale_seconds,
+        lock_seconds=lock_seconds,
+        wait_seconds=float(deps.getenv("HOTPOST_SINGLE_FLIGHT_WAIT_SECONDS", str(lock_seconds))),
+    )
+
+    lock_token = workflow_input.refresh_lock_token
+    if lock_token is None:
+        cached_raw, fresh = await read_hotpost_cache(
+            deps.redis_client, cache_key, stale_seconds=cache_stale_seconds
+        )
+        cache_status: str | None = None
+        if cached_raw and fresh:
+            cache_status = "hit"
+        elif cached_raw:
+            cache_status = "stale"
+            if deps.schedule_refresh is not None:
+                refresh_token = await single_flight.acquire(cache_key)
+                if refresh_token is not None:
+                    deps.schedule_refresh(replace(workflow_input, refresh_lock_token=refresh_token))
+        else:
+            # 同一 cache key 只允许一个请求去抓取；拿不到锁的等持锁请求写入缓存
+            lock_token = await single_flight.acquire(cache_key)
+            if lock_token is None and await single_flight.is_locked(cache_key):
+                cached_raw = await single_flight.wait_for_result(cache_key)
+                if cached_raw:
+                    cache_status = "coalesced"
+        if cached_raw and cache_status is not None:
+            return await _serve_cached_response(
+                cached_raw,
+                cache_status=cache_status,
+                query_id=query_id,
+                mode=mode,
+                time_filter=time_filter,
+                cache_ttl_seconds=cache_ttl_seconds,
+                start_time=start_time,
+                workflow_input=workflow_input,
+                deps=deps,
+            )
+
+    try:
+        return await _run_live_search(
+            workflow_input=workflow_input,
+            deps=deps,
+            query_id=query_id,
+            start_time=start_time,
+            mode=mode,
+            time_filter=time_filter,
+            sort=sort,
+            resolution=resolution,
+            search_query=search_query,
+            keywords=keywords,
+            subreddits=subreddits,
+            notes=notes,
+            query_parts=query_parts,
+            cache_key=cache_key,
+            cache_ttl_seconds=cache_ttl_seconds,
+            cache_stale_seconds=cache_stale_seconds,
+        )
+    finally:
+        if lock_token is not None:
+            await single_flight.release(cache_key, lock_token)
+
+
+async def _serve_cached_response(
+    cached_raw: str,
+    *,
+    cache_status: str,
+    query_id: uuid.UUID,
+    mode: str,
+    time_filter: str,
+    cache_ttl_seconds: int,
+    start_time: float,
+    workflow_input: HotpostSearchWorkflowInput,
+    deps: HotpostSearchWorkflowDeps,
+) -> HotpostSearchWorkflowResult:
+    assert deps.create_hotpost_query is not None
+    assert deps.tracker_factory is not None
+    request = workflow_input.request
+    payload = json.loads(cached_raw)
+    payload["from_cache"] = True
+    payload["search_time"] = datetime.now(timezone.utc).isoformat()
+    payload["status"] = normalize_hotpost_status(payload.get("status"))
+    debug_info = dict(payload.get("debug_info") or {})
+    debug_info["response_source"] = "cache"
+    debug_info["cache_status"] = cache_status
+    debug_info["cache_counters"] = await record_hotpost_cache_event(deps.redis_client, cache_status)
+    payload["debug_info"] = HotpostDebugInfo(**debug_info).model_dump()
+    # 命中缓存只写一次查询日志（不再先插 0 值行再回填）
     await deps.create_hotpost_query(
         query_id=query_id,
         query=request.query,
@@ -127,6 +229,65 @@ async def run_hotpost_search_workflow(
         user_id=workflow_input.user_id,
         session_id=workflow_input.session_id,
         ip_hash=workflow_input.ip_hash,
+        evidence_count=payload.get("evidence_count", 0),
+        community_count=len(payload.get("communities", [])),
+        confidence=payload.get("confidence", "low"),
+        from_cache=True,
+        latency_ms=int((time.monotonic() - start_time) * 1000),
+        api_calls=0,
+    )
+    queue_tracker = deps.tracker_factory(
+        deps.redis_client,
+        str(query_id),
+        ttl_seconds=cache_ttl_seconds,
+    )
+    await queue_tracker.mark_completed()
+    return HotpostSearchWorkflowResult(response=HotpostSearchResponse(**payload))
+
+
+async def _run_live_search(
+    *,
+    workflow_input: HotpostSearchWorkflowInput,
+    deps: HotpostSearchWorkflowDeps,
+    query_id: uuid.UUID,
+    start_time: float,
+    mode: str,
+    time_filter: str,
+    sort: str,
+    resolution: Any,
+    search_query: str,
+    keywords: list[str],
+    subreddits: list[str] | None,
+    notes: list[str],
+    query_parts: list[str],
+    cache_key: str,
+    cache_ttl_seconds: int,
+    cache_stale_seconds: int,
+) -> HotpostSearchWorkflowResult:
+    assert deps.create_hotpost_query is not None
+    assert deps.tracker_factory is not None
+    assert deps.collect_evidence is not None
+    assert deps.maybe_llm_summary is not None
+    assert deps.build_report_result is not None
+    assert deps.build_search_response is not None
+    assert deps.persist_side_effects is not None
+    assert deps.evidence_deps_factory is not None
+    assert deps.report_deps_factory is not None
+    assert deps.persistence_deps_factory is not None
+    request = workflow_input.request
+    # 后台 SWR 刷新是系统行为：查询行仍要写（证据映射外键依赖它），但不能再记到触发它的
+    # 用户 / 会话 / IP 头上，否则一次用户请求会在日志里出现两条
+    is_refresh = workflow_input.refresh_lock_token is not None
+
+    await deps.create_hotpost_query(
+        query_id=query_id,
+        query=request.query,
+        mode=mode,
+        time_filter=time_filter,
+        subreddits=request.subreddits,
+        user_id=None if is_refresh else workflow_input.user_id,
+        session_id=None if is_refresh else workflow_input.session_id,
+        ip_hash=None if is_refresh else workflow_input.ip_hash,
         evidence_count=0,
         community_count=0,
         confidence="none",
@@ -141,28 +302,6 @@ async def run_hotpost_search_workflow(
     )
     await queue_tracker.mark_processing()
 
-    cached_raw = await deps.redis_client.get(cache_key)
-    if cached_raw:
-        payload = json.loads(cached_raw)
-        payload["from_cache"] = True
-        payload["search_time"] = datetime.now(timezone.utc).isoformat()
-        payload["status"] = normalize_hotpost_status(payload.get("status"))
-        debug_info = dict(payload.get("debug_info") or {})
-        debug_info["response_source"] = "cache"
-        payload["debug_info"] = HotpostDebugInfo(**debug_info).model_dump()
-        await deps.update_hotpost_query(
-            query_id=query_id,
-            evidence_count=payload.get("evidence_count", 0),
-            community_count=len(payload.get("communities", [])),
-            confidence=payload.get("confidence", "low"),
-            from_cache=True,
-            latency_ms=int((time.monotonic() - start_time) * 1000),
-            api_calls=0,
-            subreddits=request.subreddits,
-        )
-        await queue_tracker.mark_completed()
-        return HotpostSearchWorkflowResult(response=HotpostSearchResponse(**payload))
-
     enable_relevance_filter = _env_flag(deps.getenv, "ENABLE_HOTPOST_RELEVANCE_FILTER", "true")
     evidence = await deps.collect_evidence(
         workflow_input=HotpostEvidenceCollectionInput(
@@ -180,6 +319,8 @@ async def run_hotpost_search_workflow(
             enable_relevance_filter=enable_relevance_filter,
             max_posts_per_subreddit=min(100, max(30, request.limit)),
             notes=notes,
+            max_concurrency=int(deps.getenv("HOTPOST_EVIDENCE_MAX_CONCURRENCY", "6")),
+            deadline_seconds=float(deps.getenv("HOTPOST_EVIDENCE_DEADLINE_SECONDS", "25")),
         ),
         deps=deps.evidence_deps_factory(),
         queue_tracker=queue_tracker,
@@ -238,6 +379,14 @@ async def run_hotpost_search_workflow(
         )
     )
 
+    if response.debug_info is not None:
+        cache_status = "refresh" if workflow_input.refresh_lock_token else "miss"
+        response.debug_info.cache_status = cache_status
+        response.debug_info.evidence_deadline_hit = evidence.deadline_hit
+        response.debug_info.cache_counters = await record_hotpost_cache_event(
+            deps.redis_client, cache_status
+        )
+
     await deps.persist_side_effects(
         workflow_input=HotpostPersistenceWorkflowInput(
             query_id=query_id,
@@ -253,6 +402,9 @@ async def run_hotpost_search_workflow(
             latency_ms=int((time.monotonic() - start_time) * 1000),
             api_calls=evidence.api_calls,
             subreddits=evidence.subreddits,
+            cache_stale_seconds=cache_stale_seconds,
+            deadline_hit=evidence.deadline_hit,
+            partial_cache_ttl_seconds=int(deps.getenv("HOTPOST_PARTIAL_CACHE_TTL_SECONDS", "60")),
         ),
         deps=deps.persistence_deps_factory(),
     )
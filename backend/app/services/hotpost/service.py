@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import uuid
@@ -9,7 +10,8 @@ from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import Settings
-from app.services.infrastructure.global_rate_limiter import GlobalRateLimiter
+from app.db.session import SessionFactory
+from app.services.infrastructure.global_rate_limiter import create_reddit_rate_limiter
 from app.services.hotpost.keywords import HotpostLexicon, load_default_hotpost_keywords
 from app.services.hotpost.cache import build_hotpost_cache_key, get_hotpost_cache_ttl_seconds
 from app.services.hotpost.evidence_collection_workflow import collect_hotpost_evidence
@@ -66,6 +68,8 @@ DEFAULT_RATE_LIMIT = 100
 DEFAULT_RATE_WINDOW = 600
 COMMENTS_TTL_SECONDS = 2 * 60 * 60
 logger = logging.getLogger(__name__)
+# 后台刷新任务的强引用，避免事件循环只持弱引用导致任务被回收
+_REFRESH_TASKS: set[asyncio.Task[None]] = set()
 
 
 class _NullRedditClient:
@@ -117,7 +121,7 @@ class HotpostService:
             self._reddit = _NullRedditClient()
         else:
             raise ValueError("REDDIT_CLIENT_ID/REDDIT_CLIENT_SECRET required for hotpost search")
-        self._rate_limiter = GlobalRateLimiter(
+        self._rate_limiter = create_reddit_rate_limiter(
             self._redis,
             limit=int(os.getenv("HOTPOST_RATE_LIMIT_MAX_REQUESTS", os.getenv("RATE_LIMIT_MAX_REQUESTS", DEFAULT_RATE_LIMIT))),
             window_seconds=int(os.getenv("HOTPOST_RATE_LIMIT_WINDOW_SECONDS", os.getenv("RATE_LIMIT_WINDOW_SECONDS", DEFAULT_RATE_WINDOW))),
@@ -297,14 +301,7 @@ class HotpostService:
         session_id: str | None = None,
         ip_hash: str | None = None,
     ) -> HotpostSearchResponse:
-        llm_client = None
-        enable_translation = os.getenv("ENABLE_HOTPOST_QUERY_TRANSLATION", "true").strip().lower() in {
-            "1",
-            "true",
-            "yes",
-        }
-        if enable_translation and resolve_llm_api_key():
-            llm_client = OpenAIChatClient(model=self._settings.llm_model_name)
+        llm_client = self._query_llm_client()
         result = await run_hotpost_search_workflow(
             workflow_input=HotpostSearchWorkflowInput(
                 request=request,
@@ -318,6 +315,49 @@ class HotpostService:
         )
         return result.response
 
+    def _query_llm_client(self) -> Any | None:
+        enable_translation = os.getenv("ENABLE_HOTPOST_QUERY_TRANSLATION", "true").strip().lower() in {
+            "1",
+            "true",
+            "yes",
+        }
+        if enable_translation and resolve_llm_api_key():
+            return OpenAIChatClient(model=self._settings.llm_model_name)
+        return None
+
+    def _schedule_refresh(self, workflow_input: HotpostSearchWorkflowInput) -> None:
+        """stale 命中后在独立会话里重跑检索并回写缓存；锁由 workflow 在结束时释放。"""
+        settings = self._settings
+        redis_client = self._redis
+        lexicon = self._lexicon
+
+        async def _refresh() -> None:
+            try:
+                async with SessionFactory() as db:
+                    service = HotpostService(
+                        settings=settings,
+                        db=db,
+                        redis_client=redis_client,
+                        lexicon=lexicon,
+                    )
+                    try:
+                        await run_hotpost_search_workflow(
+                            workflow_input=workflow_input,
+                            deps=service._search_workflow_deps(llm_client=service._query_llm_client()),
+                        )
+                    finally:
+                        await service.close()
+            except Exception:
+                logger.warning(
+                    "hotpost background refresh failed query=%s",
+                    workflow_input.request.query,
+                    exc_info=True,
+                )
+
+        task = asyncio.create_task(_refresh())
+        _REFRESH_TASKS.add(task)
+        task.add_done_callback(_REFRESH_TASKS.discard)
+
     def _search_workflow_deps(
         self,
         *,
@@ -354,6 +394,7 @@ class HotpostService:
                 build_pain_points=self._build_pain_points,
                 confidence_level=self._confidence_level,
                 maybe_llm_summary=self._maybe_llm_summary,
+                schedule_refresh=self._schedule_refresh,
             )
         )
 
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
 import json
-from dataclasses import asdict, is_dataclass
+from dataclasses import asdict, dataclass, is_dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence, cast
 
 import redis.asyncio as redis
 
+from app.core.config import settings
+from app.services.infrastructure.post_cache_codec import (
+    PostCacheCodecError,
+    decode_post_payload,
+    encode_post_payload,
+    read_payload_meta,
+    resolve_compression,
+)
 from app.services.infrastructure.reddit_client import RedditPost
 
 DEFAULT_CACHE_TTL_SECONDS = 24 * 60 * 60
@@ -16,15 +24,36 @@ class RedisLike(Protocol):
     async def get(self, key: str) -> bytes | str | None:
         ...
 
-    async def setex(self, key: str, time: int, value: str) -> bool | None:
+    async def setex(self, key: str, time: int, value: bytes | str) -> bool | None:
         ...
 
     async def exists(self, key: str) -> int:
         ...
 
-    async def delete(self, key: str) -> int:
+    async def delete(self, *keys: str) -> int:
         ...
 
+    async def mget(self, keys: Sequence[str]) -> List[bytes | str | None]:
+        ...
+
+    def pipeline(self, transaction: bool = True) -> Any:
+        ...
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStatus:
+    """Freshness metadata for one subreddit entry (no post bodies involved)."""
+
+    subreddit: str
+    exists: bool
+    fresh: bool
+    cached_at: datetime | None = None
+    post_count: int = 0
+
+    @property
+    def is_hit(self) -> bool:
+        return self.fresh and self.post_count > 0
+
 
 class CacheManager:
     """
@@ -38,6 +67,8 @@ class CacheManager:
         cache_ttl_seconds: int = DEFAULT_CACHE_TTL_SECONDS,
         namespace: str = "reddit:posts",
         redis_url: str | None = None,
+        codec: str | None = None,
+        compression: str | None = None,
     ) -> None:
         if redis_client is not None:
             self.redis = redis_client
@@ -50,6 +81,11 @@ class CacheManager:
             )
         self.cache_ttl = max(60, cache_ttl_seconds)
         self.namespace = namespace.strip(":")
+        # json = 旧格式（默认，滚动升级期间新旧 worker 都能读）；binary = 列式压缩编码（读路径两种都认）
+        self.codec = (codec or settings.reddit_cache_codec or "json").strip().lower()
+        self.compression = resolve_compression(
+            compression or settings.reddit_cache_compression
+        )
 
     async def get_cached_posts(
         self,
@@ -60,35 +96,75 @@ class CacheManager:
         """
         Load subreddit posts from cache if the payload is still considered fresh.
         """
-        key = self._build_key(subreddit)
-        raw = await self.redis.get(key)
-        if raw is None:
-            return None
-
-        decoded = raw.decode("utf-8") if isinstance(raw, bytes) else raw
-        try:
-            payload = json.loads(decoded)
-        except json.JSONDecodeError:
-            return None
+        raw = await self.redis.get(self._build_key(subreddit))
+        return self._decode_posts(raw, max_age_hours=max_age_hours)
 
-        cached_at_str = payload.get("cached_at")
-        posts_data = payload.get("posts", [])
-        if cached_at_str is None:
-            return None
+    async def get_many_cached_posts(
+        self,
+        subreddits: Iterable[str],
+        *,
+        max_age_hours: int = 24,
+    ) -> Dict[str, Optional[List[RedditPost]]]:
+        """
+        Bulk variant of `get_cached_posts`: one MGET for all subreddits.
 
-        try:
-            cached_at = datetime.fromisoformat(cached_at_str)
-        except ValueError:
-            return None
+        Missing / stale / corrupt entries map to None, same as the single-key API.
+        The result is keyed by the names exactly as the caller passed them
+        (whitespace is only stripped for the Redis key), so `result[name]` works.
+        """
+        requested = [name for name in subreddits if name and name.strip()]
+        names = self._normalise_names(requested)
+        if not names:
+            return {}
+        raws = await self.redis.mget([self._build_key(name) for name in names])
+        decoded = {
+            name: self._decode_posts(raw, max_age_hours=max_age_hours)
+            for name, raw in zip(names, raws)
+        }
+        return {name: decoded[name.strip()] for name in requested}
 
-        if cached_at.tzinfo is None:
-            cached_at = cached_at.replace(tzinfo=timezone.utc)
+    async def cache_status_many(
+        self,
+        subreddits: Iterable[str],
+        *,
+        max_age_hours: int = 24,
+    ) -> Dict[str, CacheStatus]:
+        """
+        Freshness of many entries in one MGET over the small meta keys.
 
+        Entries written before the meta key existed fall back to a second MGET
+        over their payloads (only for those names) until they are rewritten.
+        """
+        names = self._normalise_names(subreddits)
+        if not names:
+            return {}
         max_age = timedelta(hours=max_age_hours)
-        if datetime.now(timezone.utc) - cached_at > max_age:
-            return None
+        now = datetime.now(timezone.utc)
+        metas = await self.redis.mget([self._build_meta_key(name) for name in names])
+
+        statuses: Dict[str, CacheStatus] = {}
+        legacy: List[str] = []
+        for name, raw in zip(names, metas):
+            meta = self._loads(raw)
+            if meta is None:
+                legacy.append(name)
+                continue
+            statuses[name] = self._build_status(name, meta, now=now, max_age=max_age)
+
+        if legacy:
+            raws = await self.redis.mget([self._build_key(name) for name in legacy])
+            for name, raw in zip(legacy, raws):
+                payload_meta = read_payload_meta(raw)
+                if payload_meta is None:
+                    statuses[name] = CacheStatus(subreddit=name, exists=False, fresh=False)
+                    continue
+                meta = {
+                    "cached_at": payload_meta.cached_at,
+                    "post_count": payload_meta.post_count,
+                }
+                statuses[name] = self._build_status(name, meta, now=now, max_age=max_age)
 
-        return [self._deserialize_post(item) for item in posts_data]
+        return {name: statuses[name] for name in names}
 
     async def set_cached_posts(
         self,
@@ -99,12 +175,27 @@ class CacheManager:
     ) -> None:
         """Persist subreddit posts and timestamp."""
         key = self._build_key(subreddit)
-        data = {
-            "cached_at": datetime.now(timezone.utc).isoformat(),
-            "posts": [self._serialise_post(post) for post in posts],
-        }
+        cached_at = datetime.now(timezone.utc).isoformat()
+        value: bytes | str
+        if self.codec == "json":
+            value = json.dumps(
+                {
+                    "cached_at": cached_at,
+                    "posts": [self._serialise_post(post) for post in posts],
+                },
+                ensure_ascii=False,
+            )
+        else:
+            value = encode_post_payload(
+                posts, cached_at=cached_at, compression=self.compression
+            )
+        meta = {"cached_at": cached_at, "post_count": len(posts)}
         ttl = self.cache_ttl if ttl_seconds is None else max(60, int(ttl_seconds))
-        await self.redis.setex(key, ttl, json.dumps(data, ensure_ascii=False))
+        # payload 与 meta 同一个 MULTI 写入，健康检查只读 meta 不反序列化帖子
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.setex(key, ttl, value)
+        pipe.setex(self._build_meta_key(subreddit), ttl, json.dumps(meta))
+        await pipe.execute()
 
     async def calculate_cache_hit_rate(
         self,
@@ -119,20 +210,101 @@ class CacheManager:
         if not names:
             return 0.0
 
-        hits = 0
-        for name in names:
-            posts = await self.get_cached_posts(name, max_age_hours=max_age_hours)
-            if posts:
-                hits += 1
+        statuses = await self.cache_status_many(names, max_age_hours=max_age_hours)
+        hits = sum(1 for name in names if statuses[name].is_hit)
         return hits / len(names)
 
     async def invalidate(self, subreddit: str) -> None:
         """Remove a cached entry manually."""
-        await self.redis.delete(self._build_key(subreddit))
+        await self.redis.delete(
+            self._build_key(subreddit), self._build_meta_key(subreddit)
+        )
 
     def _build_key(self, subreddit: str) -> str:
         return f"{self.namespace}:{subreddit.lower()}"
 
+    def _build_meta_key(self, subreddit: str) -> str:
+        return f"{self.namespace}:meta:{subreddit.lower()}"
+
+    @staticmethod
+    def _normalise_names(subreddits: Iterable[str]) -> List[str]:
+        names: List[str] = []
+        seen: set[str] = set()
+        for name in subreddits:
+            cleaned = (name or "").strip()
+            if cleaned and cleaned not in seen:
+                seen.add(cleaned)
+                names.append(cleaned)
+        return names
+
+    @staticmethod
+    def _loads(raw: bytes | str | None) -> Optional[Dict[str, Any]]:
+        if raw is None:
+            return None
+        decoded = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+        try:
+            payload = json.loads(decoded)
+        except json.JSONDecodeError:
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    @staticmethod
+    def _parse_cached_at(value: Any) -> Optional[datetime]:
+        if value is None:
+            return None
+        try:
+            cached_at = datetime.fromisoformat(str(value))
+        except ValueError:
+            return None
+        if cached_at.tzinfo is None:
+            cached_at = cached_at.replace(tzinfo=timezone.utc)
+        return cached_at
+
+    def _build_status(
+        self,
+        subreddit: str,
+        meta: Dict[str, Any],
+        *,
+        now: datetime,
+        max_age: timedelta,
+    ) -> CacheStatus:
+        cached_at = self._parse_cached_at(meta.get("cached_at"))
+        try:
+            post_count = int(meta.get("post_count") or 0)
+        except (TypeError, ValueError):
+            post_count = 0
+        return CacheStatus(
+            subreddit=subreddit,
+            exists=True,
+            fresh=cached_at is not None and now - cached_at <= max_age,
+            cached_at=cached_at,
+            post_count=post_count,
+        )
+
+    def _decode_posts(
+        self,
+        raw: bytes | str | None,
+        *,
+        max_age_hours: int,
+    ) -> Optional[List[RedditPost]]:
+        max_age = timedelta(hours=max_age_hours)
+
+        def _is_fresh(value: Any) -> bool:
+            cached_at = self._parse_cached_at(value)
+            return cached_at is not None and datetime.now(timezone.utc) - cached_at <= max_age
+
+        try:
+            decoded = decode_post_payload(
+                raw,
+                legacy_post_factory=self._deserialize_post,
+                is_fresh=_is_fresh,
+            )
+        except PostCacheCodecError:
+            return None
+        if decoded is None or not _is_fresh(decoded.cached_at):
+            return None
+        return decoded.posts
+
     @staticmethod
     def _serialise_post(post: RedditPost) -> Dict[str, Any]:
         if is_dataclass(post):
@@ -159,4 +331,4 @@ class CacheManager:
         )
 
 
-__all__ = ["CacheManager"]
+__all__ = ["CacheManager", "CacheStatus"]
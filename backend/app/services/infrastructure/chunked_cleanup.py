@@ -0,0 +1,246 @@
+"""
+分块保留期清理引擎（comments / posts_hot / facts 审计共用）。
+
+- 按主键 keyset 游走过期行：每批 SELECT 至多 batch_size 个键，再按顺序执行 DELETE（先子表后主表）
+- 每批独立事务、立即提交：锁持有时间和 WAL 峰值都与批大小成正比，而不是与过期总量成正比
+- 时间预算 + 批间停顿节流；预算用完时保存 checkpoint，下次从断点继续
+- 返回进度（批数、删除量、rows/s、最后游标），调用方负责审计写入
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_PREFIX = "cleanup:checkpoint:"
+DEFAULT_CHECKPOINT_TTL_SECONDS = 7 * 24 * 60 * 60
+_SAMPLE_LIMIT = 50
+
+PrepareBatchFn = Callable[[Any], Awaitable[None]]
+
+
+@dataclass(frozen=True, slots=True)
+class ChunkedCleanupTarget:
+    """一张表的清理定义。
+
+    select_sql 需接收 :after / :limit，按键升序返回第一列为键；
+    delete_sql 为 (breakdown 名, 接收 :ids 的 DELETE) 列表，按顺序在同一事务执行。
+    """
+
+    name: str
+    select_sql: str
+    delete_sql: tuple[tuple[str, str], ...]
+    params: Mapping[str, Any] = field(default_factory=dict)
+    initial_key: Any = 0
+    # checkpoint 以字符串存储，读回时转换成 SQL 参数需要的类型
+    key_type: Callable[[str], Any] = int
+
+
+@dataclass(slots=True)
+class ChunkedCleanupProgress:
+    target: str
+    resumed_from: Any
+    last_key: Any
+    batches: int = 0
+    scanned: int = 0
+    deleted: dict[str, int] = field(default_factory=dict)
+    sample_keys: list[Any] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    stop_reason: str = ""
+
+    @property
+    def exhausted(self) -> bool:
+        return self.stop_reason == "exhausted"
+
+    @property
+    def total_deleted(self) -> int:
+        return sum(self.deleted.values())
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.total_deleted / self.elapsed_seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "target": self.target,
+            "batches": self.batches,
+            "scanned": self.scanned,
+            "deleted": dict(self.deleted),
+            "resumed_from": _jsonable_key(self.resumed_from),
+            "last_key": _jsonable_key(self.last_key),
+            "stop_reason": self.stop_reason,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+class CleanupCheckpointStore(Protocol):
+    async def load(self, name: str) -> str | None: ...
+
+    async def save(self, name: str, key: Any) -> None: ...
+
+    async def clear(self, name: str) -> None: ...
+
+
+class RedisCleanupCheckpointStore:
+    """Redis 断点存储（best-effort：Redis 故障只记日志，退化为从头扫描）。"""
+
+    def __init__(
+        self,
+        redis_client: Any,
+        *,
+        prefix: str = DEFAULT_CHECKPOINT_PREFIX,
+        ttl_seconds: int = DEFAULT_CHECKPOINT_TTL_SECONDS,
+    ) -> None:
+        self._redis = redis_client
+        self._prefix = prefix
+        self._ttl_seconds = max(1, int(ttl_seconds))
+
+    def _key(self, name: str) -> str:
+        return f"{self._prefix}{name}"
+
+    async def load(self, name: str) -> str | None:
+        try:
+            raw = await self._redis.get(self._key(name))
+        except Exception:
+            logger.warning("cleanup checkpoint load failed target=%s", name, exc_info=True)
+            return None
+        if raw is None:
+            return None
+        return raw.decode("utf-8") if isinstance(raw, bytes) else str(raw)
+
+    async def save(self, name: str, key: Any) -> None:
+        try:
+            await self._redis.set(self._key(name), str(key), ex=self._ttl_seconds)
+        except Exception:
+            logger.warning("cleanup checkpoint save failed target=%s", name, exc_info=True)
+
+    async def clear(self, name: str) -> None:
+        try:
+            await self._redis.delete(self._key(name))
+        except Exception:
+            logger.warning("cleanup checkpoint clear failed target=%s", name, exc_info=True)
+
+
+async def run_chunked_cleanup(
+    db: Any,
+    target: ChunkedCleanupTarget,
+    *,
+    batch_size: int,
+    max_batches: int,
+    time_budget_seconds: float = 0.0,
+    pause_seconds: float = 0.0,
+    checkpoint: CleanupCheckpointStore | None = None,
+    start_after: Any = None,
+    prepare_batch: PrepareBatchFn | None = None,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+) -> ChunkedCleanupProgress:
+    """按 keyset 分批删除 target 的过期行，每批提交一次。
+
+    time_budget_seconds <= 0 表示不限时；start_after 显式给出时优先于 checkpoint。
+    批内失败会回滚当前批并抛出，已提交批次的断点保留，下次从断点继续。
+    """
+    batch_size = max(1, int(batch_size))
+    max_batches = max(0, int(max_batches))
+
+    after = start_after
+    if after is None and checkpoint is not None:
+        raw = await checkpoint.load(target.name)
+        if raw is not None:
+            try:
+                after = target.key_type(raw)
+            except (TypeError, ValueError):
+                logger.warning("cleanup checkpoint ignored target=%s raw=%r", target.name, raw)
+    if after is None:
+        after = target.initial_key
+
+    progress = ChunkedCleanupProgress(
+        target=target.name,
+        resumed_from=after,
+        last_key=after,
+        deleted={name: 0 for name, _ in target.delete_sql},
+    )
+    select_stmt = text(target.select_sql)
+    delete_stmts = [(name, text(sql)) for name, sql in target.delete_sql]
+    started = clock()
+
+    try:
+        while True:
+            if progress.batches >= max_batches:
+                progress.stop_reason = "max_batches"
+                break
+            if time_budget_seconds > 0 and clock() - started >= time_budget_seconds:
+                progress.stop_reason = "time_budget"
+                break
+
+            if prepare_batch is not None:
+                await prepare_batch(db)
+            rows = (
+                await db.execute(select_stmt, {**target.params, "after": after, "limit": batch_size})
+            ).fetchall()
+            keys = [row[0] for row in rows]
+            if not keys:
+                await db.commit()
+                progress.stop_reason = "exhausted"
+                break
+
+            for name, stmt in delete_stmts:
+                result = await db.execute(stmt, {**target.params, "ids": keys})
+                progress.deleted[name] += int(result.rowcount or 0)
+            await db.commit()
+
+            after = keys[-1]
+            progress.last_key = after
+            progress.batches += 1
+            progress.scanned += len(keys)
+            if len(progress.sample_keys) < _SAMPLE_LIMIT:
+                progress.sample_keys.extend(keys[: _SAMPLE_LIMIT - len(progress.sample_keys)])
+            if checkpoint is not None:
+                await checkpoint.save(target.name, after)
+            progress.elapsed_seconds = clock() - started
+            logger.info(
+                "🧹 chunked cleanup progress target=%s batch=%s deleted=%s last_key=%s rate=%.0f rows/s",
+                target.name,
+                progress.batches,
+                progress.total_deleted,
+                after,
+                progress.rows_per_second,
+            )
+
+            if len(keys) < batch_size:
+                progress.stop_reason = "exhausted"
+                break
+            if pause_seconds > 0:
+                await sleep(pause_seconds)
+    except BaseException:
+        await db.rollback()
+        raise
+    finally:
+        progress.elapsed_seconds = clock() - started
+
+    if progress.exhausted and checkpoint is not None:
+        await checkpoint.clear(target.name)
+    return progress
+
+
+def _jsonable_key(key: Any) -> Any:
+    return key if isinstance(key, (int, float, str)) or key is None else str(key)
+
+
+__all__ = [
+    "ChunkedCleanupProgress",
+    "ChunkedCleanupTarget",
+    "CleanupCheckpointStore",
+    "RedisCleanupCheckpointStore",
+    "run_chunked_cleanup",
+]
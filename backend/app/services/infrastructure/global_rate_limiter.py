@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import Protocol
+import math
+import os
+from dataclasses import dataclass
+from typing import Any, Protocol
 
 
 class RedisLike(Protocol):
@@ -51,3 +54,156 @@ class GlobalRateLimiter:
             return max(1, int(ttl) if isinstance(ttl, int) else 1)
         return 0
 
+
+
+# GCRA（令牌桶的“理论到达时间”形式）：一次 EVAL 原子完成“读 TAT -> 预留 -> 写回”。
+# 时间单位统一为微秒整数（Lua number 返回给 Redis 时会被截断成整数）。
+_RESERVE_SCRIPT = """
+local key = KEYS[1]
+local interval_us = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local max_wait_us = tonumber(ARGV[4])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000000 + tonumber(t[2])
+local tat = tonumber(redis.call('GET', key) or '0')
+if tat < now then
+  tat = now
+end
+local new_tat = tat + cost * interval_us
+local wait = new_tat - burst * interval_us - now
+if wait < 0 then
+  wait = 0
+end
+if max_wait_us >= 0 and wait > max_wait_us then
+  return {0, wait}
+end
+local ttl_ms = math.floor((new_tat - now) / 1000) + 1000
+redis.call('SET', key, string.format('%d', new_tat), 'PX', ttl_ms)
+return {1, wait}
+"""
+
+
+class ScriptRedisLike(Protocol):
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any: ...
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitReservation:
+    """Outcome of a single reservation call.
+
+    granted=True means the slot is already booked and the caller only has to sleep
+    ``wait_seconds`` before sending; granted=False means nothing was reserved
+    (the wait exceeded ``max_wait_seconds``).
+    """
+
+    granted: bool
+    wait_seconds: float
+
+
+class TokenBucketRateLimiter:
+    """Distributed token-bucket (GCRA) limiter with atomic Lua reservation.
+
+    - One EVAL per call: the script reads the bucket's theoretical arrival time,
+      books ``cost`` slots and returns the exact wait until the booked slot.
+    - Reservations are handed out in arrival order across all workers sharing the
+      key, so callers queue fairly instead of retrying and colliding at window edges.
+    - ``burst`` bounds how many requests may be sent back-to-back after idling;
+      steady state is ``limit`` requests per ``window_seconds``, evenly spaced.
+    - Rejected calls (``max_wait_seconds`` exceeded) consume no capacity.
+    """
+
+    def __init__(
+        self,
+        redis_client: ScriptRedisLike,
+        *,
+        limit: int,
+        window_seconds: float,
+        burst: int | None = None,
+        namespace: str = "reddit_api:qpm",
+        client_id: str = "default",
+    ) -> None:
+        self._redis = redis_client
+        self._limit = max(1, int(limit))
+        self._window = max(0.001, float(window_seconds))
+        self._burst = max(1, int(burst if burst is not None else self._limit // 10))
+        self._interval_us = max(1, math.ceil(self._window * 1_000_000 / self._limit))
+        self._ns = namespace
+        self._client_id = client_id
+
+    @property
+    def interval_seconds(self) -> float:
+        return self._interval_us / 1_000_000
+
+    def _key(self) -> str:
+        return f"{self._ns}:{self._client_id}:tb"
+
+    async def reserve(
+        self,
+        *,
+        cost: int = 1,
+        max_wait_seconds: float | None = None,
+    ) -> RateLimitReservation:
+        """Book ``cost`` tokens (e.g. a whole batch) and return the exact wait."""
+        max_wait_us = (
+            -1
+            if max_wait_seconds is None
+            else int(max(0.0, float(max_wait_seconds)) * 1_000_000)
+        )
+        granted, wait_us = await self._redis.eval(
+            _RESERVE_SCRIPT,
+            1,
+            self._key(),
+            self._interval_us,
+            self._burst,
+            max(1, int(cost)),
+            max_wait_us,
+        )
+        return RateLimitReservation(
+            granted=bool(int(granted)),
+            wait_seconds=int(wait_us) / 1_000_000,
+        )
+
+    async def acquire(self, *, cost: int = 1) -> float:
+        """GlobalRateLimiter-compatible entry point.
+
+        Always books the slot, so callers must sleep the returned seconds and then
+        send without acquiring again.
+        """
+        reservation = await self.reserve(cost=cost)
+        return reservation.wait_seconds
+
+
+RATE_LIMITER_MODES = {"token_bucket", "fixed_window"}
+
+
+def create_reddit_rate_limiter(
+    redis_client: Any,
+    *,
+    limit: int,
+    window_seconds: float,
+    namespace: str = "reddit_api:qpm",
+    client_id: str = "default",
+    mode: str | None = None,
+) -> GlobalRateLimiter | TokenBucketRateLimiter:
+    """Build the shared limiter selected by REDDIT_RATE_LIMITER_MODE (default token_bucket)."""
+    resolved = (mode or os.getenv("REDDIT_RATE_LIMITER_MODE") or "token_bucket").strip().lower()
+    if resolved not in RATE_LIMITER_MODES:
+        resolved = "token_bucket"
+    if resolved == "fixed_window":
+        return GlobalRateLimiter(
+            redis_client,
+            limit=limit,
+            window_seconds=max(1, int(window_seconds)),
+            namespace=namespace,
+            client_id=client_id,
+        )
+    burst_raw = os.getenv("REDDIT_RATE_LIMITER_BURST")
+    return TokenBucketRateLimiter(
+        redis_client,
+        limit=limit,
+        window_seconds=window_seconds,
+        burst=int(burst_raw) if burst_raw else None,
+        namespace=namespace,
+        client_id=client_id,
+    )
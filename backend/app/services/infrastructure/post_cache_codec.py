@@ -0,0 +1,377 @@
+"""
+Compact, versioned encoding for cached subreddit post lists (CacheManager).
+
+Layout (v1)::
+
+    b"RPC" | schema_version:u8 | compression:u8 | cached_at_len:u8 | cached_at (ascii)
+    | post_count:u32 | body (compressed)
+
+    body = columns_len:u32 | columns (JSON, one array per field, no selftext)
+           | selftext offsets (u32 * (post_count + 1)) | selftext blob (utf-8)
+
+The uncompressed header carries `cached_at` / `post_count`, so freshness checks
+never touch the body. Field names are stored once (columnar), and `selftext`
+lives in its own blob that is only decoded when a post's `selftext` is read.
+
+Legacy JSON entries (`{"cached_at": ..., "posts": [...]}`) remain readable.
+zstd / lz4 are used when `zstandard` / `lz4` are installed; zlib otherwise.
+"""
+from __future__ import annotations
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from app.services.infrastructure.reddit_client import RedditPost
+
+try:  # pragma: no cover - optional dependency
+    import zstandard as _zstd  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    _zstd = None  # type: ignore
+
+try:  # pragma: no cover - optional dependency
+    import lz4.frame as _lz4  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    _lz4 = None  # type: ignore
+
+CODEC_MAGIC = b"RPC"
+SCHEMA_VERSION = 1
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+COMPRESSION_LZ4 = 3
+
+_COMPRESSION_BY_NAME = {
+    "none": COMPRESSION_NONE,
+    "zlib": COMPRESSION_ZLIB,
+    "zstd": COMPRESSION_ZSTD,
+    "lz4": COMPRESSION_LZ4,
+}
+
+# selftext 单独成块，其余字段按列存
+_COLUMN_FIELDS = (
+    "id",
+    "title",
+    "score",
+    "num_comments",
+    "created_utc",
+    "subreddit",
+    "author",
+    "url",
+    "permalink",
+)
+_HEADER = struct.Struct("<3sBBB")
+_U32 = struct.Struct("<I")
+
+
+class PostCacheCodecError(ValueError):
+    """Raised when a binary cache entry cannot be decoded."""
+
+
+@dataclass(frozen=True, slots=True)
+class PostPayloadMeta:
+    cached_at: Optional[str]
+    post_count: int
+
+
+@dataclass(frozen=True, slots=True)
+class DecodedPostPayload:
+    cached_at: Optional[str]
+    posts: List[RedditPost]
+
+
+def available_compressions() -> List[str]:
+    names = ["none", "zlib"]
+    if _zstd is not None:
+        names.append("zstd")
+    if _lz4 is not None:
+        names.append("lz4")
+    return names
+
+
+def resolve_compression(name: str | None) -> int:
+    """Map a configured name to a compression id; "auto" picks the best installed one."""
+    key = (name or "auto").strip().lower()
+    if key == "auto":
+        if _zstd is not None:
+            return COMPRESSION_ZSTD
+        if _lz4 is not None:
+            return COMPRESSION_LZ4
+        return COMPRESSION_ZLIB
+    if key not in _COMPRESSION_BY_NAME:
+        raise ValueError(f"Unsupported cache compression: {name}")
+    if key not in available_compressions():
+        raise ValueError(f"Cache compression {name} requires an optional package")
+    return _COMPRESSION_BY_NAME[key]
+
+
+def is_binary_payload(raw: bytes | str | None) -> bool:
+    return isinstance(raw, (bytes, bytearray, memoryview)) and bytes(raw[:3]) == CODEC_MAGIC
+
+
+class _SelftextColumn:
+    __slots__ = ("_blob", "_offsets")
+
+    def __init__(self, blob: bytes, offsets: array) -> None:
+        self._blob = blob
+        self._offsets = offsets
+
+    def text(self, index: int) -> str:
+        start = self._offsets[index]
+        end = self._offsets[index + 1]
+        return self._blob[start:end].decode("utf-8")
+
+
+_SELFTEXT_SLOT = RedditPost.__dict__["selftext"]
+
+
+class LazyRedditPost(RedditPost):
+    """RedditPost whose `selftext` is decoded from the shared column on first access."""
+
+    __slots__ = ("_selftext_column", "_selftext_index")
+
+    @property  # type: ignore[override]
+    def selftext(self) -> str:
+        column = self._selftext_column
+        if column is not None:
+            _SELFTEXT_SLOT.__set__(self, column.text(self._selftext_index))
+            self._selftext_column = None
+        return _SELFTEXT_SLOT.__get__(self, RedditPost)
+
+    @selftext.setter
+    def selftext(self, value: str) -> None:
+        _SELFTEXT_SLOT.__set__(self, value)
+        self._selftext_column = None
+
+    @property
+    def selftext_loaded(self) -> bool:
+        return self._selftext_column is None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RedditPost):
+            return NotImplemented
+        return _field_values(self) == _field_values(other)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # 序列化（pickle / deepcopy）时物化成普通 RedditPost，不带整块 selftext
+        return (RedditPost, _field_values(self))
+
+
+def _field_values(post: RedditPost) -> tuple[Any, ...]:
+    return (
+        post.id,
+        post.title,
+        post.selftext,
+        post.score,
+        post.num_comments,
+        post.created_utc,
+        post.subreddit,
+        post.author,
+        post.url,
+        post.permalink,
+    )
+
+
+def _compress(body: bytes, compression: int) -> bytes:
+    if compression == COMPRESSION_NONE:
+        return body
+    if compression == COMPRESSION_ZLIB:
+        return zlib.compress(body, 1)
+    if compression == COMPRESSION_ZSTD and _zstd is not None:
+        return _zstd.ZstdCompressor(level=3).compress(body)
+    if compression == COMPRESSION_LZ4 and _lz4 is not None:
+        return _lz4.compress(body)
+    raise PostCacheCodecError(f"compression {compression} unavailable")
+
+
+def _decompress(body: bytes, compression: int) -> bytes:
+    if compression == COMPRESSION_NONE:
+        return body
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(body)
+    if compression == COMPRESSION_ZSTD and _zstd is not None:
+        return _zstd.ZstdDecompressor().decompress(body)
+    if compression == COMPRESSION_LZ4 and _lz4 is not None:
+        return _lz4.decompress(body)
+    raise PostCacheCodecError(f"compression {compression} unavailable")
+
+
+def _post_value(post: Any, field: str) -> Any:
+    if isinstance(post, dict):
+        return post.get(field)
+    return getattr(post, field)
+
+
+def encode_post_payload(
+    posts: Sequence[Any],
+    *,
+    cached_at: str,
+    compression: int = COMPRESSION_ZLIB,
+) -> bytes:
+    """Encode RedditPost dataclasses (or equivalent dicts) into the v1 binary layout."""
+    cached_at_bytes = cached_at.encode("ascii")
+    if len(cached_at_bytes) > 255:
+        raise ValueError("cached_at is too long for the cache header")
+
+    columns: Dict[str, List[Any]] = {field: [] for field in _COLUMN_FIELDS}
+    offsets = array("I", [0])
+    chunks: List[bytes] = []
+    position = 0
+    for post in posts:
+        for field in _COLUMN_FIELDS:
+            columns[field].append(_post_value(post, field))
+        encoded = str(_post_value(post, "selftext") or "").encode("utf-8")
+        chunks.append(encoded)
+        position += len(encoded)
+        offsets.append(position)
+
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+        offsets.byteswap()
+    columns_bytes = json.dumps(columns, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    body = b"".join(
+        (_U32.pack(len(columns_bytes)), columns_bytes, offsets.tobytes(), *chunks)
+    )
+    header = _HEADER.pack(CODEC_MAGIC, SCHEMA_VERSION, compression, len(cached_at_bytes))
+    return b"".join(
+        (header, cached_at_bytes, _U32.pack(len(offsets) - 1), _compress(body, compression))
+    )
+
+
+def _read_header(raw: bytes) -> tuple[int, str, int, int]:
+    try:
+        magic, version, compression, cached_at_len = _HEADER.unpack_from(raw, 0)
+    except struct.error as exc:
+        raise PostCacheCodecError("truncated cache header") from exc
+    if magic != CODEC_MAGIC:
+        raise PostCacheCodecError("not a binary cache entry")
+    if version != SCHEMA_VERSION:
+        raise PostCacheCodecError(f"unsupported cache schema version {version}")
+    start = _HEADER.size
+    cached_at = raw[start : start + cached_at_len].decode("ascii")
+    (post_count,) = _U32.unpack_from(raw, start + cached_at_len)
+    return compression, cached_at, post_count, start + cached_at_len + _U32.size
+
+
+def _load_json(raw: bytes | str) -> Optional[Dict[str, Any]]:
+    try:
+        decoded = raw.decode("utf-8") if isinstance(raw, (bytes, bytearray)) else raw
+        payload = json.loads(decoded)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def read_payload_meta(raw: bytes | str | None) -> Optional[PostPayloadMeta]:
+    """cached_at / post_count of an entry; binary entries only read the header."""
+    if raw is None:
+        return None
+    if is_binary_payload(raw):
+        try:
+            _, cached_at, post_count, _ = _read_header(bytes(raw))
+        except PostCacheCodecError:
+            return None
+        return PostPayloadMeta(cached_at=cached_at, post_count=post_count)
+    payload = _load_json(raw)
+    if payload is None:
+        return None
+    return PostPayloadMeta(
+        cached_at=payload.get("cached_at"),
+        post_count=len(payload.get("posts") or []),
+    )
+
+
+def decode_post_payload(
+    raw: bytes | str | None,
+    *,
+    legacy_post_factory: Callable[[Dict[str, Any]], RedditPost],
+    is_fresh: Callable[[Optional[str]], bool] | None = None,
+) -> Optional[DecodedPostPayload]:
+    """Decode a binary or legacy JSON entry; returns None for missing / corrupt data.
+
+    `is_fresh` is checked against `cached_at` before the body is decompressed.
+    """
+    if raw is None:
+        return None
+    if not is_binary_payload(raw):
+        payload = _load_json(raw)
+        if payload is None:
+            return None
+        cached_at = payload.get("cached_at")
+        if is_fresh is not None and not is_fresh(cached_at):
+            return DecodedPostPayload(cached_at=cached_at, posts=[])
+        return DecodedPostPayload(
+            cached_at=cached_at,
+            posts=[legacy_post_factory(item) for item in payload.get("posts", [])],
+        )
+
+    data = bytes(raw)
+    try:
+        compression, cached_at, post_count, body_start = _read_header(data)
+        if is_fresh is not None and not is_fresh(cached_at):
+            return DecodedPostPayload(cached_at=cached_at, posts=[])
+        body = _decompress(data[body_start:], compression)
+        (columns_len,) = _U32.unpack_from(body, 0)
+        columns = json.loads(body[4 : 4 + columns_len])
+        offsets_start = 4 + columns_len
+        offsets_end = offsets_start + 4 * (post_count + 1)
+        offsets = array("I")
+        offsets.frombytes(body[offsets_start:offsets_end])
+    except (PostCacheCodecError, struct.error, zlib.error, ValueError) as exc:
+        raise PostCacheCodecError(f"corrupt binary cache entry: {exc}") from exc
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+        offsets.byteswap()
+
+    selftexts = _SelftextColumn(body[offsets_end:], offsets)
+    ids = columns["id"]
+    titles = columns["title"]
+    scores = columns["score"]
+    num_comments = columns["num_comments"]
+    created = columns["created_utc"]
+    subreddits = columns["subreddit"]
+    authors = columns["author"]
+    urls = columns["url"]
+    permalinks = columns["permalink"]
+
+    posts: List[RedditPost] = []
+    for index in range(post_count):
+        post = LazyRedditPost(
+            id=str(ids[index] or ""),
+            title=str(titles[index] or ""),
+            selftext="",
+            score=int(scores[index] or 0),
+            num_comments=int(num_comments[index] or 0),
+            created_utc=float(created[index] or 0.0),
+            subreddit=str(subreddits[index] or ""),
+            author=str(authors[index] or "unknown"),
+            url=str(urls[index] or ""),
+            permalink=str(permalinks[index] or ""),
+        )
+        post._selftext_column = selftexts
+        post._selftext_index = index
+        posts.append(post)
+    return DecodedPostPayload(cached_at=cached_at, posts=posts)
+
+
+__all__ = [
+    "CODEC_MAGIC",
+    "COMPRESSION_LZ4",
+    "COMPRESSION_NONE",
+    "COMPRESSION_ZLIB",
+    "COMPRESSION_ZSTD",
+    "DecodedPostPayload",
+    "LazyRedditPost",
+    "PostCacheCodecError",
+    "PostPayloadMeta",
+    "SCHEMA_VERSION",
+    "available_compressions",
+    "decode_post_payload",
+    "encode_post_payload",
+    "is_binary_payload",
+    "read_payload_meta",
+    "resolve_compression",
+]
@@ -2,10 +2,30 @@ from __future__ import annotations
 
 import asyncio
 from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
 import logging
+import math
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import TYPE_CHECKING, Any, Deque, Dict, Iterable, List, Optional, Sequence
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from app.services.infrastructure.stage_timing import note_stage_call
 
 # Delay aiohttp import to avoid event loop conflicts during pytest collection
 if TYPE_CHECKING:
@@ -14,6 +34,11 @@ if TYPE_CHECKING:
 TOKEN_ENDPOINT = "https://www.reddit.com/api/v1/access_token"
 API_BASE_URL = "https://oauth.reddit.com"
 USER_AGENT_FALLBACK = "RedditSignalScanner/1.0 (+https://github.com/)"
+# /api/morechildren 单次最多接受 100 个 children id
+MORECHILDREN_BATCH_SIZE = 100
+DEFAULT_FULL_TREE_CONCURRENCY = 4
+
+CommentPageCallback = Callable[[List[Dict[str, Any]]], Awaitable[None]]
 
 
 class RedditAPIError(RuntimeError):
@@ -48,6 +73,225 @@ class RedditPost:
     permalink: str
 
 
+@dataclass(slots=True)
+class SubredditFetchOutcome:
+    """Result of one subreddit in a multi-subreddit fan-out (posts or error, never both)."""
+
+    subreddit: str
+    posts: List[Any] | None = None
+    error: Exception | None = None
+    reason: str | None = None
+    retryable: bool = False
+    attempts: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def classify_fetch_error(exc: BaseException) -> tuple[str, bool]:
+    """Map a fetch failure to (reason, retryable).
+
+    Only transient transport/server failures are retried; rate-limit and auth
+    failures would just burn more quota, and 4xx responses will not change.
+    """
+    if isinstance(exc, asyncio.TimeoutError):
+        return "deadline", False
+    if isinstance(exc, RedditGlobalRateLimitExceeded):
+        return "rate_limit", False
+    if isinstance(exc, RedditAuthenticationError):
+        return "auth", False
+    text = str(exc).lower()
+    if "rate limit" in text:
+        return "rate_limit", False
+    if "timed out" in text or "temporarily unavailable" in text or "connection failed" in text:
+        return "transient", True
+    if isinstance(exc, (ConnectionError, OSError)):
+        return "transient", True
+    if "status=4" in text:
+        return "client_error", False
+    return "error", False
+
+
+class _FetchDeadline:
+    """Per-subreddit time budget whose clock stops while a request waits on the rate limiter.
+
+    Waiting for a limiter token is queueing, not slowness: with 58 requests per window a
+    wall-clock deadline would fail every subreddit queued behind the first window.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self._seconds = float(seconds)
+        self._started = time.monotonic()
+        self._paused_total = 0.0
+        self._paused_at: float | None = None
+        self._pause_depth = 0
+        self._resumed = asyncio.Event()
+        self._resumed.set()
+
+    @property
+    def paused(self) -> bool:
+        return self._pause_depth > 0
+
+    def remaining(self) -> float:
+        now = time.monotonic()
+        paused = self._paused_total + (now - self._paused_at if self._paused_at is not None else 0.0)
+        return self._seconds - (now - self._started - paused)
+
+    def pause(self) -> None:
+        # 同一社区内可能有多个并发请求同时排队，按嵌套深度计
+        self._pause_depth += 1
+        if self._pause_depth == 1:
+            self._paused_at = time.monotonic()
+            self._resumed.clear()
+
+    def resume(self) -> None:
+        self._pause_depth -= 1
+        if self._pause_depth == 0 and self._paused_at is not None:
+            self._paused_total += time.monotonic() - self._paused_at
+            self._paused_at = None
+            self._resumed.set()
+
+    async def wait_resumed(self) -> None:
+        await self._resumed.wait()
+
+
+_ACTIVE_FETCH_DEADLINE: ContextVar[_FetchDeadline | None] = ContextVar(
+    "reddit_fetch_deadline", default=None
+)
+
+
+@contextmanager
+def _limiter_wait() -> Iterator[None]:
+    """Stop the active per-subreddit deadline clock while waiting for a rate-limit token."""
+    deadline = _ACTIVE_FETCH_DEADLINE.get()
+    if deadline is None:
+        yield
+        return
+    deadline.pause()
+    try:
+        yield
+    finally:
+        deadline.resume()
+
+
+async def _run_with_fetch_deadline(coro: Awaitable[List[Any]], seconds: float) -> List[Any]:
+    deadline = _FetchDeadline(seconds)
+    token = _ACTIVE_FETCH_DEADLINE.set(deadline)
+    try:
+        task = asyncio.ensure_future(coro)
+    finally:
+        _ACTIVE_FETCH_DEADLINE.reset(token)
+    try:
+        while not task.done():
+            if deadline.paused:
+                resumed = asyncio.ensure_future(deadline.wait_resumed())
+                try:
+                    await asyncio.wait({task, resumed}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    resumed.cancel()
+                continue
+            remaining = deadline.remaining()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            await asyncio.wait({task}, timeout=remaining)
+        return task.result()
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+async def iter_subreddit_fetches(
+    fetch_one: Callable[[str], Awaitable[Sequence[Any]]],
+    subreddits: Sequence[str],
+    *,
+    max_concurrency: int = 0,
+    deadline_seconds: float | None = None,
+    max_attempts: int = 1,
+    retry_backoff_seconds: float = 0.5,
+) -> AsyncIterator[SubredditFetchOutcome]:
+    """Fetch subreddits concurrently and yield each outcome as soon as it completes.
+
+    ``deadline_seconds`` bounds one subreddit including its retries, excluding time spent
+    waiting for a rate-limit token; a failure never cancels the others. Stopping iteration early cancels whatever is still in flight.
+    ``max_concurrency <= 0`` means no extra bound beyond the caller's own limiter.
+    """
+    names = list(dict.fromkeys(name for name in subreddits if name))
+    if not names:
+        return
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency > 0 else None
+    attempts_cap = max(1, int(max_attempts))
+
+    async def _attempts(name: str, outcome: SubredditFetchOutcome) -> List[Any]:
+        while True:
+            outcome.attempts += 1
+            try:
+                return list(await fetch_one(name))
+            except Exception as exc:
+                _reason, retryable = classify_fetch_error(exc)
+                if not retryable or outcome.attempts >= attempts_cap:
+                    raise
+                await asyncio.sleep(retry_backoff_seconds * outcome.attempts)
+
+    async def _run(name: str) -> SubredditFetchOutcome:
+        outcome = SubredditFetchOutcome(subreddit=name)
+        started = time.monotonic()
+        try:
+            if semaphore is not None:
+                await semaphore.acquire()
+            try:
+                if deadline_seconds and deadline_seconds > 0:
+                    outcome.posts = await _run_with_fetch_deadline(
+                        _attempts(name, outcome), deadline_seconds
+                    )
+                else:
+                    outcome.posts = await _attempts(name, outcome)
+            finally:
+                if semaphore is not None:
+                    semaphore.release()
+        except Exception as exc:
+            outcome.error = exc
+            outcome.reason, outcome.retryable = classify_fetch_error(exc)
+        outcome.elapsed_seconds = time.monotonic() - started
+        return outcome
+
+    tasks = [asyncio.create_task(_run(name)) for name in names]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def summarize_subreddit_fetches(outcomes: Iterable[SubredditFetchOutcome]) -> Dict[str, Any]:
+    items = list(outcomes)
+    failures = [item for item in items if not item.ok]
+    by_reason: Dict[str, int] = {}
+    for item in failures:
+        key = item.reason or "error"
+        by_reason[key] = by_reason.get(key, 0) + 1
+    return {
+        "total": len(items),
+        "succeeded": len(items) - len(failures),
+        "failed": len(failures),
+        "by_reason": by_reason,
+        "failures": [
+            {
+                "subreddit": item.subreddit,
+                "reason": item.reason or "error",
+                "retryable": item.retryable,
+                "attempts": item.attempts,
+                "error": str(item.error) or item.error.__class__.__name__,
+            }
+            for item in failures
+        ],
+    }
+
+
 class RedditAPIClient:
     """
     Async Reddit API client honouring the cache-first contract defined in PRD-03.
@@ -100,7 +344,8 @@ class RedditAPIClient:
         self._auth_lock = asyncio.Lock()
         self._rate_lock = asyncio.Lock()
         self._request_times: Deque[float] = deque()
-        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
         self.access_token: Optional[str] = None
         self.token_expires_at: Optional[datetime] = None
         # 动态速率限制监控
@@ -456,13 +701,55 @@ class RedditAPIClient:
         slices: List[tuple[int, int]],
         per_slice_max: int = 1000,
         sort: str = "new",
+        max_concurrency: int | None = None,
+        split_threshold: int | None = None,
+        min_slice_seconds: int = 3600,
+        checkpoint: Any | None = None,
+        checkpoint_key: str | None = None,
+        on_new_posts: Callable[[List[RedditPost]], Awaitable[None]] | None = None,
     ) -> List[RedditPost]:
         """
         Fetch posts across multiple timestamp slices and deduplicate by ID.
+
+        Slices run concurrently (bounded by the client's concurrency semaphore and
+        rate limiter); a slice whose hit count reaches ``split_threshold`` (default
+        90% of ``per_slice_max``) is split in half and re-fetched.
         """
-        all_posts: Dict[str, RedditPost] = {}
-        for start_ts, end_ts in slices:
-            try:
+        report = await self.crawl_posts_by_time_slices(
+            subreddit,
+            slices=slices,
+            per_slice_max=per_slice_max,
+            sort=sort,
+            max_concurrency=max_concurrency,
+            split_threshold=split_threshold,
+            min_slice_seconds=min_slice_seconds,
+            checkpoint=checkpoint,
+            checkpoint_key=checkpoint_key,
+            on_new_posts=on_new_posts,
+        )
+        return report.posts
+
+    async def crawl_posts_by_time_slices(
+        self,
+        subreddit: str,
+        *,
+        slices: List[tuple[int, int]],
+        per_slice_max: int = 1000,
+        sort: str = "new",
+        max_concurrency: int | None = None,
+        split_threshold: int | None = None,
+        min_slice_seconds: int = 3600,
+        checkpoint: Any | None = None,
+        checkpoint_key: str | None = None,
+        on_new_posts: Callable[[List[RedditPost]], Awaitable[None]] | None = None,
+    ) -> Any:
+        """Same as ``fetch_posts_by_time_slices`` but returns the full SliceCrawlReport (per-slice KPIs)."""
+        from app.services.crawl.time_slice_scheduler import crawl_time_slices
+
+        await self.authenticate()
+
+        async def _fetch_slice(start_ts: int, end_ts: int) -> List[RedditPost]:
+            async with self._semaphore:
                 batch, _cursor_after = await self.fetch_subreddit_posts_by_timestamp(
                     subreddit=subreddit,
                     start_epoch=start_ts,
@@ -470,36 +757,55 @@ class RedditAPIClient:
                     sort=sort,
                     max_posts=per_slice_max,
                 )
-                for p in batch:
-                    if p.id not in all_posts:
-                        all_posts[p.id] = p
-            except Exception as exc:
-                logger.warning("Slice fetch failed r/%s [%s..%s]: %s", subreddit, start_ts, end_ts, exc)
-                continue
-        return list(all_posts.values())
+                return batch
 
-    async def fetch_multiple_subreddits(
+        threshold = (
+            split_threshold
+            if split_threshold is not None
+            else max(1, int(per_slice_max * 0.9))
+        )
+        report = await crawl_time_slices(
+            _fetch_slice,
+            slices,
+            max_concurrency=max_concurrency or self.max_concurrency,
+            split_threshold=threshold,
+            min_slice_seconds=min_slice_seconds,
+            checkpoint=checkpoint,
+            checkpoint_key=checkpoint_key,
+            on_new_posts=on_new_posts,
+        )
+        logger.info("Time-slice crawl r/%s: %s", subreddit, report.as_dict())
+        return report
+
+    async def iter_multiple_subreddits(
         self,
         subreddits: Sequence[str],
         *,
         limit_per_subreddit: int = 100,
         time_filter: str = "week",
         sort: str = "top",
-    ) -> Dict[str, List[RedditPost]]:
-        """Fetch multiple subreddits concurrently while respecting rate limits."""
-        if not subreddits:
-            return {}
-
+        deadline_seconds: float | None = None,
+        max_attempts: int = 2,
+    ) -> AsyncIterator[SubredditFetchOutcome]:
+        """Yield one SubredditFetchOutcome per subreddit in completion order.
+
+        Failures are reported per subreddit (with a retry classification) instead of
+        aborting the fan-out; concurrency is bounded by the client's semaphore, and
+        waiting for a slot does not count against ``deadline_seconds``.
+        """
         unique_subreddits = list(
             dict.fromkeys(name.strip() for name in subreddits if name.strip())
         )
         if not unique_subreddits:
-            return {}
+            return
 
         await self.authenticate()
 
-        async def _runner(name: str) -> List[RedditPost]:
-            async with self._semaphore:
+        async def _fetch_one(name: str) -> List[RedditPost]:
+            # 排队等并发槽位和等限流令牌一样不计入单社区 deadline，只有拿到槽位后才开始计时
+            with _limiter_wait():
+                await self._semaphore.acquire()
+            try:
                 posts, _ = await self.fetch_subreddit_posts(
                     name,
                     limit=limit_per_subreddit,
@@ -507,19 +813,56 @@ class RedditAPIClient:
                     sort=sort,
                 )
                 return posts
+            finally:
+                self._semaphore.release()
+
+        async for outcome in iter_subreddit_fetches(
+            _fetch_one,
+            unique_subreddits,
+            deadline_seconds=deadline_seconds,
+            max_attempts=max_attempts,
+        ):
+            yield outcome
 
-        tasks = [asyncio.create_task(_runner(name)) for name in unique_subreddits]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    async def fetch_multiple_subreddits(
+        self,
+        subreddits: Sequence[str],
+        *,
+        limit_per_subreddit: int = 100,
+        time_filter: str = "week",
+        sort: str = "top",
+        allow_partial: bool = False,
+        deadline_seconds: float | None = None,
+    ) -> Dict[str, List[RedditPost]]:
+        """Fetch multiple subreddits concurrently while respecting rate limits.
 
+        By default the first failure raises RedditAPIError and cancels the requests
+        still in flight; with ``allow_partial`` failed subreddits are logged and
+        omitted. Use ``iter_multiple_subreddits`` to consume results as they arrive.
+        """
         data: Dict[str, List[RedditPost]] = {}
-        for subreddit, result in zip(unique_subreddits, results):
-            if isinstance(result, Exception):
+        failures: List[SubredditFetchOutcome] = []
+        async for outcome in self.iter_multiple_subreddits(
+            subreddits,
+            limit_per_subreddit=limit_per_subreddit,
+            time_filter=time_filter,
+            sort=sort,
+            deadline_seconds=deadline_seconds,
+            max_attempts=2 if allow_partial else 1,
+        ):
+            if outcome.ok:
+                data[outcome.subreddit] = list(outcome.posts or [])
+                continue
+            if not allow_partial:
                 raise RedditAPIError(
-                    f"Failed to fetch subreddit {subreddit}: {result}"
-                ) from result
-            # Type guard: result is List[RedditPost] after Exception check
-            assert isinstance(result, list), "Expected list of RedditPost"
-            data[subreddit] = result
+                    f"Failed to fetch subreddit {outcome.subreddit}: {outcome.error}"
+                ) from outcome.error
+            failures.append(outcome)
+        if failures:
+            logger.warning(
+                "fetch_multiple_subreddits partial result: %s",
+                summarize_subreddit_fetches(failures)["by_reason"],
+            )
         return data
 
     async def search_posts(
@@ -690,11 +1033,19 @@ class RedditAPIClient:
         mode: str = "topn",
         comment_timeout: float | None = None,
         smart_config: dict[str, Any] | None = None,
+        on_page: CommentPageCallback | None = None,
     ) -> List[Dict[str, Any]]:
         """Fetch comments for a single post.
 
-        P0: use `/comments/{id}.json` and flatten the listing. Full-tree expansion
-        via `/api/morechildren` is reserved for a later iteration.
+        `/comments/{id}.json` is flattened for topn / smart_shallow. mode="full"
+        additionally expands every `more` stub through `/api/morechildren`
+        (see `_expand_comment_tree`); per-post caps come from `smart_config`
+        (`full_max_depth` / `full_max_comments` / `full_time_budget_seconds` /
+        `full_concurrency`).
+
+        When `on_page` is given, every returned comment is also handed to it
+        exactly once, page by page as it arrives (one call for non-full modes),
+        so callers can persist incrementally.
         """
         if not post_id:
             raise ValueError("post_id must be provided")
@@ -761,7 +1112,6 @@ class RedditAPIClient:
         from app.services.crawl.comments_parser import (
             compute_smart_shallow_limits,
             flatten_reddit_comments,
-            parse_morechildren_things,
             select_smart_shallow_comments,
         )
 
@@ -832,7 +1182,7 @@ class RedditAPIClient:
                 else []
             )
 
-            return select_smart_shallow_comments(
+            selected = select_smart_shallow_comments(
                 top_comments=top_comments,
                 new_comments=new_comments,
                 top_limit=top_limit,
@@ -841,6 +1191,9 @@ class RedditAPIClient:
                 reply_per_top=reply_per_top,
                 total_limit=total_limit,
             )
+            if on_page is not None and selected:
+                await on_page(selected)
+            return selected
 
         comments_listing = await _fetch_listing(
             sort_value=sort, depth_value=depth, limit_value=limit
@@ -849,37 +1202,119 @@ class RedditAPIClient:
             return []
 
         if mode == "topn":
-            return flatten_reddit_comments(
+            top_n = flatten_reddit_comments(
                 comments_listing, max_items=limit if mode == "topn" else None
             )
+            if on_page is not None and top_n:
+                await on_page(top_n)
+            return top_n
+
+        # full mode: expand every `more` stub via /api/morechildren, fan out concurrently
+        return await self._expand_comment_tree(
+            post_id,
+            comments_listing,
+            headers=headers,
+            sort=sort,
+            depth=depth,
+            smart_config=smart_config,
+            on_page=on_page,
+        )
 
-        # full mode: gather all "more" children and iterate /api/morechildren
-        initial = flatten_reddit_comments(comments_listing, max_items=None)
-        # collect "more" children ids from the initial payload
-        raw_children_lists: List[List[str]] = []
-        try:
-            children_nodes = comments_listing.get("data", {}).get("children", [])
-            for node in children_nodes:
-                if node.get("kind") == "more":
-                    ids = node.get("data", {}).get("children") or []
-                    if ids:
-                        raw_children_lists.append([str(x) for x in ids])
-        except Exception:
-            pass
+    async def _expand_comment_tree(
+        self,
+        post_id: str,
+        comments_listing: Dict[str, Any],
+        *,
+        headers: Dict[str, str],
+        sort: str,
+        depth: int,
+        smart_config: dict[str, Any] | None,
+        on_page: CommentPageCallback | None,
+    ) -> List[Dict[str, Any]]:
+        """Expand all `more` stubs of a post via concurrent `/api/morechildren` calls.
+
+        Child ids are packed up to `MORECHILDREN_BATCH_SIZE` per call and up to
+        `full_concurrency` calls are in flight at once; every request still goes
+        through `_request_json`, so the local/global limiter budget applies.
+        Pages are handed to `on_page` from this coroutine only (never
+        concurrently), which keeps a shared AsyncSession safe for persisting.
+
+        Caps (from `smart_config`, all optional; an explicit 0 is honoured):
+        - full_max_depth: drop comments / stubs deeper than this (default: `depth`)
+        - full_max_comments: stop once this many comments were collected
+        - full_time_budget_seconds: stop scheduling and cancel in-flight calls at the deadline
+        - full_concurrency: in-flight morechildren calls per post
+        """
+        from app.services.crawl.comments_parser import (
+            collect_more_stubs,
+            flatten_reddit_comments,
+            parse_morechildren_page,
+        )
+
+        cfg = smart_config or {}
+        # 显式 0 也是有效上限（如 full_max_depth=0 只保留顶层），只有缺省才回落
+        raw_max_depth = cfg.get("full_max_depth")
+        max_depth = (
+            max(0, int(raw_max_depth)) if raw_max_depth is not None else max(depth, 1)
+        )
+        raw_max_comments = cfg.get("full_max_comments")
+        max_comments = (
+            max(0, int(raw_max_comments)) if raw_max_comments is not None else None
+        )
+        raw_budget = cfg.get("full_time_budget_seconds")
+        time_budget = max(0.0, float(raw_budget)) if raw_budget is not None else None
+        concurrency = max(
+            1, int(cfg.get("full_concurrency") or DEFAULT_FULL_TREE_CONCURRENCY)
+        )
 
-        all_comments: List[Dict[str, Any]] = list(initial)
-        pending: List[str] = []
-        for ids in raw_children_lists:
-            pending.extend(ids)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + time_budget if time_budget is not None else None
+        all_comments: List[Dict[str, Any]] = []
+        seen_ids: set[str] = set()
+        requested_ids: set[str] = set()
+        pending_ids: Deque[str] = deque()
+
+        def _room() -> int | None:
+            if max_comments is None:
+                return None
+            return max(0, max_comments - len(all_comments))
+
+        async def _emit(page: List[Dict[str, Any]]) -> None:
+            fresh: List[Dict[str, Any]] = []
+            for comment in page:
+                cid = str(comment.get("id") or "")
+                if not cid or cid in seen_ids:
+                    continue
+                if int(comment.get("depth") or 0) > max_depth:
+                    continue
+                seen_ids.add(cid)
+                fresh.append(comment)
+            room = _room()
+            if room is not None:
+                fresh = fresh[:room]
+            if not fresh:
+                return
+            all_comments.extend(fresh)
+            if on_page is not None:
+                await on_page(fresh)
+
+        def _enqueue(stubs: List[Tuple[List[str], int]]) -> None:
+            for ids, stub_depth in stubs:
+                if stub_depth > max_depth:
+                    continue
+                for cid in ids:
+                    if cid in requested_ids or cid in seen_ids:
+                        continue
+                    requested_ids.add(cid)
+                    pending_ids.append(cid)
 
-        # chunk and fetch up to 100 at a time
-        def _chunks(seq: List[str], size: int = 100) -> List[List[str]]:
-            return [seq[i : i + size] for i in range(0, len(seq), size)]
+        await _emit(flatten_reddit_comments(comments_listing, max_items=None))
+        _enqueue(collect_more_stubs(comments_listing))
 
         link_id = f"t3_{post_id}"
-        while pending:
-            batch = pending[:100]
-            pending = pending[100:]
+        url_more = f"{API_BASE_URL}/api/morechildren"
+
+        async def _fetch_batch(batch: List[str]) -> Dict[str, Any]:
             data = {
                 "api_type": "json",
                 "link_id": link_id,
@@ -888,24 +1323,68 @@ class RedditAPIClient:
                 "sort": sort,
                 "raw_json": "1",
             }
-            url_more = f"{API_BASE_URL}/api/morechildren"
-            try:
-                payload_more = await self._request_json(
-                    "POST", url_more, headers=headers, data=data
-                )
-            except RedditAPIError as exc:
-                logger.warning(
-                    "fetch_post_comments morechildren failed: post_id=%s batch=%s error=%s",
-                    post_id,
-                    len(batch),
-                    exc,
-                )
-                break
-            comments_more, more_ids_lists = parse_morechildren_things(payload_more)
-            all_comments.extend(comments_more)
-            for ids in more_ids_lists:
-                pending.extend(ids)
+            return await self._request_json("POST", url_more, headers=headers, data=data)
 
+        in_flight: Dict[asyncio.Task[Dict[str, Any]], int] = {}
+        failed_batches = 0
+        stop_reason: str | None = None
+        try:
+            while pending_ids or in_flight:
+                room = _room()
+                if room == 0:
+                    stop_reason = "max_comments"
+                    break
+                if deadline is not None and loop.time() >= deadline:
+                    stop_reason = "time_budget"
+                    break
+                while pending_ids and len(in_flight) < concurrency:
+                    batch = [
+                        pending_ids.popleft()
+                        for _ in range(min(MORECHILDREN_BATCH_SIZE, len(pending_ids)))
+                    ]
+                    in_flight[asyncio.ensure_future(_fetch_batch(batch))] = len(batch)
+
+                timeout = None if deadline is None else max(0.0, deadline - loop.time())
+                done, _ = await asyncio.wait(
+                    set(in_flight), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    batch_size = in_flight.pop(task)
+                    exc = task.exception()
+                    if isinstance(exc, RedditGlobalRateLimitExceeded):
+                        # fail-fast：全局配额耗尽时停止展开，已拿到的页照常返回
+                        stop_reason = "global_rate_limit"
+                        continue
+                    if exc is not None:
+                        failed_batches += 1
+                        logger.warning(
+                            "fetch_post_comments morechildren failed: post_id=%s batch=%s error=%s",
+                            post_id,
+                            batch_size,
+                            exc,
+                        )
+                        continue
+                    page_comments, page_stubs = parse_morechildren_page(task.result())
+                    await _emit(page_comments)
+                    _enqueue(page_stubs)
+                if stop_reason:
+                    break
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+        if stop_reason or failed_batches:
+            logger.info(
+                "fetch_post_comments full tree truncated: post_id=%s comments=%s "
+                "unfetched_ids=%s failed_batches=%s reason=%s",
+                post_id,
+                len(all_comments),
+                len(pending_ids),
+                failed_batches,
+                stop_reason or "errors",
+            )
         return all_comments
 
     async def fetch_subreddit_about(self, subreddit: str) -> Dict[str, Any]:
@@ -1019,6 +1498,7 @@ class RedditAPIClient:
         """
         import aiohttp  # Runtime import to avoid event loop conflicts
 
+        note_stage_call("reddit")
         session = await self._ensure_session()
         timeout = aiohttp.ClientTimeout(total=self.request_timeout)
         last_error: Exception | None = None
@@ -1197,10 +1677,18 @@ class RedditAPIClient:
         Enforce the configured rate limit (requests per window).
 
         Uses a rolling deque of timestamps measured via `time.monotonic()` to avoid
-        issues caused by system clock adjustments.
+        issues caused by system clock adjustments. Time spent here does not count
+        against the per-subreddit fetch deadline.
         """
+        with _limiter_wait():
+            await self._wait_for_rate_slot()
+
+    async def _wait_for_rate_slot(self) -> None:
         # 全局分布式限流（若配置）
-        if getattr(self, "_global_limiter", None) is not None:
+        limiter = getattr(self, "_global_limiter", None)
+        if limiter is not None and callable(getattr(limiter, "reserve", None)):
+            await self._throttle_with_reservation(limiter)
+        elif limiter is not None:
             wait = 0
             try:
                 wait = int(await self._global_limiter.acquire())
@@ -1244,6 +1732,33 @@ class RedditAPIClient:
                 sleep_for = max(0.0, self.rate_limit_window - (now - oldest))
             await asyncio.sleep(sleep_for)
 
+    async def _throttle_with_reservation(self, limiter: Any) -> None:
+        """Book a slot on a reserving limiter (token bucket) and sleep the exact wait.
+
+        The slot is already booked when reserve() returns, so the wait is not clamped
+        and the request is not re-acquired afterwards.
+        """
+        fail_fast = bool(getattr(self, "_fail_fast_on_global_rate_limit", False))
+        try:
+            reservation = await limiter.reserve(
+                cost=1,
+                max_wait_seconds=0.0 if fail_fast else None,
+            )
+        except Exception:
+            # 全局限流出错不阻断请求，回退到本地限流
+            return
+
+        if not reservation.granted:
+            raise RedditGlobalRateLimitExceeded(
+                wait_seconds=max(1, math.ceil(reservation.wait_seconds))
+            )
+        if reservation.wait_seconds > 0:
+            logger.debug(
+                "Global rate limiter reservation: sleep_for=%.3fs",
+                reservation.wait_seconds,
+            )
+            await asyncio.sleep(reservation.wait_seconds)
+
     def _discard_outdated_requests(self, threshold: float) -> None:
         while self._request_times and self._request_times[0] <= threshold:
             self._request_times.popleft()
@@ -1280,8 +1795,14 @@ class RedditAPIClient:
 
 
 __all__ = [
+    "CommentPageCallback",
+    "MORECHILDREN_BATCH_SIZE",
     "RedditAPIClient",
     "RedditAPIError",
     "RedditAuthenticationError",
     "RedditPost",
+    "SubredditFetchOutcome",
+    "classify_fetch_error",
+    "iter_subreddit_fetches",
+    "summarize_subreddit_fetches",
 ]
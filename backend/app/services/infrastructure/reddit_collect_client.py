@@ -3,7 +3,12 @@ from __future__ import annotations
 from typing import Any
 
 from app.core.config import settings
-from app.services.infrastructure.reddit_client import RedditAPIClient, RedditAPIError, RedditPost
+from app.services.infrastructure.reddit_client import (
+    CommentPageCallback,
+    RedditAPIClient,
+    RedditAPIError,
+    RedditPost,
+)
 from app.services.infrastructure.sociavault_reddit_client import SociaVaultRedditClient
 
 
@@ -175,6 +180,7 @@ class CollectRedditClient:
         mode: str = "topn",
         comment_timeout: float | None = None,
         smart_config: dict[str, Any] | None = None,
+        on_page: CommentPageCallback | None = None,
     ) -> list[dict[str, Any]]:
         if self.fallback is not None and self.primary.should_skip_comment_fetch():
             self._stats["fallback_comment_requests"] += 1
@@ -187,6 +193,7 @@ class CollectRedditClient:
                 mode=mode,
                 comment_timeout=comment_timeout,
                 smart_config=smart_config,
+                on_page=on_page,
             )
         try:
             self._stats["primary_comment_requests"] += 1
@@ -198,6 +205,7 @@ class CollectRedditClient:
                 mode=mode,
                 comment_timeout=comment_timeout,
                 smart_config=smart_config,
+                on_page=on_page,
             )
             if comments or self.fallback is None:
                 return comments
@@ -211,6 +219,7 @@ class CollectRedditClient:
                 mode=mode,
                 comment_timeout=comment_timeout,
                 smart_config=smart_config,
+                on_page=on_page,
             )
         except RedditAPIError as exc:
             if self.fallback is None or not _should_fallback_to_sociavault(exc):
@@ -225,6 +234,7 @@ class CollectRedditClient:
                 mode=mode,
                 comment_timeout=comment_timeout,
                 smart_config=smart_config,
+                on_page=on_page,
             )
 
 
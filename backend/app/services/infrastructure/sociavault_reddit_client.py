@@ -6,7 +6,7 @@ from typing import Any
 
 import httpx
 
-from app.services.infrastructure.reddit_client import RedditAPIError, RedditPost
+from app.services.infrastructure.reddit_client import CommentPageCallback, RedditAPIError, RedditPost
 
 
 def _coerce_created_utc(value: Any, iso_value: Any = None) -> float:
@@ -184,11 +184,15 @@ class SociaVaultRedditClient:
         mode: str = "topn",
         comment_timeout: float | None = None,
         smart_config: dict[str, Any] | None = None,
+        on_page: CommentPageCallback | None = None,
     ) -> list[dict[str, Any]]:
         post_url = self._post_urls.get(post_id) or f"https://www.reddit.com/comments/{post_id}"
         payload = await self._request_json("/scrape/reddit/post/comments", params={"url": post_url})
         max_items = limit if mode == "topn" else None
-        return _flatten_sociavault_comments(payload, limit=max_items)
+        comments = _flatten_sociavault_comments(payload, limit=max_items)
+        if on_page is not None and comments:
+            await on_page(comments)
+        return comments
 
     async def _request_json(self, path: str, *, params: dict[str, Any]) -> dict[str, Any]:
         client = await self._ensure_client()
@@ -0,0 +1,246 @@
+"""
+长流程阶段计时（轻量 span API，目前用于 run_analysis）。
+
+- StageTimer.enter(name) 顺序切换阶段：上一阶段自动收尾，适合长协程里打点；
+  独立片段可用 `with timer.stage(name):`
+- 每个阶段记录 wall time、DB 查询数 / 行数、Reddit 调用数、LLM 调用数
+- 计数通过 ContextVar 归属到当前激活的 timer：DB 走 Engine 的 after_cursor_execute 事件，
+  Reddit / LLM 客户端在发请求处调用 note_stage_call()；未激活时全部 no-op
+- as_dict() 供调用方落库（run_analysis 写入 sources["stage_timings"]）；
+  capture_profile() 可选对单次运行做 cProfile / pyinstrument
+"""
+from __future__ import annotations
+
+import cProfile
+import logging
+import pstats
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOP_FUNCTIONS = 25
+
+_ACTIVE_TIMER: ContextVar["StageTimer | None"] = ContextVar(
+    "stage_timer", default=None
+)
+_DB_LISTENER_INSTALLED = False
+
+
+@dataclass(slots=True)
+class StageSpan:
+    name: str
+    wall_ms: float = 0.0
+    db_queries: int = 0
+    db_rows: int = 0
+    reddit_calls: int = 0
+    llm_calls: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "wall_ms": round(self.wall_ms, 1),
+            "db_queries": self.db_queries,
+            "db_rows": self.db_rows,
+            "reddit_calls": self.reddit_calls,
+            "llm_calls": self.llm_calls,
+        }
+
+
+@dataclass(slots=True)
+class StageTimer:
+    clock: Callable[[], float] = time.perf_counter
+    spans: list[StageSpan] = field(default_factory=list)
+    _current: StageSpan | None = None
+    _current_started: float = 0.0
+    _started: float | None = None
+    _total_ms: float = 0.0
+
+    def enter(self, name: str) -> StageSpan:
+        """结束当前阶段并开始新阶段；同名阶段再次进入时累加到同一条记录。"""
+        now = self.clock()
+        self._close(now)
+        if self._started is None:
+            self._started = now
+        span = next((s for s in self.spans if s.name == name), None)
+        if span is None:
+            span = StageSpan(name=name)
+            self.spans.append(span)
+        self._current = span
+        self._current_started = now
+        return span
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageSpan]:
+        span = self.enter(name)
+        try:
+            yield span
+        finally:
+            self.finish()
+
+    def finish(self) -> None:
+        now = self.clock()
+        self._close(now)
+        if self._started is not None:
+            self._total_ms = (now - self._started) * 1000
+
+    def note(self, kind: str, count: int = 1) -> None:
+        span = self._current
+        if span is None:
+            return
+        if kind == "reddit":
+            span.reddit_calls += count
+        elif kind == "llm":
+            span.llm_calls += count
+
+    def note_query(self, rows: int) -> None:
+        span = self._current
+        if span is None:
+            return
+        span.db_queries += 1
+        span.db_rows += max(0, rows)
+
+    def _close(self, now: float) -> None:
+        if self._current is not None:
+            self._current.wall_ms += (now - self._current_started) * 1000
+            self._current = None
+
+    def as_dict(self) -> dict[str, Any]:
+        slowest = max(self.spans, key=lambda s: s.wall_ms, default=None)
+        return {
+            "total_ms": round(self._total_ms, 1),
+            "slowest_stage": slowest.name if slowest is not None else None,
+            "db_queries": sum(s.db_queries for s in self.spans),
+            "reddit_calls": sum(s.reddit_calls for s in self.spans),
+            "llm_calls": sum(s.llm_calls for s in self.spans),
+            "stages": [s.as_dict() for s in self.spans],
+        }
+
+
+def note_stage_call(kind: str, count: int = 1) -> None:
+    """外部调用（Reddit / LLM）计入当前阶段；没有激活的 timer 时不做任何事。"""
+    timer = _ACTIVE_TIMER.get()
+    if timer is not None:
+        timer.note(kind, count)
+
+
+def _after_cursor_execute(
+    _conn: Any,
+    cursor: Any,
+    _statement: str,
+    _parameters: Any,
+    _context: Any,
+    _executemany: bool,
+) -> None:
+    timer = _ACTIVE_TIMER.get()
+    if timer is None:
+        return
+    try:
+        rows = int(getattr(cursor, "rowcount", 0) or 0)
+    except (TypeError, ValueError):
+        rows = 0
+    timer.note_query(rows)
+
+
+def _install_db_listener() -> None:
+    global _DB_LISTENER_INSTALLED
+    if _DB_LISTENER_INSTALLED:
+        return
+    # 挂在 Engine 类上：AsyncEngine 底层的 sync engine 同样触发；asyncpg 的 rowcount 含 SELECT 行数
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _DB_LISTENER_INSTALLED = True
+
+
+@contextmanager
+def activate_stage_timer(timer: StageTimer) -> Iterator[StageTimer]:
+    _install_db_listener()
+    token = _ACTIVE_TIMER.set(timer)
+    try:
+        yield timer
+    finally:
+        _ACTIVE_TIMER.reset(token)
+
+
+def _top_functions(profiler: cProfile.Profile, limit: int) -> list[dict[str, Any]]:
+    stats = pstats.Stats(profiler)
+    rows = sorted(
+        stats.stats.items(),  # type: ignore[attr-defined]
+        key=lambda item: item[1][3],
+        reverse=True,
+    )
+    top: list[dict[str, Any]] = []
+    for (filename, lineno, func), (_cc, calls, total, cumulative, _callers) in rows[:limit]:
+        top.append(
+            {
+                "function": f"{filename}:{lineno}({func})",
+                "calls": calls,
+                "self_ms": round(total * 1000, 1),
+                "cumulative_ms": round(cumulative * 1000, 1),
+            }
+        )
+    return top
+
+
+@contextmanager
+def capture_profile(label: str, *, output_dir: str) -> Iterator[dict[str, Any]]:
+    """对单次运行做 profiling；产物落盘，摘要写进 yield 出去的 dict（失败只记日志）。
+
+    优先 pyinstrument（async 感知，输出 HTML）；未安装时退回 cProfile（.prof + 累计耗时 top N）。
+    注意 cProfile 统计的是整个线程：同一事件循环上并发的其他协程也会被计入。
+    """
+    info: dict[str, Any] = {}
+    try:
+        from pyinstrument import Profiler  # type: ignore[import-not-found]
+    except ImportError:
+        Profiler = None  # type: ignore[assignment,misc]
+
+    sampler: Any = None
+    profiler: cProfile.Profile | None = None
+    if Profiler is not None:
+        sampler = Profiler(async_mode="enabled")
+        sampler.start()
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield info
+    finally:
+        target_dir = Path(output_dir)
+        try:
+            target_dir.mkdir(parents=True, exist_ok=True)
+            if sampler is not None:
+                sampler.stop()
+                path = target_dir / f"{label}.html"
+                path.write_text(sampler.output_html(), encoding="utf-8")
+                info.update({"engine": "pyinstrument", "path": str(path)})
+            elif profiler is not None:
+                profiler.disable()
+                path = target_dir / f"{label}.prof"
+                profiler.dump_stats(str(path))
+                info.update(
+                    {
+                        "engine": "cprofile",
+                        "path": str(path),
+                        "top_cumulative": _top_functions(profiler, PROFILE_TOP_FUNCTIONS),
+                    }
+                )
+        except Exception as exc:
+            logger.warning("profile capture failed label=%s: %s", label, exc)
+            info["error"] = str(exc)[:200]
+
+
+__all__ = [
+    "StageSpan",
+    "StageTimer",
+    "activate_stage_timer",
+    "capture_profile",
+    "note_stage_call",
+]
@@ -3,14 +3,18 @@ Redis-backed task status cache used for near-real-time progress polling.
 
 The cache mirrors PostgreSQL state transitions but allows the API layer
 to serve quick responses without hitting the database for every poll.
+Every `set_status` is also published to a per-task channel so SSE streams
+can be pushed instead of polling (see `TaskStatusCache.subscribe`).
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
 import uuid
+import weakref
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from typing import (
@@ -31,6 +35,8 @@ DEFAULT_STATUS_CACHE_URL = os.getenv(
     "TASK_STATUS_REDIS_URL", "redis://localhost:6379/3"
 )
 DEFAULT_STATUS_TTL_SECONDS = int(os.getenv("TASK_STATUS_TTL_SECONDS", "3600"))
+# 每个 SSE 订阅者的待投递队列上限；满了丢最旧的（只有最新状态有意义）
+SUBSCRIBER_QUEUE_SIZE = 16
 
 if TYPE_CHECKING:
     from app.models.task import TaskStatus as TaskStatusEnum
@@ -88,6 +94,160 @@ class RedisClient(Protocol[T]):
     async def delete(self, key: str) -> Any:
         ...
 
+    async def publish(self, channel: str, message: T) -> Any:
+        ...
+
+    def pubsub(self, **kwargs: Any) -> Any:
+        ...
+
+
+class TaskStatusSubscriptionClosed(RuntimeError):
+    """Raised when the shared pub/sub connection dies; callers fall back to polling."""
+
+
+_HUB_CLOSED = object()
+
+
+class _StatusEventHub:
+    """
+    One pub/sub connection per process (per event loop), fanned out to
+    per-stream queues, so N open SSE streams cost one Redis connection
+    instead of N.
+    """
+
+    def __init__(self, redis: RedisClient[str]) -> None:
+        self._redis = redis
+        self._pubsub: Any = None
+        self._reader: asyncio.Task[None] | None = None
+        self._listeners: Dict[str, set[asyncio.Queue[object]]] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def channel_count(self) -> int:
+        return len(self._listeners)
+
+    async def add(self, channel: str) -> asyncio.Queue[object]:
+        async with self._lock:
+            if self._pubsub is None:
+                self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            listeners = self._listeners.get(channel)
+            if listeners is None:
+                await self._pubsub.subscribe(channel)
+                listeners = self._listeners[channel] = set()
+            queue: asyncio.Queue[object] = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+            listeners.add(queue)
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read_loop())
+            return queue
+
+    async def remove(self, channel: str, queue: asyncio.Queue[object]) -> None:
+        async with self._lock:
+            listeners = self._listeners.get(channel)
+            if listeners is None:
+                return
+            listeners.discard(queue)
+            if listeners:
+                return
+            del self._listeners[channel]
+            try:
+                if self._pubsub is not None:
+                    await self._pubsub.unsubscribe(channel)
+            except Exception as exc:  # pragma: no cover - depends on Redis availability
+                logger.warning("Unable to unsubscribe task status channel %s: %s", channel, exc)
+            if not self._listeners:
+                await self._shutdown()
+
+    async def _shutdown(self) -> None:
+        reader, self._reader = self._reader, None
+        if reader is not None and reader is not asyncio.current_task():
+            reader.cancel()
+            try:
+                await reader
+            except (asyncio.CancelledError, Exception):
+                pass
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            try:
+                await pubsub.aclose()
+            except Exception:  # pragma: no cover - best effort
+                pass
+
+    async def _read_loop(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Task status pub/sub connection lost: %s", exc)
+                await self._fail_all()
+                return
+            if not message or message.get("type") != "message":
+                continue
+            channel = message.get("channel")
+            if isinstance(channel, bytes):
+                channel = channel.decode("utf-8")
+            for queue in tuple(self._listeners.get(str(channel), ())):
+                _offer_latest(queue, message.get("data"))
+
+    async def _fail_all(self) -> None:
+        async with self._lock:
+            for listeners in self._listeners.values():
+                for queue in listeners:
+                    _offer_latest(queue, _HUB_CLOSED)
+            self._listeners.clear()
+            self._reader = None
+            pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            try:
+                await pubsub.aclose()
+            except Exception:  # pragma: no cover - best effort
+                pass
+
+
+def _offer_latest(queue: asyncio.Queue[object], item: object) -> None:
+    if queue.full():
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:  # pragma: no cover - single consumer
+            pass
+    queue.put_nowait(item)
+
+
+class TaskStatusSubscription:
+    """Status updates for one task, pushed through the shared pub/sub hub."""
+
+    def __init__(self, hub: _StatusEventHub, channel: str, queue: asyncio.Queue[object]) -> None:
+        self._hub = hub
+        self._channel = channel
+        self._queue = queue
+        self._closed = False
+
+    async def next(self, timeout: float) -> Optional[TaskStatusPayload]:
+        """Next pushed payload, or None when nothing arrived within `timeout` seconds."""
+        try:
+            item = await asyncio.wait_for(self._queue.get(), timeout=max(0.0, timeout))
+        except asyncio.TimeoutError:
+            return None
+        if item is _HUB_CLOSED:
+            self._closed = True
+            raise TaskStatusSubscriptionClosed(self._channel)
+        if isinstance(item, bytes):
+            item = item.decode("utf-8")
+        try:
+            return TaskStatusPayload.decode(str(item))
+        except (ValueError, KeyError, TypeError) as exc:
+            logger.warning("Dropping malformed task status event on %s: %s", self._channel, exc)
+            return None
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        await self._hub.remove(self._channel, self._queue)
+
 
 class TaskStatusCache:
     """Thin wrapper around Redis for task status entries."""
@@ -95,6 +255,9 @@ class TaskStatusCache:
     def __init__(self, redis_url: str = DEFAULT_STATUS_CACHE_URL) -> None:
         client = Redis.from_url(redis_url, decode_responses=True)
         self._redis: RedisClient[str] = cast(RedisClient[str], client)
+        self._hubs: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _StatusEventHub]" = (
+            weakref.WeakKeyDictionary()
+        )
 
     @property
     def redis(self) -> RedisClient[str]:
@@ -108,10 +271,32 @@ class TaskStatusCache:
         key = self._build_key(payload.task_id)
         if payload.updated_at is None:
             payload.updated_at = datetime.now(timezone.utc).isoformat()
+        encoded = payload.encode()
         try:
-            await self.redis.set(key, payload.encode(), ex=ttl_seconds)
+            await self.redis.set(key, encoded, ex=ttl_seconds)
         except Exception as exc:  # pragma: no cover - depends on Redis availability
             logger.warning("Unable to persist task status to Redis: %s", exc)
+            return
+        try:
+            await self.redis.publish(self._build_channel(payload.task_id), encoded)
+        except Exception as exc:  # pragma: no cover - depends on Redis availability
+            # 推送失败不影响状态落地：SSE 会在兜底轮询里读到
+            logger.warning("Unable to publish task status event: %s", exc)
+
+    async def subscribe(self, task_id: str) -> TaskStatusSubscription:
+        """
+        Subscribe to status updates published by `set_status` for one task.
+
+        Raises whatever Redis raises when the channel cannot be subscribed;
+        callers are expected to fall back to polling `get_status`.
+        """
+        loop = asyncio.get_running_loop()
+        hub = self._hubs.get(loop)
+        if hub is None:
+            hub = self._hubs[loop] = _StatusEventHub(self.redis)
+        channel = self._build_channel(task_id)
+        queue = await hub.add(channel)
+        return TaskStatusSubscription(hub, channel, queue)
 
     async def get_status(
         self,
@@ -153,6 +338,10 @@ class TaskStatusCache:
     def _build_key(task_id: str) -> str:
         return f"task-status:{task_id}"
 
+    @staticmethod
+    def _build_channel(task_id: str) -> str:
+        return f"task-status-events:{task_id}"
+
     async def sync_to_db(
         self, payload: TaskStatusPayload, session: AsyncSession
     ) -> None:
@@ -229,4 +418,9 @@ class TaskStatusCache:
         return mapping.get(status, "")
 
 
-__all__ = ["TaskStatusCache", "TaskStatusPayload"]
+__all__ = [
+    "TaskStatusCache",
+    "TaskStatusPayload",
+    "TaskStatusSubscription",
+    "TaskStatusSubscriptionClosed",
+]
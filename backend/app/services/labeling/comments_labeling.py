@@ -7,10 +7,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.comment import ContentLabel, ContentEntity, ContentType, EntityType
 import os
-import re
 from app.services.semantic.text_classifier import classify_category_aspect
 from pathlib import Path
 from app.core.config import get_settings
+from app.services.semantic.term_automaton import TermAutomaton, compile_term_automaton
 from app.services.semantic.unified_lexicon import UnifiedLexicon
 
 
@@ -90,11 +90,11 @@ BRAND_PATTERNS: Tuple[Tuple[str, EntityType], ...] = _load_brand_patterns()
 
 def _unified_enabled() -> bool:
     return os.getenv("ENABLE_UNIFIED_LEXICON", "false").strip().lower() in {"1", "true", "yes"}
-_LEX_BRAND_PATS: list[tuple[str, re.Pattern[str]]] | None = None
+_LEX_BRAND_AUTOMATON: TermAutomaton | None = None
 _LEX_BRAND_MTIME: float | None = None
 
 def _ensure_brand_patterns() -> None:
-    global _LEX_BRAND_PATS
+    global _LEX_BRAND_AUTOMATON
     if not _unified_enabled():
         return
     global _LEX_BRAND_MTIME
@@ -105,14 +105,14 @@ def _ensure_brand_patterns() -> None:
         cfg_path = os.getenv("SEMANTIC_LEXICON_PATH", "backend/config/semantic_sets/unified_lexicon.yml")
         p = Path(cfg_path)
         mtime = p.stat().st_mtime if p.exists() else None
-        if _LEX_BRAND_PATS is not None and _LEX_BRAND_MTIME == mtime:
+        if _LEX_BRAND_AUTOMATON is not None and _LEX_BRAND_MTIME == mtime:
             return
         lex = UnifiedLexicon(p)
         brands = lex.get_brands()
-        _LEX_BRAND_PATS = lex.get_patterns_for_matching(brands)
+        _LEX_BRAND_AUTOMATON = lex.get_automaton_for_matching(brands)
         _LEX_BRAND_MTIME = mtime
     except Exception:
-        _LEX_BRAND_PATS = []
+        _LEX_BRAND_AUTOMATON = compile_term_automaton([])
 
 
 def _extract_entities_from_text(text: str) -> list[tuple[str, EntityType]]:
@@ -121,10 +121,11 @@ def _extract_entities_from_text(text: str) -> list[tuple[str, EntityType]]:
     if _unified_enabled():
         _ensure_brand_patterns()
         try:
-            for name, pat in (_LEX_BRAND_PATS or []):
-                if pat.search(t):
+            automaton = _LEX_BRAND_AUTOMATON
+            if automaton is not None:
+                for index in sorted(automaton.matched(t)):
                     # 返回统一小写，便于断言与后续归一化
-                    out.append((name.lower(), EntityType.BRAND))
+                    out.append((automaton.patterns[index].text.lower(), EntityType.BRAND))
         except Exception:
             pass
     else:
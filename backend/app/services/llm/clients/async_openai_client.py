@@ -0,0 +1,228 @@
+"""
+Async-native OpenAI-compatible chat client.
+
+- generate() goes straight through a shared httpx.AsyncClient (no to_thread):
+  one keep-alive connection pool per event loop, HTTP/2 when `h2` is installed
+- 429 / 5xx / transport errors are retried with full-jitter exponential backoff,
+  honouring Retry-After
+- summarize_many() runs the summarize prompts concurrently under a bound
+- the sync surface (summarize / normalize / _chat_completion) is inherited
+  unchanged from OpenAIChatClient, so it is a drop-in replacement
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import random
+import weakref
+from typing import Any, Sequence
+
+import httpx
+
+from app.core.config import get_settings
+from app.services.infrastructure.stage_timing import note_stage_call
+from app.services.llm.clients.openai_client import OpenAIChatClient
+from app.services.llm.interfaces import LLMClientError
+from app.services.llm.response_cache import LLMResponseCache
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_KEEPALIVE_EXPIRY_SECONDS = 30.0
+_DEFAULT_SUMMARIZE_CONCURRENCY = 8
+
+# httpx.AsyncClient 绑定创建它的事件循环：Celery 每个任务一个新 loop，按 loop 各建一个池
+_POOLS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def shared_llm_http_client() -> httpx.AsyncClient:
+    """当前事件循环共享的 LLM HTTP 连接池（所有 base_url 共用，httpx 按 origin 复用连接）。"""
+    loop = asyncio.get_running_loop()
+    client = _POOLS.get(loop)
+    if client is None or client.is_closed:
+        max_connections = max(1, int(get_settings().llm_http_max_connections))
+        client = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        _POOLS[loop] = client
+    return client
+
+
+async def close_llm_http_pools() -> None:
+    """关闭当前事件循环的连接池（应用 shutdown 时调用）。"""
+    loop = asyncio.get_running_loop()
+    client = _POOLS.pop(loop, None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    raw = (response.headers.get("retry-after") or "").strip()
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return None
+
+
+class AsyncOpenAIChatClient(OpenAIChatClient):
+    def __init__(
+        self,
+        model: str,
+        *,
+        timeout: float = 8.0,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        response_cache: LLMResponseCache | None = None,
+        max_retries: int | None = None,
+        backoff_base_seconds: float = 0.5,
+        backoff_max_seconds: float = 8.0,
+    ) -> None:
+        super().__init__(
+            model,
+            timeout=timeout,
+            api_key=api_key,
+            base_url=base_url,
+            response_cache=response_cache,
+        )
+        self._max_retries = max(
+            0,
+            int(max_retries if max_retries is not None else get_settings().llm_http_max_retries),
+        )
+        self._backoff_base = max(0.0, float(backoff_base_seconds))
+        self._backoff_max = max(self._backoff_base, float(backoff_max_seconds))
+
+    # --------------- Public API ---------------
+
+    async def generate(
+        self,
+        prompt: str | list[dict[str, str]],
+        *,
+        response_format: dict[str, str] | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+    ) -> str:
+        messages = [{"role": "user", "content": prompt}] if isinstance(prompt, str) else prompt
+        payload: dict[str, Any] = {
+            "model": self._model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        if response_format:
+            payload["response_format"] = response_format
+        return await self._post_chat(payload)
+
+    async def summarize_many(
+        self,
+        texts: Sequence[str],
+        *,
+        max_chars: int = 48,
+        max_concurrency: int = _DEFAULT_SUMMARIZE_CONCURRENCY,
+    ) -> list[str]:
+        """并发版 summarize：结果顺序与输入一致，任一条失败即抛出 LLMClientError。"""
+        semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+        max_tokens = max(64, max_chars * 3)
+
+        async def _one(text: str) -> str:
+            prompt = self._build_summarize_prompt(text, max_chars=max_chars)
+            key = None
+            if self._response_cache is not None:
+                key = self._completion_cache_key(
+                    "summarize", prompt, max_tokens=max_tokens, temperature=0.2
+                )
+                # SQLite 读写放到线程里，不阻塞同一事件循环上的其它并发请求
+                cached = await asyncio.to_thread(self._response_cache.get, key)
+                if isinstance(cached, str):
+                    return self._post_summarize(cached, max_chars)
+            async with semaphore:
+                content = await self.generate(prompt, temperature=0.2, max_tokens=max_tokens)
+            if key is not None and content:
+                await asyncio.to_thread(
+                    self._response_cache.set, key, content, kind="summarize", model=self._model
+                )
+            return self._post_summarize(content, max_chars)
+
+        return list(await asyncio.gather(*(_one(text) for text in texts)))
+
+    # --------------- Transport ---------------
+
+    def _backoff_delay(self, attempt: int, retry_after: float | None) -> float:
+        ceiling = min(self._backoff_max, self._backoff_base * (2**attempt))
+        delay = random.uniform(0.0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self._backoff_max))
+        return delay
+
+    async def _post_chat(self, payload: dict[str, Any]) -> str:
+        if not self._api_key:
+            raise LLMClientError("openai", "missing API key")
+        note_stage_call("llm")
+        headers = {"Authorization": f"Bearer {self._api_key}"}
+        if self._org:
+            headers["OpenAI-Organization"] = self._org
+        url = f"{self._base}/chat/completions"
+
+        last_error: LLMClientError | None = None
+        for attempt in range(self._max_retries + 1):
+            retry_after: float | None = None
+            try:
+                response = await shared_llm_http_client().post(
+                    url, json=payload, headers=headers, timeout=self._timeout
+                )
+            except httpx.TransportError as exc:
+                last_error = LLMClientError("openai", str(exc) or exc.__class__.__name__)
+            else:
+                if response.status_code < 400:
+                    return self._parse_content(response)
+                last_error = LLMClientError(
+                    "openai",
+                    response.text[:300] or "HTTP request failed",
+                    status_code=response.status_code,
+                )
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    raise last_error
+                retry_after = _retry_after_seconds(response)
+
+            if attempt >= self._max_retries:
+                break
+            delay = self._backoff_delay(attempt, retry_after)
+            logger.warning(
+                "OpenAI async request retry model=%s attempt=%s delay=%.2fs error=%s",
+                self._model,
+                attempt + 1,
+                delay,
+                last_error,
+            )
+            await asyncio.sleep(delay)
+
+        assert last_error is not None
+        raise last_error
+
+    @staticmethod
+    def _parse_content(response: httpx.Response) -> str:
+        try:
+            data = response.json()
+        except ValueError as exc:
+            raise LLMClientError("openai", "invalid JSON response", status_code=response.status_code) from exc
+        choices = data.get("choices") or [{}]
+        content = (choices[0].get("message") or {}).get("content", "")
+        return str(content or "")
+
+
+__all__ = [
+    "AsyncOpenAIChatClient",
+    "RETRYABLE_STATUS_CODES",
+    "close_llm_http_pools",
+    "shared_llm_http_client",
+]
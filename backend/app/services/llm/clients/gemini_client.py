@@ -8,6 +8,7 @@ import urllib.error
 import urllib.request
 from typing import Sequence
 
+from app.services.infrastructure.stage_timing import note_stage_call
 from app.services.llm.interfaces import LLMClientError
 
 logger = logging.getLogger(__name__)
@@ -76,6 +77,7 @@ class GeminiChatClient:
     ) -> str:
         if not self._api_key:
             raise LLMClientError("gemini", "missing API key")
+        note_stage_call("llm")
 
         payload: dict[str, object] = {
             "contents": [{"parts": [{"text": prompt_text}]}],
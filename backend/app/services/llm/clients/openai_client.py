@@ -25,7 +25,9 @@ try:  # Prefer the official SDK if available (>=1.0)
 except Exception:  # pragma: no cover - optional dependency
     OpenAI = None  # type: ignore
 
+from app.services.infrastructure.stage_timing import note_stage_call
 from app.services.llm.interfaces import LLMClient, LLMClientError
+from app.services.llm.response_cache import LLMResponseCache, build_response_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -51,7 +53,9 @@ class OpenAIChatClient(LLMClient):
         timeout: float = 8.0,
         api_key: str | None = None,
         base_url: str | None = None,
+        response_cache: LLMResponseCache | None = None,
     ) -> None:
+        self._response_cache = response_cache
         self._base = (
             base_url or os.getenv("OPENAI_BASE") or "https://api.openai.com/v1"
         ).rstrip("/")
@@ -108,17 +112,61 @@ class OpenAIChatClient(LLMClient):
         outputs: List[str] = []
         for text in texts:
             prompt = self._build_summarize_prompt(text, max_chars=max_chars)
-            content = self._chat_completion(
-                prompt, max_tokens=max(64, max_chars * 3), temperature=0.2
+            content = self._cached_completion(
+                "summarize", prompt, max_tokens=max(64, max_chars * 3), temperature=0.2
             )
             outputs.append(self._post_summarize(content, max_chars))
         return outputs
 
     def normalize(self, name: str, *, candidates: Sequence[str]) -> str | None:
         prompt = self._build_normalize_prompt(name, candidates)
-        content = self._chat_completion(prompt, max_tokens=24, temperature=0.1)
+        content = self._cached_completion("normalize", prompt, max_tokens=24, temperature=0.1)
         return self._post_normalize(content, candidates)
 
+    def _cached_completion(
+        self,
+        kind: str,
+        messages: list[dict[str, str]],
+        *,
+        max_tokens: int,
+        temperature: float,
+    ) -> str:
+        """summarize / normalize 是确定性的短 prompt：按完整消息内容寻址缓存原始回复。"""
+        if self._response_cache is None:
+            return self._chat_completion(messages, max_tokens=max_tokens, temperature=temperature)
+        key = self._completion_cache_key(
+            kind, messages, max_tokens=max_tokens, temperature=temperature
+        )
+        cached = self._response_cache.get(key)
+        if isinstance(cached, str):
+            return cached
+        content = self._chat_completion(messages, max_tokens=max_tokens, temperature=temperature)
+        if content:
+            self._response_cache.set(key, content, kind=kind, model=self._model)
+        return content
+
+    def _completion_cache_key(
+        self,
+        kind: str,
+        messages: list[dict[str, str]],
+        *,
+        max_tokens: int,
+        temperature: float,
+    ) -> str:
+        return build_response_cache_key(
+            kind=kind,
+            model=self._model,
+            template_version="chat-v1",
+            payload={
+                "messages": [
+                    {"role": m.get("role"), "content": " ".join((m.get("content") or "").split())}
+                    for m in messages
+                ],
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+            },
+        )
+
     # --------------- Prompt craft ---------------
 
     @staticmethod
@@ -171,6 +219,7 @@ class OpenAIChatClient(LLMClient):
         temperature: float,
         response_format: dict[str, str] | None = None,
     ) -> str:
+        note_stage_call("llm")
         sdk_error: Exception | None = None
         if self._sdk is not None:
             try:
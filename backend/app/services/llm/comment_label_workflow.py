@@ -8,6 +8,7 @@ from app.services.llm.comment_label_planner import IncrementalCommentLabelPlan
 from app.services.llm.label_batch_support import (
     LLMLabelRunStats,
     build_comment_item,
+    label_pipeline_limits,
     process_label_batches,
     should_use_long_lab,
 )
@@ -35,6 +36,8 @@ class IncrementalCommentLabelWorkflowDeps:
     session_factory: Callable[[], Any]
     labeler_factory: Callable[..., Any]
     persist_comment_analysis: Callable[..., Awaitable[None]]
+    # 可选：整批一次 upsert；未提供时退回逐条 savepoint 落库
+    persist_comment_analyses: Callable[..., Awaitable[int]] | None = None
 
 
 async def run_incremental_comment_label_workflow(
@@ -143,6 +146,19 @@ async def run_incremental_comment_label_workflow(
                 "task_scope": "incremental_only",
             }
 
+        max_in_flight, token_budget = label_pipeline_limits(settings)
+
+        def _bulk_persist(labeler: Any) -> Callable[[list[dict[str, Any]]], Awaitable[int]] | None:
+            bulk = deps.persist_comment_analyses
+            if bulk is None:
+                return None
+            return lambda results: bulk(
+                session=session,
+                labeler=labeler,
+                prompt_version=settings.llm_label_prompt_version,
+                results=results,
+            )
+
         await process_label_batches(
             session=session,
             items=long_items,
@@ -175,6 +191,9 @@ async def run_incremental_comment_label_workflow(
                 input_chars=single_result[2],
                 output_chars=single_result[3],
             ),
+            persist_many=_bulk_persist(core_labeler),
+            max_in_flight=max_in_flight,
+            token_budget=token_budget,
         )
 
         await process_label_batches(
@@ -209,8 +228,12 @@ async def run_incremental_comment_label_workflow(
                 input_chars=single_result[2],
                 output_chars=single_result[3],
             ),
+            persist_many=_bulk_persist(lab_labeler),
+            max_in_flight=max_in_flight,
+            token_budget=token_budget,
         )
 
+    stats.add_cache_hits(core_labeler, lab_labeler)
     result = stats.to_result()
     result["task_scope"] = "incremental_only"
     result["rule_filtered"] = prefilter_stats.filtered_short
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from collections.abc import Awaitable, Callable, Sequence
 from dataclasses import dataclass, field
 from typing import Any
@@ -14,6 +16,11 @@ BatchLabelFn = Callable[[Sequence[dict[str, Any]]], Awaitable[list[dict[str, Any
 SingleLabelFn = Callable[[dict[str, Any]], Awaitable[SingleLabelResult]]
 PersistBatchFn = Callable[[dict[str, Any]], Awaitable[None]]
 PersistSingleFn = Callable[[dict[str, Any], SingleLabelResult], Awaitable[None]]
+# 一批结果一次落库；入参统一为 batch 结果形状 {id, analysis, score, input_chars, output_chars}
+PersistManyFn = Callable[[list[dict[str, Any]]], Awaitable[Any]]
+
+_CHARS_PER_TOKEN = 4
+_PROMPT_OVERHEAD_TOKENS = 300
 
 
 def chunk_items(items: Sequence[dict[str, Any]], size: int) -> list[list[dict[str, Any]]]:
@@ -85,12 +92,17 @@ class LLMLabelRunStats:
     fallback_batches: int = 0
     llm_failures: int = 0
     persist_failures: int = 0
+    # 命中 LLM 响应缓存、没有真正发起请求的条数
+    cache_hits: int = 0
     degraded_reasons: list[str] = field(default_factory=list)
 
     def mark_degraded(self, reason: str) -> None:
         if reason not in self.degraded_reasons:
             self.degraded_reasons.append(reason)
 
+    def add_cache_hits(self, *labelers: Any) -> None:
+        self.cache_hits += sum(int(getattr(labeler, "cache_hits", 0) or 0) for labeler in labelers)
+
     def to_result(self) -> dict[str, Any]:
         if self.processed == 0 and (self.llm_failures > 0 or self.persist_failures > 0):
             status = "failed"
@@ -105,10 +117,88 @@ class LLMLabelRunStats:
             "fallback_batches": self.fallback_batches,
             "llm_failures": self.llm_failures,
             "persist_failures": self.persist_failures,
+            "cache_hits": self.cache_hits,
             "degraded_reasons": self.degraded_reasons,
         }
 
 
+class TokenBudget:
+    """每分钟 token 预算（令牌桶）：桶容量 = 一分钟额度，按秒匀速回填。
+
+    单次申请超过桶容量时按桶容量计，避免超大批次永远拿不到额度。
+    """
+
+    def __init__(
+        self,
+        tokens_per_minute: int,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ) -> None:
+        self._capacity = float(max(1, int(tokens_per_minute)))
+        self._rate = self._capacity / 60.0
+        self._available = self._capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated_at = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int) -> None:
+        needed = min(float(max(0, tokens)), self._capacity)
+        # 加锁保证先到先得，后来的批次不会插队抢走回填的额度
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._available = min(
+                    self._capacity,
+                    self._available + (now - self._updated_at) * self._rate,
+                )
+                self._updated_at = now
+                if self._available >= needed:
+                    self._available -= needed
+                    return
+                await self._sleep((needed - self._available) / self._rate)
+
+
+def label_pipeline_limits(settings: Any) -> tuple[int, TokenBudget | None]:
+    """从配置读取打标流水线的在途批次数与 token 预算（一次任务共用一个预算）。"""
+    max_in_flight = max(1, int(getattr(settings, "llm_label_concurrency", 1) or 1))
+    tokens_per_minute = int(getattr(settings, "llm_label_tokens_per_minute", 0) or 0)
+    token_budget = TokenBudget(tokens_per_minute) if tokens_per_minute > 0 else None
+    return max_in_flight, token_budget
+
+
+def estimate_label_tokens(items: Sequence[dict[str, Any]]) -> int:
+    """粗估一次打标请求的 token 数：文本按 4 字符/token，外加每条 prompt 固定开销。"""
+    chars = 0
+    for item in items:
+        for value in item.values():
+            if isinstance(value, str):
+                chars += len(value)
+            elif isinstance(value, list):
+                chars += sum(len(str(v)) for v in value)
+    return chars // _CHARS_PER_TOKEN + _PROMPT_OVERHEAD_TOKENS * len(items)
+
+
+@dataclass(slots=True)
+class _BatchOutcome:
+    batch: list[dict[str, Any]]
+    results: list[dict[str, Any]] = field(default_factory=list)
+    single_results: list[tuple[dict[str, Any], SingleLabelResult]] = field(default_factory=list)
+    fallback: bool = False
+
+
+def _single_as_batch_result(item: dict[str, Any], single_result: SingleLabelResult) -> dict[str, Any]:
+    analysis, score, input_chars, output_chars = single_result
+    return {
+        "id": item.get("id"),
+        "analysis": analysis,
+        "score": score,
+        "input_chars": input_chars,
+        "output_chars": output_chars,
+    }
+
+
 async def process_label_batches(
     *,
     session: Any,
@@ -120,86 +210,209 @@ async def process_label_batches(
     single_label: SingleLabelFn,
     persist_batch: PersistBatchFn,
     persist_single: PersistSingleFn,
+    persist_many: PersistManyFn | None = None,
+    max_in_flight: int = 1,
+    token_budget: TokenBudget | None = None,
 ) -> None:
-    for batch in chunk_items(items, batch_size):
-        batch_processed = 0
-        request_failed = False
+    """分批打标并落库。
+
+    - LLM 调用最多 max_in_flight 个批次同时在途（1 = 旧的逐批串行）
+    - 落库仍在当前协程里按批次完成顺序串行执行（AsyncSession 不能并发使用）
+    - 提供 persist_many 时每批一次批量 upsert（一个 savepoint）；批量失败再逐条重试，定位坏行
+    """
+    window = max(1, int(max_in_flight))
+    pending: set[asyncio.Task[_BatchOutcome]] = set()
+    try:
+        for batch in chunk_items(items, batch_size):
+            if len(pending) >= window:
+                pending = await _drain_completed(
+                    pending,
+                    session=session,
+                    stats=stats,
+                    label_kind=label_kind,
+                    persist_batch=persist_batch,
+                    persist_single=persist_single,
+                    persist_many=persist_many,
+                )
+            pending.add(
+                asyncio.create_task(
+                    _label_batch(
+                        batch,
+                        label_kind=label_kind,
+                        stats=stats,
+                        batch_label=batch_label,
+                        single_label=single_label,
+                        token_budget=token_budget,
+                    )
+                )
+            )
+        while pending:
+            pending = await _drain_completed(
+                pending,
+                session=session,
+                stats=stats,
+                label_kind=label_kind,
+                persist_batch=persist_batch,
+                persist_single=persist_single,
+                persist_many=persist_many,
+            )
+    finally:
+        # 落库出错向上抛时，别把还在途的 LLM 请求留在后台
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _drain_completed(
+    pending: set[asyncio.Task[_BatchOutcome]],
+    *,
+    session: Any,
+    stats: LLMLabelRunStats,
+    label_kind: str,
+    persist_batch: PersistBatchFn,
+    persist_single: PersistSingleFn,
+    persist_many: PersistManyFn | None,
+) -> set[asyncio.Task[_BatchOutcome]]:
+    done, still_pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    for task in done:
+        await _persist_outcome(
+            task.result(),
+            session=session,
+            stats=stats,
+            label_kind=label_kind,
+            persist_batch=persist_batch,
+            persist_single=persist_single,
+            persist_many=persist_many,
+        )
+    return still_pending
+
+
+async def _label_batch(
+    batch: list[dict[str, Any]],
+    *,
+    label_kind: str,
+    stats: LLMLabelRunStats,
+    batch_label: BatchLabelFn,
+    single_label: SingleLabelFn,
+    token_budget: TokenBudget | None,
+) -> _BatchOutcome:
+    outcome = _BatchOutcome(batch=batch)
+    request_failed = False
+    if token_budget is not None:
+        await token_budget.acquire(estimate_label_tokens(batch))
+    try:
+        outcome.results = list(await batch_label(batch) or [])
+    except LLMClientError as exc:
+        request_failed = True
+        stats.llm_failures += len(batch)
+        stats.mark_degraded("batch_llm_request_failed")
+        logger.warning("%s batch request failed size=%s", label_kind, len(batch), exc_info=exc)
+    except Exception as exc:
+        request_failed = True
+        stats.llm_failures += len(batch)
+        stats.mark_degraded("batch_label_unexpected_error")
+        logger.warning("%s batch call failed size=%s", label_kind, len(batch), exc_info=exc)
+
+    if outcome.results:
+        return outcome
+
+    outcome.fallback = True
+    stats.fallback_batches += 1
+    if not request_failed:
+        stats.mark_degraded("batch_empty_fallback")
+    for item in batch:
+        if token_budget is not None:
+            await token_budget.acquire(estimate_label_tokens([item]))
         try:
-            results = await batch_label(batch)
+            single_result = await single_label(item)
         except LLMClientError as exc:
-            request_failed = True
-            results = []
-            stats.llm_failures += len(batch)
-            stats.mark_degraded("batch_llm_request_failed")
-            logger.warning("%s batch request failed size=%s", label_kind, len(batch), exc_info=exc)
+            stats.llm_failures += 1
+            stats.mark_degraded("single_llm_request_failed")
+            logger.warning(
+                "%s single fallback request failed item_id=%s",
+                label_kind,
+                item.get("id"),
+                exc_info=exc,
+            )
+            continue
         except Exception as exc:
-            request_failed = True
-            results = []
-            stats.llm_failures += len(batch)
-            stats.mark_degraded("batch_label_unexpected_error")
-            logger.warning("%s batch call failed size=%s", label_kind, len(batch), exc_info=exc)
-
-        if not results:
-            stats.fallback_batches += 1
-            if not request_failed:
-                stats.mark_degraded("batch_empty_fallback")
-            for item in batch:
-                try:
-                    single_result = await single_label(item)
-                except LLMClientError as exc:
-                    stats.llm_failures += 1
-                    stats.mark_degraded("single_llm_request_failed")
-                    logger.warning(
-                        "%s single fallback request failed item_id=%s",
-                        label_kind,
-                        item.get("id"),
-                        exc_info=exc,
-                    )
-                    continue
-                except Exception as exc:
-                    stats.llm_failures += 1
-                    stats.mark_degraded("single_label_unexpected_error")
-                    logger.warning(
-                        "%s single fallback call failed item_id=%s",
-                        label_kind,
-                        item.get("id"),
-                        exc_info=exc,
-                    )
-                    continue
-
-                try:
-                    async with session.begin_nested():
-                        await persist_single(item, single_result)
-                    batch_processed += 1
-                except Exception as exc:
-                    stats.persist_failures += 1
-                    stats.mark_degraded("persist_failed")
-                    logger.warning(
-                        "%s single fallback persist failed item_id=%s",
-                        label_kind,
-                        item.get("id"),
-                        exc_info=exc,
-                    )
-
-            await _commit_batch(session=session, stats=stats, label_kind=label_kind, batch_processed=batch_processed)
+            stats.llm_failures += 1
+            stats.mark_degraded("single_label_unexpected_error")
+            logger.warning(
+                "%s single fallback call failed item_id=%s",
+                label_kind,
+                item.get("id"),
+                exc_info=exc,
+            )
             continue
+        outcome.single_results.append((item, single_result))
+    return outcome
 
-        for result in results:
+
+async def _persist_outcome(
+    outcome: _BatchOutcome,
+    *,
+    session: Any,
+    stats: LLMLabelRunStats,
+    label_kind: str,
+    persist_batch: PersistBatchFn,
+    persist_single: PersistSingleFn,
+    persist_many: PersistManyFn | None,
+) -> None:
+    batch_processed = 0
+    if persist_many is not None:
+        rows = outcome.results or [
+            _single_as_batch_result(item, single_result)
+            for item, single_result in outcome.single_results
+        ]
+        if rows:
             try:
                 async with session.begin_nested():
-                    await persist_batch(result)
-                batch_processed += 1
+                    await persist_many(rows)
+                batch_processed = len(rows)
             except Exception as exc:
-                stats.persist_failures += 1
-                stats.mark_degraded("persist_failed")
                 logger.warning(
-                    "%s batch persist failed item_id=%s",
+                    "%s bulk persist failed size=%s, retrying row by row",
                     label_kind,
-                    result.get("id"),
+                    len(rows),
                     exc_info=exc,
                 )
+        if batch_processed or not rows:
+            await _commit_batch(session=session, stats=stats, label_kind=label_kind, batch_processed=batch_processed)
+            return
+
+    for item, single_result in outcome.single_results:
+        try:
+            async with session.begin_nested():
+                await persist_single(item, single_result)
+            batch_processed += 1
+        except Exception as exc:
+            stats.persist_failures += 1
+            stats.mark_degraded("persist_failed")
+            logger.warning(
+                "%s single fallback persist failed item_id=%s",
+                label_kind,
+                item.get("id"),
+                exc_info=exc,
+            )
+
+    for result in outcome.results:
+        try:
+            async with session.begin_nested():
+                await persist_batch(result)
+            batch_processed += 1
+        except Exception as exc:
+            stats.persist_failures += 1
+            stats.mark_degraded("persist_failed")
+            logger.warning(
+                "%s batch persist failed item_id=%s",
+                label_kind,
+                result.get("id"),
+                exc_info=exc,
+            )
 
-        await _commit_batch(session=session, stats=stats, label_kind=label_kind, batch_processed=batch_processed)
+    await _commit_batch(session=session, stats=stats, label_kind=label_kind, batch_processed=batch_processed)
 
 
 async def _commit_batch(
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
 from typing import Any, Awaitable, Callable
 
@@ -98,9 +99,110 @@ async def persist_incremental_comment_analysis(
     )
 
 
+def _score_dict(score: Any) -> dict[str, Any]:
+    return dict(score) if isinstance(score, Mapping) else dict(vars(score))
+
+
+def _merge_term_analyses(analyses: Sequence[Mapping[str, Any]]) -> dict[str, Any]:
+    """把一批 analysis 的词条字段合并成一份，整批只需同步一次语义词。"""
+    pains: list[Any] = []
+    aspects: list[Any] = []
+    brands: list[Any] = []
+    for analysis in analyses:
+        pains.extend(analysis.get("pain_tags") or [])
+        aspects.extend(analysis.get("aspect_tags") or [])
+        entities = analysis.get("entities") or {}
+        brands.extend(entities.get("known") or [])
+        brands.extend(entities.get("new") or [])
+    return {
+        "pain_tags": pains,
+        "aspect_tags": aspects,
+        "entities": {"known": brands, "new": []},
+    }
+
+
+async def persist_incremental_post_analyses(
+    *,
+    session: Any,
+    row_by_id: dict[int, dict[str, Any]],
+    labeler: Any,
+    prompt_version: str,
+    results: Sequence[Mapping[str, Any]],
+    deps: LabelResultPersistenceDeps | None = None,
+) -> int:
+    """一批帖子打标结果：一次批量 upsert + 一次语义词同步。"""
+    effective_deps = deps or build_default_label_result_persistence_deps()
+    label_rows: list[dict[str, Any]] = []
+    for result in results:
+        item_id = int(result["id"])
+        row = row_by_id.get(item_id)
+        if not row:
+            raise KeyError(f"post row not found for item_id={item_id}")
+        label_rows.append(
+            build_post_label_row(
+                post_id=item_id,
+                text_norm_hash=row.get("text_norm_hash"),
+                llm_version=prompt_version,
+                model_name=labeler.model_name,
+                prompt_version=labeler.prompt_version,
+                analysis=result["analysis"],
+                score=_score_dict(result["score"]),
+                input_chars=int(result["input_chars"]),
+                output_chars=int(result["output_chars"]),
+            )
+        )
+    if not label_rows:
+        return 0
+    written = await effective_deps.upsert_post_label_rows(session=session, rows=label_rows)
+    await effective_deps.sync_llm_terms(
+        session,
+        analysis=_merge_term_analyses([result["analysis"] for result in results]),
+        llm_version=prompt_version,
+        prompt_version=labeler.prompt_version,
+    )
+    return int(written)
+
+
+async def persist_incremental_comment_analyses(
+    *,
+    session: Any,
+    labeler: Any,
+    prompt_version: str,
+    results: Sequence[Mapping[str, Any]],
+    deps: LabelResultPersistenceDeps | None = None,
+) -> int:
+    """一批评论打标结果：一次批量 upsert + 一次语义词同步。"""
+    effective_deps = deps or build_default_label_result_persistence_deps()
+    label_rows = [
+        build_comment_label_row(
+            comment_id=int(result["id"]),
+            llm_version=prompt_version,
+            model_name=labeler.model_name,
+            prompt_version=labeler.prompt_version,
+            analysis=result["analysis"],
+            score=_score_dict(result["score"]),
+            input_chars=int(result["input_chars"]),
+            output_chars=int(result["output_chars"]),
+        )
+        for result in results
+    ]
+    if not label_rows:
+        return 0
+    written = await effective_deps.upsert_comment_label_rows(session=session, rows=label_rows)
+    await effective_deps.sync_llm_terms(
+        session,
+        analysis=_merge_term_analyses([result["analysis"] for result in results]),
+        llm_version=prompt_version,
+        prompt_version=labeler.prompt_version,
+    )
+    return int(written)
+
+
 __all__ = [
     "LabelResultPersistenceDeps",
     "build_default_label_result_persistence_deps",
+    "persist_incremental_comment_analyses",
     "persist_incremental_comment_analysis",
+    "persist_incremental_post_analyses",
     "persist_incremental_post_analysis",
 ]
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Sequence
+from typing import Any, Awaitable, Callable, Sequence
 
 from app.services.llm.clients.gemini_client import GeminiChatClient
-from app.services.llm.label_contract import LLMScoreResult
+from app.services.llm.label_contract import (
+    LLMScoreResult,
+    score_comment_analysis,
+    score_post_analysis,
+)
+from app.services.llm.label_prefilter import build_comment_body_hash, normalize_subreddit_key
 from app.services.llm.labeling_runtime import (
     run_label_comment,
     run_label_comments_batch,
@@ -16,6 +22,7 @@ from app.services.llm.labeling_support import (
     COMMENT_SCHEMA,
     POST_BATCH_SCHEMA,
     POST_SCHEMA,
+    SYSTEM_PROMPT,
     build_comment_batch_prompt,
     build_comment_prompt,
     build_post_batch_prompt,
@@ -25,6 +32,11 @@ from app.services.llm.labeling_support import (
     safe_json_loads_any,
     truncate,
 )
+from app.services.llm.response_cache import (
+    LLMResponseCache,
+    build_response_cache_key,
+    fingerprint_template,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +64,10 @@ def _extract_batch_items(parsed: Any) -> list[dict[str, Any]]:
     return extract_batch_items(parsed)
 
 
+# 打标模板指纹：system prompt / schema 改动后旧的缓存结果自动失效
+_LABEL_TEMPLATE_FINGERPRINT = fingerprint_template(SYSTEM_PROMPT, POST_SCHEMA, COMMENT_SCHEMA)
+
+
 class LLMLabeler:
     def __init__(
         self,
@@ -62,12 +78,15 @@ class LLMLabeler:
         max_comment_chars: int,
         timeout: float = 25.0,
         api_key: str | None = None,
+        response_cache: LLMResponseCache | None = None,
     ) -> None:
         self._model = model
         self._prompt_version = prompt_version
         self._max_body_chars = max_body_chars
         self._max_comment_chars = max_comment_chars
         self._client = GeminiChatClient(model, timeout=timeout, api_key=api_key)
+        self._response_cache = response_cache
+        self._cache_hits = 0
 
     @property
     def prompt_version(self) -> str:
@@ -77,6 +96,127 @@ class LLMLabeler:
     def model_name(self) -> str:
         return self._model
 
+    @property
+    def cache_hits(self) -> int:
+        """本实例命中响应缓存、跳过 LLM 调用的条数。"""
+        return self._cache_hits
+
+    # 缓存键只取影响 prompt 的字段：正文按 build_comment_body_hash 归一化（空白 / 大小写不敏感）
+    def _post_cache_key(self, item: dict[str, Any]) -> str:
+        return build_response_cache_key(
+            kind="post_label",
+            model=self._model,
+            template_version=f"{self._prompt_version}:{_LABEL_TEMPLATE_FINGERPRINT}",
+            payload={
+                "title": build_comment_body_hash(str(item.get("title") or "")),
+                "body": build_comment_body_hash(str(item.get("body") or "")),
+                "subreddit": normalize_subreddit_key(str(item.get("subreddit") or "")),
+                "comments": [build_comment_body_hash(str(c or "")) for c in item.get("comments") or []],
+                "limits": [self._max_body_chars, self._max_comment_chars],
+            },
+        )
+
+    def _comment_cache_key(self, item: dict[str, Any]) -> str:
+        return build_response_cache_key(
+            kind="comment_label",
+            model=self._model,
+            template_version=f"{self._prompt_version}:{_LABEL_TEMPLATE_FINGERPRINT}",
+            payload={
+                "body": build_comment_body_hash(str(item.get("body") or "")),
+                "post_title": build_comment_body_hash(str(item.get("post_title") or "")),
+                "subreddit": normalize_subreddit_key(str(item.get("subreddit") or "")),
+                "limits": [self._max_body_chars],
+            },
+        )
+
+    # SQLite 读写是阻塞调用，统一放到线程里执行，避免卡住事件循环上的其它打标协程
+    async def _cached_single(
+        self,
+        key: str,
+        score_fn: Callable[[dict[str, Any]], LLMScoreResult],
+    ) -> tuple[dict[str, Any], LLMScoreResult, int, int] | None:
+        if self._response_cache is None:
+            return None
+        entry = await asyncio.to_thread(self._response_cache.get, key)
+        if not entry:
+            return None
+        self._cache_hits += 1
+        analysis = dict(entry["analysis"])
+        return analysis, score_fn(analysis), int(entry["input_chars"]), int(entry["output_chars"])
+
+    async def _remember_single(
+        self,
+        key: str,
+        kind: str,
+        result: tuple[dict[str, Any], LLMScoreResult, int, int],
+    ) -> None:
+        if self._response_cache is None:
+            return
+        analysis, _score, input_chars, output_chars = result
+        await asyncio.to_thread(
+            self._response_cache.set,
+            key,
+            {"analysis": analysis, "input_chars": input_chars, "output_chars": output_chars},
+            kind=kind,
+            model=self._model,
+        )
+
+    async def _label_batch_cached(
+        self,
+        items: Sequence[dict[str, Any]],
+        *,
+        kind: str,
+        key_fn: Callable[[dict[str, Any]], str],
+        score_fn: Callable[[dict[str, Any]], LLMScoreResult],
+        label_misses: Callable[[Sequence[dict[str, Any]]], Awaitable[list[dict[str, Any]]]],
+    ) -> list[dict[str, Any]]:
+        """批量打标：已缓存的条目直接复用，只把未命中的条目送 LLM。"""
+        if self._response_cache is None:
+            return await label_misses(items)
+        keys = {int(item["id"]): key_fn(item) for item in items}
+        cached = await asyncio.to_thread(self._response_cache.get_many, list(keys.values()))
+        hits: list[dict[str, Any]] = []
+        misses: list[dict[str, Any]] = []
+        for item in items:
+            entry = cached.get(keys[int(item["id"])])
+            if not entry:
+                misses.append(item)
+                continue
+            analysis = dict(entry["analysis"])
+            hits.append(
+                {
+                    "id": int(item["id"]),
+                    "analysis": analysis,
+                    "score": score_fn(analysis),
+                    "input_chars": int(entry["input_chars"]),
+                    "output_chars": int(entry["output_chars"]),
+                }
+            )
+        if not misses:
+            self._cache_hits += len(hits)
+            return hits
+        results = await label_misses(misses)
+        if not results:
+            # 与未开缓存时一致：整批无结果交给上层走逐条兜底。已缓存条目在兜底时会再次命中并在
+            # 那里计数，这里不记，避免同一条命中被算两次
+            return []
+        self._cache_hits += len(hits)
+        await asyncio.to_thread(
+            self._response_cache.set_many,
+            {
+                keys[int(result["id"])]: {
+                    "analysis": result["analysis"],
+                    "input_chars": result["input_chars"],
+                    "output_chars": result["output_chars"],
+                }
+                for result in results
+                if int(result["id"]) in keys
+            },
+            kind=kind,
+            model=self._model,
+        )
+        return hits + results
+
     def _build_post_prompt(
         self,
         *,
@@ -137,7 +277,13 @@ class LLMLabeler:
         subreddit: str,
         comments: Sequence[str],
     ) -> tuple[dict[str, Any], LLMScoreResult, int, int]:
-        return await run_label_post(
+        key = self._post_cache_key(
+            {"title": title, "body": body, "subreddit": subreddit, "comments": list(comments)}
+        )
+        cached = await self._cached_single(key, score_post_analysis)
+        if cached is not None:
+            return cached
+        result = await run_label_post(
             client=self._client,
             title=title,
             body=body,
@@ -146,20 +292,28 @@ class LLMLabeler:
             max_body_chars=self._max_body_chars,
             max_comment_chars=self._max_comment_chars,
         )
+        await self._remember_single(key, "post_label", result)
+        return result
 
     async def label_posts_batch(
         self,
         *,
         items: Sequence[dict[str, Any]],
     ) -> list[dict[str, Any]]:
-        return await run_label_posts_batch(
-            client=self._client,
-            items=items,
-            max_body_chars=self._max_body_chars,
-            max_comment_chars=self._max_comment_chars,
-            model_name=self._model,
-            prompt_version=self._prompt_version,
-            logger=logger,
+        return await self._label_batch_cached(
+            items,
+            kind="post_label",
+            key_fn=self._post_cache_key,
+            score_fn=score_post_analysis,
+            label_misses=lambda misses: run_label_posts_batch(
+                client=self._client,
+                items=misses,
+                max_body_chars=self._max_body_chars,
+                max_comment_chars=self._max_comment_chars,
+                model_name=self._model,
+                prompt_version=self._prompt_version,
+                logger=logger,
+            ),
         )
 
     async def label_comment(
@@ -169,26 +323,38 @@ class LLMLabeler:
         post_title: str,
         subreddit: str,
     ) -> tuple[dict[str, Any], LLMScoreResult, int, int]:
-        return await run_label_comment(
+        key = self._comment_cache_key({"body": body, "post_title": post_title, "subreddit": subreddit})
+        cached = await self._cached_single(key, score_comment_analysis)
+        if cached is not None:
+            return cached
+        result = await run_label_comment(
             client=self._client,
             body=body,
             post_title=post_title,
             subreddit=subreddit,
             max_body_chars=self._max_body_chars,
         )
+        await self._remember_single(key, "comment_label", result)
+        return result
 
     async def label_comments_batch(
         self,
         *,
         items: Sequence[dict[str, Any]],
     ) -> list[dict[str, Any]]:
-        return await run_label_comments_batch(
-            client=self._client,
-            items=items,
-            max_body_chars=self._max_body_chars,
-            model_name=self._model,
-            prompt_version=self._prompt_version,
-            logger=logger,
+        return await self._label_batch_cached(
+            items,
+            kind="comment_label",
+            key_fn=self._comment_cache_key,
+            score_fn=score_comment_analysis,
+            label_misses=lambda misses: run_label_comments_batch(
+                client=self._client,
+                items=misses,
+                max_body_chars=self._max_body_chars,
+                model_name=self._model,
+                prompt_version=self._prompt_version,
+                logger=logger,
+            ),
         )
 
 
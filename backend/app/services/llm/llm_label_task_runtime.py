@@ -48,6 +48,8 @@ class LLMLabelTaskRuntimeDeps:
     run_incremental_post_label_workflow: Callable[..., Awaitable[dict[str, Any]]]
     run_incremental_comment_label_workflow: Callable[..., Awaitable[dict[str, Any]]]
     run_legacy_label_backfill_workflow: Callable[..., Awaitable[dict[str, Any]]]
+    persist_post_analyses: Callable[..., Awaitable[int]] | None = None
+    persist_comment_analyses: Callable[..., Awaitable[int]] | None = None
 
 
 async def run_label_posts_task(
@@ -78,6 +80,7 @@ async def run_label_posts_task(
             fetch_post_candidates=deps.fetch_post_candidates,
             fetch_top_comments=deps.fetch_top_comments,
             persist_post_analysis=deps.persist_post_analysis,
+            persist_post_analyses=deps.persist_post_analyses,
         ),
     )
 
@@ -112,6 +115,7 @@ async def run_label_comments_task(
             session_factory=deps.session_factory,
             labeler_factory=deps.labeler_factory,
             persist_comment_analysis=deps.persist_comment_analysis,
+            persist_comment_analyses=deps.persist_comment_analyses,
         ),
     )
 
@@ -4,11 +4,14 @@ from typing import List, Sequence
 
 from app.services.llm.interfaces import EvidenceText, Summarizer
 from app.services.llm.clients.openai_client import OpenAIChatClient
+from app.services.llm.response_cache import get_llm_response_cache
 
 
 class OpenAISummarizer(Summarizer):
     def __init__(self, *, model: str, timeout: float = 8.0) -> None:
-        self._client = OpenAIChatClient(model, timeout=timeout)
+        self._client = OpenAIChatClient(
+            model, timeout=timeout, response_cache=get_llm_response_cache()
+        )
 
     def summarize_evidences(self, evidences: Sequence[EvidenceText], *, max_chars: int = 28) -> list[str]:
         texts: List[str] = []
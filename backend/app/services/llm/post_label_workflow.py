@@ -7,6 +7,7 @@ from typing import Any
 from app.services.llm.label_batch_support import (
     LLMLabelRunStats,
     build_post_item,
+    label_pipeline_limits,
     process_label_batches,
     should_use_long_lab,
 )
@@ -34,6 +35,8 @@ class IncrementalPostLabelWorkflowDeps:
     fetch_post_candidates: Callable[..., Awaitable[list[dict[str, Any]]]]
     fetch_top_comments: Callable[..., Awaitable[list[str]]]
     persist_post_analysis: Callable[..., Awaitable[None]]
+    # 可选：整批一次 upsert；未提供时退回逐条 savepoint 落库
+    persist_post_analyses: Callable[..., Awaitable[int]] | None = None
 
 
 async def run_incremental_post_label_workflow(
@@ -112,6 +115,20 @@ async def run_incremental_post_label_workflow(
 
         stats.attempted = len(long_items) + len(short_items)
 
+        max_in_flight, token_budget = label_pipeline_limits(settings)
+
+        def _bulk_persist(labeler: Any) -> Callable[[list[dict[str, Any]]], Awaitable[int]] | None:
+            bulk = deps.persist_post_analyses
+            if bulk is None:
+                return None
+            return lambda results: bulk(
+                session=session,
+                row_by_id=row_by_id,
+                labeler=labeler,
+                prompt_version=settings.llm_label_prompt_version,
+                results=results,
+            )
+
         await process_label_batches(
             session=session,
             items=long_items,
@@ -147,6 +164,9 @@ async def run_incremental_post_label_workflow(
                 input_chars=single_result[2],
                 output_chars=single_result[3],
             ),
+            persist_many=_bulk_persist(core_labeler),
+            max_in_flight=max_in_flight,
+            token_budget=token_budget,
         )
 
         await process_label_batches(
@@ -184,7 +204,11 @@ async def run_incremental_post_label_workflow(
                 input_chars=single_result[2],
                 output_chars=single_result[3],
             ),
+            persist_many=_bulk_persist(lab_labeler),
+            max_in_flight=max_in_flight,
+            token_budget=token_budget,
         )
 
+    stats.add_cache_hits(core_labeler, lab_labeler)
     return stats.to_result()
 
@@ -0,0 +1,319 @@
+"""
+LLM 响应缓存：按内容寻址的本地持久化缓存（内嵌 SQLite）。
+
+- 键 = sha256(用途 + 模型 + 模板版本 + 归一化输入)；同一段文本重爬 / 回填后再打标直接命中
+- 值为 JSON；TTL 过期即失效，总字节数超过上限时按最近使用时间淘汰
+- 跨进程共享同一个库文件（WAL，写入是短事务），Celery worker 之间也能复用
+- 缓存故障只记日志并退化为未命中，绝不影响 LLM 主流程
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_BUSY_TIMEOUT_SECONDS = 10.0
+# 超过上限后一次清到上限的 90%，避免每次写入都触发淘汰
+_PRUNE_TARGET_RATIO = 0.9
+_REPO_ROOT = Path(__file__).resolve().parents[4]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    cache_key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    model TEXT NOT NULL,
+    body TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS llm_responses_last_used ON llm_responses(last_used_at);
+"""
+
+
+def build_response_cache_key(
+    *,
+    kind: str,
+    model: str,
+    template_version: str,
+    payload: Any,
+) -> str:
+    """内容寻址键：payload 需已归一化（调用方决定哪些字段影响 prompt）。"""
+    material = json.dumps(
+        [kind, model, template_version, payload],
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def fingerprint_template(*parts: Any) -> str:
+    """模板指纹：prompt 文案 / schema 一改，旧缓存自然失效。"""
+    material = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:12]
+
+
+@dataclass(slots=True)
+class ResponseCacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    expirations: int = 0
+    evictions: int = 0
+    errors: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class LLMResponseCache:
+    """SQLite 持久化的 LLM 响应缓存（线程安全，单连接 + 锁）。"""
+
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        ttl_seconds: int,
+        max_bytes: int,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._path = Path(path)
+        self._ttl_seconds = max(1, int(ttl_seconds))
+        self._max_bytes = max(0, int(max_bytes))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._bytes: int | None = None
+        self.stats = ResponseCacheStats()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def get(self, key: str) -> Any | None:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        wanted = list(dict.fromkeys(keys))
+        if not wanted:
+            return {}
+        now = self._clock()
+        found: dict[str, Any] = {}
+        expired: list[str] = []
+        try:
+            with self._lock:
+                conn = self._connection()
+                placeholders = ",".join("?" for _ in wanted)
+                rows = conn.execute(
+                    f"SELECT cache_key, body, created_at FROM llm_responses WHERE cache_key IN ({placeholders})",
+                    wanted,
+                ).fetchall()
+                for key, body, created_at in rows:
+                    if created_at + self._ttl_seconds <= now:
+                        expired.append(key)
+                        continue
+                    try:
+                        found[key] = json.loads(body)
+                    except ValueError:
+                        expired.append(key)
+                if expired:
+                    self._delete(conn, expired)
+                    self.stats.expirations += len(expired)
+                if found:
+                    conn.executemany(
+                        "UPDATE llm_responses SET last_used_at = ? WHERE cache_key = ?",
+                        [(now, key) for key in found],
+                    )
+        except (sqlite3.Error, OSError):
+            self._record_error("read")
+            found = {}
+        self.stats.hits += len(found)
+        self.stats.misses += len(wanted) - len(found)
+        return found
+
+    def set(self, key: str, value: Any, *, kind: str = "", model: str = "") -> None:
+        self.set_many({key: value}, kind=kind, model=model)
+
+    def set_many(self, entries: Mapping[str, Any], *, kind: str = "", model: str = "") -> None:
+        if not entries:
+            return
+        now = self._clock()
+        rows = []
+        for key, value in entries.items():
+            body = json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+            size = len(body.encode("utf-8"))
+            if size > self._max_bytes:
+                continue
+            rows.append((key, kind, model, body, size, now, now))
+        if not rows:
+            return
+        try:
+            with self._lock:
+                conn = self._connection()
+                before = self._current_bytes(conn)
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    replaced = self._sizes(conn, [row[0] for row in rows])
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO llm_responses "
+                        "(cache_key, kind, model, body, size, created_at, last_used_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                self._bytes = before + sum(row[4] for row in rows) - replaced
+                self.stats.writes += len(rows)
+                if self._bytes > self._max_bytes:
+                    self._prune(conn)
+        except (sqlite3.Error, OSError):
+            self._record_error("write")
+
+    def purge_expired(self) -> int:
+        """删除全部过期条目，返回删除数量（给维护任务 / 手动清理用）。"""
+        cutoff = self._clock() - self._ttl_seconds
+        try:
+            with self._lock:
+                conn = self._connection()
+                cursor = conn.execute("DELETE FROM llm_responses WHERE created_at <= ?", (cutoff,))
+                self._bytes = None
+                removed = int(cursor.rowcount)
+        except (sqlite3.Error, OSError):
+            self._record_error("purge")
+            return 0
+        self.stats.expirations += removed
+        return removed
+
+    def metrics(self) -> dict[str, Any]:
+        lookups = self.stats.hits + self.stats.misses
+        try:
+            with self._lock:
+                conn = self._connection()
+                entries = int(conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0])
+                size = self._current_bytes(conn)
+        except (sqlite3.Error, OSError):
+            self._record_error("metrics")
+            entries, size = 0, 0
+        return {
+            **self.stats.as_dict(),
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self._max_bytes,
+            "hit_rate": (self.stats.hits / lookups) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._bytes = None
+
+    # -------------------- Internal helpers --------------------
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self._path),
+                timeout=_BUSY_TIMEOUT_SECONDS,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _current_bytes(self, conn: sqlite3.Connection) -> int:
+        if self._bytes is None:
+            self._bytes = int(conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0])
+        return self._bytes
+
+    @staticmethod
+    def _sizes(conn: sqlite3.Connection, keys: list[str]) -> int:
+        placeholders = ",".join("?" for _ in keys)
+        row = conn.execute(
+            f"SELECT COALESCE(SUM(size), 0) FROM llm_responses WHERE cache_key IN ({placeholders})",
+            keys,
+        ).fetchone()
+        return int(row[0])
+
+    def _delete(self, conn: sqlite3.Connection, keys: list[str]) -> None:
+        placeholders = ",".join("?" for _ in keys)
+        conn.execute(f"DELETE FROM llm_responses WHERE cache_key IN ({placeholders})", keys)
+        self._bytes = None
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        cutoff = self._clock() - self._ttl_seconds
+        conn.execute("DELETE FROM llm_responses WHERE created_at <= ?", (cutoff,))
+        # 其它进程也在写，按库里的真实总量重新计算
+        self._bytes = None
+        total = self._current_bytes(conn)
+        target = int(self._max_bytes * _PRUNE_TARGET_RATIO)
+        if total <= target:
+            return
+        evicted = 0
+        freed = 0
+        victims: list[str] = []
+        for key, size in conn.execute("SELECT cache_key, size FROM llm_responses ORDER BY last_used_at, rowid"):
+            if total - freed <= target:
+                break
+            victims.append(key)
+            freed += int(size)
+            evicted += 1
+        if victims:
+            conn.executemany("DELETE FROM llm_responses WHERE cache_key = ?", [(key,) for key in victims])
+        self._bytes = total - freed
+        self.stats.evictions += evicted
+
+    def _record_error(self, operation: str) -> None:
+        self.stats.errors += 1
+        logger.warning("LLM response cache %s failed path=%s", operation, self._path, exc_info=True)
+
+
+_RESPONSE_CACHE: LLMResponseCache | None = None
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def get_llm_response_cache() -> LLMResponseCache | None:
+    """进程级共享的 LLM 响应缓存；配置关闭时返回 None。"""
+    global _RESPONSE_CACHE
+    settings = get_settings()
+    if not settings.llm_response_cache_enabled:
+        return None
+    with _RESPONSE_CACHE_LOCK:
+        if _RESPONSE_CACHE is None:
+            path = Path(settings.llm_response_cache_path)
+            if not path.is_absolute():
+                path = _REPO_ROOT / path
+            _RESPONSE_CACHE = LLMResponseCache(
+                path,
+                ttl_seconds=settings.llm_response_cache_ttl_seconds,
+                max_bytes=settings.llm_response_cache_max_bytes,
+            )
+        return _RESPONSE_CACHE
+
+
+__all__ = [
+    "LLMResponseCache",
+    "ResponseCacheStats",
+    "build_response_cache_key",
+    "fingerprint_template",
+    "get_llm_response_cache",
+]
@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Protocol
+from uuid import UUID
+
+from app.core.config import settings
+from app.schemas.report_payload import ReportPayload
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "report-cache"
+# 每个条目除正文外的估算开销（OrderedDict 节点 + 元数据），用于字节预算
+ENTRY_OVERHEAD_BYTES = 256
+REDIS_RETRY_AFTER_SECONDS = 30.0
+
+
+class ReportCacheRedis(Protocol):
+    async def get(self, name: str) -> bytes | None:
+        ...
+
+    async def set(self, name: str, value: bytes, ex: int | None = None) -> Any:
+        ...
+
+    async def delete(self, *names: str) -> Any:
+        ...
+
+    async def sadd(self, name: str, *values: str) -> Any:
+        ...
+
+    async def smembers(self, name: str) -> set[Any]:
+        ...
+
+    async def expire(self, name: str, time: int) -> Any:
+        ...
+
+
+@dataclass(frozen=True, slots=True)
+class SerializedReport:
+    """序列化后的报告：正文只读、可直接作为 HTTP 响应体，读取时不再深拷贝。"""
+
+    body: bytes
+    generated_at: datetime | None
+    data_source: str | None
+
+    @classmethod
+    def from_payload(cls, payload: ReportPayload) -> "SerializedReport":
+        return cls(
+            body=payload.model_dump_json().encode("utf-8"),
+            generated_at=payload.generated_at,
+            data_source=payload.data_source,
+        )
+
+    def to_payload(self) -> ReportPayload:
+        # 每次解析出新对象，调用方随意修改也不会污染缓存
+        return ReportPayload.model_validate_json(self.body)
+
+    def encode(self) -> bytes:
+        header = json.dumps(
+            {
+                "generated_at": self.generated_at.isoformat() if self.generated_at else None,
+                "data_source": self.data_source,
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        # 紧凑 JSON 正文不含裸换行，可安全用换行分隔元数据头
+        return header + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, raw: bytes) -> "SerializedReport":
+        header_raw, _, body = raw.partition(b"\n")
+        header = json.loads(header_raw)
+        generated_at = header.get("generated_at")
+        return cls(
+            body=body,
+            generated_at=datetime.fromisoformat(generated_at) if generated_at else None,
+            data_source=header.get("data_source"),
+        )
+
+
+@dataclass(slots=True)
+class ReportCacheStats:
+    memory_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    oversized: int = 0
+    redis_errors: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class _MemoryEntry:
+    expires_at: float
+    report: SerializedReport
+    task_token: str
+    size: int
+
+
+def build_report_cache_key(task_id: UUID | str, analysis: Any) -> str:
+    """按任务 + 分析版本生成缓存键：重新分析后 generated_at 变化，旧键自然失效。"""
+    version = getattr(analysis, "analysis_version", None)
+    report = getattr(analysis, "report", None)
+    generated_at = getattr(report, "generated_at", None)
+    revision = generated_at.isoformat() if isinstance(generated_at, datetime) else "na"
+    return f"report:{task_id}:v{version}:{revision}"
+
+
+def _task_token(key: str) -> str:
+    parts = key.split(":", 2)
+    if len(parts) >= 2 and parts[0] == "report":
+        return parts[1]
+    return key
+
+
+class TwoTierReportCache:
+    """两级报告缓存：进程内按字节预算的 LRU + 跨 worker 共享的 Redis。
+
+    - 两级都只存序列化后的字节，命中时不做 model_copy(deep=True)
+    - 进程内 LRU 不加锁：读写都是同步字典操作，在事件循环内天然原子
+    - Redis 出错时记一次错误并暂停访问 REDIS_RETRY_AFTER_SECONDS，退化为纯进程内缓存
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        *,
+        max_bytes: int | None = None,
+        redis_client: ReportCacheRedis | None = None,
+        redis_url: str | None = None,
+        key_prefix: str = REDIS_KEY_PREFIX,
+    ) -> None:
+        self._ttl_seconds = max(1, int(ttl_seconds))
+        self._max_bytes = max(
+            0,
+            int(max_bytes if max_bytes is not None else settings.report_cache_max_bytes),
+        )
+        self._redis = redis_client
+        # 只给 URL 时按事件循环懒建连接：Celery 每个任务一个新 loop，旧连接不能跨 loop 复用
+        self._redis_url = redis_url if redis_client is None else None
+        self._redis_loop: asyncio.AbstractEventLoop | None = None
+        self._key_prefix = key_prefix.strip(":")
+        self._entries: OrderedDict[str, _MemoryEntry] = OrderedDict()
+        self._bytes = 0
+        self._redis_paused_until = 0.0
+        self.stats = ReportCacheStats()
+
+    # -------------------- ReportCacheProtocol --------------------
+    async def get(self, key: str) -> ReportPayload | None:
+        report = await self.get_serialized(key)
+        return report.to_payload() if report is not None else None
+
+    async def set(self, key: str, value: ReportPayload) -> None:
+        await self.set_serialized(key, SerializedReport.from_payload(value))
+
+    async def invalidate(self, key: str) -> None:
+        self._drop(key)
+        self.stats.invalidations += 1
+        await self._redis_call("delete", self._redis_key(key))
+
+    # -------------------- Serialized API --------------------
+    async def get_serialized(self, key: str) -> SerializedReport | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats.memory_hits += 1
+                return entry.report
+            self._drop(key)
+            self.stats.expirations += 1
+
+        raw = await self._redis_call("get", self._redis_key(key))
+        if raw:
+            try:
+                report = SerializedReport.decode(bytes(raw))
+            except Exception:
+                logger.warning("Discarding undecodable report cache entry %s", key)
+            else:
+                self.stats.redis_hits += 1
+                self._store(key, report)
+                return report
+
+        self.stats.misses += 1
+        return None
+
+    async def set_serialized(self, key: str, report: SerializedReport) -> None:
+        self.stats.sets += 1
+        self._store(key, report)
+        redis_key = self._redis_key(key)
+        if await self._redis_call("set", redis_key, report.encode(), ex=self._ttl_seconds) is None:
+            return
+        index_key = self._task_index_key(_task_token(key))
+        await self._redis_call("sadd", index_key, redis_key)
+        await self._redis_call("expire", index_key, self._ttl_seconds)
+
+    async def invalidate_task(self, task_id: UUID | str) -> int:
+        """删除某个任务的全部缓存版本（重新分析后调用）。"""
+        token = str(task_id)
+        removed = 0
+        for key in [k for k, entry in self._entries.items() if entry.task_token == token]:
+            self._drop(key)
+            removed += 1
+        index_key = self._task_index_key(token)
+        members = await self._redis_call("smembers", index_key)
+        if members:
+            names = [m.decode("utf-8") if isinstance(m, bytes) else str(m) for m in members]
+            await self._redis_call("delete", *names, index_key)
+            removed += len(names)
+        self.stats.invalidations += 1
+        return removed
+
+    def metrics(self) -> dict[str, Any]:
+        lookups = self.stats.memory_hits + self.stats.redis_hits + self.stats.misses
+        hits = self.stats.memory_hits + self.stats.redis_hits
+        return {
+            **self.stats.as_dict(),
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "hit_rate": (hits / lookups) if lookups else 0.0,
+            "redis_enabled": self._redis is not None or bool(self._redis_url),
+        }
+
+    # -------------------- Internal helpers --------------------
+    def _store(self, key: str, report: SerializedReport) -> None:
+        size = len(report.body) + ENTRY_OVERHEAD_BYTES
+        self._drop(key)
+        if size > self._max_bytes:
+            self.stats.oversized += 1
+            return
+        self._entries[key] = _MemoryEntry(
+            expires_at=time.monotonic() + self._ttl_seconds,
+            report=report,
+            task_token=_task_token(key),
+            size=size,
+        )
+        self._bytes += size
+        while self._bytes > self._max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.stats.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self._key_prefix}:{key}"
+
+    def _task_index_key(self, token: str) -> str:
+        return f"{self._key_prefix}:task:{token}"
+
+    def _redis_client(self) -> ReportCacheRedis | None:
+        if self._redis_url:
+            loop = asyncio.get_running_loop()
+            if self._redis is None or self._redis_loop is not loop:
+                from redis.asyncio import Redis
+
+                self._redis = Redis.from_url(self._redis_url, decode_responses=False)
+                self._redis_loop = loop
+        return self._redis
+
+    async def _redis_call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        if time.monotonic() < self._redis_paused_until:
+            return None
+        client = self._redis_client()
+        if client is None:
+            return None
+        try:
+            return await getattr(client, method)(*args, **kwargs)
+        except Exception as exc:
+            self.stats.redis_errors += 1
+            self._redis_paused_until = time.monotonic() + REDIS_RETRY_AFTER_SECONDS
+            logger.warning("Report cache redis %s failed, using memory tier only: %s", method, exc)
+            return None
+
+
+class InMemoryReportCache(TwoTierReportCache):
+    """仅进程内一级（无 Redis），保留旧名称供测试和单进程脚本使用。"""
+
+    def __init__(self, ttl_seconds: int, *, max_bytes: int | None = None) -> None:
+        super().__init__(ttl_seconds, max_bytes=max_bytes, redis_client=None)
+
+
+_REPORT_CACHE: TwoTierReportCache | None = None
+
+
+def get_report_cache() -> TwoTierReportCache:
+    """进程级共享的报告缓存（API 路由与 ReportService 默认共用一份）。"""
+    global _REPORT_CACHE
+    if _REPORT_CACHE is None:
+        redis_url = None
+        if settings.report_cache_redis_enabled:
+            redis_url = settings.report_cache_redis_url or settings.reddit_cache_redis_url
+        _REPORT_CACHE = TwoTierReportCache(
+            settings.report_cache_ttl_seconds,
+            max_bytes=settings.report_cache_max_bytes,
+            redis_url=redis_url,
+        )
+    return _REPORT_CACHE
+
+
+async def invalidate_task_reports(task_id: UUID | str) -> int:
+    """分析重跑后清掉该任务的旧报告；失败只记日志，不影响主流程。"""
+    try:
+        return await get_report_cache().invalidate_task(task_id)
+    except Exception:
+        logger.warning("Failed to invalidate report cache for task %s", task_id, exc_info=True)
+        return 0
+
+
+__all__ = [
+    "InMemoryReportCache",
+    "ReportCacheStats",
+    "SerializedReport",
+    "TwoTierReportCache",
+    "build_report_cache_key",
+    "get_report_cache",
+    "invalidate_task_reports",
+]
@@ -5,6 +5,8 @@ from dataclasses import dataclass
 from typing import Any
 from uuid import UUID
 
+from app.services.report.report_cache import build_report_cache_key
+
 
 @dataclass(slots=True, frozen=True)
 class ReportRequestContext:
@@ -55,7 +57,7 @@ async def load_report_request_context(
     return ReportRequestContext(
         task=task,
         analysis=analysis,
-        cache_key=f"report:{task_id}:{user_id}",
+        cache_key=build_report_cache_key(task_id, analysis),
     )
 
 
@@ -6,6 +6,7 @@ from typing import Any, Awaitable, Callable
 from uuid import UUID
 
 from app.schemas.report_payload import ReportPayload
+from app.services.report.report_cache import SerializedReport
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +16,8 @@ class ReportRequestWorkflowInput:
     task_id: UUID
     user_id: UUID
     inline_llm_enabled: bool
+    # True：调用方要的是可直接输出的序列化字节（GET /report 走这条）
+    serialized: bool = False
 
 
 @dataclass(slots=True)
@@ -24,12 +27,15 @@ class ReportRequestWorkflowDeps:
     cache_set: Callable[[str, ReportPayload], Awaitable[None]] | None
     validate_analysis_payload: Callable[[Any], Any]
     assemble_payload: Callable[[Any, Any, bool], Awaitable[Any]]
+    cache_get_serialized: Callable[[str], Awaitable[SerializedReport | None]] | None = None
+    cache_set_serialized: Callable[[str, SerializedReport], Awaitable[None]] | None = None
 
 
 @dataclass(slots=True)
 class ReportRequestWorkflowResult:
-    payload: ReportPayload
+    payload: ReportPayload | None
     cache_hit: bool
+    serialized: SerializedReport | None = None
 
 
 async def run_report_request_workflow(
@@ -46,7 +52,13 @@ async def run_report_request_workflow(
     analysis = context.analysis
     cache_key = context.cache_key
 
-    if deps.cache_get is not None:
+    use_serialized = workflow_input.serialized and deps.cache_get_serialized is not None
+    if use_serialized:
+        entry = await deps.cache_get_serialized(cache_key)
+        if entry is not None and entry.generated_at == analysis.report.generated_at:
+            logger.debug("Serialized cache hit for report task %s", workflow_input.task_id)
+            return ReportRequestWorkflowResult(payload=None, cache_hit=True, serialized=entry)
+    elif deps.cache_get is not None:
         cached = await deps.cache_get(cache_key)
         if cached is not None and cached.generated_at == analysis.report.generated_at:
             logger.debug("Cache hit for report task %s", workflow_input.task_id)
@@ -65,6 +77,10 @@ async def run_report_request_workflow(
         task.id,
         task.status,
     )
+    if use_serialized and deps.cache_set_serialized is not None:
+        serialized = SerializedReport.from_payload(payload)
+        await deps.cache_set_serialized(cache_key, serialized)
+        return ReportRequestWorkflowResult(payload=payload, cache_hit=False, serialized=serialized)
     if deps.cache_set is not None:
         await deps.cache_set(cache_key, payload)
 
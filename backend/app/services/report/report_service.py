@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import asyncio
-import time
 from dataclasses import dataclass
 from typing import Any, Protocol
 from uuid import UUID
@@ -12,8 +10,13 @@ from app.core.config import settings
 from app.repositories.report_repository import ReportRepository
 from app.schemas.analysis import AnalysisRead, CommunitySourceDetail
 from app.schemas.report_payload import ReportOverview, ReportPayload, ReportStats
+from app.services.report.report_cache import (
+    InMemoryReportCache,
+    SerializedReport,
+)
 from app.services.report.report_request_workflow import (
     ReportRequestWorkflowInput,
+    ReportRequestWorkflowResult,
     run_report_request_workflow,
 )
 from app.services.report.report_runtime import ReportRuntime
@@ -69,35 +72,6 @@ class ReportCacheProtocol(Protocol):
         ...
 
 
-class InMemoryReportCache(ReportCacheProtocol):
-    def __init__(self, ttl_seconds: int) -> None:
-        self._ttl_seconds = max(1, ttl_seconds)
-        self._store: dict[str, tuple[float, ReportPayload]] = {}
-        self._lock = asyncio.Lock()
-
-    async def get(self, key: str) -> ReportPayload | None:
-        async with self._lock:
-            entry = self._store.get(key)
-            if not entry:
-                return None
-            expires_at, payload = entry
-            if expires_at <= time.monotonic():
-                self._store.pop(key, None)
-                return None
-            return payload.model_copy(deep=True)
-
-    async def set(self, key: str, value: ReportPayload) -> None:
-        async with self._lock:
-            self._store[key] = (
-                time.monotonic() + self._ttl_seconds,
-                value.model_copy(deep=True),
-            )
-
-    async def invalidate(self, key: str) -> None:
-        async with self._lock:
-            self._store.pop(key, None)
-
-
 class ReportService:
     """Business logic for assembling the report analysis payload."""
 
@@ -128,26 +102,44 @@ class ReportService:
         )
 
     async def get_report(self, task_id: UUID, user_id: UUID) -> ReportPayload:
+        result = await self._run_request_workflow(task_id, user_id, serialized=False)
+        assert result.payload is not None
+        return result.payload
+
+    async def get_report_serialized(self, task_id: UUID, user_id: UUID) -> SerializedReport:
+        """与 get_report 相同的鉴权/校验，但命中缓存时直接返回序列化字节（不反序列化）。"""
+        result = await self._run_request_workflow(task_id, user_id, serialized=True)
+        if result.serialized is not None:
+            return result.serialized
+        assert result.payload is not None
+        return SerializedReport.from_payload(result.payload)
+
+    async def _run_request_workflow(
+        self, task_id: UUID, user_id: UUID, *, serialized: bool
+    ) -> ReportRequestWorkflowResult:
         from app.core.config import settings as _cfg
-        result = await run_report_request_workflow(
+        deps = self._runtime.build_request_workflow_deps(
+            not_found_error=ReportNotFoundError,
+            access_denied_error=ReportAccessDeniedError,
+            not_ready_error=ReportNotReadyError,
+            validation_error=ReportDataValidationError,
+            validate_analysis_payload=self.validate_analysis_payload,
+            fetch_member_count=self.fetch_community_member_count,
+            coerce_report_html=self.coerce_report_html,
+        )
+        deps.cache_get_serialized = getattr(self._cache, "get_serialized", None)
+        deps.cache_set_serialized = getattr(self._cache, "set_serialized", None)
+        return await run_report_request_workflow(
             workflow_input=ReportRequestWorkflowInput(
                 task_id=task_id,
                 user_id=user_id,
                 inline_llm_enabled=bool(
                     getattr(_cfg, "enable_report_inline_llm", False)
                 ),
+                serialized=serialized,
             ),
-            deps=self._runtime.build_request_workflow_deps(
-                not_found_error=ReportNotFoundError,
-                access_denied_error=ReportAccessDeniedError,
-                not_ready_error=ReportNotReadyError,
-                validation_error=ReportDataValidationError,
-                validate_analysis_payload=self.validate_analysis_payload,
-                fetch_member_count=self.fetch_community_member_count,
-                coerce_report_html=self.coerce_report_html,
-            ),
+            deps=deps,
         )
-        return result.payload
 
     @property
     def runtime(self) -> ReportRuntime:
@@ -188,4 +180,5 @@ __all__ = [
     "ReportService",
     "ReportServiceConfig",
     "ReportServiceError",
+    "SerializedReport",
 ]
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from pathlib import Path
 from typing import List, Protocol, Union, cast
 
 logger = logging.getLogger(__name__)
@@ -44,16 +51,142 @@ else:
     )
 
 
+class QueryEmbeddingCache:
+    """查询 / 主题向量的 LRU 缓存，键为 sha256(model + text)；配置目录时落盘，进程重启后复用。"""
+
+    def __init__(self, *, max_entries: int = 512, cache_dir: str | Path | None = None) -> None:
+        self._max_entries = max(0, int(max_entries))
+        self._cache_dir = Path(cache_dir) if cache_dir else None
+        self._entries: OrderedDict[str, List[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model_name: str, text: str) -> str:
+        return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> List[float] | None:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector
+        vector = self._read_disk(key)
+        with self._lock:
+            if vector is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, vector)
+        return vector
+
+    def put(self, key: str, vector: List[float]) -> None:
+        with self._lock:
+            self._remember(key, vector)
+        self._write_disk(key, vector)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        if self._max_entries <= 0:
+            return
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> Path | None:
+        if self._cache_dir is None:
+            return None
+        return self._cache_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> List[float] | None:
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable embedding cache file %s", path)
+            return None
+        if not isinstance(payload, list):
+            return None
+        return [float(value) for value in payload]
+
+    def _write_disk(self, key: str, vector: List[float]) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再 rename，并发 worker 不会读到半截 JSON
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(vector), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.warning("Failed to persist embedding cache file %s", path, exc_info=True)
+
+
+def estimate_token_count(text: str) -> int:
+    """粗估 token 数：ASCII 约 4 字符 / token，CJK 等非 ASCII 约 1 字符 / token，另加 CLS/SEP。"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars) + 2
+
+
+def plan_length_buckets(
+    lengths: Sequence[int], *, max_tokens_per_batch: int, max_batch_size: int
+) -> List[List[int]]:
+    """按长度降序分桶，每批 padding 后 token 数（批大小 × 批内最长）不超过上限；返回原始下标。"""
+    order = sorted(range(len(lengths)), key=lambda index: lengths[index], reverse=True)
+    batches: List[List[int]] = []
+    current: List[int] = []
+    longest = 0
+    for index in order:
+        length = max(1, int(lengths[index]))
+        if current and (
+            len(current) >= max_batch_size or (len(current) + 1) * longest > max_tokens_per_batch
+        ):
+            batches.append(current)
+            current = []
+        if not current:
+            longest = length
+        current.append(index)
+    if current:
+        batches.append(current)
+    return batches
+
+
 class EmbeddingService:
-    """Singleton wrapper around SentenceTransformer for BGE-M3 embeddings."""
+    """Per-model singleton wrapper around SentenceTransformer (BGE-M3 by default)."""
+
+    _instances: dict[str, "EmbeddingService"] = {}
 
-    _instance: "EmbeddingService" | None = None
-    _model: _SentenceTransformerModel | None = None
+    model_name: str
+    _model: _SentenceTransformerModel | None
+    _query_cache: QueryEmbeddingCache | None
 
-    def __new__(cls) -> "EmbeddingService":
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    def __new__(cls, model_name: str = MODEL_NAME) -> "EmbeddingService":
+        instance = cls._instances.get(model_name)
+        if instance is None:
+            instance = super().__new__(cls)
+            instance.model_name = model_name
+            instance._model = None
+            instance._query_cache = None
+            cls._instances[model_name] = instance
+        return instance
 
     def _load_model(self) -> None:
         if self._model is None:
@@ -61,12 +194,20 @@ class EmbeddingService:
                 raise RuntimeError(
                     "sentence-transformers is required for embedding generation"
                 ) from _sentence_transformer_import_error
-            logger.info("Loading embedding model: %s ...", MODEL_NAME)
-            self._model = _sentence_transformer_factory(MODEL_NAME)
-            # Explicitly set max length to leverage BGE-M3 long context
-            self._model.max_seq_length = 8192
+            logger.info("Loading embedding model: %s ...", self.model_name)
+            self._model = _sentence_transformer_factory(self.model_name)
+            if self.model_name == MODEL_NAME:
+                # Explicitly set max length to leverage BGE-M3 long context
+                self._model.max_seq_length = 8192
             logger.info("Embedding model loaded.")
 
+    def _loaded_model(self) -> _SentenceTransformerModel:
+        self._load_model()
+        model = self._model
+        if model is None:
+            raise RuntimeError("embedding model was not loaded")
+        return model
+
     def encode(
         self, texts: Union[str, List[str]], batch_size: int = 32
     ) -> Union[List[float], List[List[float]]]:
@@ -75,10 +216,7 @@ class EmbeddingService:
 
         Returns native Python lists for easy JSON/DB persistence.
         """
-        self._load_model()
-        model = self._model
-        if model is None:
-            raise RuntimeError("embedding model was not loaded")
+        model = self._loaded_model()
         embeddings = model.encode(
             texts,
             batch_size=batch_size,
@@ -87,6 +225,79 @@ class EmbeddingService:
         )
         return embeddings.tolist()
 
+    @property
+    def query_cache(self) -> QueryEmbeddingCache:
+        if self._query_cache is None:
+            from app.core.config import settings
+
+            self._query_cache = QueryEmbeddingCache(
+                max_entries=settings.embedding_query_cache_size,
+                cache_dir=settings.embedding_query_cache_dir or None,
+            )
+        return self._query_cache
+
+    def configure_query_cache(self, cache: QueryEmbeddingCache | None) -> None:
+        """替换查询缓存（None 表示下次使用时按 settings 重建）。"""
+        self._query_cache = cache
+
+    def encode_query(self, text: str) -> List[float]:
+        """编码单条查询 / 主题文本；同模型同文本命中缓存时不触发模型推理。"""
+        cache = self.query_cache
+        key = cache.key(self.model_name, text)
+        cached = cache.get(key)
+        if cached is not None:
+            return list(cached)
+        vector = cast(List[float], self.encode(text))
+        cache.put(key, vector)
+        return list(vector)
+
+    def encode_many(
+        self,
+        texts: Sequence[str],
+        *,
+        max_tokens_per_batch: int | None = None,
+        max_batch_size: int = 64,
+    ) -> List[List[float]]:
+        """
+        批量编码：按估算长度分桶、限制每批 padding 后的 token 总数，结果按输入顺序返回。
+
+        混合长短文本按固定批大小编码时，短文本会被 pad 到批内最长，CPU 大部分耗在 padding 上。
+        """
+        if not texts:
+            return []
+        if max_tokens_per_batch is None:
+            from app.core.config import settings
+
+            max_tokens_per_batch = settings.embedding_max_tokens_per_batch
+        model = self._loaded_model()
+        seq_cap = max(1, int(getattr(model, "max_seq_length", 0) or 512))
+        lengths = [min(seq_cap, estimate_token_count(text)) for text in texts]
+        batches = plan_length_buckets(
+            lengths,
+            max_tokens_per_batch=max(1, int(max_tokens_per_batch)),
+            max_batch_size=max(1, int(max_batch_size)),
+        )
+        results: List[List[float] | None] = [None] * len(texts)
+        for batch in batches:
+            vectors = model.encode(
+                [texts[index] for index in batch],
+                batch_size=len(batch),
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+            ).tolist()
+            for index, vector in zip(batch, vectors):
+                results[index] = cast(List[float], vector)
+        return cast(List[List[float]], results)
+
 
 # Export global singleton
 embedding_service = EmbeddingService()
+
+__all__ = [
+    "MODEL_NAME",
+    "EmbeddingService",
+    "QueryEmbeddingCache",
+    "embedding_service",
+    "estimate_token_count",
+    "plan_length_buckets",
+]
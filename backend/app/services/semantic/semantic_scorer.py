@@ -54,16 +54,16 @@ class SemanticScorer:
         if not terms:
             return ScoringResult(0.0, {}, 0.0, 0.0, 0.0, 1.0, 0, 0, _token_count(texts))
 
-        # 预编译模式（仅使用 canonical 参与匹配，保持一致性）
-        pats = self._lex.get_patterns_for_matching(terms)
+        # 预编译自动机（仅使用 canonical 参与匹配，保持一致性；每条文本单遍扫描）
+        automaton = self._lex.get_automaton_for_matching(terms)
         excl_pats: List[Tuple[str, re.Pattern[str]]] = []
         # exclude 列表在旧格式里是字符串；这里按惯例忽略（可在未来加入 lexicon.get_excludes(theme)）
 
         # 计数
         hits: Dict[str, int] = {t.canonical: 0 for t in terms}
-        for canon, pat in pats:
-            for txt in texts:
-                hits[canon] += len(pat.findall(txt or ""))
+        for txt in texts:
+            for index, count in automaton.count(txt).items():
+                hits[automaton.patterns[index].text] += count
         excl_hits = 0
         for _t, pat in excl_pats:
             for txt in texts:
@@ -0,0 +1,189 @@
+"""
+Term Automaton - 词库多模式单遍匹配（Aho-Corasick）
+
+替代「每个词条一个正则、逐条 finditer」的写法：同一份词库只构建一次自动机，
+每篇文本只扫描一遍，就能拿到所有词条的命中位置。
+
+匹配语义与原先的正则逐条保持一致：
+- 不区分大小写（逐字符 lower 折叠，长度不变，位置可直接映射回原文）
+- word 模式等价于 rf"\\b{re.escape(term)}\\b"（\\b 判定与 re 的 Unicode \\w 一致）
+- substring 模式等价于 re.escape(term)（CJK 词条按子串命中）
+- auto 模式：含拉丁字母 → word，否则 → substring（与 compile_patterns 规则一致）
+- 同一词条的多次命中按 re.finditer 语义取「从左到右、互不重叠」
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+BOUNDARY_AUTO = "auto"
+BOUNDARY_WORD = "word"
+BOUNDARY_SUBSTRING = "substring"
+_BOUNDARY_MODES = frozenset({BOUNDARY_AUTO, BOUNDARY_WORD, BOUNDARY_SUBSTRING})
+_LATIN = re.compile(r"[A-Za-z]")
+
+
+@dataclass(frozen=True, slots=True)
+class TermPattern:
+    """待匹配的字面词条及其边界规则。"""
+
+    text: str
+    boundary: str = BOUNDARY_AUTO
+
+
+def _fold(text: str) -> str:
+    """逐字符小写折叠；保证输出与输入等长。"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # 极少数字符（如 'İ'）lower 后会变长，这些字符保持原样，避免位置错位
+    return "".join(low if len(low := ch.lower()) == 1 else ch for ch in text)
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _resolve_boundary(pattern: TermPattern) -> bool:
+    if pattern.boundary not in _BOUNDARY_MODES:
+        raise ValueError(f"Unknown boundary mode: {pattern.boundary!r}")
+    if pattern.boundary == BOUNDARY_AUTO:
+        return bool(_LATIN.search(pattern.text))
+    return pattern.boundary == BOUNDARY_WORD
+
+
+class TermAutomaton:
+    """不可变的多模式匹配自动机；pattern 下标即调用方传入的顺序。"""
+
+    def __init__(self, patterns: Iterable[TermPattern | str]) -> None:
+        self.patterns: Tuple[TermPattern, ...] = tuple(
+            item if isinstance(item, TermPattern) else TermPattern(str(item))
+            for item in patterns
+        )
+        self._word_boundary: Tuple[bool, ...] = tuple(
+            _resolve_boundary(pattern) for pattern in self.patterns
+        )
+        self._lengths: Tuple[int, ...] = tuple(len(pattern.text) for pattern in self.patterns)
+
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for index, pattern in enumerate(self.patterns):
+            if not pattern.text:
+                # 空词条不参与匹配（正则版会在每个位置命中，没有业务意义）
+                continue
+            node = 0
+            for ch in _fold(pattern.text):
+                child = goto[node].get(ch)
+                if child is None:
+                    child = len(goto)
+                    goto.append({})
+                    outputs.append([])
+                    goto[node][ch] = child
+                node = child
+            outputs[node].append(index)
+
+        # BFS 构建 fail 链，并把 fail 节点的输出并入当前节点
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(ch, 0)
+                fail[child] = target if target != child else 0
+                outputs[child].extend(outputs[fail[child]])
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs: Tuple[Tuple[int, ...], ...] = tuple(tuple(items) for items in outputs)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def iter_matches(self, text: str | None) -> Iterator[Tuple[int, int]]:
+        """按结束位置顺序产出 (pattern_index, start)，已过滤边界且满足 finditer 的不重叠语义。"""
+        if not text or not self.patterns:
+            return
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        lengths, word_boundary = self._lengths, self._word_boundary
+        last_end: Dict[int, int] = {}
+        size = len(text)
+        node = 0
+        for end, ch in enumerate(_fold(text), 1):
+            child = goto[node].get(ch)
+            while child is None and node:
+                node = fail[node]
+                child = goto[node].get(ch)
+            node = child or 0
+            hits = outputs[node]
+            if not hits:
+                continue
+            for index in hits:
+                start = end - lengths[index]
+                if start < last_end.get(index, 0):
+                    continue
+                if word_boundary[index]:
+                    before = start > 0 and _is_word(text[start - 1])
+                    if before == _is_word(text[start]):
+                        continue
+                    after = end < size and _is_word(text[end])
+                    if after == _is_word(text[end - 1]):
+                        continue
+                last_end[index] = end
+                yield index, start
+
+    def find_all(self, text: str | None) -> Dict[int, List[int]]:
+        """{pattern_index: [start, ...]}，等价于逐条 pattern.finditer。"""
+        positions: Dict[int, List[int]] = {}
+        for index, start in self.iter_matches(text):
+            positions.setdefault(index, []).append(start)
+        for starts in positions.values():
+            starts.sort()
+        return positions
+
+    def count(self, text: str | None) -> Dict[int, int]:
+        """{pattern_index: 命中次数}，等价于 len(pattern.findall(text))。"""
+        counts: Dict[int, int] = {}
+        for index, _start in self.iter_matches(text):
+            counts[index] = counts.get(index, 0) + 1
+        return counts
+
+    def matched(self, text: str | None) -> Set[int]:
+        """命中过的 pattern 下标集合，等价于 pattern.search(text) 为真。"""
+        return {index for index, _start in self.iter_matches(text)}
+
+    def first_match(self, text: str | None) -> int | None:
+        """按 pattern 顺序第一个命中的下标（等价于按顺序 any/next(pattern.search)）。"""
+        hits = self.matched(text)
+        return min(hits) if hits else None
+
+
+@lru_cache(maxsize=64)
+def _compile_cached(patterns: Tuple[TermPattern, ...]) -> TermAutomaton:
+    return TermAutomaton(patterns)
+
+
+def compile_term_automaton(patterns: Sequence[TermPattern | str]) -> TermAutomaton:
+    """按词条内容缓存自动机：同一版本词库在进程内只构建一次。"""
+    normalized = tuple(
+        item if isinstance(item, TermPattern) else TermPattern(str(item))
+        for item in patterns
+    )
+    return _compile_cached(normalized)
+
+
+__all__ = [
+    "BOUNDARY_AUTO",
+    "BOUNDARY_SUBSTRING",
+    "BOUNDARY_WORD",
+    "TermAutomaton",
+    "TermPattern",
+    "compile_term_automaton",
+]
@@ -11,6 +11,7 @@ from typing import List, Tuple
 from app.interfaces.semantic_provider import SemanticLoadStrategy, SemanticProvider
 from app.models.comment import Aspect, Category
 from app.services.semantic.robust_loader import RobustSemanticLoader
+from app.services.semantic.term_automaton import TermAutomaton, compile_term_automaton
 from app.services.semantic.unified_lexicon import UnifiedLexicon
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
@@ -134,8 +135,8 @@ FUNCTION_KWS = tuple(_CLASSIFIER_KEYWORDS.get("function_kws", []))
 UX_KWS = tuple(_CLASSIFIER_KEYWORDS.get("ux_kws", []))
 RETURN_KWS = tuple(_CLASSIFIER_KEYWORDS.get("return_kws", []))
 
-_LEX_FEATURE_PATS: List[Tuple[str, re.Pattern[str]]] | None = None
-_LEX_PAIN_PATS: List[Tuple[str, re.Pattern[str]]] | None = None
+_LEX_FEATURE_AUTOMATON: TermAutomaton | None = None
+_LEX_PAIN_AUTOMATON: TermAutomaton | None = None
 _LEXICON_PATH: str | None = None
 _EXPANDED_PAIN_PATS: List[Tuple[Aspect, re.Pattern[str]]] | None = None
 _DEFAULT_PROVIDER = RobustSemanticLoader(strategy=SemanticLoadStrategy.YAML_ONLY)
@@ -150,26 +151,26 @@ _ASPECT_MAP = {
 
 def _load_unified_lexicon() -> None:
     """从配置路径加载词库用于可选匹配，不依赖数据库。"""
-    global _LEX_FEATURE_PATS, _LEX_PAIN_PATS, _LEXICON_PATH
+    global _LEX_FEATURE_AUTOMATON, _LEX_PAIN_AUTOMATON, _LEXICON_PATH
     cfg_path = os.getenv(
         "SEMANTIC_LEXICON_PATH",
         str(_config_path("semantic_sets", "unified_lexicon.yml")),
     )
     if (
         _LEXICON_PATH == cfg_path
-        and _LEX_FEATURE_PATS is not None
-        and _LEX_PAIN_PATS is not None
+        and _LEX_FEATURE_AUTOMATON is not None
+        and _LEX_PAIN_AUTOMATON is not None
     ):
         return
     try:
         lex = UnifiedLexicon(Path(cfg_path))
         feats = lex.get_features()
         pains = lex.get_pain_points()
-        _LEX_FEATURE_PATS = lex.get_patterns_for_matching(feats)
-        _LEX_PAIN_PATS = lex.get_patterns_for_matching(pains)
+        _LEX_FEATURE_AUTOMATON = lex.get_automaton_for_matching(feats)
+        _LEX_PAIN_AUTOMATON = lex.get_automaton_for_matching(pains)
         _LEXICON_PATH = cfg_path
     except Exception:
-        _LEX_FEATURE_PATS, _LEX_PAIN_PATS = [], []
+        _LEX_FEATURE_AUTOMATON = _LEX_PAIN_AUTOMATON = compile_term_automaton([])
         _LEXICON_PATH = cfg_path
 
 
@@ -320,12 +321,13 @@ def classify_category_aspect(text: str) -> Classification:
     # 可选：统一词表辅助
     try:
         _load_unified_lexicon()
-        feature_match = next(
-            (name for name, pat in (_LEX_FEATURE_PATS or []) if pat.search(t)),
-            None,
-        )
+        feature_match = None
+        if _LEX_FEATURE_AUTOMATON is not None:
+            feature_index = _LEX_FEATURE_AUTOMATON.first_match(t)
+            if feature_index is not None:
+                feature_match = _LEX_FEATURE_AUTOMATON.patterns[feature_index].text
         if category == Category.OTHER:
-            if any(pat.search(t) for _, pat in (_LEX_PAIN_PATS or [])):
+            if _LEX_PAIN_AUTOMATON is not None and _LEX_PAIN_AUTOMATON.matched(t):
                 category = Category.PAIN
             elif feature_match is not None:
                 category = Category.SOLUTION
@@ -7,6 +7,8 @@ from typing import Any, Dict, Iterable, List, Mapping, Tuple
 
 import yaml
 
+from app.services.semantic.term_automaton import TermAutomaton, compile_term_automaton
+
 
 @dataclass(frozen=True)
 class SemanticTerm:
@@ -79,6 +81,15 @@ class UnifiedLexicon:
                     return out
         return compile_patterns([t.canonical for t in terms])
 
+    def get_automaton_for_matching(self, terms: List[SemanticTerm]) -> TermAutomaton:
+        """与 get_patterns_for_matching 同规则的单遍匹配自动机。
+
+        pattern 顺序与 get_patterns_for_matching 返回的列表一一对应（空词条已剔除），
+        按词条内容缓存，同一版本词库只构建一次。
+        """
+        items = [(t.canonical or "").strip() for t in terms]
+        return compile_term_automaton([s for s in items if s])
+
     def get_layer_definition(self, layer: str) -> Dict[str, Any]:
         """读取层级定义（来自 layer_definitions.yml），失败回退内置默认。
 
@@ -36,6 +36,7 @@ from app.models.task import TaskStatus
 from app.schemas.task import TaskSummary
 from app.services.analysis.analysis_engine import AnalysisResult, run_analysis, InsufficientDataError
 from app.services.infrastructure.task_status_cache import TaskStatusCache, TaskStatusPayload
+from app.services.report.report_cache import invalidate_task_reports
 from app.core.tenant_context import set_current_user_id, unset_current_user_id
 from app.utils.asyncio_runner import run as run_coro, shutdown as shutdown_asyncio_runner
 
@@ -674,6 +675,8 @@ async def _store_analysis_results(task_id: uuid.UUID, result: AnalysisResult) ->
             task.dead_letter_at = None
 
             await session.commit()
+            # 重新分析后旧报告失效（共享 Redis 层；各 worker 进程内的旧键因 generated_at 变化不会再命中）
+            await invalidate_task_reports(task.id)
             # 真实分析结果和展示兜底分层：InsightCard/Evidence 只落真实证据。
             try:
                 await _persist_insight_cards(
@@ -4,6 +4,7 @@ import logging
 import os
 import uuid
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta, timezone
 from typing import Any, Iterable, List, Sequence, Tuple, TypeVar, cast
 
@@ -31,8 +32,10 @@ from app.services.infrastructure.task_outbox_service import (
 from app.services.infrastructure.task_outbox_dispatcher import dispatch_pending_task_outbox
 from app.utils.asyncio_runner import run as run_coro
 from app.services.crawl.crawl_plan import CrawlPlanBuilder
+from app.services.crawl.crawl_priority_scheduler import RedisCrawlPriorityQueue
 from app.services.crawl.crawler_task_runtime import (
     build_cache_manager as build_cache_manager_runtime,
+    build_crawl_priority_queue as build_crawl_priority_queue_runtime,
     build_patrol_planner_workflow_deps as build_patrol_planner_workflow_deps_runtime,
     build_patrol_target_planner_deps as build_patrol_target_planner_deps_runtime,
     build_planned_target_queue_deps as build_planned_target_queue_deps_runtime,
@@ -144,6 +147,10 @@ from app.services.infrastructure.reddit_client import RedditAPIClient, RedditAPI
 
 logger = get_task_logger(__name__)
 _MODULE_LOGGER = logging.getLogger(__name__)
+# 本轮巡航心跳共用的优先级队列（一个 Redis 连接）：领取、失败释放租约都走它，心跳结束时关闭
+_PATROL_PRIORITY_QUEUE: ContextVar[RedisCrawlPriorityQueue | None] = ContextVar(
+    "patrol_priority_queue", default=None
+)
 
 BACKFILL_POSTS_QUEUE = os.getenv("BACKFILL_POSTS_QUEUE", "backfill_posts_queue_v2")
 COMMENTS_BACKFILL_QUEUE = os.getenv("COMMENTS_BACKFILL_QUEUE", "backfill_queue")
@@ -275,6 +282,7 @@ def _patrol_planner_workflow_deps() -> PatrolPlannerWorkflowDeps:
         plan_patrol_targets_func=_plan_patrol_targets_workflow,
         generate_run_id=lambda: str(uuid.uuid4()),
         log_warning=logger.warning,
+        release_seed_profiles=_release_patrol_seed_profiles,
     )
 
 
@@ -454,9 +462,13 @@ async def _plan_patrol_targets(
 async def _load_incremental_seed_profiles(
     force_refresh: bool,
 ) -> tuple[list[CommunityProfile], int]:
+    settings = get_settings()
     seeds, total_pool_count = await load_incremental_seed_profiles_runtime(
         session_factory=SessionFactory,
         force_refresh=force_refresh,
+        priority_queue=_PATROL_PRIORITY_QUEUE.get(),
+        priority_batch_size=settings.crawl_priority_batch_size,
+        module_logger=_MODULE_LOGGER,
     )
     if force_refresh:
         _MODULE_LOGGER.info("🔄 强制刷新模式：下单全量 %s 个社区", len(seeds))
@@ -541,14 +553,37 @@ def dispatch_task_outbox() -> dict[str, Any]:
         raise
 
 
+async def _release_patrol_seed_profiles(profiles: list[CommunityProfile]) -> None:
+    priority_queue = _PATROL_PRIORITY_QUEUE.get()
+    if priority_queue is not None:
+        await priority_queue.release(profile.name for profile in profiles)
+
+
 async def _crawl_seeds_incremental_impl(force_refresh: bool = False) -> dict[str, Any]:
     """增量巡航心跳（planner-only）：只生成计划并派发 execute_target。"""
-    return await run_patrol_planner_task_runtime(
-        force_refresh=force_refresh,
-        build_patrol_planner_workflow_deps_func=_patrol_planner_workflow_deps,
-        task_logger=logger,
-        module_logger=_MODULE_LOGGER,
+    priority_queue = (
+        None
+        if force_refresh
+        else build_crawl_priority_queue_runtime(
+            settings=get_settings(),
+            module_logger=_MODULE_LOGGER,
+        )
     )
+    token = _PATROL_PRIORITY_QUEUE.set(priority_queue)
+    try:
+        return await run_patrol_planner_task_runtime(
+            force_refresh=force_refresh,
+            build_patrol_planner_workflow_deps_func=_patrol_planner_workflow_deps,
+            task_logger=logger,
+            module_logger=_MODULE_LOGGER,
+        )
+    finally:
+        _PATROL_PRIORITY_QUEUE.reset(token)
+        if priority_queue is not None:
+            try:
+                await priority_queue.aclose()
+            except Exception as exc:
+                _log_swallowed_exception("crawl priority queue close failed", exc)
 
 
 async def _crawl_single_impl(community_name: str, tier_name: str | None = None) -> dict[str, Any]:
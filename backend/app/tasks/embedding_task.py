@@ -145,8 +145,7 @@ async def _backfill_posts_batch(
         ids.append(int(row["id"]))
         texts.append(_truncate(content, max_chars))
 
-    batch_size = min(DEFAULT_EMBED_BATCH_SIZE, len(texts))
-    embeddings = embedding_service.encode(texts, batch_size=batch_size)
+    embeddings = embedding_service.encode_many(texts, max_batch_size=DEFAULT_EMBED_BATCH_SIZE)
 
     insert_rows = []
     for post_id, vec in zip(ids, embeddings):
@@ -204,8 +203,7 @@ async def _backfill_comments_batch(
         ids.append(int(row["id"]))
         texts.append(_truncate(row.get("body") or "", max_chars))
 
-    batch_size = min(DEFAULT_EMBED_BATCH_SIZE, len(texts))
-    embeddings = embedding_service.encode(texts, batch_size=batch_size)
+    embeddings = embedding_service.encode_many(texts, max_batch_size=DEFAULT_EMBED_BATCH_SIZE)
 
     insert_rows = []
     for comment_id, vec in zip(ids, embeddings):
@@ -35,13 +35,16 @@ from app.services.llm.legacy_label_persistence import (
     upsert_legacy_post_label,
 )
 from app.services.llm.label_result_persistence import (
+    persist_incremental_comment_analyses,
     persist_incremental_comment_analysis,
+    persist_incremental_post_analyses,
     persist_incremental_post_analysis,
 )
 from app.services.llm.legacy_label_backfill_workflow import (
     run_legacy_label_backfill_workflow,
 )
 from app.services.llm.labeling import LLMLabeler
+from app.services.llm.response_cache import get_llm_response_cache
 from app.services.semantic.llm_term_sync import sync_llm_terms
 from app.utils.asyncio_runner import run as run_coro
 
@@ -95,11 +98,16 @@ async def _fetch_top_comments(
     )
 
 
+def _build_labeler(**kwargs: Any) -> LLMLabeler:
+    # 重爬 / 回填后的相同内容直接命中响应缓存，不再重复调用 LLM
+    return LLMLabeler(**kwargs, response_cache=get_llm_response_cache())
+
+
 def _build_runtime_deps() -> LLMLabelTaskRuntimeDeps:
     return LLMLabelTaskRuntimeDeps(
         get_settings=get_settings,
         session_factory=SessionFactory,
-        labeler_factory=LLMLabeler,
+        labeler_factory=_build_labeler,
         fetch_post_candidates=_fetch_post_candidates,
         fetch_top_comments=_fetch_top_comments,
         build_incremental_comment_label_plan=build_incremental_comment_label_plan,
@@ -112,6 +120,8 @@ def _build_runtime_deps() -> LLMLabelTaskRuntimeDeps:
         run_incremental_post_label_workflow=run_incremental_post_label_workflow,
         run_incremental_comment_label_workflow=run_incremental_comment_label_workflow,
         run_legacy_label_backfill_workflow=run_legacy_label_backfill_workflow,
+        persist_post_analyses=persist_incremental_post_analyses,
+        persist_comment_analyses=persist_incremental_comment_analyses,
     )
 
 
@@ -15,7 +15,10 @@ from __future__ import annotations
 import json
 import logging
 import os
-from datetime import datetime, timezone
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from celery.utils.log import get_task_logger  # type: ignore[import-untyped]
@@ -26,6 +29,12 @@ from sqlalchemy import create_engine
 from app.core.celery_app import celery_app
 from app.db.session import SessionFactory
 from app.core.config import get_settings
+from app.services.infrastructure.chunked_cleanup import (
+    ChunkedCleanupProgress,
+    ChunkedCleanupTarget,
+    RedisCleanupCheckpointStore,
+    run_chunked_cleanup,
+)
 
 logger = get_task_logger(__name__)
 _MODULE_LOGGER = logging.getLogger(__name__)
@@ -223,6 +232,124 @@ async def _write_cleanup_audit(
         _MODULE_LOGGER.exception("Failed to write cleanup audit records")
 
 
+# 单次运行的批次上限只是兜底，正常由时间预算截停
+_RETENTION_CLEANUP_MAX_BATCHES = 10_000
+
+_POSTS_HOT_CLEANUP_TARGET = ChunkedCleanupTarget(
+    name="posts_hot",
+    select_sql="""
+        SELECT id
+        FROM posts_hot
+        WHERE id > :after AND expires_at < NOW()
+        ORDER BY id
+        LIMIT :limit
+    """,
+    delete_sql=(("posts_hot", "DELETE FROM posts_hot WHERE id = ANY(:ids)"),),
+)
+
+_NIL_UUID = "00000000-0000-0000-0000-000000000000"
+
+
+def _facts_cleanup_target(table_name: str) -> ChunkedCleanupTarget:
+    return ChunkedCleanupTarget(
+        name=table_name,
+        select_sql=f"""
+            SELECT id
+            FROM {table_name}
+            WHERE id > CAST(:after AS uuid)
+              AND expires_at IS NOT NULL AND expires_at < NOW()
+            ORDER BY id
+            LIMIT :limit
+        """,
+        delete_sql=((table_name, f"DELETE FROM {table_name} WHERE id = ANY(CAST(:ids AS uuid[]))"),),
+        initial_key=_NIL_UUID,
+        key_type=str,
+    )
+
+
+_FACTS_SNAPSHOTS_CLEANUP_TARGET = _facts_cleanup_target("facts_snapshots")
+_FACTS_RUN_LOGS_CLEANUP_TARGET = _facts_cleanup_target("facts_run_logs")
+
+
+def _comments_cleanup_target(*, has_expires: bool, retention_days: int) -> ChunkedCleanupTarget:
+    if has_expires:
+        # 优先使用 expires_at；若为空，则回退到 captured_at（不是 Reddit 的 created_utc）
+        expired = """
+            (expires_at IS NOT NULL AND expires_at < NOW())
+            OR (expires_at IS NULL AND captured_at < (NOW() - :days * interval '1 day'))
+        """
+    else:
+        # 旧库兼容：无 expires_at 时，使用 captured_at 判断保留期，避免误删历史很久但刚抓到的评论
+        expired = "captured_at < (NOW() - :days * interval '1 day')"
+    return ChunkedCleanupTarget(
+        name="comments",
+        select_sql=f"""
+            SELECT id
+            FROM comments
+            WHERE id > :after AND ({expired})
+            ORDER BY id
+            LIMIT :limit
+        """,
+        delete_sql=(
+            (
+                "content_labels",
+                "DELETE FROM content_labels WHERE content_type='comment' AND content_id = ANY(:ids)",
+            ),
+            (
+                "content_entities",
+                "DELETE FROM content_entities WHERE content_type='comment' AND content_id = ANY(:ids)",
+            ),
+            ("comments", "DELETE FROM comments WHERE id = ANY(:ids)"),
+        ),
+        params={"days": int(retention_days)},
+    )
+
+
+def _retention_cleanup_limits(
+    batch_size: int | None,
+    time_budget_seconds: float | None,
+) -> dict[str, Any]:
+    settings = get_settings()
+    return {
+        "batch_size": max(1, int(batch_size or settings.retention_cleanup_batch_size)),
+        "time_budget_seconds": float(
+            settings.retention_cleanup_time_budget_seconds
+            if time_budget_seconds is None
+            else time_budget_seconds
+        ),
+        "pause_seconds": max(0, int(settings.retention_cleanup_pause_ms)) / 1000.0,
+    }
+
+
+@asynccontextmanager
+async def _cleanup_checkpoint_store() -> AsyncIterator[RedisCleanupCheckpointStore]:
+    from redis.asyncio import Redis
+
+    client = Redis.from_url(get_settings().reddit_cache_redis_url, decode_responses=True)
+    try:
+        yield RedisCleanupCheckpointStore(client)
+    finally:
+        try:
+            await client.aclose()
+        except Exception:
+            _MODULE_LOGGER.debug("Failed to close cleanup checkpoint redis", exc_info=True)
+
+
+def _cleanup_progress_breakdown(progress: ChunkedCleanupProgress) -> dict[str, Any]:
+    summary = progress.as_dict()
+    return {
+        "batches": summary["batches"],
+        "stop_reason": summary["stop_reason"],
+        "last_id": summary["last_key"],
+        "rows_per_second": summary["rows_per_second"],
+    }
+
+
+def _cleanup_status(progress: ChunkedCleanupProgress) -> str:
+    # 预算 / 批次上限截停时已保存断点，下次运行继续，标记为 partial
+    return "completed" if progress.exhausted else "partial"
+
+
 def _refresh_view_with_fallback(conn, view_name: str) -> bool:
     try:
         conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view_name}"))
@@ -428,32 +555,160 @@ def refresh_mining_views() -> dict[str, Any]:
     return _refresh_mining_views()
 
 
-async def cleanup_expired_posts_hot_impl() -> dict[str, Any]:
+_ROLLUP_BACKFILL_DAYS = 365
+_ROLLUP_BACKFILL_SLICE_DAYS = 30
+
+
+async def refresh_subreddit_daily_stats_impl(
+    days: int | None = None, *, reconcile: bool = False
+) -> dict[str, Any]:
     """
-    清理过期的 posts_hot 数据（实现函数）。
+    增量刷新 subreddit_daily_stats 日汇总表。
+
+    - 常规：重算最近 T1_STATS_ROLLUP_REFRESH_DAYS 天（含今天）
+    - reconcile：重算最近 T1_STATS_ROLLUP_RECONCILE_DAYS 天，吸收迟到的标签 / 品牌实体
+    - 回填：水位未覆盖 365 天时，从水位（或今天）往前按 30 天一片回填；每片与水位推进同一事务提交，
+      中途失败下次从水位处续跑，读路径只在水位覆盖其窗口时才切到日汇总
     """
+    from app.services.analysis.subreddit_daily_stats import (
+        fetch_rollup_covered_since,
+        mark_rollup_covered_since,
+        refresh_subreddit_daily_stats,
+        rollup_table_exists,
+    )
+
+    settings = get_settings()
     start_time = datetime.now(timezone.utc)
+    today = start_time.date()
 
     async with SessionFactory() as db:
-        await _enable_safe_delete(db)
-        result = await db.execute(
-            text("SELECT cleanup_expired_hot_cache() AS deleted_count")
+        if not await rollup_table_exists(db):
+            _MODULE_LOGGER.warning("subreddit_daily_stats 表不存在，跳过刷新（请先执行迁移）")
+            return {"status": "skipped", "reason": "table_missing"}
+
+        covered_since = await fetch_rollup_covered_since(db)
+        # 多回填一天：365 天窗口的起点（today - 365）也要落在水位内
+        backfill_target = today - timedelta(days=_ROLLUP_BACKFILL_DAYS)
+        backfill = covered_since is None or covered_since > backfill_target
+        rows = 0
+        slices = 0
+        if backfill:
+            first_day = backfill_target
+            slice_end = today if covered_since is None else covered_since - timedelta(days=1)
+            while slice_end >= first_day:
+                slice_start = max(
+                    first_day, slice_end - timedelta(days=_ROLLUP_BACKFILL_SLICE_DAYS - 1)
+                )
+                rows += await refresh_subreddit_daily_stats(
+                    db, start_day=slice_start, end_day=slice_end
+                )
+                await mark_rollup_covered_since(db, slice_start)
+                await db.commit()
+                slices += 1
+                slice_end = slice_start - timedelta(days=1)
+            covered_since = first_day
+            window_days = (today - first_day).days + 1
+        else:
+            if days is not None:
+                window_days = days
+            elif reconcile:
+                window_days = settings.t1_stats_rollup_reconcile_days
+            else:
+                window_days = settings.t1_stats_rollup_refresh_days
+            window_days = max(1, int(window_days))
+            first_day = today - timedelta(days=window_days - 1)
+            rows += await refresh_subreddit_daily_stats(db, start_day=first_day, end_day=today)
+            await db.commit()
+            slices = 1
+
+        mode = "backfill" if backfill else ("reconcile" if reconcile else "incremental")
+        await _write_maintenance_audit(
+            db,
+            task_name="refresh_subreddit_daily_stats",
+            started_at=start_time,
+            affected_rows=rows,
+            extra={
+                "mode": mode,
+                "window_days": window_days,
+                "slices": slices,
+                "start_day": first_day.isoformat(),
+                "end_day": today.isoformat(),
+                "covered_since": covered_since.isoformat() if covered_since else None,
+            },
         )
-        deleted_count = int(result.scalar() or 0)
+
+    duration = (datetime.now(timezone.utc) - start_time).total_seconds()
+    _MODULE_LOGGER.info(
+        "📊 subreddit_daily_stats 刷新完成: mode=%s, days=%s, rows=%s, duration=%.2fs",
+        mode,
+        window_days,
+        rows,
+        duration,
+    )
+    return {
+        "status": "completed",
+        "mode": mode,
+        "window_days": window_days,
+        "rows": rows,
+        "covered_since": covered_since.isoformat() if covered_since else None,
+        "duration_seconds": duration,
+    }
+
+
+@celery_app.task(name="tasks.maintenance.refresh_subreddit_daily_stats")  # type: ignore[misc]
+def refresh_subreddit_daily_stats(
+    days: int | None = None, reconcile: bool = False
+) -> dict[str, Any]:
+    """Celery 任务：刷新 T1 统计日汇总表。"""
+    import asyncio
+
+    logger.info("📊 开始刷新 subreddit_daily_stats (days=%s, reconcile=%s)", days, reconcile)
+    result = asyncio.run(refresh_subreddit_daily_stats_impl(days, reconcile=reconcile))
+    logger.info("✅ subreddit_daily_stats 刷新完成: %s", result)
+    return result
+
+
+async def cleanup_expired_posts_hot_impl(
+    *,
+    batch_size: int | None = None,
+    max_batches: int = _RETENTION_CLEANUP_MAX_BATCHES,
+    time_budget_seconds: float | None = None,
+) -> dict[str, Any]:
+    """
+    清理过期的 posts_hot 数据（实现函数）。
+
+    按 id keyset 分批删除、每批提交；时间预算用完时保存断点，下次继续。
+    """
+    start_time = datetime.now(timezone.utc)
+    limits = _retention_cleanup_limits(batch_size, time_budget_seconds)
+
+    async with _cleanup_checkpoint_store() as checkpoint, SessionFactory() as db:
+        progress = await run_chunked_cleanup(
+            db,
+            _POSTS_HOT_CLEANUP_TARGET,
+            max_batches=max_batches,
+            checkpoint=checkpoint,
+            prepare_batch=_enable_safe_delete,
+            **limits,
+        )
+        deleted_count = progress.deleted["posts_hot"]
         duration = (datetime.now(timezone.utc) - start_time).total_seconds()
         await _write_cleanup_audit(
             db,
             task_name="cleanup_expired_posts_hot",
             total_records=deleted_count,
-            breakdown={"posts_hot": deleted_count},
+            breakdown={"posts_hot": deleted_count, **_cleanup_progress_breakdown(progress)},
             duration_seconds=duration,
         )
         await db.commit()
     duration = (datetime.now(timezone.utc) - start_time).total_seconds()
 
     _MODULE_LOGGER.info(
-        "🧹 posts_hot 清理完成: deleted=%s, duration=%.2fs",
+        "🧹 posts_hot 清理完成: deleted=%s, batches=%s, stop=%s, rate=%.0f rows/s, duration=%.2fs",
         deleted_count,
+        progress.batches,
+        progress.stop_reason,
+        progress.rows_per_second,
         duration,
     )
 
@@ -463,12 +718,16 @@ async def cleanup_expired_posts_hot_impl() -> dict[str, Any]:
             task_name="cleanup_expired_posts_hot",
             started_at=start_time,
             affected_rows=deleted_count,
-            extra={"view": "posts_hot"},
+            extra={"view": "posts_hot", **_cleanup_progress_breakdown(progress)},
         )
 
     return {
-        "status": "completed",
+        "status": _cleanup_status(progress),
         "deleted_count": deleted_count,
+        "batches": progress.batches,
+        "stop_reason": progress.stop_reason,
+        "last_id": progress.last_key,
+        "rows_per_second": round(progress.rows_per_second, 1),
         "duration_seconds": duration,
     }
 
@@ -493,8 +752,12 @@ async def cleanup_expired_facts_audit_impl(
     max_batches: int = 100,
     skip_guard: bool = False,
     dry_run: bool = False,
+    time_budget_seconds: float | None = None,
 ) -> dict[str, Any]:
-    """清理过期的 facts 审计包与最小运行日志（facts_snapshots / facts_run_logs）。"""
+    """清理过期的 facts 审计包与最小运行日志（facts_snapshots / facts_run_logs）。
+
+    两张表依次按 id keyset 分批删除；max_batches 为每张表的批次上限，时间预算两表共享。
+    """
     start_time = datetime.now(timezone.utc)
     enabled_flag = os.getenv("ENABLE_FACTS_AUDIT_CLEANUP", "").strip().lower() in {
         "1",
@@ -514,14 +777,15 @@ async def cleanup_expired_facts_audit_impl(
             "duration_seconds": 0.0,
         }
 
-    batch_size = max(1, int(batch_size))
+    limits = _retention_cleanup_limits(batch_size, time_budget_seconds)
+    batch_size = limits["batch_size"]
     max_batches = max(1, int(max_batches))
 
     deleted_snapshots = 0
     deleted_run_logs = 0
     batches = 0
 
-    async with SessionFactory() as db:
+    async with _cleanup_checkpoint_store() as checkpoint, SessionFactory() as db:
         has_snapshots = (
             await db.execute(text("SELECT to_regclass('public.facts_snapshots')"))
         ).scalar_one_or_none() is not None
@@ -603,97 +867,39 @@ async def cleanup_expired_facts_audit_impl(
                 "duration_seconds": duration,
             }
 
-        for _ in range(max_batches):
-            await _enable_safe_delete(db)
-            picked_snapshots = 0
-            picked_run_logs = 0
-            if has_snapshots:
-                row = (
-                    await db.execute(
-                        text(
-                            """
-                            WITH victim AS (
-                                SELECT id
-                                FROM facts_snapshots
-                                WHERE expires_at IS NOT NULL AND expires_at < NOW()
-                                ORDER BY expires_at
-                                LIMIT :limit
-                            ),
-                            deleted AS (
-                                DELETE FROM facts_snapshots
-                                WHERE id IN (SELECT id FROM victim)
-                                RETURNING 1
-                            )
-                            SELECT
-                                (SELECT COUNT(*) FROM victim) AS picked,
-                                (SELECT COUNT(*) FROM deleted) AS deleted
-                            """
-                        ),
-                        {"limit": batch_size},
-                    )
-                ).mappings().one()
-                picked_snapshots = int(row.get("picked") or 0)
-                deleted_snapshots += int(row.get("deleted") or 0)
-                if not sample_snapshot_ids:
-                    sample_rows = await db.execute(
-                        text(
-                            """
-                            SELECT id
-                            FROM facts_snapshots
-                            WHERE expires_at IS NOT NULL AND expires_at < NOW()
-                            ORDER BY expires_at
-                            LIMIT :limit
-                            """
-                        ),
-                        {"limit": min(50, batch_size)},
-                    )
-                    sample_snapshot_ids = [str(r[0]) for r in sample_rows.fetchall()]
-            if has_run_logs:
-                row = (
-                    await db.execute(
-                        text(
-                            """
-                            WITH victim AS (
-                                SELECT id
-                                FROM facts_run_logs
-                                WHERE expires_at IS NOT NULL AND expires_at < NOW()
-                                ORDER BY expires_at
-                                LIMIT :limit
-                            ),
-                            deleted AS (
-                                DELETE FROM facts_run_logs
-                                WHERE id IN (SELECT id FROM victim)
-                                RETURNING 1
-                            )
-                            SELECT
-                                (SELECT COUNT(*) FROM victim) AS picked,
-                                (SELECT COUNT(*) FROM deleted) AS deleted
-                            """
-                        ),
-                        {"limit": batch_size},
-                    )
-                ).mappings().one()
-                picked_run_logs = int(row.get("picked") or 0)
-                deleted_run_logs += int(row.get("deleted") or 0)
-                if not sample_run_log_ids:
-                    sample_rows = await db.execute(
-                        text(
-                            """
-                            SELECT id
-                            FROM facts_run_logs
-                            WHERE expires_at IS NOT NULL AND expires_at < NOW()
-                            ORDER BY expires_at
-                            LIMIT :limit
-                            """
-                        ),
-                        {"limit": min(50, batch_size)},
-                    )
-                    sample_run_log_ids = [str(r[0]) for r in sample_rows.fetchall()]
-
-            if picked_snapshots == 0 and picked_run_logs == 0:
-                break
-            batches += 1
-            await db.commit()
+        stop_reasons: dict[str, str] = {}
+        budget_started = time.monotonic()
+        for has_table, target in (
+            (has_snapshots, _FACTS_SNAPSHOTS_CLEANUP_TARGET),
+            (has_run_logs, _FACTS_RUN_LOGS_CLEANUP_TARGET),
+        ):
+            if not has_table:
+                continue
+            remaining_budget = limits["time_budget_seconds"]
+            if remaining_budget > 0:
+                remaining_budget -= time.monotonic() - budget_started
+                if remaining_budget <= 0:
+                    stop_reasons[target.name] = "time_budget"
+                    continue
+            progress = await run_chunked_cleanup(
+                db,
+                target,
+                batch_size=limits["batch_size"],
+                max_batches=max_batches,
+                time_budget_seconds=remaining_budget,
+                pause_seconds=limits["pause_seconds"],
+                checkpoint=checkpoint,
+                prepare_batch=_enable_safe_delete,
+            )
+            stop_reasons[target.name] = progress.stop_reason
+            batches = max(batches, progress.batches)
+            samples = [str(key) for key in progress.sample_keys]
+            if target is _FACTS_SNAPSHOTS_CLEANUP_TARGET:
+                deleted_snapshots = progress.deleted["facts_snapshots"]
+                sample_snapshot_ids = samples
+            else:
+                deleted_run_logs = progress.deleted["facts_run_logs"]
+                sample_run_log_ids = samples
 
         # audit record (best-effort)
         try:
@@ -725,6 +931,7 @@ async def cleanup_expired_facts_audit_impl(
                         "batch_size": batch_size,
                         "max_batches": max_batches,
                         "batches": batches,
+                        "stop_reasons": stop_reasons,
                     },
                 },
             )
@@ -738,6 +945,7 @@ async def cleanup_expired_facts_audit_impl(
                     "facts_run_logs": int(deleted_run_logs),
                     "batch_size": batch_size,
                     "batches": batches,
+                    "stop_reasons": stop_reasons,
                 },
                 duration_seconds=duration,
             )
@@ -746,11 +954,13 @@ async def cleanup_expired_facts_audit_impl(
             _MODULE_LOGGER.exception("Failed to write maintenance_audit record")
 
     duration = (datetime.now(timezone.utc) - start_time).total_seconds()
+    exhausted = all(reason == "exhausted" for reason in stop_reasons.values())
     return {
-        "status": "completed",
+        "status": "completed" if exhausted else "partial",
         "deleted_snapshots": int(deleted_snapshots),
         "deleted_run_logs": int(deleted_run_logs),
         "batches": int(batches),
+        "stop_reasons": stop_reasons,
         "duration_seconds": duration,
     }
 
@@ -779,11 +989,19 @@ def cleanup_expired_facts_audit(
     return result
 
 
-async def cleanup_expired_comments_impl(skip_guard: bool = False) -> dict[str, Any]:
+async def cleanup_expired_comments_impl(
+    skip_guard: bool = False,
+    *,
+    batch_size: int | None = None,
+    max_batches: int = _RETENTION_CLEANUP_MAX_BATCHES,
+    time_budget_seconds: float | None = None,
+) -> dict[str, Any]:
     """清理过期的 comments 以及其关联的 labels/entities。
 
     安全门：默认需要设置环境变量 ENABLE_COMMENTS_CLEANUP 才会执行；
     测试或受控调用可通过传入 skip_guard=True 跳过该保护。
+    过期评论按 id keyset 分批删除（每批先删 labels/entities 再删 comments 并提交），
+    时间预算用完时保存断点，下次从断点继续。
     """
     start_time = datetime.now(timezone.utc)
     from app.core.config import get_settings
@@ -805,9 +1023,9 @@ async def cleanup_expired_comments_impl(skip_guard: bool = False) -> dict[str, A
         retention_days = int(getattr(settings, "comments_retention_days", 180))
     except Exception:
         retention_days = 180
+    limits = _retention_cleanup_limits(batch_size, time_budget_seconds)
 
-    async with SessionFactory() as db:
-        # collect expired ids first
+    async with _cleanup_checkpoint_store() as checkpoint, SessionFactory() as db:
         # detect if expires_at column exists to maintain compatibility on older DBs
         col_check = await db.execute(
             text(
@@ -816,56 +1034,17 @@ async def cleanup_expired_comments_impl(skip_guard: bool = False) -> dict[str, A
         )
         has_expires = col_check.first() is not None
 
-        if has_expires:
-            # 优先使用 expires_at；若为空，则回退到 captured_at（不是 Reddit 的 created_utc）
-            expired_ids_sql = text(
-                """
-                SELECT id
-                FROM comments
-                WHERE (
-                    expires_at IS NOT NULL AND expires_at < NOW()
-                ) OR (
-                    expires_at IS NULL AND captured_at < (NOW() - :days * interval '1 day')
-                )
-                """
-            )
-        else:
-            # 旧库兼容：无 expires_at 时，使用 captured_at 判断保留期，避免误删历史很久但刚抓到的评论
-            expired_ids_sql = text(
-                f"""
-                SELECT id
-                FROM comments
-                WHERE captured_at < (NOW() - ({int(retention_days)} * interval '1 day'))
-                """
-            )
-        if has_expires:
-            expired_ids_result = await db.execute(expired_ids_sql, {"days": retention_days})
-        else:
-            expired_ids_result = await db.execute(expired_ids_sql)
-        ids = [int(row[0]) for row in expired_ids_result.fetchall()]
-        deleted_labels = deleted_entities = deleted_comments = 0
-        if ids:
-            await _enable_safe_delete(db)
-            # delete related labels/entities
-            res1 = await db.execute(
-                text(
-                    "DELETE FROM content_labels WHERE content_type='comment' AND content_id = ANY(:ids) RETURNING 1"
-                ),
-                {"ids": ids},
-            )
-            deleted_labels = res1.rowcount or 0
-            res2 = await db.execute(
-                text(
-                    "DELETE FROM content_entities WHERE content_type='comment' AND content_id = ANY(:ids) RETURNING 1"
-                ),
-                {"ids": ids},
-            )
-            deleted_entities = res2.rowcount or 0
-            res3 = await db.execute(
-                text("DELETE FROM comments WHERE id = ANY(:ids) RETURNING 1"),
-                {"ids": ids},
-            )
-            deleted_comments = res3.rowcount or 0
+        progress = await run_chunked_cleanup(
+            db,
+            _comments_cleanup_target(has_expires=has_expires, retention_days=retention_days),
+            max_batches=max_batches,
+            checkpoint=checkpoint,
+            prepare_batch=_enable_safe_delete,
+            **limits,
+        )
+        deleted_labels = progress.deleted["content_labels"]
+        deleted_entities = progress.deleted["content_entities"]
+        deleted_comments = progress.deleted["comments"]
         # write audit record
         try:
             from sqlalchemy import text as _t
@@ -890,10 +1069,11 @@ async def cleanup_expired_comments_impl(skip_guard: bool = False) -> dict[str, A
                     "triggered_by": triggered_by,
                     "started_at": start_time,
                     "affected": int(deleted_comments or 0),
-                    "samples": ids[:50],
+                    "samples": [int(key) for key in progress.sample_keys],
                     "extra": {
                         "retention_days": retention_days,
                         "has_expires": has_expires,
+                        **_cleanup_progress_breakdown(progress),
                     },
                 },
             )
@@ -907,7 +1087,8 @@ async def cleanup_expired_comments_impl(skip_guard: bool = False) -> dict[str, A
                     "content_labels": int(deleted_labels),
                     "content_entities": int(deleted_entities),
                     "retention_days": retention_days,
-                    "expired_ids": len(ids),
+                    "expired_ids": progress.scanned,
+                    **_cleanup_progress_breakdown(progress),
                 },
                 duration_seconds=duration,
             )
@@ -918,19 +1099,27 @@ async def cleanup_expired_comments_impl(skip_guard: bool = False) -> dict[str, A
 
     duration = (datetime.now(timezone.utc) - start_time).total_seconds()
     _MODULE_LOGGER.info(
-        "🧹 comments 清理完成: expired_ids=%s, labels=%s, entities=%s, comments=%s, duration=%.2fs",
-        len(ids),
+        "🧹 comments 清理完成: expired_ids=%s, labels=%s, entities=%s, comments=%s, batches=%s, "
+        "stop=%s, rate=%.0f rows/s, duration=%.2fs",
+        progress.scanned,
         deleted_labels,
         deleted_entities,
         deleted_comments,
+        progress.batches,
+        progress.stop_reason,
+        progress.rows_per_second,
         duration,
     )
     return {
-        "status": "completed",
-        "expired_ids": len(ids),
+        "status": _cleanup_status(progress),
+        "expired_ids": progress.scanned,
         "deleted_labels": deleted_labels,
         "deleted_entities": deleted_entities,
         "deleted_comments": deleted_comments,
+        "batches": progress.batches,
+        "stop_reason": progress.stop_reason,
+        "last_id": progress.last_key,
+        "rows_per_second": round(progress.rows_per_second, 1),
         "duration_seconds": duration,
     }
 
@@ -20,6 +20,7 @@ from app.services.infrastructure.reddit_client import RedditAPIClient
 from app.services.crawl.incremental_crawler import IncrementalCrawler
 from app.core.config import get_settings
 from app.services.infrastructure.global_rate_limiter import GlobalRateLimiter
+from app.services.crawl.time_slice_scheduler import RedisSliceCheckpointStore
 import redis.asyncio as redis  # type: ignore
 from datetime import timezone, timedelta
 
@@ -177,6 +178,7 @@ async def main():
                 # 构建客户端与写入器
                 # Connect a global limiter so multiple shards coordinate capacity
                 limiter = None
+                rclient = None
                 try:
                     rclient = redis.Redis.from_url(settings.reddit_cache_redis_url)
                     limiter = GlobalRateLimiter(
@@ -202,9 +204,31 @@ async def main():
                     async with SessionFactory() as session:
                         crawler = IncrementalCrawler(session, reddit, hot_cache_ttl_hours=24)
                         sub = community[2:] if community.lower().startswith('r/') else community
-                        posts = await reddit.fetch_posts_by_time_slices(subreddit=sub, slices=slices, per_slice_max=args.per_slice, sort='new')
-                        res = await crawler.ingest_posts_batch(community, posts)
-                        print(f"    ✅ 切片模式成功：new={res['new']}, updated={res['updated']}, dup={res['duplicates']} (total={len(posts)})")
+                        totals = {'new': 0, 'updated': 0, 'duplicates': 0}
+                        ingest_lock = asyncio.Lock()
+
+                        async def _ingest_slice(fresh_posts):
+                            # 每片先入库再写 checkpoint（scheduler 在回调返回后才 mark），中断重跑不会丢已标记切片的数据；
+                            # 切片并发抓取但共享一个 session，入库串行
+                            async with ingest_lock:
+                                res = await crawler.ingest_posts_batch(community, fresh_posts)
+                            for field in totals:
+                                totals[field] += int(res.get(field, 0))
+
+                        # 切片并发抓取 + 截断切片自动拆分；完成并入库的切片记入 Redis，中断后重跑跳过
+                        report = await reddit.crawl_posts_by_time_slices(
+                            subreddit=sub,
+                            slices=slices,
+                            per_slice_max=args.per_slice,
+                            sort='new',
+                            checkpoint=RedisSliceCheckpointStore(rclient) if rclient is not None else None,
+                            checkpoint_key=f"{sub.lower()}:new:{since}:{until}",
+                            on_new_posts=_ingest_slice,
+                        )
+                        posts = report.posts
+                        kpi = report.as_dict()
+                        print(f"    📐 切片：done={kpi['slices_done']}, split={kpi['slices_split']}, resumed={kpi['slices_resumed']}, failed={kpi['slices_failed']}, {kpi['elapsed_seconds']}s")
+                        print(f"    ✅ 切片模式成功：new={totals['new']}, updated={totals['updated']}, dup={totals['duplicates']} (total={len(posts)})")
             success_count += 1
             print(f'  ✅ 社区 {community} 抓取完成')
         except Exception as e:
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Dry-run 统一抓取优先级调度：回放某天的 patrol 抓取记录，对比按额度持续派发的效果。
+
+只读数据库，不写 Redis、不下单。
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from app.core.config import get_settings
+from app.db.session import SessionFactory
+from app.services.crawl.crawl_priority_scheduler import (
+    load_crawl_candidates,
+    load_recorded_crawls,
+    simulate_day,
+)
+
+
+async def run(day: date, budget_per_hour: float, tick_minutes: int) -> dict[str, Any]:
+    async with SessionFactory() as db:
+        candidates = await load_crawl_candidates(db)
+        recorded = await load_recorded_crawls(db, day)
+    report = simulate_day(
+        candidates,
+        recorded,
+        day_start=datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc),
+        request_budget_per_hour=budget_per_hour,
+        tick_minutes=tick_minutes,
+    )
+    return {"day": day.isoformat(), "candidates": len(candidates), **report.as_dict()}
+
+
+def main() -> None:
+    settings = get_settings()
+    default_budget = (
+        settings.reddit_rate_limit * 3600 / max(1, settings.reddit_rate_limit_window_seconds)
+    )
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--day",
+        type=date.fromisoformat,
+        default=datetime.now(timezone.utc).date() - timedelta(days=1),
+        help="回放日期（UTC，默认昨天）",
+    )
+    parser.add_argument(
+        "--budget-per-hour",
+        type=float,
+        default=default_budget,
+        help="每小时可用请求数（默认按 REDDIT_RATE_LIMIT 折算）",
+    )
+    parser.add_argument("--tick-minutes", type=int, default=5)
+    args = parser.parse_args()
+    result = asyncio.run(run(args.day, args.budget_per_hour, args.tick_minutes))
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""热帖证据采集延迟基准：用带随机延迟的假 Reddit 客户端测各 mode 的 p50/p95 端到端耗时。
+
+对比顺序执行（--concurrency 1）与并发 + 时限两种配置，不访问网络、不依赖数据库/Redis。
+
+    python scripts/hotpost/bench_evidence_latency.py --runs 30 --concurrency 6 --deadline 25
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.services.hotpost.evidence_collection_workflow import (  # noqa: E402
+    HotpostEvidenceCollectionDeps,
+    HotpostEvidenceCollectionInput,
+    collect_hotpost_evidence,
+)
+from app.services.hotpost.hotpost_runtime import (  # noqa: E402
+    build_hotpost_pain_points,
+    build_hotpost_post,
+    fetch_hotpost_comments,
+    resolve_hotpost_confidence_level,
+    resolve_hotpost_sentiment_label,
+    resolve_hotpost_sort,
+    search_hotpost_subreddit_posts,
+    select_hotpost_signals,
+)
+from app.services.hotpost.keywords import load_default_hotpost_keywords  # noqa: E402
+from app.services.infrastructure.reddit_client import RedditPost  # noqa: E402
+
+MODES = ("rant", "opportunity", "trending")
+SUBREDDITS = ["r/robotvacuums", "r/homeimprovement", "r/cleaningtips", "r/roomba", "r/buyitforlife"]
+
+
+class _StubRedditClient:
+    """每次请求 sleep 一个对数正态分布的延迟（中位数 median_ms），返回固定模板帖子。"""
+
+    def __init__(self, *, median_ms: float, seed: int) -> None:
+        self._median = median_ms / 1000.0
+        self._rng = random.Random(seed)
+
+    async def _latency(self) -> None:
+        await asyncio.sleep(self._median * self._rng.lognormvariate(0.0, 0.5))
+
+    def _posts(self, subreddit: str, query: str, count: int) -> list[RedditPost]:
+        return [
+            RedditPost(
+                id=f"{subreddit}-{query}-{i}",
+                title=f"{query} keeps breaking, looking for an alternative",
+                selftext="Frustrated, it broke again. Anyone recommend a better option?",
+                score=50 - i,
+                num_comments=10,
+                created_utc=0.0,
+                subreddit=subreddit,
+                author="user",
+                url="",
+                permalink="",
+            )
+            for i in range(count)
+        ]
+
+    async def search_subreddit_page(
+        self, subreddit: str, query: str, *, limit: int, **_kwargs: Any
+    ) -> tuple[list[RedditPost], str | None]:
+        await self._latency()
+        return self._posts(subreddit, query, min(limit, 8)), None
+
+    async def search_posts(self, query: str, *, limit: int, **_kwargs: Any) -> list[RedditPost]:
+        await self._latency()
+        return self._posts("r/all", query, min(limit, 25))
+
+    async def fetch_post_comments(self, post_id: str, **_kwargs: Any) -> list[dict[str, Any]]:
+        await self._latency()
+        return [{"name": f"t1_{post_id}", "author": "a", "body": "same here", "score": 3}]
+
+
+async def _no_wait_budget(*, cost: int, queue_tracker: Any | None = None) -> None:
+    return None
+
+
+async def _run_once(mode: str, *, client: _StubRedditClient, concurrency: int, deadline: float) -> float:
+    lexicon = load_default_hotpost_keywords()
+
+    async def _search_subreddit_posts(subreddit: str, query: str, **kwargs: Any) -> tuple[list[RedditPost], int]:
+        return await search_hotpost_subreddit_posts(
+            subreddit,
+            query,
+            acquire_rate_budget=_no_wait_budget,
+            search_subreddit_page=client.search_subreddit_page,
+            **kwargs,
+        )
+
+    async def _fetch_comments(post_id: str, *, queue_tracker: Any | None = None) -> list[dict[str, Any]]:
+        return await fetch_hotpost_comments(
+            post_id,
+            queue_tracker=queue_tracker,
+            acquire_rate_budget=_no_wait_budget,
+            fetch_post_comments=client.fetch_post_comments,
+        )
+
+    result = await collect_hotpost_evidence(
+        workflow_input=HotpostEvidenceCollectionInput(
+            request_query="robot vacuum",
+            query_parts=["robot vacuum", "vacuum alternative", "roomba broken"],
+            keywords=["robot", "vacuum"],
+            mode=mode,
+            time_filter="month",
+            sort=resolve_hotpost_sort(mode),
+            limit=30,
+            requested_subreddits=None if mode == "opportunity" else SUBREDDITS,
+            suggest_subreddits_when_missing=False,
+            enable_relevance_filter=True,
+            max_posts_per_subreddit=30,
+            notes=[],
+            max_concurrency=concurrency,
+            deadline_seconds=deadline,
+        ),
+        deps=HotpostEvidenceCollectionDeps(
+            acquire_rate_budget=_no_wait_budget,
+            search_subreddits=None,
+            search_subreddit_posts=_search_subreddit_posts,
+            search_posts=client.search_posts,
+            fetch_comments=_fetch_comments,
+            select_signals=lambda m, text: select_hotpost_signals(m, text, lexicon=lexicon),
+            sentiment_label=lambda m, text, signals: resolve_hotpost_sentiment_label(
+                m, text, signals, lexicon=lexicon
+            ),
+            build_post=build_hotpost_post,
+            build_pain_points=build_hotpost_pain_points,
+            confidence_level=resolve_hotpost_confidence_level,
+            lexicon=lexicon,
+        ),
+    )
+    return result.elapsed_seconds
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _bench(args: argparse.Namespace) -> dict[str, Any]:
+    report: dict[str, Any] = {}
+    for mode in MODES:
+        for label, concurrency, deadline in (
+            ("sequential", 1, 0.0),
+            ("concurrent", args.concurrency, args.deadline),
+        ):
+            client = _StubRedditClient(median_ms=args.median_ms, seed=args.seed)
+            samples = [
+                await _run_once(mode, client=client, concurrency=concurrency, deadline=deadline)
+                for _ in range(args.runs)
+            ]
+            report.setdefault(mode, {})[label] = {
+                "p50_ms": round(statistics.median(samples) * 1000, 1),
+                "p95_ms": round(_percentile(samples, 95) * 1000, 1),
+                "runs": len(samples),
+            }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="hotpost evidence collection latency benchmark")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=6)
+    parser.add_argument("--deadline", type=float, default=25.0)
+    parser.add_argument("--median-ms", type=float, default=80.0, help="假 Reddit 单次请求延迟中位数")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_bench(args)), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import argparse
 import json
 from pathlib import Path
 import sys
@@ -13,8 +14,17 @@ from app.services.hotpost.card_payload_store import migrate_cards_payload_layout
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Import hotpost cards (legacy single file or split layout) into the indexed record store."
+    )
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Re-import from the legacy layout even if the record store was already migrated.",
+    )
+    args = parser.parse_args()
     load_backend_env()
-    result = migrate_cards_payload_layout()
+    result = migrate_cards_payload_layout(overwrite=args.overwrite)
     print(json.dumps(result, ensure_ascii=False))
 
 
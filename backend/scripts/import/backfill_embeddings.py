@@ -70,7 +70,7 @@ async def backfill_embeddings():
         # 3. Generate Embeddings (CPU/GPU bound, no DB needed)
         try:
             # This handles model loading internally
-            embeddings = embedding_service.encode(texts, batch_size=batch_count)
+            embeddings = embedding_service.encode_many(texts)
         except Exception as e:
             logger.error(f"❌ Failed to generate embeddings for batch: {e}")
             break
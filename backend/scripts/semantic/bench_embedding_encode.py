@@ -0,0 +1,116 @@
+"""向量回填编码吞吐基准：对比固定批大小 encode 与按长度分桶的 encode_many（CPU）。
+
+模拟 tasks.embedding.backfill_posts_batch 的输入：每轮 200 条、长短混合（标题 + 截断到 2000 字符的正文）。
+默认用小模型本地跑，不访问数据库；首次运行会下载模型权重。
+
+    python scripts/semantic/bench_embedding_encode.py --model sentence-transformers/all-MiniLM-L6-v2 --rounds 5
+    python scripts/semantic/bench_embedding_encode.py --texts-file posts.jsonl  # 每行 {"title": ..., "body": ...}
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.services.semantic.embedding_service import EmbeddingService  # noqa: E402
+from app.tasks.embedding_task import (  # noqa: E402
+    DEFAULT_BATCH_LIMIT,
+    DEFAULT_EMBED_BATCH_SIZE,
+    DEFAULT_MAX_CHARS,
+    _truncate,
+)
+
+WORDS = (
+    "robot vacuum battery suction mop dock app wifi carpet pet hair brush filter noise map "
+    "schedule warranty refund support broke again alternative recommend cheaper roomba"
+).split()
+
+
+def _synthetic_posts(count: int, *, seed: int) -> list[str]:
+    """大部分是短帖，少量长帖：贴近 Reddit 正文长度的长尾分布。"""
+    rng = random.Random(seed)
+    texts: list[str] = []
+    for _ in range(count):
+        title = " ".join(rng.choices(WORDS, k=rng.randint(4, 14)))
+        body_words = int(min(600, rng.lognormvariate(3.5, 1.2)))
+        body = " ".join(rng.choices(WORDS, k=body_words))
+        texts.append(_truncate(f"{title}\n{body}".strip(), DEFAULT_MAX_CHARS))
+    return texts
+
+
+def _load_posts(path: Path, count: int) -> list[str]:
+    texts: list[str] = []
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            row: dict[str, Any] = json.loads(line)
+            content = f"{row.get('title') or ''}\n{row.get('body') or ''}".strip()
+            texts.append(_truncate(content, DEFAULT_MAX_CHARS))
+            if len(texts) >= count:
+                break
+    return texts
+
+
+def _timed(fn: Any) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="embedding encode throughput benchmark")
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--batch-limit", type=int, default=DEFAULT_BATCH_LIMIT, help="每轮条数（同回填任务 limit）")
+    parser.add_argument("--max-tokens-per-batch", type=int, default=None, help="默认取 EMBEDDING_MAX_TOKENS_PER_BATCH")
+    parser.add_argument("--texts-file", type=Path, default=None)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    if args.texts_file is not None:
+        texts = _load_posts(args.texts_file, args.batch_limit)
+    else:
+        texts = _synthetic_posts(args.batch_limit, seed=args.seed)
+    service = EmbeddingService(args.model)
+    service.encode(texts[:2], batch_size=2)  # 预热：加载模型
+
+    baseline = [
+        _timed(lambda: service.encode(texts, batch_size=min(DEFAULT_EMBED_BATCH_SIZE, len(texts))))
+        for _ in range(args.rounds)
+    ]
+    bucketed = [
+        _timed(
+            lambda: service.encode_many(
+                texts,
+                max_tokens_per_batch=args.max_tokens_per_batch,
+                max_batch_size=DEFAULT_EMBED_BATCH_SIZE,
+            )
+        )
+        for _ in range(args.rounds)
+    ]
+
+    def _summary(samples: list[float]) -> dict[str, float]:
+        median = statistics.median(samples)
+        return {"median_s": round(median, 3), "texts_per_s": round(len(texts) / median, 1)}
+
+    report = {
+        "model": args.model,
+        "texts": len(texts),
+        "rounds": args.rounds,
+        "fixed_batch": _summary(baseline),
+        "encode_many": _summary(bucketed),
+        "speedup": round(statistics.median(baseline) / statistics.median(bucketed), 2),
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -199,3 +199,73 @@ async def test_sse_permission_denied(client: AsyncClient, db_session: AsyncSessi
         headers={"Authorization": f"Bearer {token}"},
     )
     assert response.status_code == 403
+
+
+async def test_sse_pushes_published_status_without_db_session(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import fakeredis.aioredis
+    from fakeredis import FakeServer
+
+    from app.api.routes import stream
+    from app.models.task import TaskStatus
+    from app.services.infrastructure.task_status_cache import TaskStatusCache
+
+    cache = TaskStatusCache()
+    fake_redis = fakeredis.aioredis.FakeRedis(server=FakeServer(), decode_responses=True)
+    monkeypatch.setattr(cache, "_redis", fake_redis, raising=False)
+    monkeypatch.setattr(stream, "STATUS_CACHE", cache)
+    # 轮询间隔调大：事件只能靠推送在 1s 内到达
+    monkeypatch.setattr(stream, "POLL_INTERVAL_SECONDS", 30.0)
+    monkeypatch.setattr(stream, "FALLBACK_POLL_INTERVAL_SECONDS", 30.0)
+    monkeypatch.setattr(stream, "HEARTBEAT_INTERVAL_SECONDS", 30.0)
+
+    def _no_db() -> None:
+        raise AssertionError("stream must not open DB sessions while Redis has the status")
+
+    monkeypatch.setattr(stream, "SessionFactory", _no_db)
+
+    task_id = uuid.uuid4()
+    task = Task(
+        id=task_id,
+        user_id=uuid.uuid4(),
+        product_description="Push SSE",
+        status=TaskStatus.PENDING,
+        updated_at=datetime.now(timezone.utc),
+    )
+    pending = TaskStatusPayload(
+        task_id=str(task_id), status="pending", progress=0, message="任务排队中"
+    )
+    await cache.set_status(pending)
+
+    gen = stream._event_generator(task)  # type: ignore[attr-defined]
+    events: list[str] = []
+    progress_values: list[object] = []
+
+    async def _consume() -> None:
+        async for chunk in gen:
+            for line in chunk.splitlines():
+                if line.startswith("event:"):
+                    events.append(line.split(": ", 1)[1])
+                elif line.startswith("data:"):
+                    progress_values.append(json.loads(line.split(": ", 1)[1]).get("progress"))
+
+    consumer = asyncio.create_task(_consume())
+    while "progress" not in events:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)  # 等订阅建立
+
+    for progress, status_value in ((60, "processing"), (100, "completed")):
+        await cache.set_status(
+            TaskStatusPayload(
+                task_id=str(task_id),
+                status=status_value,
+                progress=progress,
+                message=status_value,
+            )
+        )
+    await asyncio.wait_for(consumer, timeout=1.0)
+
+    assert events[0] == "connected"
+    assert events[-2:] == ["completed", "close"]
+    assert 60 in progress_values
@@ -0,0 +1,86 @@
+"""
+卡片存储基准：拆分 JSON 目录（整包读写） vs 记录存储（主键读写），20k candidates + 2k published
+
+- get: 按 id 取单个 candidate
+- upsert: 更新单个 candidate 并落盘
+
+运行：pytest tests/benchmarks/test_card_record_store_benchmark.py -m slow -s
+"""
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services.hotpost.card_record_store import CardRecordStore
+from app.services.hotpost.card_storage_layout import load_payload, write_split_payload
+
+CANDIDATES = 20_000
+PUBLISHED = 2_000
+ROUNDS = 20
+
+
+def _payload() -> dict:
+    candidates = [
+        {
+            "candidate_id": f"cand-{i}",
+            "source_scope_id": f"scope-{i % 12}",
+            "title": f"candidate title {i} " * 4,
+            "collected_at": f"2026-04-{1 + i % 28:02d}T00:00:00Z",
+            "evidence_quotes": [{"text": "quote " * 30, "community": "r/PPC"}] * 2,
+        }
+        for i in range(CANDIDATES)
+    ]
+    published = [
+        {"card_id": f"card-{i}", "published_at": f"2026-04-{1 + i % 28:02d}T00:00:00Z", "summary_line": "s " * 40}
+        for i in range(PUBLISHED)
+    ]
+    return {"categories": [], "candidates": candidates, "drafts": [], "published": published}
+
+
+@pytest.mark.slow
+def test_single_card_read_write_at_20k(tmp_path: Path) -> None:
+    payload = _payload()
+    split_path = tmp_path / "split" / "hotpost_clues.json"
+    split_path.parent.mkdir()
+    write_split_payload(split_path, payload)
+
+    t0 = time.perf_counter()
+    for i in range(3):
+        next(item for item in load_payload(split_path)["candidates"] if item["candidate_id"] == f"cand-{i * 997}")
+    split_get = (time.perf_counter() - t0) / 3
+
+    t0 = time.perf_counter()
+    for i in range(3):
+        current = load_payload(split_path)
+        current["candidates"][i]["title"] = f"patched {i}"
+        write_split_payload(split_path, current)
+    split_upsert = (time.perf_counter() - t0) / 3
+
+    record_path = tmp_path / "records" / "hotpost_clues.json"
+    record_path.parent.mkdir()
+    store = CardRecordStore(record_path)
+    with store.transaction() as tx:
+        tx.replace_all("candidates", payload["candidates"])
+        tx.replace_all("published", payload["published"])
+
+    t0 = time.perf_counter()
+    for i in range(ROUNDS):
+        assert store.get("candidates", f"cand-{i * 997}") is not None
+    store_get = (time.perf_counter() - t0) / ROUNDS
+
+    t0 = time.perf_counter()
+    for i in range(ROUNDS):
+        item = dict(payload["candidates"][i], title=f"patched {i}")
+        with store.transaction() as tx:
+            tx.upsert("candidates", item)
+    store_upsert = (time.perf_counter() - t0) / ROUNDS
+
+    print(
+        f"\n[bench] split layout: get={split_get * 1000:.1f}ms upsert={split_upsert * 1000:.1f}ms"
+        f"\n[bench] record store: get={store_get * 1000:.3f}ms upsert={store_upsert * 1000:.3f}ms"
+    )
+    assert store.get("candidates", "cand-3")["title"] == "patched 3"
+    assert store_get * 50 < split_get
+    assert store_upsert * 50 < split_upsert
@@ -0,0 +1,116 @@
+"""
+向量去重基准：384 维 x 20k posts
+
+- legacy: 旧实现（逐帖 Python sum(x*y) 对比全部 kept 向量），只跑 2k 子集
+- exact: 归一化 float32 矩阵 + 分块贪心
+- approximate: 超平面 LSH 近邻索引（>= 50k 时的默认路径），并统计相对 exact 的召回
+
+运行：pytest tests/benchmarks/test_embedding_dedup_benchmark.py -m slow -s
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Mapping, Sequence
+
+import numpy as np
+import pytest
+
+from app.services.analysis.deduplicator import deduplicate_posts_by_embeddings
+
+DIM = 384
+POSTS = 20_000
+LEGACY_POSTS = 1_000
+DUPLICATE_RATIO = 0.25
+THRESHOLD = 0.92
+
+
+def _dataset(count: int) -> tuple[list[dict[str, object]], dict[str, list[float]]]:
+    rng = np.random.default_rng(11)
+    vectors = rng.standard_normal((count, DIM)).astype(np.float32)
+    duplicates = rng.random(count) < DUPLICATE_RATIO
+    sources = rng.integers(0, count, size=count)
+    for idx in np.flatnonzero(duplicates):
+        # 同义改写：在源向量上加小扰动（cos ≈ 0.96~0.99）
+        src = vectors[sources[idx]]
+        noise = rng.standard_normal(DIM).astype(np.float32) * rng.uniform(0.1, 0.25)
+        vectors[idx] = src / np.linalg.norm(src) + noise / np.sqrt(DIM) * 2
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    posts = [
+        {"id": f"p{i}", "score": int(rng.integers(0, 500)), "num_comments": int(rng.integers(0, 80))}
+        for i in range(count)
+    ]
+    embeddings = {f"p{i}": vectors[i].tolist() for i in range(count)}
+    return posts, embeddings
+
+
+def _legacy_dedupe(
+    posts: Sequence[Dict[str, object]],
+    embeddings: Mapping[str, Sequence[float]],
+    threshold: float,
+) -> List[Dict[str, object]]:
+    def _engagement(post: Mapping[str, object]) -> float:
+        score_val: Any = post.get("score", 0) or 0
+        comments_val: Any = post.get("num_comments", 0) or 0
+        return float(score_val) + float(comments_val) * 0.75
+
+    indexed = sorted(enumerate(posts), key=lambda pair: _engagement(pair[1]), reverse=True)
+    kept: List[Dict[str, object]] = []
+    kept_vectors: List[Sequence[float]] = []
+    for _, post in indexed:
+        vec = embeddings[str(post["id"])]
+        primary = next(
+            (
+                kept_post
+                for kept_post, kept_vec in zip(kept, kept_vectors)
+                if sum(x * y for x, y in zip(vec, kept_vec)) >= threshold
+            ),
+            None,
+        )
+        if primary is None:
+            kept.append(dict(post))
+            kept_vectors.append(vec)
+        else:
+            primary.setdefault("duplicate_ids", []).append(str(post["id"]))
+    return kept
+
+
+def _duplicate_map(kept: Sequence[Mapping[str, object]]) -> dict[str, str]:
+    return {
+        str(dup): str(post["id"])
+        for post in kept
+        for dup in post.get("duplicate_ids") or []  # type: ignore[union-attr]
+    }
+
+
+@pytest.mark.slow
+def test_embedding_dedup_384d_20k() -> None:
+    posts, embeddings = _dataset(POSTS)
+
+    legacy_posts = posts[:LEGACY_POSTS]
+    t0 = time.perf_counter()
+    legacy = _legacy_dedupe(legacy_posts, embeddings, THRESHOLD)
+    legacy_seconds = time.perf_counter() - t0
+    small = deduplicate_posts_by_embeddings(
+        legacy_posts, embeddings, threshold=THRESHOLD, approximate=False
+    )
+    assert _duplicate_map(small) == _duplicate_map(legacy)
+
+    t0 = time.perf_counter()
+    exact = deduplicate_posts_by_embeddings(posts, embeddings, threshold=THRESHOLD, approximate=False)
+    exact_seconds = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    approx = deduplicate_posts_by_embeddings(posts, embeddings, threshold=THRESHOLD, approximate=True)
+    approx_seconds = time.perf_counter() - t0
+
+    exact_dups = _duplicate_map(exact)
+    approx_dups = _duplicate_map(approx)
+    recall = len(approx_dups.keys() & exact_dups.keys()) / max(1, len(exact_dups))
+    print(
+        f"\n[bench] legacy {LEGACY_POSTS} posts: {legacy_seconds:.2f}s"
+        f"\n[bench] exact  {POSTS} x {DIM}d: {exact_seconds:.2f}s kept={len(exact)}"
+        f"\n[bench] approx {POSTS} x {DIM}d: {approx_seconds:.2f}s kept={len(approx)} "
+        f"recall={recall:.3f}"
+    )
+    assert len(exact) < POSTS
+    assert recall >= 0.97
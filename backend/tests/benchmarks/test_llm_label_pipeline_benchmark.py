@@ -0,0 +1,104 @@
+"""
+LLM 打标流水线基准：逐批串行 vs 多批在途 + 整批落库
+
+- stub LLM：每次批量请求固定网络延迟，不消耗真实额度
+- stub session：每次 savepoint / 落库都有少量固定开销，模拟 DB 往返
+- 指标：每分钟打标行数（labeled rows / minute）
+
+运行：pytest tests/benchmarks/test_llm_label_pipeline_benchmark.py -m slow -s
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Sequence
+from typing import Any
+
+import pytest
+
+from app.services.llm.label_batch_support import LLMLabelRunStats, process_label_batches
+
+ITEMS = 240
+BATCH_SIZE = 8
+LLM_LATENCY_SECONDS = 0.05
+DB_ROUNDTRIP_SECONDS = 0.0005
+
+
+class _StubNested:
+    async def __aenter__(self) -> "_StubNested":
+        await asyncio.sleep(DB_ROUNDTRIP_SECONDS)
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        return False
+
+
+class _StubSession:
+    def begin_nested(self) -> _StubNested:
+        return _StubNested()
+
+    async def commit(self) -> None:
+        await asyncio.sleep(DB_ROUNDTRIP_SECONDS)
+
+    async def rollback(self) -> None:
+        return None
+
+
+async def _stub_batch_label(batch: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+    await asyncio.sleep(LLM_LATENCY_SECONDS)
+    return [
+        {"id": item["id"], "analysis": {}, "score": {}, "input_chars": 100, "output_chars": 50}
+        for item in batch
+    ]
+
+
+async def _stub_single_label(item: dict[str, Any]) -> Any:
+    raise AssertionError("stub LLM never falls back")
+
+
+async def _persist_row(*_args: Any) -> None:
+    await asyncio.sleep(DB_ROUNDTRIP_SECONDS)
+
+
+async def _persist_many(results: list[dict[str, Any]]) -> int:
+    await asyncio.sleep(DB_ROUNDTRIP_SECONDS)
+    return len(results)
+
+
+async def _run(*, max_in_flight: int, bulk: bool) -> tuple[float, LLMLabelRunStats]:
+    stats = LLMLabelRunStats(attempted=ITEMS)
+    items = [{"id": idx, "title": f"post {idx}", "body": "fees are too high"} for idx in range(ITEMS)]
+    started = time.perf_counter()
+    await process_label_batches(
+        session=_StubSession(),
+        items=items,
+        batch_size=BATCH_SIZE,
+        label_kind="benchmark",
+        stats=stats,
+        batch_label=_stub_batch_label,
+        single_label=_stub_single_label,
+        persist_batch=_persist_row,
+        persist_single=_persist_row,
+        persist_many=_persist_many if bulk else None,
+        max_in_flight=max_in_flight,
+    )
+    return time.perf_counter() - started, stats
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_llm_label_pipeline_rows_per_minute() -> None:
+    serial_elapsed, serial_stats = await _run(max_in_flight=1, bulk=False)
+    pipelined_elapsed, pipelined_stats = await _run(max_in_flight=8, bulk=True)
+
+    assert serial_stats.processed == ITEMS
+    assert pipelined_stats.processed == ITEMS
+
+    serial_rate = ITEMS / serial_elapsed * 60
+    pipelined_rate = ITEMS / pipelined_elapsed * 60
+    print(
+        f"\nserial: {serial_rate:,.0f} rows/min ({serial_elapsed:.2f}s)"
+        f"\npipelined x8 + bulk: {pipelined_rate:,.0f} rows/min ({pipelined_elapsed:.2f}s)"
+        f"\nspeedup: {pipelined_rate / serial_rate:.1f}x"
+    )
+    assert pipelined_rate > serial_rate * 3
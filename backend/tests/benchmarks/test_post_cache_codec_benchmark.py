@@ -0,0 +1,123 @@
+"""
+帖子缓存编码基准：旧 JSON vs 列式二进制（1k posts / subreddit）
+
+- bytes: Redis 里的 value 大小
+- encode / decode: 单次耗时（decode 不访问 selftext，即 cache-first 分析里的常见读法）
+- decode+selftext: 解码后访问全部 selftext
+
+运行：pytest tests/benchmarks/test_post_cache_codec_benchmark.py -m slow -s
+"""
+from __future__ import annotations
+
+import json
+import random
+import time
+from dataclasses import asdict
+from typing import Callable
+
+import pytest
+
+from app.services.infrastructure.cache_manager import CacheManager
+from app.services.infrastructure.post_cache_codec import (
+    COMPRESSION_NONE,
+    available_compressions,
+    decode_post_payload,
+    encode_post_payload,
+    resolve_compression,
+)
+from app.services.infrastructure.reddit_client import RedditPost
+
+BENCH_POSTS = 1_000
+ROUNDS = 20
+CACHED_AT = "2024-01-01T00:00:00+00:00"
+
+_WORDS = (
+    "pricing churn onboarding integration shopify seller margin workflow "
+    "automation tool customer support refund inventory ads conversion "
+    "subscription analytics dashboard export api webhook bug feature"
+).split()
+
+
+def _realistic_posts(count: int) -> list[RedditPost]:
+    rng = random.Random(42)
+
+    def _sentence(min_words: int, max_words: int) -> str:
+        return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(min_words, max_words)))
+
+    posts = []
+    for i in range(count):
+        post_id = f"1{i:05x}"
+        # 约三分之一是链接帖（无正文），其余正文 50~400 词
+        selftext = "" if i % 3 == 0 else _sentence(50, 400)
+        posts.append(
+            RedditPost(
+                id=post_id,
+                title=_sentence(6, 18).capitalize(),
+                selftext=selftext,
+                score=int(rng.paretovariate(1.2)),
+                num_comments=int(rng.paretovariate(1.5)),
+                created_utc=1_700_000_000.0 + i * 37,
+                subreddit="smallbusiness",
+                author=f"user_{rng.randint(1, 400)}",
+                url=f"https://www.reddit.com/r/smallbusiness/comments/{post_id}/",
+                permalink=f"/r/smallbusiness/comments/{post_id}/slug_{i}/",
+            )
+        )
+    return posts
+
+
+def _best_of(fn: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _json_encode(posts: list[RedditPost]) -> bytes:
+    payload = {"cached_at": CACHED_AT, "posts": [asdict(post) for post in posts]}
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _decode(raw: bytes, *, touch_selftext: bool) -> None:
+    decoded = decode_post_payload(raw, legacy_post_factory=CacheManager._deserialize_post)
+    assert decoded is not None and len(decoded.posts) == BENCH_POSTS
+    if touch_selftext:
+        for post in decoded.posts:
+            post.selftext
+
+
+@pytest.mark.slow
+def test_binary_codec_vs_json_1k_posts() -> None:
+    posts = _realistic_posts(BENCH_POSTS)
+    variants: dict[str, Callable[[], bytes]] = {"json": lambda: _json_encode(posts)}
+    for name in ["none", *[c for c in available_compressions() if c != "none"]]:
+        compression = resolve_compression(name)
+        variants[f"binary/{name}"] = (
+            lambda compression=compression: encode_post_payload(
+                posts, cached_at=CACHED_AT, compression=compression
+            )
+        )
+
+    results: dict[str, dict[str, float]] = {}
+    for name, encode in variants.items():
+        raw = encode()
+        results[name] = {
+            "bytes": float(len(raw)),
+            "encode": _best_of(encode),
+            "decode": _best_of(lambda raw=raw: _decode(raw, touch_selftext=False)),
+            "decode_selftext": _best_of(lambda raw=raw: _decode(raw, touch_selftext=True)),
+        }
+        stats = results[name]
+        print(
+            f"\n[bench] {name:12s} bytes={int(stats['bytes']):8d} "
+            f"encode={stats['encode'] * 1000:6.2f}ms decode={stats['decode'] * 1000:6.2f}ms "
+            f"decode+selftext={stats['decode_selftext'] * 1000:6.2f}ms"
+        )
+
+    best_compressed = resolve_compression("auto")
+    assert best_compressed != COMPRESSION_NONE
+    compressed = next(v for k, v in results.items() if k.startswith("binary/") and not k.endswith("none"))
+    assert compressed["bytes"] < results["json"]["bytes"] / 2
+    assert results["binary/none"]["decode"] < results["json"]["decode"]
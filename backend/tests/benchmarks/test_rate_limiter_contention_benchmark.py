@@ -0,0 +1,110 @@
+"""
+全局限流器争用基准：多个 worker 共享一个配额（fakeredis）
+
+对比 fixed-window（INCRBY+EXPIRE+TTL）与 token bucket（单次 Lua 预留）：
+- sent: 实际发出的请求数（worker 睡完等待后即发送）
+- peak: 任意一个滑动窗口内的最大请求数（> limit 即 429 风险）
+- utilization: sent / (duration * limit / window)
+
+运行：pytest tests/benchmarks/test_rate_limiter_contention_benchmark.py -m slow -s
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import time
+from typing import Any
+
+import pytest
+
+try:
+    import fakeredis
+    import fakeredis.aioredis as fake_aioredis  # type: ignore
+except Exception:  # pragma: no cover - CI fallback if fakeredis not available
+    fakeredis = None  # type: ignore
+    fake_aioredis = None  # type: ignore
+
+from app.services.infrastructure.global_rate_limiter import (
+    GlobalRateLimiter,
+    TokenBucketRateLimiter,
+)
+
+WORKERS = 16
+LIMIT = 50
+WINDOW_SECONDS = 1.0
+DURATION_SECONDS = 3.0
+BURST = 5
+
+
+async def _run_workers(make_limiter: Any) -> list[float]:
+    sent: list[float] = []
+    deadline = time.monotonic() + DURATION_SECONDS
+
+    async def _worker() -> None:
+        limiter = make_limiter()
+        while True:
+            wait = float(await limiter.acquire())
+            if wait > 0:
+                await asyncio.sleep(wait)
+            now = time.monotonic()
+            if now >= deadline:
+                return
+            sent.append(now)
+
+    await asyncio.gather(*(_worker() for _ in range(WORKERS)))
+    return sorted(sent)
+
+
+def _peak_per_window(sent: list[float]) -> int:
+    peak = 0
+    for idx, start in enumerate(sent):
+        end = bisect.bisect_left(sent, start + WINDOW_SECONDS)
+        peak = max(peak, end - idx)
+    return peak
+
+
+def _report(name: str, sent: list[float]) -> dict[str, float]:
+    allowed = DURATION_SECONDS * LIMIT / WINDOW_SECONDS
+    stats = {
+        "sent": float(len(sent)),
+        "peak": float(_peak_per_window(sent)),
+        "utilization": len(sent) / allowed,
+    }
+    print(
+        f"\n[bench] {name}: workers={WORKERS} sent={len(sent)} peak/window={int(stats['peak'])} "
+        f"(limit {LIMIT}) utilization={stats['utilization']:.0%}"
+    )
+    return stats
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_token_bucket_vs_fixed_window_under_contention() -> None:
+    if fakeredis is None:
+        pytest.skip("fakeredis not available")
+
+    fixed_server = fakeredis.FakeServer()
+    fixed_sent = await _run_workers(
+        lambda: GlobalRateLimiter(
+            fake_aioredis.FakeRedis(server=fixed_server),
+            limit=LIMIT,
+            window_seconds=int(WINDOW_SECONDS),
+            client_id="bench-fixed",
+        )
+    )
+    bucket_server = fakeredis.FakeServer()
+    bucket_sent = await _run_workers(
+        lambda: TokenBucketRateLimiter(
+            fake_aioredis.FakeRedis(server=bucket_server),
+            limit=LIMIT,
+            window_seconds=WINDOW_SECONDS,
+            burst=BURST,
+            client_id="bench-bucket",
+        )
+    )
+
+    _report("fixed_window", fixed_sent)
+    bucket = _report("token_bucket", bucket_sent)
+
+    assert bucket["peak"] <= LIMIT + BURST
+    assert bucket["utilization"] >= 0.9
@@ -0,0 +1,80 @@
+"""
+报告缓存基准：旧版深拷贝缓存 vs 两级缓存的序列化字节命中
+
+- legacy: 命中时 model_copy(deep=True)，再由 FastAPI 按 response_model 序列化
+- serialized: 命中时直接返回缓存里的 JSON 字节（GET /report 的路径）
+
+运行：pytest tests/benchmarks/test_report_cache_benchmark.py -m slow -s
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.schemas.report_payload import ReportPayload
+from app.services.report.report_cache import TwoTierReportCache
+
+ROUNDS = 500
+
+
+def _large_payload() -> ReportPayload:
+    return ReportPayload.model_validate(
+        {
+            "task_id": str(uuid4()),
+            "status": "completed",
+            "report": {
+                "executive_summary": {"total_communities": 400, "key_insights": 0, "top_opportunity": ""},
+                "pain_points": [],
+                "competitors": [],
+                "opportunities": [],
+                "action_items": [],
+                "entity_summary": {"brands": [], "features": [], "pain_points": []},
+            },
+            "report_html": "<p>" + "signal " * 20_000 + "</p>",
+            "metadata": {
+                "analysis_version": "1.0",
+                "confidence_score": 0.9,
+                "processing_time_seconds": 1.0,
+                "cache_hit_rate": 0.5,
+                "total_mentions": 3,
+            },
+            "overview": {
+                "sentiment": {"positive": 1, "negative": 1, "neutral": 1},
+                "top_communities": [
+                    {"name": f"r/c{i}", "mentions": i, "relevance": i % 100, "category": "saas"}
+                    for i in range(400)
+                ],
+            },
+            "stats": {"total_mentions": 3, "positive_mentions": 3, "negative_mentions": 0, "neutral_mentions": 0},
+            "generated_at": datetime.now(timezone.utc),
+            "data_source": "real",
+        }
+    )
+
+
+@pytest.mark.slow
+async def test_serialized_hits_vs_deep_copy() -> None:
+    payload = _large_payload()
+
+    t0 = time.perf_counter()
+    for _ in range(ROUNDS):
+        copied = payload.model_copy(deep=True)
+        ReportPayload.model_validate(copied).model_dump_json()
+    legacy_seconds = time.perf_counter() - t0
+
+    cache = TwoTierReportCache(3600, max_bytes=64 << 20)
+    await cache.set("report:bench:v1:na", payload)
+    t0 = time.perf_counter()
+    for _ in range(ROUNDS):
+        body = (await cache.get_serialized("report:bench:v1:na")).body
+    serialized_seconds = time.perf_counter() - t0
+
+    print(
+        f"\n[bench] {ROUNDS} report hits ({len(body) / 1024:.0f} KiB): "
+        f"legacy {legacy_seconds * 1000 / ROUNDS:.3f}ms/hit, "
+        f"serialized {serialized_seconds * 1000 / ROUNDS:.4f}ms/hit"
+    )
+    assert serialized_seconds * 10 < legacy_seconds
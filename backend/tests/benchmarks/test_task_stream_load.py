@@ -0,0 +1,130 @@
+"""
+SSE 推送负载测试：300 条并发任务流（fakeredis pub/sub）
+
+- 每条流 = 一个 _event_generator，订阅各自任务频道
+- 发布端对每个任务推 processing x2 + completed
+- 统计：全部流收到 completed 的总耗时、推送延迟 p50/p95、缓存读次数、DB session 次数
+
+运行：pytest tests/benchmarks/test_task_stream_load.py -m slow -s
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from datetime import datetime, timezone
+
+import fakeredis.aioredis
+import pytest
+from fakeredis import FakeServer
+
+from app.api.routes import stream
+from app.models.task import Task, TaskStatus
+from app.services.infrastructure.task_status_cache import TaskStatusCache, TaskStatusPayload
+
+STREAMS = 300
+
+
+@pytest.mark.slow
+async def test_sse_push_with_300_concurrent_streams(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = TaskStatusCache()
+    fake_redis = fakeredis.aioredis.FakeRedis(server=FakeServer(), decode_responses=True)
+    monkeypatch.setattr(cache, "_redis", fake_redis, raising=False)
+    monkeypatch.setattr(stream, "STATUS_CACHE", cache)
+    monkeypatch.setattr(stream, "FALLBACK_POLL_INTERVAL_SECONDS", 30.0)
+    monkeypatch.setattr(stream, "HEARTBEAT_INTERVAL_SECONDS", 30.0)
+
+    db_sessions = 0
+
+    def _count_db_session() -> None:
+        nonlocal db_sessions
+        db_sessions += 1
+        raise AssertionError("DB session opened during push streaming")
+
+    monkeypatch.setattr(stream, "SessionFactory", _count_db_session)
+
+    cache_reads = 0
+    original_get_status = cache.get_status
+
+    async def _counting_get_status(*args, **kwargs):  # type: ignore[no-untyped-def]
+        nonlocal cache_reads
+        cache_reads += 1
+        return await original_get_status(*args, **kwargs)
+
+    monkeypatch.setattr(cache, "get_status", _counting_get_status)
+
+    now = datetime.now(timezone.utc)
+    tasks = [
+        Task(
+            id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            product_description="load",
+            status=TaskStatus.PENDING,
+            updated_at=now,
+        )
+        for _ in range(STREAMS)
+    ]
+    for task in tasks:
+        await cache.set_status(
+            TaskStatusPayload(task_id=str(task.id), status="pending", progress=0, message="排队")
+        )
+
+    sent_at: dict[tuple[str, int], float] = {}
+    latencies: list[float] = []
+    subscribed = 0
+
+    async def _consume(task: Task) -> list[str]:
+        nonlocal subscribed
+        events: list[str] = []
+        async for chunk in stream._event_generator(task):  # type: ignore[attr-defined]
+            lines = chunk.splitlines()
+            event = lines[0].split(": ", 1)[1]
+            events.append(event)
+            if event == "progress" and len(events) == 2:
+                subscribed += 1
+            data = json.loads(lines[1].split(": ", 1)[1])
+            key = (str(task.id), data.get("progress", -1))
+            if key in sent_at:
+                latencies.append(time.perf_counter() - sent_at[key])
+        return events
+
+    started = time.perf_counter()
+    consumers = [asyncio.create_task(_consume(task)) for task in tasks]
+
+    async def _all_subscribed() -> None:
+        while subscribed < STREAMS or not cache._hubs:
+            await asyncio.sleep(0.01)
+        while next(iter(cache._hubs.values())).channel_count < STREAMS:
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(_all_subscribed(), timeout=10)
+    hub = next(iter(cache._hubs.values()))
+    peak_channels = hub.channel_count
+
+    for progress, status_value in ((30, "processing"), (70, "processing"), (100, "completed")):
+        for task in tasks:
+            sent_at[(str(task.id), progress)] = time.perf_counter()
+            await cache.set_status(
+                TaskStatusPayload(
+                    task_id=str(task.id), status=status_value, progress=progress, message=status_value
+                )
+            )
+    results = await asyncio.wait_for(asyncio.gather(*consumers), timeout=30)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"\n[bench] {STREAMS} streams: {elapsed:.2f}s total, pushed events={len(latencies)}, "
+        f"latency p50={statistics.median(latencies) * 1000:.1f}ms p95={p95 * 1000:.1f}ms, "
+        f"cache reads={cache_reads}, db sessions={db_sessions}, hub channels peak={peak_channels}"
+    )
+    assert all(events[-2:] == ["completed", "close"] for events in results)
+    assert db_sessions == 0
+    assert peak_channels == STREAMS
+    assert len(cache._hubs) == 1
+    # 推送模式下每条流只在订阅后对账一次，不再每秒轮询
+    assert cache_reads <= STREAMS
+    assert hub.channel_count == 0
@@ -0,0 +1,94 @@
+"""
+词库匹配基准：逐词条正则 vs 共享 Aho-Corasick 自动机
+
+- entity_dictionary: EntityMatcher 实际词典（≈55 个实体）在 2k 条帖子上的匹配耗时
+- scaled: 词条数扩到 2k 时两种实现的耗时（正则随词条数线性增长，自动机基本不变）
+
+运行：pytest tests/benchmarks/test_term_automaton_benchmark.py -m slow -s
+"""
+from __future__ import annotations
+
+import random
+import re
+import time
+
+import pytest
+
+from app.services.analysis.entity_matcher import EntityMatcher
+from app.services.semantic.term_automaton import TermAutomaton
+
+DOCS = 2_000
+
+
+def _docs(entities: list[str]) -> list[str]:
+    rng = random.Random(11)
+    vocab = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9)))
+        for _ in range(3_000)
+    ]
+    vocab += entities[:10]
+    return [" ".join(rng.choice(vocab) for _ in range(120)) for _ in range(DOCS)]
+
+
+def _regexes(terms: list[str]) -> list[re.Pattern[str]]:
+    out = []
+    for term in terms:
+        esc = re.escape(term)
+        out.append(
+            re.compile(rf"\b{esc}\b", re.IGNORECASE)
+            if re.search(r"[A-Za-z]", term)
+            else re.compile(esc, re.IGNORECASE)
+        )
+    return out
+
+
+def _time_regex(regexes: list[re.Pattern[str]], docs: list[str]) -> tuple[float, list[set[int]]]:
+    t0 = time.perf_counter()
+    hits = [{i for i, rx in enumerate(regexes) if rx.search(doc)} for doc in docs]
+    return time.perf_counter() - t0, hits
+
+
+def _time_automaton(automaton: TermAutomaton, docs: list[str]) -> tuple[float, list[set[int]]]:
+    t0 = time.perf_counter()
+    hits = [automaton.matched(doc) for doc in docs]
+    return time.perf_counter() - t0, hits
+
+
+@pytest.mark.slow
+def test_entity_dictionary_single_pass() -> None:
+    matcher = EntityMatcher()
+    entities = [entity for _, entity in matcher._entries]
+    docs = _docs(entities)
+
+    regex_seconds, regex_hits = _time_regex(_regexes(entities), docs)
+    automaton_seconds, automaton_hits = _time_automaton(matcher._automaton, docs)
+
+    print(
+        f"\n[bench] {len(entities)} entities x {DOCS} docs: regex {regex_seconds:.2f}s, "
+        f"automaton {automaton_seconds:.2f}s, speedup x{regex_seconds / automaton_seconds:.1f}"
+    )
+    assert automaton_hits == regex_hits
+    assert automaton_seconds < regex_seconds
+
+
+@pytest.mark.slow
+def test_scaled_lexicon_single_pass() -> None:
+    rng = random.Random(5)
+    terms = [
+        " ".join(
+            "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 8)))
+            for _ in range(rng.randint(1, 2))
+        )
+        for _ in range(2_000)
+    ]
+    docs = _docs(terms)[:200]
+
+    regex_seconds, regex_hits = _time_regex(_regexes(terms), docs)
+    automaton_seconds, automaton_hits = _time_automaton(TermAutomaton(terms), docs)
+
+    print(
+        f"\n[bench] {len(terms)} terms x {len(docs)} docs: regex {regex_seconds:.2f}s, "
+        f"automaton {automaton_seconds:.2f}s, speedup x{regex_seconds / automaton_seconds:.1f}"
+    )
+    assert automaton_hits == regex_hits
+    assert automaton_seconds * 10 < regex_seconds
@@ -47,6 +47,8 @@ _ensure_backend_import_precedence()
 os.environ.setdefault("SQLALCHEMY_DISABLE_POOL", "1")
 # Ensure config.py doesn't override DATABASE_URL from backend/.env during pytest runs.
 os.environ.setdefault("PYTEST_RUNNING", "1")
+# LLM 响应缓存是落盘的持久缓存：测试间不能互相命中，需要时由用例自建临时库
+os.environ.setdefault("LLM_RESPONSE_CACHE_ENABLED", "false")
 # Safety default: if caller didn't set DATABASE_URL, run against local *_test DB.
 os.environ.setdefault(
     "DATABASE_URL",
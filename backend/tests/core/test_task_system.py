@@ -257,3 +257,41 @@ def test_sources_ledger_validation_requires_data_lineage() -> None:
     }
     with pytest.raises(analysis_task.SourcesSchemaError):
         analysis_task._validate_sources_ledger_min_schema(sources)
+
+
+@pytest.mark.asyncio
+async def test_task_status_cache_publishes_to_subscribers(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = TaskStatusCache()
+    fake_redis = fakeredis.aioredis.FakeRedis(
+        server=FakeServer(), decode_responses=True
+    )
+    monkeypatch.setattr(cache, "_redis", fake_redis, raising=False)
+
+    task_id = str(uuid.uuid4())
+    first = await cache.subscribe(task_id)
+    second = await cache.subscribe(task_id)
+    other = await cache.subscribe(str(uuid.uuid4()))
+    try:
+        await cache.set_status(
+            TaskStatusPayload(
+                task_id=task_id,
+                status=TaskStatus.PROCESSING.value,
+                progress=40,
+                message="正在分析",
+            )
+        )
+
+        for subscription in (first, second):
+            pushed = await subscription.next(timeout=1.0)
+            assert pushed is not None
+            assert pushed.progress == 40
+            assert pushed.updated_at is not None
+        assert await other.next(timeout=0.05) is None
+    finally:
+        await first.close()
+        await second.close()
+        await other.close()
+
+    # 最后一个订阅者退出后共享连接关闭
+    hub = next(iter(cache._hubs.values()))
+    assert hub.channel_count == 0
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.models.task import TaskStatus
+from app.schemas.task import TaskSummary
+from app.services.analysis import analysis_engine as analysis_engine_module
+from app.services.analysis.analysis_engine import AnalysisResult, run_analysis
+from app.services.infrastructure.stage_timing import note_stage_call
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def _task() -> TaskSummary:
+    return TaskSummary(
+        id=uuid4(),
+        status=TaskStatus.PENDING,
+        product_description="robot vacuum for pet owners",
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
+    )
+
+
+async def _fake_stages(task, *, data_collection, stage_timer, stage_graph) -> AnalysisResult:
+    stage_timer.enter("collection")
+    note_stage_call("reddit", 2)
+    stage_timer.enter("rendering")
+    note_stage_call("llm")
+    return AnalysisResult(
+        insights={},
+        sources={"posts_analyzed": 0},
+        report_html="",
+        action_items=[],
+        confidence_score=0.0,
+    )
+
+
+async def test_run_analysis_records_stage_timings_in_sources(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(analysis_engine_module, "_run_analysis_stages", _fake_stages)
+    monkeypatch.setattr(
+        analysis_engine_module,
+        "get_settings",
+        lambda: SimpleNamespace(analysis_profile_task_id="", analysis_profile_dir="unused"),
+    )
+
+    result = await run_analysis(_task())
+
+    timings = result.sources["stage_timings"]
+    assert [stage["name"] for stage in timings["stages"]] == ["collection", "rendering"]
+    assert timings["reddit_calls"] == 2
+    assert timings["llm_calls"] == 1
+    assert "profile" not in timings
+    assert result.sources["posts_analyzed"] == 0
+    graph_stages = {stage["name"] for stage in result.sources["stage_graph"]["stages"]}
+    assert {"post_scores", "label_signals", "trend_series", "coverage_summary"} <= graph_stages
+
+
+async def test_run_analysis_profiles_only_the_configured_task(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    task = _task()
+    monkeypatch.setattr(analysis_engine_module, "_run_analysis_stages", _fake_stages)
+    monkeypatch.setattr(
+        analysis_engine_module,
+        "get_settings",
+        lambda: SimpleNamespace(analysis_profile_task_id=str(task.id), analysis_profile_dir=str(tmp_path)),
+    )
+
+    profiled = await run_analysis(task)
+    other = await run_analysis(_task())
+
+    profile = profiled.sources["stage_timings"]["profile"]
+    assert Path(profile["path"]).parent == tmp_path
+    assert Path(profile["path"]).name.startswith(f"analysis-{task.id}")
+    assert "profile" not in other.sources["stage_timings"]
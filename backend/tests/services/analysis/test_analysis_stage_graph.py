@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.analysis.analysis_stage_graph import AnalysisStageGraph
+from app.services.infrastructure.stage_timing import (
+    StageTimer,
+    activate_stage_timer,
+    note_stage_call,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class _Probe:
+    def __init__(self) -> None:
+        self.running = 0
+        self.peak = 0
+        self.calls: list[str] = []
+
+    def stage(self, name: str, value, *, delay: float = 0.05):
+        async def _fn(**kwargs):
+            self.calls.append(name)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            try:
+                await asyncio.sleep(delay)
+                return value(**kwargs) if callable(value) else value
+            finally:
+                self.running -= 1
+
+        return _fn
+
+
+async def test_independent_stages_run_concurrently_under_the_cap() -> None:
+    probe = _Probe()
+    graph = AnalysisStageGraph(max_concurrency=2)
+    graph.add("trend", probe.stage("trend", [1]), inputs=("tokens",))
+    graph.add("coverage", probe.stage("coverage", {"ok": True}), inputs=("collected",))
+    graph.add("freshness", probe.stage("freshness", (False, [])))
+    graph.add(
+        "signals",
+        probe.stage("signals", lambda trend, collected: len(trend) + len(collected)),
+        inputs=("trend", "collected"),
+    )
+
+    graph.provide("tokens", ["a"])
+    graph.provide("collected", ["r/a", "r/b"])
+    await asyncio.sleep(0.01)
+    assert probe.calls == []  # start() 之前不调度
+
+    graph.start()
+    assert await graph.result("signals") == 3
+    assert await graph.result("coverage") == {"ok": True}
+    await graph.aclose()
+
+    assert probe.peak == 2
+    assert probe.calls.index("signals") == 3
+    summary = graph.describe()
+    assert summary["peak_concurrency"] == 2
+    assert summary["external_inputs"] == ["collected", "tokens"]
+    signals = next(stage for stage in summary["stages"] if stage["name"] == "signals")
+    assert signals["depends_on"] == ["trend"]
+    assert signals["status"] == "done"
+    assert all(stage["wall_ms"] is not None for stage in summary["stages"])
+
+
+async def test_failures_cancellation_and_cycles_are_reported() -> None:
+    probe = _Probe()
+    graph = AnalysisStageGraph(max_concurrency=4)
+
+    async def _boom() -> None:
+        raise RuntimeError("view missing")
+
+    graph.add("freshness", _boom)
+    graph.add("slow", probe.stage("slow", None, delay=10))
+    graph.add("gated", probe.stage("gated", None), inputs=("report_tier",))
+    graph.start()
+
+    with pytest.raises(RuntimeError, match="view missing"):
+        await graph.result("freshness")
+    with pytest.raises(RuntimeError, match="not scheduled"):
+        await graph.result("gated")
+    await graph.aclose()
+
+    statuses = {stage["name"]: stage["status"] for stage in graph.describe()["stages"]}
+    assert statuses == {"freshness": "failed", "slow": "cancelled", "gated": "pending"}
+
+    cyclic = AnalysisStageGraph()
+    cyclic.add("a", probe.stage("a", None), inputs=("b",))
+    with pytest.raises(ValueError, match="stage cycle"):
+        cyclic.add("b", probe.stage("b", None), inputs=("a",))
+
+
+async def test_critical_stage_is_not_queued_behind_side_stages() -> None:
+    probe = _Probe()
+    graph = AnalysisStageGraph(max_concurrency=2)
+    for name in ("trend", "coverage", "freshness"):
+        graph.add(name, probe.stage(name, None, delay=0.1))
+    graph.add("scores", probe.stage("scores", "scored", delay=0.02), inputs=("posts",), critical=True)
+
+    graph.start()
+    await asyncio.sleep(0.01)
+    # 关键路径还没跑完：旁路阶段最多占 1 个槽位
+    assert probe.calls == ["trend"]
+
+    graph.provide("posts", [1, 2])
+    assert await graph.result("scores") == "scored"
+    assert probe.calls.index("scores") == 1
+    # 关键路径结束后旁路阶段用满并发
+    await asyncio.gather(graph.result("coverage"), graph.result("freshness"))
+    await graph.aclose()
+    assert probe.peak == 2
+
+
+async def test_stage_calls_are_counted_on_the_stage_not_the_main_span() -> None:
+    graph = AnalysisStageGraph(max_concurrency=2)
+
+    async def _side() -> int:
+        note_stage_call("reddit", 2)
+        await asyncio.sleep(0.01)
+        note_stage_call("llm")
+        return 1
+
+    graph.add("side", _side)
+    timer = StageTimer()
+    with activate_stage_timer(timer):
+        timer.enter("collection")
+        graph.start()
+        await graph.result("side")
+        note_stage_call("reddit")
+        timer.finish()
+    await graph.aclose()
+
+    assert timer.as_dict()["reddit_calls"] == 1
+    assert timer.as_dict()["llm_calls"] == 0
+    side = graph.describe()["stages"][0]
+    assert (side["reddit_calls"], side["llm_calls"], side["critical"]) == (2, 1, False)
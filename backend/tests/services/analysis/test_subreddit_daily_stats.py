@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Callable
+
+import pytest
+
+from app.services.analysis import community_ranker, t1_stats
+from app.services.analysis import subreddit_daily_stats as daily_stats
+from app.services.analysis.subreddit_daily_stats import rollup_available
+from app.tasks import maintenance_task
+
+
+class _Result:
+    def __init__(self, rows: list[Any]) -> None:
+        self._rows = rows
+
+    def fetchall(self) -> list[Any]:
+        return self._rows
+
+    def scalars(self) -> SimpleNamespace:
+        return SimpleNamespace(all=lambda: [row[0] for row in self._rows])
+
+
+class _RollupSession:
+    """按 SQL 片段路由的假会话：命中 rollup 表的查询返回预置行，其余返回空并记录。"""
+
+    def __init__(self, routes: list[tuple[str, Callable[[dict[str, Any]], list[Any]]]]) -> None:
+        self._routes = routes
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+
+    async def execute(self, stmt: Any, params: dict[str, Any] | None = None) -> _Result:
+        sql = getattr(stmt, "text", str(stmt))
+        self.calls.append((sql, dict(params or {})))
+        for needle, handler in self._routes:
+            if needle in sql:
+                return _Result(handler(dict(params or {})))
+        return _Result([])
+
+    def sql_containing(self, needle: str) -> list[str]:
+        return [sql for sql, _ in self.calls if needle in sql]
+
+
+def _available(
+    present: bool = True, covered_since: date | None = date(2020, 1, 1)
+) -> list[tuple[str, Callable]]:
+    return [
+        ("to_regclass", lambda _p: [(present,)]),
+        ("SELECT covered_since", lambda _p: [(covered_since,)] if covered_since else []),
+    ]
+
+
+def _totals_row(subreddit: str, **counts: int) -> SimpleNamespace:
+    fields = (
+        "posts",
+        "comments",
+        "recent_posts",
+        "recent_comments",
+        "pain_labels",
+        "solution_labels",
+        "brand_comments",
+    )
+    return SimpleNamespace(subreddit=subreddit, **{name: counts.get(name, 0) for name in fields})
+
+
+@pytest.mark.asyncio
+async def test_rollup_available_requires_watermark_covering_window() -> None:
+    assert await rollup_available(_RollupSession(_available(present=False))) is False
+    assert await rollup_available(_RollupSession(_available(covered_since=None))) is False
+    assert await rollup_available(_RollupSession(_available())) is True
+
+    # 回填进行中 / 中途失败：水位只覆盖最近 60 天，365 天窗口继续走实时聚合
+    partial = _available(covered_since=date(2026, 8, 19))
+    assert await rollup_available(_RollupSession(partial), since_day=date(2026, 9, 18)) is True
+    assert await rollup_available(_RollupSession(partial), since_day=date(2025, 10, 18)) is False
+
+
+@pytest.mark.asyncio
+async def test_backfill_resumes_below_watermark_and_advances_it_per_slice(monkeypatch) -> None:
+    today = datetime.now(timezone.utc).date()
+    watermark = [today - timedelta(days=59)]
+    slices: list[tuple[date, date]] = []
+    commits: list[date] = []
+
+    class _Session:
+        async def __aenter__(self) -> "_Session":
+            return self
+
+        async def __aexit__(self, *_exc: Any) -> None:
+            return None
+
+        async def commit(self) -> None:
+            commits.append(watermark[0])
+
+    async def _refresh(_db: Any, *, start_day: date, end_day: date) -> int:
+        slices.append((start_day, end_day))
+        return 1
+
+    async def _mark(_db: Any, covered_since: date) -> None:
+        watermark[0] = covered_since
+
+    async def _covered_since(_db: Any) -> date:
+        return watermark[0]
+
+    async def _true(_db: Any) -> bool:
+        return True
+
+    async def _audit(*_args: Any, **_kwargs: Any) -> None:
+        return None
+
+    monkeypatch.setattr(maintenance_task, "SessionFactory", _Session)
+    monkeypatch.setattr(maintenance_task, "_write_maintenance_audit", _audit)
+    monkeypatch.setattr(daily_stats, "rollup_table_exists", _true)
+    monkeypatch.setattr(daily_stats, "fetch_rollup_covered_since", _covered_since)
+    monkeypatch.setattr(daily_stats, "mark_rollup_covered_since", _mark)
+    monkeypatch.setattr(daily_stats, "refresh_subreddit_daily_stats", _refresh)
+
+    result = await maintenance_task.refresh_subreddit_daily_stats_impl()
+
+    # 已覆盖的最近 60 天不重算；从水位前一天往回，最后一片止于 today - 365
+    assert result["mode"] == "backfill"
+    assert slices[0] == (today - timedelta(days=89), today - timedelta(days=60))
+    assert slices[-1][0] == today - timedelta(days=365)
+    assert all(end - start <= timedelta(days=29) for start, end in slices)
+    assert commits == [start for start, _ in slices]
+    assert result["covered_since"] == (today - timedelta(days=365)).isoformat()
+
+    slices.clear()
+    result = await maintenance_task.refresh_subreddit_daily_stats_impl()
+    assert result["mode"] == "incremental"
+    assert slices == [(today - timedelta(days=2), today)]
+
+
+@pytest.mark.asyncio
+async def test_build_stats_snapshot_reads_rollup_instead_of_raw_tables() -> None:
+    fixed = datetime(2026, 3, 12, 3, 0, tzinfo=timezone.utc)
+    totals_params: list[dict[str, Any]] = []
+
+    def _totals(params: dict[str, Any]) -> list[Any]:
+        totals_params.append(params)
+        return [
+            _totals_row(
+                "r/test",
+                posts=3,
+                comments=40,
+                recent_posts=1,
+                recent_comments=12,
+                pain_labels=6,
+                solution_labels=2,
+            )
+        ]
+
+    session = _RollupSession(
+        _available()
+        + [
+            ("SUM(posts)", _totals),
+            ("jsonb_each_text", lambda _p: [SimpleNamespace(aspect="price", pain_cnt=5)]),
+        ]
+    )
+
+    snapshot = await t1_stats.build_stats_snapshot(
+        session, subreddits=["r/Test"], days=30, anchor_ts=fixed, brand_limit=0
+    )
+
+    assert totals_params[0]["since_day"] == date(2026, 2, 10)
+    assert totals_params[0]["until_day"] == date(2026, 3, 12)
+    assert totals_params[0]["subs"] == ["r/test"]
+    stat = snapshot.community_stats[0]
+    assert (stat.posts, stat.comments, stat.recent_comments_30d) == (3, 40, 12)
+    assert stat.ps_ratio == pytest.approx(3.0)
+    assert snapshot.global_ps_ratio == pytest.approx(3.0)
+    assert [(a.aspect, a.pain) for a in snapshot.aspect_breakdown] == [("price", 5)]
+    assert session.sql_containing("posts_raw") == []
+    assert session.sql_containing("content_labels") == []
+
+
+@pytest.mark.asyncio
+async def test_compute_ranking_scores_uses_rollup_signals(monkeypatch) -> None:
+    async def _fail(*_args: Any, **_kwargs: Any) -> Any:
+        raise AssertionError("live aggregation should be skipped when rollup is available")
+
+    async def _flat(_session: Any, subs: list[str]) -> dict[str, float]:
+        return {s.lower(): 0.5 for s in subs}
+
+    async def _counts(_session: Any, subs: list[str]) -> dict[str, int]:
+        return {s.lower(): 100 for s in subs}
+
+    monkeypatch.setattr(community_ranker, "_ps_ratio_by_subreddit", _fail)
+    monkeypatch.setattr(community_ranker, "_pain_density", _fail)
+    monkeypatch.setattr(community_ranker, "_brand_penetration", _fail)
+    monkeypatch.setattr(community_ranker, "_moderation_score", _flat)
+    monkeypatch.setattr(community_ranker, "_fetch_30d_counts", _counts)
+
+    session = _RollupSession(
+        _available()
+        + [
+            (
+                "SUM(posts)",
+                lambda _p: [
+                    _totals_row("r/pain", comments=100, pain_labels=40, solution_labels=10, brand_comments=30),
+                    _totals_row("r/calm", comments=100, pain_labels=1, solution_labels=10),
+                ],
+            )
+        ]
+    )
+
+    scores = await community_ranker.compute_ranking_scores(session, ["r/pain", "r/calm"])
+
+    assert scores["r/pain"] > scores["r/calm"]
+
+
+@pytest.mark.asyncio
+async def test_overview_stats_batches_keyword_and_title_lookups() -> None:
+    session = _RollupSession(
+        _available()
+        + [
+            ("WHERE tier = 'high'", lambda _p: [(f"r/sub{i}",) for i in range(1, 8)]),
+            (
+                "SUM(posts)",
+                lambda _p: [_totals_row(f"r/sub{i}", posts=i, comments=10 * i) for i in range(1, 8)],
+            ),
+            (
+                "description_keywords",
+                lambda p: [SimpleNamespace(name=p["names"][0], description_keywords=["vacuum"])],
+            ),
+            (
+                "DISTINCT ON (subreddit)",
+                lambda p: [SimpleNamespace(subreddit=n, latest_post_title=f"title {n}") for n in p["subs"]],
+            ),
+        ]
+    )
+
+    stats = await t1_stats.T1StatsService(session).get_overview_stats(days=30)
+    top = stats["top_communities"]
+
+    assert [c["name"] for c in top] == ["r/sub7", "r/sub6", "r/sub5", "r/sub4", "r/sub3"]
+    assert all(c["sample_title"] == f"title {c['name']}" for c in top)
+    assert len(session.sql_containing("description_keywords")) == 1
+    assert len(session.sql_containing("latest_post_title")) == 1
+    assert session.sql_containing("content_entities") == []
@@ -66,7 +66,7 @@ async def test_fetch_topic_relevant_communities_uses_fixed_anchor_timestamp(monk
     diagnostics: dict[str, object] = {}
 
     class _NoEmbedding:
-        def encode(self, topic: str) -> list[float]:
+        def encode_query(self, topic: str) -> list[float]:
             raise RuntimeError("disable embedding for deterministic unit test")
 
     async def fake_comments_rel(_session):
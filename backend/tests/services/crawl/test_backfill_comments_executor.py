@@ -145,6 +145,7 @@ async def test_execute_crawl_plan_backfill_comments_fetches_and_persists(
             limit: int,
             mode: str,
             smart_config: dict[str, Any] | None = None,
+            on_page: Any = None,
         ) -> list[dict[str, Any]]:
             return [
                 {"id": "c1", "body": "hello"},
@@ -220,6 +221,7 @@ async def test_execute_crawl_plan_backfill_comments_maps_internal_post_id(
             limit: int,
             mode: str,
             smart_config: dict[str, Any] | None = None,
+            on_page: Any = None,
         ) -> list[dict[str, Any]]:
             captured["fetched_post_id"] = post_id
             return [{"id": "c1", "body": "hello"}]
@@ -299,6 +301,7 @@ async def test_execute_crawl_plan_backfill_comments_smart_shallow_does_not_boost
             limit: int,
             mode: str,
             smart_config: dict[str, Any] | None = None,
+            on_page: Any = None,
         ) -> list[dict[str, Any]]:
             captured["mode"] = mode
             captured["depth"] = depth
@@ -382,6 +385,7 @@ async def test_execute_crawl_plan_backfill_comments_smart_shallow_old_post_uses_
             limit: int,
             mode: str,
             smart_config: dict[str, Any] | None = None,
+            on_page: Any = None,
         ) -> list[dict[str, Any]]:
             captured["mode"] = mode
             captured["depth"] = depth
@@ -6,6 +6,7 @@ from unittest.mock import AsyncMock
 
 import pytest
 
+from app.core.config import get_settings
 from app.services.crawl.backfill_comments_workflow import (
     BackfillCommentsWorkflowDeps,
     BackfillCommentsWorkflowInput,
@@ -136,3 +137,64 @@ async def test_backfill_comments_workflow_old_post_uses_top_only_smart_config()
     assert kwargs["mode"] == "smart_shallow"
     assert kwargs["smart_config"]["smart_top_limit"] == 40
     assert kwargs["smart_config"]["smart_new_limit"] == 0
+
+
+@pytest.mark.asyncio
+async def test_backfill_comments_workflow_full_mode_streams_pages_into_persist() -> None:
+    persisted: list[list[str]] = []
+
+    async def _persist(_session, *, comments, **_kwargs) -> int:
+        persisted.append([c["id"] for c in comments])
+        return len(comments)
+
+    async def _fetch(_post_id, *, on_page=None, **_kwargs):
+        first = [{"id": "c1"}, {"id": "c2"}]
+        second = [{"id": "c3"}]
+        await on_page(first)
+        await on_page(second)
+        return [*first, *second]
+
+    reddit_client = AsyncMock()
+    reddit_client.fetch_post_comments.side_effect = _fetch
+
+    result = await execute_backfill_comments_workflow(
+        workflow_input=BackfillCommentsWorkflowInput(
+            plan=CrawlPlanContract(
+                plan_kind="backfill_comments",
+                target_type="post_ids",
+                target_value="t3_big",
+                reason="backfill_full_comments",
+                limits=CrawlPlanLimits(comments_limit=500),
+                meta={
+                    "subreddit": "r/testsub",
+                    "mode": "full",
+                    "depth": 8,
+                    "full_max_comments": 2000,
+                },
+            ),
+            session=SimpleNamespace(),
+            reddit_client=reddit_client,
+            crawl_run_id="run",
+            community_run_id="community",
+        ),
+        deps=BackfillCommentsWorkflowDeps(
+            resolve_post_context=AsyncMock(
+                return_value=("t3_big", "r/testsub", 10, 5000, datetime.now(timezone.utc))
+            ),
+            count_existing_comments=AsyncMock(return_value=0),
+            persist_comments=_persist,
+            classify_comments=AsyncMock(return_value=0),
+            extract_comment_entities=AsyncMock(return_value=0),
+        ),
+    )
+
+    assert result.payload["processed"] == 3
+    assert persisted == [["c1", "c2"], ["c3"]]
+    _, kwargs = reddit_client.fetch_post_comments.await_args
+    # plan.meta 的 full_* 优先，其余上限回落到 settings 默认值
+    settings = get_settings()
+    assert kwargs["smart_config"] == {
+        "full_max_comments": 2000,
+        "full_max_depth": 8,
+        "full_time_budget_seconds": settings.incremental_comments_full_time_budget_seconds,
+    }
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.services.crawl.bulk_post_ingestion_service import (
+    BulkIngestDeps,
+    BulkIngestInput,
+    bulk_ingest_posts,
+)
+from app.services.infrastructure.reddit_client import RedditPost
+
+
+class _FakeNestedTransaction:
+    async def __aenter__(self) -> None:
+        return None
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+class _FakeMappings:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self._rows = rows
+
+    def all(self) -> list[dict[str, Any]]:
+        return self._rows
+
+
+class _FakeResult:
+    def __init__(self, rows: list[dict[str, Any]] | None = None) -> None:
+        self._rows = rows or []
+
+    def mappings(self) -> _FakeMappings:
+        return _FakeMappings(self._rows)
+
+
+class _FakeAsyncSession:
+    def __init__(
+        self,
+        *,
+        existing: dict[str, dict[str, Any]] | None = None,
+        hashes: dict[str, str] | None = None,
+        stored_duplicates: dict[str, str] | None = None,
+        fail_raw_insert: Exception | None = None,
+    ) -> None:
+        self.existing = existing or {}
+        self.hashes = hashes or {}
+        self.stored_duplicates = stored_duplicates or {}
+        self.fail_raw_insert = fail_raw_insert
+        self.statements: list[tuple[str, Any]] = []
+        self._in_transaction = False
+        self.commit_calls = 0
+        self.rollback_calls = 0
+
+    def in_transaction(self) -> bool:
+        return self._in_transaction
+
+    async def begin(self) -> None:
+        self._in_transaction = True
+
+    def begin_nested(self) -> _FakeNestedTransaction:
+        return _FakeNestedTransaction()
+
+    async def flush(self) -> None:
+        return None
+
+    async def commit(self) -> None:
+        self.commit_calls += 1
+
+    async def rollback(self) -> None:
+        self.rollback_calls += 1
+
+    async def execute(self, statement: Any, params: Any = None) -> _FakeResult:
+        sql = str(statement)
+        self.statements.append((sql, params))
+        if "DISTINCT ON (source_post_id)" in sql:
+            rows = [
+                {"source_post_id": pid, **row}
+                for pid, row in self.existing.items()
+                if pid in params["pids"]
+            ]
+            return _FakeResult(rows)
+        if "text_norm_hash(content)" in sql:
+            rows = []
+            for ord_, content in enumerate(params["contents"], start=1):
+                content_hash = self.hashes.get(content, content)
+                rows.append(
+                    {
+                        "ord": ord_,
+                        "hash": content_hash,
+                        "duplicate_of": self.stored_duplicates.get(content_hash),
+                    }
+                )
+            return _FakeResult(rows)
+        if "INSERT INTO posts_raw" in sql and self.fail_raw_insert is not None:
+            raise self.fail_raw_insert
+        return _FakeResult()
+
+    def statements_matching(self, needle: str) -> list[tuple[str, Any]]:
+        return [item for item in self.statements if needle in item[0]]
+
+
+def _make_post(post_id: str, *, title: str | None = None, score: int = 1) -> RedditPost:
+    return RedditPost(
+        id=post_id,
+        title=title or f"title-{post_id}",
+        selftext="body",
+        score=score,
+        num_comments=0,
+        created_utc=1.0,
+        subreddit="test",
+        author=f"author-{post_id}",
+        url="https://example.com",
+        permalink=f"/r/test/{post_id}",
+    )
+
+
+def _existing_row(post: RedditPost, *, version: int = 1) -> dict[str, Any]:
+    return {
+        "version": version,
+        "score": post.score,
+        "num_comments": post.num_comments,
+        "title": post.title,
+        "body": post.selftext,
+        "edit_count": 0,
+    }
+
+
+def _write_input(posts: list[RedditPost], **overrides: Any) -> BulkIngestInput:
+    values: dict[str, Any] = dict(
+        community_name="r/Test",
+        posts=posts,
+        source_track="incremental",
+        crawl_run_id=None,
+        community_run_id=None,
+        duplicate_mode="tag",
+        spam_categories={},
+        crawler_run_row_ensured=True,
+        hot_cache_ttl_hours=24,
+    )
+    values.update(overrides)
+    return BulkIngestInput(**values)
+
+
+def _deps(db: _FakeAsyncSession, **overrides: Any) -> BulkIngestDeps:
+    async def _false(*_args: Any) -> bool:
+        return False
+
+    async def _true() -> bool:
+        return True
+
+    values: dict[str, Any] = dict(
+        db=db,
+        unix_to_datetime=lambda _ts: None,
+        text_norm_hash_available=_true,
+        posts_raw_has_crawl_run_id=_false,
+        posts_raw_has_community_run_id=_false,
+        fallback_dual_write=AsyncMock(side_effect=AssertionError("unexpected fallback")),
+        fallback_hot_upsert=AsyncMock(side_effect=AssertionError("unexpected fallback")),
+        schedule_posts_latest_refresh=lambda: None,
+        enqueue_comment_backfill=lambda *_args: None,
+    )
+    values.update(overrides)
+    return BulkIngestDeps(**values)
+
+
+@pytest.mark.asyncio
+async def test_bulk_ingest_counts_new_updated_and_duplicates() -> None:
+    unchanged = _make_post("same")
+    edited = _make_post("edited", score=10)
+    db = _FakeAsyncSession(
+        existing={
+            "same": _existing_row(unchanged),
+            "edited": {**_existing_row(edited, version=2), "score": 1},
+        }
+    )
+    posts = [_make_post("new-1"), unchanged, edited, _make_post("new-1")]
+    backfill_calls: list[list[str]] = []
+
+    result = await bulk_ingest_posts(
+        _write_input(posts, trigger_comments_fetch=True),
+        _deps(
+            db,
+            enqueue_comment_backfill=lambda _name, batch: backfill_calls.append(
+                [post.id for post in batch]
+            ),
+        ),
+    )
+
+    assert (result.new_count, result.updated_count, result.duplicate_count) == (1, 1, 2)
+    assert backfill_calls == [["new-1"]]
+    close_sql, close_params = db.statements_matching("SET is_current = FALSE")[0]
+    assert close_params["pids"] == ["edited"]
+    touch_params = db.statements_matching("UPDATE posts_raw AS p")[0][1]
+    assert touch_params["pids"] == ["same"]
+    assert touch_params["versions"] == [1]
+
+
+@pytest.mark.asyncio
+async def test_bulk_ingest_round_trips_do_not_grow_with_batch_size() -> None:
+    small = _FakeAsyncSession()
+    large = _FakeAsyncSession()
+
+    small_result = await bulk_ingest_posts(
+        _write_input([_make_post(f"s{i}") for i in range(3)]),
+        _deps(small),
+    )
+    large_result = await bulk_ingest_posts(
+        _write_input([_make_post(f"l{i}") for i in range(300)]),
+        _deps(large),
+    )
+
+    assert large_result.new_count == 300
+    assert small_result.round_trips == large_result.round_trips
+    assert len(small.statements) == len(large.statements)
+
+
+@pytest.mark.asyncio
+async def test_bulk_ingest_resolves_content_duplicates_in_store_and_batch() -> None:
+    stored = _make_post("a", title="stored title")
+    first = _make_post("b", title="same title")
+    second = _make_post("c", title="same title")
+    db = _FakeAsyncSession(stored_duplicates={"stored title body": "old-1"})
+
+    result = await bulk_ingest_posts(
+        _write_input([stored, first, second], duplicate_mode="drop"),
+        _deps(db),
+    )
+
+    assert (result.new_count, result.updated_count, result.duplicate_count) == (1, 0, 2)
+    assert result.new_post_ids == ["b"]
+    assert len(db.statements_matching("text_norm_hash(content)")) == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_ingest_skips_content_lookup_when_duplicates_allowed() -> None:
+    db = _FakeAsyncSession()
+
+    result = await bulk_ingest_posts(
+        _write_input([_make_post("a"), _make_post("b")], duplicate_mode="allow"),
+        _deps(db),
+    )
+
+    assert result.new_count == 2
+    assert db.statements_matching("text_norm_hash(content)") == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_ingest_replays_per_row_on_current_unique_violation() -> None:
+    db = _FakeAsyncSession(
+        fail_raw_insert=IntegrityError(
+            "stmt",
+            {},
+            Exception('duplicate key value violates unique constraint "ux_posts_raw_current"'),
+        )
+    )
+    fallback = AsyncMock(return_value=(0, 0, 2))
+    posts = [_make_post("a"), _make_post("b")]
+
+    result = await bulk_ingest_posts(
+        _write_input(posts),
+        _deps(db, fallback_dual_write=fallback),
+    )
+
+    assert result.used_fallback is True
+    assert (result.new_count, result.updated_count, result.duplicate_count) == (0, 0, 2)
+    fallback.assert_awaited_once_with("r/Test", posts)
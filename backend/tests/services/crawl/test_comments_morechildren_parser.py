@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from app.services.crawl.comments_parser import parse_morechildren_things
+from app.services.crawl.comments_parser import (
+    collect_more_stubs,
+    parse_morechildren_page,
+    parse_morechildren_things,
+)
 
 
 def test_parse_morechildren_returns_comments_and_more_ids() -> None:
@@ -30,3 +34,46 @@ def test_parse_morechildren_returns_comments_and_more_ids() -> None:
     assert [c["id"] for c in comments] == ["c3"]
     assert mores == [["c4", "c5"]]
 
+
+
+def test_collect_more_stubs_includes_nested_placeholders() -> None:
+    listing = {
+        "data": {
+            "children": [
+                {
+                    "kind": "t1",
+                    "data": {
+                        "id": "c1",
+                        "replies": {
+                            "data": {
+                                "children": [
+                                    {"kind": "more", "data": {"children": ["c9"], "depth": 1}},
+                                    {"kind": "more", "data": {"children": [], "id": "_"}},
+                                ]
+                            }
+                        },
+                    },
+                },
+                {"kind": "more", "data": {"children": ["c2", "c3"]}},
+            ]
+        }
+    }
+
+    assert collect_more_stubs(listing) == [(["c9"], 1), (["c2", "c3"], 0)]
+
+
+def test_parse_morechildren_page_keeps_reported_depth() -> None:
+    payload = {
+        "json": {
+            "data": {
+                "things": [
+                    {"kind": "t1", "data": {"id": "c3", "depth": 2, "parent_id": "t1_c1"}},
+                    {"kind": "more", "data": {"children": ["c4"], "depth": 3}},
+                ]
+            }
+        }
+    }
+
+    comments, stubs = parse_morechildren_page(payload)
+    assert [(c["id"], c["depth"]) for c in comments] == [("c3", 2)]
+    assert stubs == [(["c4"], 3)]
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any
+
+import fakeredis.aioredis
+import pytest
+
+from app.services.community.community_pool_loader import CommunityProfile
+from app.services.crawl import crawler_task_runtime
+from app.services.crawl.crawl_priority_scheduler import (
+    CrawlCandidate,
+    CrawlPriorityPolicy,
+    RecordedCrawl,
+    RedisCrawlPriorityQueue,
+    load_recent_empty_streaks,
+    rank_crawl_candidates,
+    simulate_day,
+)
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+def _candidate(name: str, hours_ago: float | None, **kwargs: Any) -> CrawlCandidate:
+    last = None if hours_ago is None else NOW - timedelta(hours=hours_ago)
+    return CrawlCandidate(name=name, last_crawled_at=last, **kwargs)
+
+
+def _profile(name: str) -> CommunityProfile:
+    return CommunityProfile(
+        name=name,
+        tier="high",
+        categories=[],
+        description_keywords={},
+        daily_posts=0,
+        avg_comment_length=0,
+        quality_score=0.5,
+        priority="high",
+    )
+
+
+def test_policy_combines_tier_frequency_empty_streak_and_yield() -> None:
+    policy = CrawlPriorityPolicy()
+    nominal = _candidate("r/nominal", 1, frequency_hours=2, success_hit=5, avg_valid_posts=10)
+    productive = _candidate("r/productive", 1, frequency_hours=2, success_hit=5, avg_valid_posts=40)
+    empty = _candidate("r/empty", 1, frequency_hours=2, empty_hit=4, success_hit=0, empty_streak=4)
+    slow_tier = _candidate("r/slow", 1, frequency_hours=24, success_hit=5, avg_valid_posts=10)
+    # 累计空命中很多但最近一次有产出：不退避
+    recovered = _candidate(
+        "r/recovered", 1, frequency_hours=2, empty_hit=40, success_hit=5, avg_valid_posts=10
+    )
+
+    assert policy.interval_hours(nominal) == pytest.approx(2.0)
+    assert policy.interval_hours(productive) == pytest.approx(1.0)  # 产出封顶 2 倍
+    assert policy.interval_hours(empty) == pytest.approx(32.0)  # 2 × 2^4
+    assert policy.interval_hours(slow_tier) == pytest.approx(24.0)
+    assert policy.interval_hours(recovered) == pytest.approx(2.0)
+
+    ranked = rank_crawl_candidates(
+        [empty, slow_tier, nominal, productive, _candidate("r/new", None)], policy=policy
+    )
+    assert [c.name for c in ranked] == ["r/new", "r/productive", "r/nominal", "r/slow", "r/empty"]
+
+
+@pytest.mark.asyncio
+async def test_queue_hands_out_due_communities_once_per_lease() -> None:
+    redis_client = fakeredis.aioredis.FakeRedis()
+    queue = RedisCrawlPriorityQueue(redis_client, lease_seconds=600)
+    candidates = [
+        _candidate("r/overdue", 10, frequency_hours=2),
+        _candidate("r/due", 3, frequency_hours=2),
+        _candidate("r/fresh", 0.5, frequency_hours=2),
+        _candidate("r/gone", 9, frequency_hours=2),
+    ]
+    assert await queue.sync(candidates) == 4
+
+    assert await queue.next_batch(1, now=NOW) == ["r/overdue"]
+    assert await queue.next_batch(5, now=NOW) == ["r/gone", "r/due"]
+    assert await queue.next_batch(5, now=NOW) == []
+
+    # 下线社区在下次 sync 时移出队列；租约过期后重新可领
+    await queue.sync(candidates[:3])
+    assert [name for name, _ in await queue.peek()] == ["r/overdue", "r/due", "r/fresh"]
+    assert await queue.next_batch(5, now=NOW + timedelta(minutes=11)) == ["r/overdue", "r/due"]
+
+    await queue.release(["r/due"])
+    assert await queue.next_batch(5, now=NOW + timedelta(minutes=12)) == ["r/due"]
+
+
+def test_simulate_day_spends_budget_on_high_yield_communities() -> None:
+    day_start = datetime(2026, 10, 17, tzinfo=timezone.utc)
+    candidates = [
+        CrawlCandidate("r/busy", frequency_hours=2, last_crawled_at=day_start, success_hit=3, avg_valid_posts=30),
+        CrawlCandidate("r/quiet", frequency_hours=2, last_crawled_at=day_start, success_hit=3, avg_valid_posts=1),
+    ]
+    recorded = [
+        RecordedCrawl("r/busy", day_start + timedelta(hours=h), new_posts=20) for h in range(0, 24, 2)
+    ] + [RecordedCrawl("r/quiet", day_start + timedelta(hours=h), new_posts=0) for h in range(0, 24, 2)]
+
+    report = simulate_day(
+        candidates, recorded, day_start=day_start, request_budget_per_hour=2, tick_minutes=10
+    )
+    summary = report.as_dict()
+
+    assert summary["baseline_crawls"] == 24
+    assert summary["baseline_new_posts"] == 240
+    assert report.crawls_by_community["r/busy"] > report.crawls_by_community.get("r/quiet", 0)
+    assert summary["requests"] <= 48
+    assert summary["posts_per_request"] > summary["baseline_posts_per_request"]
+    # 原候选对象不被模拟修改
+    assert candidates[1].empty_hit == 0
+
+
+@pytest.mark.asyncio
+async def test_rank_patrol_seed_profiles_uses_unified_priority(monkeypatch) -> None:
+    async def _load(_session: Any, *, names: list[str]) -> list[CrawlCandidate]:
+        assert sorted(names) == ["r/a", "r/b", "r/c"]
+        return [
+            _candidate("r/a", 3, frequency_hours=24),
+            _candidate("r/b", 3, frequency_hours=2),
+        ]
+
+    class _Session:
+        async def __aenter__(self) -> "_Session":
+            return self
+
+        async def __aexit__(self, *_exc: Any) -> None:
+            return None
+
+    monkeypatch.setattr(crawler_task_runtime, "load_crawl_candidates", _load)
+
+    ranked = await crawler_task_runtime.rank_patrol_seed_profiles(
+        session_factory=_Session,
+        seed_profiles=[_profile("r/a"), _profile("r/c"), _profile("r/b")],
+        module_logger=logging.getLogger(__name__),
+    )
+
+    assert [p.name for p in ranked] == ["r/b", "r/a", "r/c"]
+
+
+@pytest.mark.asyncio
+async def test_load_recent_empty_streaks_counts_trailing_empty_runs() -> None:
+    # 行按社区、最新在前排列（与 SQL 的 ORDER BY subreddit, rn 一致）
+    rows = [
+        SimpleNamespace(subreddit="r/dry", new_posts=0),
+        SimpleNamespace(subreddit="r/dry", new_posts=0),
+        SimpleNamespace(subreddit="r/dry", new_posts=7),
+        SimpleNamespace(subreddit="r/dry", new_posts=0),
+        SimpleNamespace(subreddit="r/live", new_posts=3),
+        SimpleNamespace(subreddit="r/live", new_posts=0),
+    ]
+    captured: dict[str, Any] = {}
+
+    class _Db:
+        async def execute(self, _stmt: Any, params: dict[str, Any]) -> Any:
+            captured.update(params)
+            return SimpleNamespace(fetchall=lambda: rows)
+
+    streaks = await load_recent_empty_streaks(
+        _Db(), names=["r/Dry", "r/live", "r/none"], recent_runs=4, now=NOW
+    )
+
+    assert streaks == {"r/dry": 2, "r/live": 0}
+    assert captured["keys"] == ["r/dry", "r/live", "r/none"]
+    assert captured["recent_runs"] == 4
+
+
+@pytest.mark.asyncio
+async def test_queue_aclose_closes_redis_client() -> None:
+    redis_client = fakeredis.aioredis.FakeRedis()
+    closed: list[bool] = []
+    original = redis_client.aclose
+
+    async def _aclose() -> None:
+        closed.append(True)
+        await original()
+
+    redis_client.aclose = _aclose  # type: ignore[method-assign]
+    await RedisCrawlPriorityQueue(redis_client).aclose()
+
+    assert closed == [True]
@@ -106,3 +106,101 @@ async def test_collect_posts_with_fallback_uses_stale_cache_on_api_error() -> No
     assert result.stale_cache_fallback_subreddits == {"r/python"}
     assert result.posts_by_subreddit["r/python"][0].id == "p1"
     assert result.api_failures[0]["reason"] == "rate_limit"
+
+
+@pytest.mark.asyncio
+async def test_collect_posts_with_fallback_prefers_bulk_cache_read() -> None:
+    bulk_calls: list[list[str]] = []
+
+    async def _cache_get(_subreddit: str) -> list[RedditPost]:
+        raise AssertionError("per-subreddit cache read should be skipped")
+
+    async def _cache_get_many(subreddits) -> dict[str, list[RedditPost] | None]:
+        bulk_calls.append(list(subreddits))
+        return {"r/python": [_post(subreddit="r/python", created_utc=time.time())]}
+
+    async def _cache_set(_subreddit: str, _posts) -> None:
+        return None
+
+    async def _load_hot(subreddits, _limit: int):
+        return {name: [_post(subreddit=name, created_utc=time.time())] for name in subreddits}
+
+    async def _load_empty(_subreddits, _limit: int):
+        return {}
+
+    async def _fetch(_subreddit: str, _limit: int):
+        raise AssertionError("API should not be called")
+
+    result = await collect_posts_with_fallback(
+        runtime_input=DataCollectionRuntimeInput(
+            communities=["python", "rust"],
+            limit_per_subreddit=5,
+            cache_stale_hours=12,
+            stale_fallback_enabled=True,
+        ),
+        deps=DataCollectionRuntimeDeps(
+            cache_get=_cache_get,
+            cache_set=_cache_set,
+            load_hot_posts=_load_hot,
+            load_cold_posts=_load_empty,
+            fetch_subreddit_posts=_fetch,
+            logger=logging.getLogger("test.data_collection_runtime"),
+            cache_get_many=_cache_get_many,
+        ),
+    )
+
+    assert bulk_calls == [["r/python", "r/rust"]]
+    assert set(result.posts_by_subreddit) == {"r/python", "r/rust"}
+
+
+@pytest.mark.asyncio
+async def test_collect_posts_with_fallback_streams_arrivals_and_isolates_failures() -> None:
+    import asyncio
+
+    arrivals: list[tuple[str, str]] = []
+
+    async def _cache_get(subreddit: str) -> list[RedditPost] | None:
+        if subreddit == "r/cached":
+            return [_post(subreddit=subreddit, created_utc=time.time())]
+        return None
+
+    async def _cache_set(_subreddit: str, _posts) -> None:
+        return None
+
+    async def _load_empty(_subreddits, _limit: int):
+        return {}
+
+    async def _fetch(subreddit: str, _limit: int):
+        if subreddit == "slow":
+            await asyncio.sleep(5)
+        if subreddit == "broken":
+            raise RuntimeError("boom")
+        return [_post(subreddit=f"r/{subreddit}", created_utc=time.time())]
+
+    async def _on_collected(subreddit: str, posts, source: str) -> None:
+        arrivals.append((subreddit, source))
+
+    result = await collect_posts_with_fallback(
+        runtime_input=DataCollectionRuntimeInput(
+            communities=["slow", "cached", "broken", "fast"],
+            limit_per_subreddit=5,
+            cache_stale_hours=12,
+            stale_fallback_enabled=True,
+            api_deadline_seconds=0.2,
+        ),
+        deps=DataCollectionRuntimeDeps(
+            cache_get=_cache_get,
+            cache_set=_cache_set,
+            load_hot_posts=_load_empty,
+            load_cold_posts=_load_empty,
+            fetch_subreddit_posts=_fetch,
+            logger=logging.getLogger("test.data_collection_runtime"),
+            on_subreddit_collected=_on_collected,
+        ),
+    )
+
+    assert arrivals == [("r/cached", "cache"), ("r/fast", "api")]
+    assert set(result.posts_by_subreddit) == {"r/cached", "r/fast"}
+    assert result.api_calls == 1
+    reasons = {item["subreddit"]: item["reason"] for item in result.api_failures}
+    assert reasons == {"r/broken": "error", "r/slow": "deadline"}
@@ -119,3 +119,46 @@ async def test_run_patrol_planner_workflow_ranks_profiles_and_plans_targets() ->
     assert result.inserted == 2
     assert result.enqueued == 2
     assert call_order == ["probe", "ensure", "rank", "plan"]
+
+
+async def test_run_patrol_planner_workflow_releases_leases_when_dispatch_fails() -> None:
+    released: list[list[str]] = []
+
+    async def _load_seed_profiles(_force_refresh: bool) -> tuple[list[CommunityProfile], int]:
+        return [_profile("r/a"), _profile("r/b")], 5
+
+    async def _noop_probe(**_kwargs: int) -> bool:
+        return False
+
+    async def _ensure_parent_run(_crawl_run_id: str, _force_refresh: bool) -> None:
+        return None
+
+    async def _rank_profiles(profiles: list[CommunityProfile]) -> list[CommunityProfile]:
+        return profiles
+
+    async def _plan_patrol_targets(*_args: object) -> dict[str, int]:
+        raise RuntimeError("outbox unavailable")
+
+    async def _release(profiles: list[CommunityProfile]) -> None:
+        released.append([profile.name for profile in profiles])
+
+    deps = PatrolPlannerWorkflowDeps(
+        load_seed_profiles=_load_seed_profiles,
+        maybe_trigger_probe_hot_fallback=_noop_probe,
+        ensure_parent_run=_ensure_parent_run,
+        rank_profiles=_rank_profiles,
+        plan_patrol_targets=_plan_patrol_targets,
+        generate_run_id=lambda: "run-3",
+        log_warning=lambda _msg: None,
+        release_seed_profiles=_release,
+    )
+
+    try:
+        await run_patrol_planner_workflow(PatrolPlannerWorkflowInput(), deps=deps)
+    except RuntimeError as exc:
+        assert str(exc) == "outbox unavailable"
+    else:  # pragma: no cover
+        raise AssertionError("dispatch failure must propagate")
+
+    # 下单失败：租约立即释放，下一轮心跳可以重新领取
+    assert released == [["r/a", "r/b"]]
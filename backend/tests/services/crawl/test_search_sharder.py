@@ -80,3 +80,141 @@ async def test_run_search_partition(monkeypatch, tmp_path: Path):
     assert total > 3
     assert out.exists() and out.stat().st_size > 0
     assert kpi.exists()
+
+
+class _CountingAPI:
+    """每个前缀固定命中数；记录在途并发与被查询的前缀。"""
+
+    def __init__(self, hits: dict[str, int], *, fail: set[str] | None = None):
+        self.hits = hits
+        self.fail = set(fail or ())
+        self.queries: list[str] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def authenticate(self):
+        return None
+
+    async def search_subreddit_page(self, subreddit, query, *, limit, sort, time_filter, restrict_sr, syntax, after):
+        self.queries.append(query)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if query in self.fail:
+                raise RuntimeError("search timeout")
+            count = self.hits.get(query, 0)
+            posts = [
+                type("P", (), {"id": f"{query[0]}{i}", "title": "t", "selftext": "s", "score": 1, "num_comments": 0,
+                               "created_utc": 1700000000.0, "subreddit": subreddit, "author": "u", "url": "u", "permalink": "/p"})
+                for i in range(count)
+            ]
+            return posts, None
+        finally:
+            self.in_flight -= 1
+
+
+def _patch_api(monkeypatch, api):
+    import app.services.crawl.search_sharder as sh
+
+    class _Ctx:
+        async def __aenter__(self):
+            return api
+
+        async def __aexit__(self, *args):
+            return None
+
+    monkeypatch.setattr(sh, "RedditAPIClient", lambda **kw: _Ctx())
+
+
+async def _partition(tmp_path: Path, progress: Path, **overrides):
+    kwargs = dict(
+        subreddit="ecommerce",
+        client_id="x", client_secret="y", user_agent="z",
+        prefix_chars="abcd", max_prefix_len=2, split_threshold=5, max_pages_per_shard=1,
+        sort="new", writer=None, progress_path=progress, kpi_output_dir=tmp_path,
+        max_concurrency=4,
+    )
+    kwargs.update(overrides)
+    return await run_search_partition(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_run_search_partition_runs_shards_in_parallel_and_splits_by_hits(monkeypatch, tmp_path: Path):
+    # "a" 命中 6 条 → 分裂为 aa..ad；子前缀返回同一批 id（a0..），验证跨分片去重
+    api = _CountingAPI({"a": 6, "aa": 6, "b": 2})
+    _patch_api(monkeypatch, api)
+
+    total, kpi = await _partition(tmp_path, tmp_path / "progress.jsonl")
+
+    assert api.peak == 4
+    assert set(api.queries) == {"a", "b", "c", "d", "aa", "ab", "ac", "ad"}
+    assert total == 8
+    rows = kpi.read_text(encoding="utf-8").splitlines()
+    assert rows[0] == "prefix,status,count,hits,pages,split,elapsed_ms"
+    assert len(rows) == 1 + 8
+
+
+@pytest.mark.asyncio
+async def test_run_search_partition_resumes_from_append_only_progress(monkeypatch, tmp_path: Path):
+    progress = tmp_path / "progress.jsonl"
+    first_api = _CountingAPI({"a": 6, "b": 2, "c": 1}, fail={"c"})
+    _patch_api(monkeypatch, first_api)
+
+    first_total, _ = await _partition(tmp_path, progress)
+
+    assert first_total == 8
+    events = [json.loads(line) for line in progress.read_text(encoding="utf-8").splitlines()]
+    assert events[0]["event"] == "start" and events[-1]["event"] == "done"
+    shard_events = [e for e in events if e["event"] == "shard"]
+    assert {e["prefix"] for e in shard_events if e["status"] == "ok"} == {"a", "b", "d", "aa", "ab", "ac", "ad"}
+
+    second_api = _CountingAPI({"a": 6, "b": 2, "c": 1})
+    _patch_api(monkeypatch, second_api)
+
+    second_total, _ = await _partition(tmp_path, progress)
+
+    # 只重跑失败的 c；之前的 id 已恢复进去重集合，total 只算本次新增
+    assert second_api.queries == ["c"]
+    assert second_total == 1
+
+
+@pytest.mark.asyncio
+async def test_run_search_partition_appends_output_on_resume(monkeypatch, tmp_path: Path):
+    from app.services.crawl.common import JSONLWriter
+
+    out = tmp_path / "out.jsonl"
+    progress = tmp_path / "progress.jsonl"
+    _patch_api(monkeypatch, _CountingAPI({"a": 3, "b": 2}, fail={"b"}))
+    with JSONLWriter(out, stream=True) as writer:
+        await _partition(tmp_path, progress, writer=writer)
+    assert len(out.read_text(encoding="utf-8").splitlines()) == 3
+
+    _patch_api(monkeypatch, _CountingAPI({"a": 3, "b": 2}))
+    with JSONLWriter(out, stream=True, resume=True) as writer:
+        total, _ = await _partition(tmp_path, progress, writer=writer)
+
+    # 续跑不能截断已写入的输出
+    assert total == 2
+    assert len(out.read_text(encoding="utf-8").splitlines()) == 5
+
+
+@pytest.mark.asyncio
+async def test_run_search_partition_fresh_output_discards_stale_progress(monkeypatch, tmp_path: Path):
+    from app.services.crawl.common import JSONLWriter
+
+    out = tmp_path / "out.jsonl"
+    progress = tmp_path / "progress.jsonl"
+    _patch_api(monkeypatch, _CountingAPI({"a": 3, "b": 2}))
+    with JSONLWriter(out, stream=True) as writer:
+        await _partition(tmp_path, progress, writer=writer)
+
+    api = _CountingAPI({"a": 3, "b": 2})
+    _patch_api(monkeypatch, api)
+    with JSONLWriter(out, stream=True) as writer:
+        total, _ = await _partition(tmp_path, progress, writer=writer)
+
+    # 输出从头写时旧进度作废，否则整次运行会变成空跑
+    assert set(api.queries) == {"a", "b", "c", "d"}
+    assert total == 5
+    assert len(out.read_text(encoding="utf-8").splitlines()) == 5
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import fakeredis.aioredis
+import pytest
+
+from app.services.crawl.time_slice_scheduler import (
+    RedisSliceCheckpointStore,
+    crawl_time_slices,
+)
+from app.services.infrastructure.reddit_client import RedditAPIClient, RedditPost
+
+DAY = 86400
+
+
+def _post(post_id: str, created: int = 0) -> RedditPost:
+    return RedditPost(
+        id=post_id,
+        title=post_id,
+        selftext="",
+        score=1,
+        num_comments=0,
+        created_utc=float(created),
+        subreddit="test",
+        author="a",
+        url="",
+        permalink="",
+    )
+
+
+class _Listing:
+    """按 created_utc 模拟 timestamp search：区间内的帖子按上限截断返回。"""
+
+    def __init__(self, timestamps: list[int], *, cap: int = 10, fail: set[tuple[int, int]] | None = None) -> None:
+        self.posts = [_post(f"p{ts}", ts) for ts in timestamps]
+        self.cap = cap
+        self.fail = set(fail or ())
+        self.calls: list[tuple[int, int]] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, start: int, end: int) -> list[RedditPost]:
+        self.calls.append((start, end))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if (start, end) in self.fail:
+                raise RuntimeError("search timeout")
+            hits = [p for p in self.posts if start <= p.created_utc <= end]
+            return hits[: self.cap]
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+async def test_slices_run_concurrently_and_dedup_overlaps() -> None:
+    listing = _Listing([10, 20, 100, 110, 200])
+    streamed: list[str] = []
+
+    async def _sink(posts: list[RedditPost]) -> None:
+        streamed.extend(p.id for p in posts)
+
+    report = await crawl_time_slices(
+        listing,
+        [(0, 100), (100, 200), (200, 300)],
+        max_concurrency=3,
+        on_new_posts=_sink,
+    )
+
+    assert listing.peak == 3
+    assert sorted(p.id for p in report.posts) == ["p10", "p100", "p110", "p20", "p200"]
+    # 重叠边界上的 p100 / p200 只流出一次
+    assert sorted(streamed) == sorted(p.id for p in report.posts)
+    summary = report.as_dict()
+    assert summary["slices_done"] == 3
+    assert summary["fetched"] == 7
+    assert all(kpi.status == "done" for kpi in report.kpis)
+
+
+@pytest.mark.asyncio
+async def test_truncated_slice_is_split_until_under_threshold() -> None:
+    # 第一天 16 条（超过上限 10），之后稀疏
+    timestamps = [i * 3600 for i in range(16)] + [5 * DAY, 9 * DAY]
+    listing = _Listing(timestamps, cap=10)
+
+    report = await crawl_time_slices(
+        listing,
+        [(0, 10 * DAY)],
+        max_concurrency=2,
+        split_threshold=10,
+        min_slice_seconds=3600,
+    )
+
+    assert len(report.posts) == len(timestamps)
+    assert report.as_dict()["slices_split"] >= 2
+    assert max(kpi.depth for kpi in report.kpis) >= 2
+    leaves = [kpi for kpi in report.kpis if kpi.status == "done"]
+    assert all(kpi.fetched < 10 for kpi in leaves)
+
+
+@pytest.mark.asyncio
+async def test_failed_slice_keeps_checkpoint_and_resume_only_refetches_it() -> None:
+    checkpoint = RedisSliceCheckpointStore(fakeredis.aioredis.FakeRedis())
+    slices = [(0, 100), (100, 200), (200, 300)]
+    listing = _Listing([10, 150, 250], fail={(100, 200)})
+
+    first = await crawl_time_slices(
+        listing, slices, checkpoint=checkpoint, checkpoint_key="r/test:new"
+    )
+
+    assert first.failed_slices == [(100, 200)]
+    assert first.kpis[[k.start for k in first.kpis].index(100)].error == "search timeout"
+    assert await checkpoint.load("r/test:new") == {(0, 100): "done", (200, 300): "done"}
+
+    listing.fail.clear()
+    listing.calls.clear()
+    second = await crawl_time_slices(
+        listing, slices, checkpoint=checkpoint, checkpoint_key="r/test:new"
+    )
+
+    assert listing.calls == [(100, 200)]
+    assert [p.id for p in second.posts] == ["p150"]
+    assert second.as_dict()["slices_resumed"] == 2
+    assert await checkpoint.load("r/test:new") == {}
+
+
+@pytest.mark.asyncio
+async def test_client_fetch_posts_by_time_slices_splits_at_listing_cap(monkeypatch) -> None:
+    client = RedditAPIClient("id", "secret", max_concurrency=2)
+    listing = _Listing([i * 60 for i in range(30)], cap=20)
+
+    async def _noop() -> None:
+        return None
+
+    async def _by_timestamp(**kwargs: Any) -> tuple[list[RedditPost], None]:
+        hits = await listing(kwargs["start_epoch"], kwargs["end_epoch"])
+        return hits[: kwargs["max_posts"]], None
+
+    monkeypatch.setattr(client, "authenticate", _noop)
+    monkeypatch.setattr(client, "fetch_subreddit_posts_by_timestamp", _by_timestamp)
+
+    posts = await client.fetch_posts_by_time_slices(
+        "test", slices=[(0, DAY)], per_slice_max=20, min_slice_seconds=60
+    )
+
+    assert len(posts) == 30
+    assert listing.peak <= 2
+    assert len(listing.calls) > 1
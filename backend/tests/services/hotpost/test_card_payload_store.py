@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
@@ -126,13 +125,15 @@ def test_publish_draft_keeps_payload_valid_under_concurrent_writes(monkeypatch,
     assert len(payload["published"]) == 2
     assert {item["card_id"] for item in payload["published"]} == {card_id for card_id, _ in results}
 
-    root = storage_root_for(path)
-    latest = json.loads((root / "releases" / "latest.json").read_text(encoding="utf-8"))
-    release_root = root / "releases" / latest["release_id"]
-    index = json.loads((release_root / "index.json").read_text(encoding="utf-8"))
-    assert index["card_count"] == 2
-    assert sorted(index["card_ids"]) == sorted(card_id for card_id, _ in results)
-    assert (root / "candidates" / "business-growth-ops.json").exists()
+    store = card_payload_store.record_store()
+    assert store.db_path.parent == storage_root_for(path)
+    assert store.db_path.exists()
+    assert {item["candidate_id"] for item in store.find_group("candidates", "business-growth-ops")} == {
+        "cand-a",
+        "cand-b",
+    }
+    for card_id, _ in results:
+        assert store.get("published", card_id) is not None
 
 
 def test_publish_draft_blocks_precheck_block_by_default(monkeypatch, tmp_path: Path) -> None:
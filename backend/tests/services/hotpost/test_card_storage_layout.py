@@ -132,20 +132,59 @@ def test_migrate_cards_payload_layout_splits_legacy_file(monkeypatch, tmp_path:
 
     result = card_payload_store.migrate_cards_payload_layout()
     root = storage_root_for(legacy_path)
-    latest = json.loads((root / "releases" / "latest.json").read_text(encoding="utf-8"))
 
     assert result["categories"] == 1
     assert result["candidates"] == 1
     assert result["drafts"] == 1
     assert result["published"] == 1
-    assert result["release_id"] == latest["release_id"]
-    assert (root / "categories.json").exists()
-    assert (root / "candidates" / "ai-automation.json").exists()
-    assert (root / "drafts" / "draft-1.json").exists()
-    assert (root / "releases" / latest["release_id"] / "cards" / "card-2.json").exists()
+    assert result["source"] == "legacy"
+    assert result["store"] == str(root / "cards.sqlite3")
+
+    store = card_payload_store.record_store()
+    assert store.get("candidates", "cand-1")["source_scope_id"] == "ai-automation"
+    assert store.get("drafts", "draft-1")["card_id"] == "card-1"
+    assert store.get("published", "card-2")["title"] == "Published title"
 
     loaded = card_payload_store.load_cards_payload()
     assert loaded["categories"][0]["category_id"] == "all"
     assert loaded["candidates"][0]["candidate_id"] == "cand-1"
     assert loaded["drafts"][0]["draft_id"] == "draft-1"
     assert loaded["published"][0]["card_id"] == "card-2"
+
+
+def test_record_store_imports_split_layout_on_first_write(monkeypatch, tmp_path: Path) -> None:
+    from app.services.hotpost import card_payload_store
+    from app.services.hotpost.card_storage_layout import storage_root_for, write_split_payload
+
+    legacy_path = tmp_path / "hotpost_cards.json"
+    legacy_path.write_text('{"categories":[],"candidates":[],"drafts":[],"published":[]}', encoding="utf-8")
+    write_split_payload(
+        legacy_path,
+        {
+            "categories": [{"category_id": "all"}],
+            "candidates": [],
+            "drafts": [{"draft_id": "draft-split", "card_id": "card-split", "card_type": "validate"}],
+            "published": [
+                {"card_id": "card-old", "published_at": "2026-04-01T00:00:00Z"},
+                {"card_id": "card-new", "published_at": "2026-04-09T00:00:00Z"},
+            ],
+        },
+    )
+    monkeypatch.setattr(card_payload_store, "_CARDS_PATH", legacy_path)
+    store = card_payload_store.record_store()
+
+    # 迁移前：读操作直接读拆分目录，不建库
+    assert card_payload_store.load_draft("draft-split")["card_id"] == "card-split"
+    assert not store.exists()
+
+    touched = card_payload_store.merge_published_cards(
+        [{"card_id": "card-old", "published_at": "2026-04-01T00:00:00Z", "title": "patched"}]
+    )
+
+    assert touched == 1
+    assert store.exists()
+    assert (storage_root_for(legacy_path) / "cards.sqlite3") == store.db_path
+    assert [item["card_id"] for item in card_payload_store.load_published_cards()] == ["card-new", "card-old"]
+    assert card_payload_store.load_published_card("card-old")["title"] == "patched"
+    assert card_payload_store.load_categories() == [{"category_id": "all"}]
+    assert card_payload_store.migrate_cards_payload_layout()["source"] == "split"
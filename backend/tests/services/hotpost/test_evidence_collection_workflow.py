@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+
 from app.schemas.hotpost import Hotpost, HotpostComment
 from app.services.hotpost.evidence_collection_workflow import (
     HotpostEvidenceCollectionDeps,
@@ -211,3 +213,134 @@ async def test_collect_hotpost_evidence_filters_low_relevance_opportunity_posts(
     assert len(result.top_posts) == 1
     assert result.top_posts[0].id == "p1"
     assert result.community_distribution == {"r/saas": "100%"}
+
+
+class _StubReddit:
+    """带固定延迟的假 Reddit：记录在途峰值与限流预算调用次数。"""
+
+    def __init__(self, *, latency: float, hang: set[str] | None = None) -> None:
+        self.latency = latency
+        self.hang = set(hang or ())
+        self.in_flight = 0
+        self.peak = 0
+        self.budget_calls = 0
+
+    async def acquire_rate_budget(self, *, cost: int, queue_tracker: object | None = None) -> None:
+        self.budget_calls += cost
+
+    async def _call(self, key: str) -> None:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(30 if key in self.hang else self.latency)
+        finally:
+            self.in_flight -= 1
+
+    async def search_subreddit_posts(
+        self,
+        subreddit: str,
+        query: str,
+        *,
+        sort: str,
+        time_filter: str,
+        max_posts: int,
+        queue_tracker: object | None = None,
+    ) -> tuple[list[RedditPost], int]:
+        await self.acquire_rate_budget(cost=1)
+        await self._call(subreddit)
+        slug = subreddit.removeprefix("r/")
+        return (
+            [
+                _reddit_post(
+                    post_id=f"{slug}-{i}",
+                    title=f"{query} broken again",
+                    body="so broken",
+                    subreddit=subreddit,
+                )
+                for i in range(2)
+            ],
+            1,
+        )
+
+    async def fetch_comments(self, post_id: str, *, queue_tracker: object | None = None) -> list[dict[str, object]]:
+        await self.acquire_rate_budget(cost=1)
+        await self._call(post_id)
+        return [{"name": f"t1_{post_id}", "author": "a", "body": "same here", "score": 1}]
+
+
+def _concurrent_input(subreddits: list[str], **kwargs: object) -> HotpostEvidenceCollectionInput:
+    return HotpostEvidenceCollectionInput(
+        request_query="vacuum",
+        query_parts=["vacuum", "mop"],
+        keywords=["vacuum"],
+        mode="trending",
+        time_filter="month",
+        sort="top",
+        limit=10,
+        requested_subreddits=subreddits,
+        suggest_subreddits_when_missing=False,
+        enable_relevance_filter=False,
+        max_posts_per_subreddit=30,
+        notes=[],
+        **kwargs,
+    )
+
+
+def _stub_deps(stub: _StubReddit) -> HotpostEvidenceCollectionDeps:
+    return HotpostEvidenceCollectionDeps(
+        acquire_rate_budget=stub.acquire_rate_budget,
+        search_subreddits=None,
+        search_subreddit_posts=stub.search_subreddit_posts,
+        search_posts=None,
+        fetch_comments=stub.fetch_comments,
+        select_signals=lambda _mode, _text: {"rant": ["broken"]},
+        sentiment_label=lambda _mode, _text, _signals: "negative",
+        build_post=_hotpost,
+        build_pain_points=lambda _posts, _categories: [],
+        confidence_level=lambda evidence_count: "low" if evidence_count < 10 else "medium",
+        lexicon=load_default_hotpost_keywords(),
+    )
+
+
+async def test_collect_hotpost_evidence_fans_out_under_concurrency_bound() -> None:
+    subreddits = ["r/a", "r/b", "r/c", "r/d"]
+    sequential_stub = _StubReddit(latency=0.02)
+    sequential = await collect_hotpost_evidence(
+        workflow_input=_concurrent_input(subreddits), deps=_stub_deps(sequential_stub)
+    )
+    concurrent_stub = _StubReddit(latency=0.02)
+    concurrent = await collect_hotpost_evidence(
+        workflow_input=_concurrent_input(subreddits, max_concurrency=4),
+        deps=_stub_deps(concurrent_stub),
+    )
+
+    assert sequential_stub.peak == 1
+    assert concurrent_stub.peak == 4
+    # 结果顺序、调用次数与顺序执行一致；每个请求都经过限流预算
+    assert [p.id for p in concurrent.top_posts] == [p.id for p in sequential.top_posts]
+    assert [c.comment_fullname for c in concurrent.all_comments] == [
+        c.comment_fullname for c in sequential.all_comments
+    ]
+    assert concurrent.api_calls == sequential.api_calls == 8
+    assert concurrent_stub.budget_calls == sequential_stub.budget_calls == 8 + 8
+    assert concurrent.deadline_hit is False
+    assert concurrent.elapsed_seconds < sequential.elapsed_seconds
+
+
+async def test_collect_hotpost_evidence_returns_partial_results_at_deadline() -> None:
+    stub = _StubReddit(latency=0.01, hang={"r/slow"})
+
+    result = await collect_hotpost_evidence(
+        workflow_input=_concurrent_input(
+            ["r/a", "r/slow"], max_concurrency=4, deadline_seconds=0.3
+        ),
+        deps=_stub_deps(stub),
+    )
+
+    assert result.deadline_hit is True
+    assert result.elapsed_seconds < 1.0
+    assert [p.id for p in result.top_posts] == ["a-0", "a-1"]
+    assert result.api_calls == 2
+    assert result.top_posts[0].top_comments == []  # 检索已耗尽时限，评论阶段直接截断
+    assert "检索达到时限，已返回 2/4 个子查询的结果" in result.notes
+    assert "评论抓取达到时限，2 条帖子未附带评论" in result.notes
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import uuid
 from datetime import datetime, timezone
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
+import fakeredis
+import fakeredis.aioredis
 import pytest
 
 from app.schemas.hotpost import HotpostSearchRequest, HotpostSearchResponse
+from app.services.hotpost.cache import (
+    HotpostSingleFlight,
+    build_hotpost_cache_key,
+    hotpost_cache_fresh_key,
+)
 from app.services.hotpost.result_meta import HotpostLLMReportResult, HotpostSummaryResult
 from app.services.hotpost.search_workflow import (
     HotpostSearchWorkflowDeps,
@@ -64,6 +72,7 @@ async def test_search_workflow_returns_cached_payload() -> None:
         },
     ).model_dump_json()
     redis_client = _FakeRedis(cached_payload)
+    create_hotpost_query = AsyncMock()
     update_hotpost_query = AsyncMock()
 
     result = await run_hotpost_search_workflow(
@@ -85,7 +94,7 @@ async def test_search_workflow_returns_cached_payload() -> None:
                     degraded_reason=None,
                 )
             ),
-            create_hotpost_query=AsyncMock(),
+            create_hotpost_query=create_hotpost_query,
             update_hotpost_query=update_hotpost_query,
             tracker_factory=_FakeTracker,
             collect_evidence=AsyncMock(),
@@ -102,7 +111,12 @@ async def test_search_workflow_returns_cached_payload() -> None:
     assert result.response.from_cache is True
     assert result.response.debug_info is not None
     assert result.response.debug_info.response_source == "cache"
-    update_hotpost_query.assert_awaited_once()
+    assert result.response.debug_info.cache_status == "hit"
+    # 命中缓存只插一次查询日志（带最终值），不再回填
+    create_hotpost_query.assert_awaited_once()
+    assert create_hotpost_query.await_args.kwargs["from_cache"] is True
+    assert create_hotpost_query.await_args.kwargs["api_calls"] == 0
+    update_hotpost_query.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -130,6 +144,7 @@ async def test_search_workflow_runs_live_path() -> None:
             categories=[],
             api_calls=2,
             community_distribution={"r/robotvacuums": "100%"},
+            deadline_hit=False,
         )
     )
     summary_result = HotpostSummaryResult(text="summary", source="fallback", degraded_reason="low_confidence")
@@ -191,3 +206,203 @@ async def test_search_workflow_runs_live_path() -> None:
     persist_side_effects.assert_awaited_once()
     update_hotpost_query.assert_not_awaited()
     collect_evidence.assert_awaited_once()
+
+
+def _live_response(query_id: str = "live-id") -> HotpostSearchResponse:
+    return HotpostSearchResponse(
+        query_id=query_id,
+        query="robot vacuum",
+        mode="trending",
+        search_time=datetime.now(timezone.utc),
+        from_cache=False,
+        status="completed",
+        summary="live summary",
+        top_posts=[],
+        key_comments=[],
+        communities=[],
+        related_queries=[],
+        evidence_count=0,
+        community_distribution={},
+        sentiment_overview={"positive": 0.0, "neutral": 1.0, "negative": 0.0},
+        confidence="none",
+        debug_info={"response_source": "live"},
+    )
+
+
+def _redis_backed_deps(redis_client, *, collect_evidence, schedule_refresh=None) -> HotpostSearchWorkflowDeps:
+    async def _persist(*, workflow_input, deps) -> None:
+        payload = workflow_input.response.model_dump_json()
+        ttl = workflow_input.cache_ttl_seconds
+        await redis_client.setex(workflow_input.cache_key, ttl + workflow_input.cache_stale_seconds, payload)
+        await redis_client.setex(hotpost_cache_fresh_key(workflow_input.cache_key), ttl, "1")
+
+    return HotpostSearchWorkflowDeps(
+        redis_client=redis_client,
+        getenv=lambda key, default: {"HOTPOST_SINGLE_FLIGHT_WAIT_SECONDS": "5"}.get(key, default),
+        resolve_mode=lambda _request: "trending",
+        resolve_time_filter=lambda _mode, _request: "month",
+        resolve_sort=lambda _mode: "top",
+        split_search_queries=lambda query, _max_chars: [query],
+        resolve_query=AsyncMock(
+            return_value=SimpleNamespace(
+                search_query="robot vacuum",
+                keywords=["robot", "vacuum"],
+                subreddits=["r/robotvacuums"],
+                source="rule",
+                degraded_reason=None,
+            )
+        ),
+        create_hotpost_query=AsyncMock(),
+        update_hotpost_query=AsyncMock(),
+        tracker_factory=_FakeTracker,
+        collect_evidence=collect_evidence,
+        maybe_llm_summary=AsyncMock(),
+        build_report_result=AsyncMock(),
+        build_search_response=lambda _bundle: _live_response(),
+        persist_side_effects=_persist,
+        evidence_deps_factory=lambda: SimpleNamespace(lexicon=None),
+        report_deps_factory=lambda: object(),
+        persistence_deps_factory=lambda: object(),
+        schedule_refresh=schedule_refresh,
+    )
+
+
+def _evidence(*, deadline_hit: bool = False) -> SimpleNamespace:
+    return SimpleNamespace(
+        top_posts=[],
+        all_comments=[],
+        notes=[],
+        subreddits=["r/robotvacuums"],
+        raw_posts=0,
+        filtered_posts=0,
+        relevance_filtered=0,
+        sentiment_overview={"positive": 0.0, "neutral": 1.0, "negative": 0.0},
+        confidence="none",
+        me_too_count=0,
+        pain_points=[],
+        opportunities=None,
+        rant_intensity=None,
+        need_urgency=None,
+        categories=[],
+        api_calls=1,
+        community_distribution={},
+        deadline_hit=deadline_hit,
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_searches_are_coalesced() -> None:
+    redis_client = fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+
+    async def _slow_collect(**_kwargs):
+        await asyncio.sleep(0.3)
+        return _evidence()
+
+    collect_evidence = AsyncMock(side_effect=_slow_collect)
+    deps = _redis_backed_deps(redis_client, collect_evidence=collect_evidence)
+    workflow_input = HotpostSearchWorkflowInput(request=HotpostSearchRequest(query="robot vacuum", limit=10))
+
+    first, second = await asyncio.gather(
+        run_hotpost_search_workflow(workflow_input=workflow_input, deps=deps),
+        run_hotpost_search_workflow(workflow_input=workflow_input, deps=deps),
+    )
+
+    collect_evidence.assert_awaited_once()
+    statuses = sorted(r.response.debug_info.cache_status for r in (first, second))
+    assert statuses == ["coalesced", "miss"]
+    coalesced = first if first.response.debug_info.cache_status == "coalesced" else second
+    assert coalesced.response.from_cache is True
+    assert coalesced.response.debug_info.cache_counters["coalesced"] == 1
+    assert coalesced.response.debug_info.cache_counters["miss"] == 1
+    # 锁在持锁请求结束后释放
+    assert await redis_client.keys("*:lock") == []
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_and_refresh_is_scheduled() -> None:
+    redis_client = fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+    cache_key = build_hotpost_cache_key("robot vacuum", "trending", ["r/robotvacuums"])
+    # 只有结果本体、没有新鲜度标记 = 软过期
+    await redis_client.set(cache_key, _live_response("old-id").model_dump_json())
+    scheduled: list[HotpostSearchWorkflowInput] = []
+    collect_evidence = AsyncMock(return_value=_evidence())
+    deps = _redis_backed_deps(
+        redis_client, collect_evidence=collect_evidence, schedule_refresh=scheduled.append
+    )
+    workflow_input = HotpostSearchWorkflowInput(
+        request=HotpostSearchRequest(query="robot vacuum", limit=10),
+        session_id="session-1",
+        ip_hash="ip-1",
+    )
+
+    stale = await run_hotpost_search_workflow(workflow_input=workflow_input, deps=deps)
+
+    assert stale.response.query_id == "old-id"
+    assert stale.response.debug_info.cache_status == "stale"
+    assert stale.response.debug_info.cache_counters["stale"] == 1
+    collect_evidence.assert_not_awaited()
+    assert len(scheduled) == 1 and scheduled[0].refresh_lock_token
+
+    # 刷新在途时再来的 stale 请求不会重复调度
+    await run_hotpost_search_workflow(workflow_input=workflow_input, deps=deps)
+    assert len(scheduled) == 1
+
+    deps.create_hotpost_query.reset_mock()
+    refreshed = await run_hotpost_search_workflow(workflow_input=scheduled[0], deps=deps)
+    assert refreshed.response.debug_info.cache_status == "refresh"
+    collect_evidence.assert_awaited_once()
+    # 刷新写的查询行归属系统，不再记到触发它的用户 / 会话 / IP 上
+    deps.create_hotpost_query.assert_awaited_once()
+    refresh_log = deps.create_hotpost_query.await_args.kwargs
+    assert (refresh_log["user_id"], refresh_log["session_id"], refresh_log["ip_hash"]) == (None, None, None)
+    assert await redis_client.keys("*:lock") == []
+
+    fresh = await run_hotpost_search_workflow(workflow_input=workflow_input, deps=deps)
+    assert fresh.response.debug_info.cache_status == "hit"
+    assert fresh.response.query_id == "live-id"
+
+
+@pytest.mark.asyncio
+async def test_deadline_truncated_result_is_flagged_and_passed_to_persistence() -> None:
+    redis_client = fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+    persisted: list = []
+    deps = _redis_backed_deps(
+        redis_client, collect_evidence=AsyncMock(return_value=_evidence(deadline_hit=True))
+    )
+
+    async def _persist(*, workflow_input, deps) -> None:
+        persisted.append(workflow_input)
+
+    deps.persist_side_effects = _persist
+    workflow_input = HotpostSearchWorkflowInput(request=HotpostSearchRequest(query="robot vacuum", limit=10))
+
+    result = await run_hotpost_search_workflow(workflow_input=workflow_input, deps=deps)
+
+    assert result.response.debug_info.evidence_deadline_hit is True
+    assert persisted[0].deadline_hit is True
+    assert persisted[0].partial_cache_ttl_seconds == 60
+
+
+@pytest.mark.asyncio
+async def test_single_flight_waiter_waits_while_lock_is_held() -> None:
+    redis_client = fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+    holder = HotpostSingleFlight(redis_client, stale_seconds=60, lock_seconds=2)
+    waiter = HotpostSingleFlight(redis_client, stale_seconds=60, lock_seconds=2, poll_seconds=0.05)
+    token = await holder.acquire("hot:key")
+    assert token is not None
+
+    async def _finish_live_search() -> None:
+        await asyncio.sleep(0.6)
+        await redis_client.setex("hot:key", 120, "live-result")
+        await redis_client.setex(hotpost_cache_fresh_key("hot:key"), 60, "1")
+        await holder.release("hot:key", token)
+
+    finisher = asyncio.create_task(_finish_live_search())
+    assert await waiter.wait_for_result("hot:key") == "live-result"
+    await finisher
+
+    # 持锁方崩溃不释放：等待方在锁过期时结束，而不是无限等待
+    await holder.acquire("hot:dead")
+    started = asyncio.get_running_loop().time()
+    assert await waiter.wait_for_result("hot:dead") is None
+    assert asyncio.get_running_loop().time() - started < 2.5
@@ -6,9 +6,12 @@ from datetime import datetime, timezone
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
+import fakeredis
+import fakeredis.aioredis
 import pytest
 
 from app.schemas.hotpost import Hotpost, HotpostComment, HotpostSearchResponse
+from app.services.hotpost.cache import hotpost_cache_fresh_key
 from app.services.hotpost.persistence_workflow import (
     HotpostPersistenceWorkflowDeps,
     HotpostPersistenceWorkflowInput,
@@ -220,3 +223,47 @@ async def test_persist_hotpost_search_side_effects_skips_llm_report_cache_withou
         "hotpost:cache:test",
         f"hotpost:result:{query_id}",
     ]
+
+
+@pytest.mark.asyncio
+async def test_deadline_truncated_result_is_cached_briefly_without_fresh_marker() -> None:
+    redis = fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+    deps = HotpostPersistenceWorkflowDeps(
+        db=AsyncMock(),
+        redis_client=redis,
+        upsert_evidence_post=AsyncMock(),
+        insert_query_evidence_map=AsyncMock(),
+        maybe_discover_community=AsyncMock(),
+        update_hotpost_query=AsyncMock(),
+    )
+
+    def _input(cache_key: str) -> HotpostPersistenceWorkflowInput:
+        return HotpostPersistenceWorkflowInput(
+            query_id=uuid.uuid4(),
+            request_query="robot vacuum",
+            search_query="robot vacuum",
+            keywords=["robot"],
+            top_posts=[],
+            response=_response([]),
+            llm_report_result=HotpostLLMReportResult(report=None, source="disabled"),
+            cache_key=cache_key,
+            cache_ttl_seconds=3600,
+            comments_cache_ttl_seconds=7200,
+            latency_ms=25000,
+            api_calls=1,
+            subreddits=None,
+            cache_stale_seconds=3600,
+            deadline_hit=True,
+            partial_cache_ttl_seconds=60,
+        )
+
+    await persist_hotpost_search_side_effects(workflow_input=_input("hot:partial"), deps=deps)
+
+    assert await redis.get("hot:partial") is not None
+    assert 0 < await redis.ttl("hot:partial") <= 60
+    assert await redis.get(hotpost_cache_fresh_key("hot:partial")) is None
+
+    # 截断的后台刷新不覆盖 stale 窗口内的完整结果
+    await redis.set("hot:complete", "complete-result", ex=1800)
+    await persist_hotpost_search_side_effects(workflow_input=_input("hot:complete"), deps=deps)
+    assert await redis.get("hot:complete") == "complete-result"
@@ -43,7 +43,8 @@ async def test_set_and_get_cached_posts() -> None:
 @pytest.mark.asyncio
 async def test_get_cached_posts_returns_none_when_stale() -> None:
     client = fakeredis.FakeRedis(server=FakeServer())
-    manager = CacheManager(client)
+    # 旧 JSON 格式条目：仍需按 cached_at 判定过期
+    manager = CacheManager(client, codec="json")
     post = _build_post()
 
     await manager.set_cached_posts("python", [post])
@@ -68,3 +69,84 @@ async def test_calculate_cache_hit_rate() -> None:
     await manager.set_cached_posts("python", [post])
     hit_rate = await manager.calculate_cache_hit_rate(["python", "golang"])
     assert hit_rate == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_get_many_cached_posts_reads_all_keys_in_one_mget() -> None:
+    client = fakeredis.FakeRedis(server=FakeServer())
+    manager = CacheManager(client)
+    await manager.set_cached_posts("python", [_build_post("python")])
+    await manager.set_cached_posts("rust", [_build_post("rust"), _build_post("rust")])
+
+    calls: list[list[str]] = []
+    original_mget = client.mget
+
+    async def _tracking_mget(keys, *args):
+        calls.append(list(keys))
+        return await original_mget(keys, *args)
+
+    client.mget = _tracking_mget  # type: ignore[method-assign]
+    cached = await manager.get_many_cached_posts(["python", "rust", "golang"])
+
+    assert len(calls) == 1
+    assert [post.subreddit for post in cached["python"] or []] == ["python"]
+    assert len(cached["rust"] or []) == 2
+    assert cached["golang"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_many_cached_posts_keys_results_by_requested_names() -> None:
+    manager = CacheManager(fakeredis.FakeRedis(server=FakeServer()))
+    await manager.set_cached_posts("python", [_build_post("python")])
+
+    cached = await manager.get_many_cached_posts([" python ", "rust", ""])
+
+    # 调用方按原始 profile.name 取值，结果不能只用 strip 后的名字做 key
+    assert set(cached) == {" python ", "rust"}
+    assert len(cached[" python "] or []) == 1
+    assert cached["rust"] is None
+
+
+@pytest.mark.asyncio
+async def test_cache_status_many_uses_meta_keys_without_payloads() -> None:
+    client = fakeredis.FakeRedis(server=FakeServer())
+    manager = CacheManager(client)
+    await manager.set_cached_posts("python", [_build_post(), _build_post()])
+    # 旧格式条目（没有 meta key）仍可读出状态
+    legacy_payload = {
+        "cached_at": (datetime.now(timezone.utc) - timedelta(hours=48)).isoformat(),
+        "posts": [],
+    }
+    await client.set("reddit:posts:legacy", json.dumps(legacy_payload))
+
+    requested: list[list[str]] = []
+    original_mget = client.mget
+
+    async def _tracking_mget(keys, *args):
+        requested.append(list(keys))
+        return await original_mget(keys, *args)
+
+    client.mget = _tracking_mget  # type: ignore[method-assign]
+    statuses = await manager.cache_status_many(["python", "golang", "legacy"])
+
+    assert requested[0] == [
+        "reddit:posts:meta:python",
+        "reddit:posts:meta:golang",
+        "reddit:posts:meta:legacy",
+    ]
+    assert "reddit:posts:python" not in requested[1]
+    assert statuses["python"].is_hit and statuses["python"].post_count == 2
+    assert statuses["golang"].exists is False
+    assert statuses["legacy"].exists is True and statuses["legacy"].fresh is False
+
+
+@pytest.mark.asyncio
+async def test_invalidate_removes_meta_key() -> None:
+    client = fakeredis.FakeRedis(server=FakeServer())
+    manager = CacheManager(client)
+    await manager.set_cached_posts("python", [_build_post()])
+
+    await manager.invalidate("python")
+
+    assert await client.exists("reddit:posts:python", "reddit:posts:meta:python") == 0
+    assert await manager.calculate_cache_hit_rate(["python"]) == 0.0
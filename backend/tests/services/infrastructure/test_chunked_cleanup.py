@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+import fakeredis.aioredis
+import pytest
+
+from app.services.infrastructure.chunked_cleanup import (
+    ChunkedCleanupTarget,
+    RedisCleanupCheckpointStore,
+    run_chunked_cleanup,
+)
+
+_TARGET = ChunkedCleanupTarget(
+    name="comments",
+    select_sql="SELECT id FROM comments WHERE id > :after ORDER BY id LIMIT :limit",
+    delete_sql=(
+        ("content_labels", "DELETE FROM content_labels WHERE content_id = ANY(:ids)"),
+        ("comments", "DELETE FROM comments WHERE id = ANY(:ids)"),
+    ),
+)
+
+
+class _FakeSession:
+    """内存版 comments 表：SELECT 走 keyset，DELETE 真删，记录每批参数与提交。"""
+
+    def __init__(self, expired_ids: list[int], *, fail_on_batch: int | None = None) -> None:
+        self.expired = sorted(expired_ids)
+        self.labels = set(expired_ids)
+        self.select_params: list[dict[str, Any]] = []
+        self.delete_sizes: list[int] = []
+        self.commits = 0
+        self.rollbacks = 0
+        self._fail_on_batch = fail_on_batch
+
+    async def execute(self, stmt: Any, params: dict[str, Any]) -> Any:
+        sql = str(stmt)
+        if sql.startswith("SELECT"):
+            self.select_params.append(dict(params))
+            rows = [(row_id,) for row_id in self.expired if row_id > params["after"]][: params["limit"]]
+            return SimpleNamespace(fetchall=lambda: rows)
+        ids = set(params["ids"])
+        if "content_labels" in sql:
+            removed = len(self.labels & ids)
+            self.labels -= ids
+            return SimpleNamespace(rowcount=removed)
+        if self._fail_on_batch is not None and len(self.delete_sizes) + 1 == self._fail_on_batch:
+            raise RuntimeError("lock timeout")
+        self.delete_sizes.append(len(ids))
+        before = len(self.expired)
+        self.expired = [row_id for row_id in self.expired if row_id not in ids]
+        return SimpleNamespace(rowcount=before - len(self.expired))
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+    async def rollback(self) -> None:
+        self.rollbacks += 1
+
+
+@pytest.mark.asyncio
+async def test_run_chunked_cleanup_deletes_in_bounded_batches() -> None:
+    session = _FakeSession(list(range(1, 26)))
+    prepared: list[Any] = []
+
+    async def _prepare(db: Any) -> None:
+        prepared.append(db)
+
+    progress = await run_chunked_cleanup(
+        session,
+        _TARGET,
+        batch_size=10,
+        max_batches=100,
+        prepare_batch=_prepare,
+    )
+
+    assert session.delete_sizes == [10, 10, 5]
+    assert [params["after"] for params in session.select_params] == [0, 10, 20]
+    assert session.commits == 3
+    assert len(prepared) == 3
+    assert progress.deleted == {"content_labels": 25, "comments": 25}
+    assert progress.batches == 3
+    assert progress.scanned == 25
+    assert progress.last_key == 25
+    assert progress.exhausted
+    assert progress.sample_keys[:3] == [1, 2, 3]
+    assert progress.as_dict()["stop_reason"] == "exhausted"
+
+
+@pytest.mark.asyncio
+async def test_run_chunked_cleanup_stops_on_time_budget_and_resumes_from_checkpoint() -> None:
+    checkpoint = RedisCleanupCheckpointStore(fakeredis.aioredis.FakeRedis())
+    session = _FakeSession(list(range(1, 31)))
+    now = 0.0
+    pauses: list[float] = []
+
+    def _clock() -> float:
+        return now
+
+    async def _sleep(seconds: float) -> None:
+        nonlocal now
+        pauses.append(seconds)
+        now += 1.0
+
+    first = await run_chunked_cleanup(
+        session,
+        _TARGET,
+        batch_size=10,
+        max_batches=100,
+        time_budget_seconds=1.5,
+        pause_seconds=0.05,
+        checkpoint=checkpoint,
+        clock=_clock,
+        sleep=_sleep,
+    )
+
+    assert first.stop_reason == "time_budget"
+    assert first.batches == 2
+    assert pauses == [0.05, 0.05]
+    assert await checkpoint.load("comments") == "20"
+
+    second = await run_chunked_cleanup(
+        session,
+        _TARGET,
+        batch_size=10,
+        max_batches=100,
+        checkpoint=checkpoint,
+        clock=_clock,
+        sleep=_sleep,
+    )
+
+    assert second.resumed_from == 20
+    assert second.deleted["comments"] == 10
+    assert second.exhausted
+    assert session.expired == []
+    # 扫完一轮后清掉断点，下次从头开始
+    assert await checkpoint.load("comments") is None
+
+
+@pytest.mark.asyncio
+async def test_run_chunked_cleanup_respects_max_batches() -> None:
+    session = _FakeSession(list(range(1, 51)))
+
+    progress = await run_chunked_cleanup(session, _TARGET, batch_size=10, max_batches=2)
+
+    assert progress.stop_reason == "max_batches"
+    assert progress.deleted["comments"] == 20
+    assert len(session.expired) == 30
+
+
+@pytest.mark.asyncio
+async def test_run_chunked_cleanup_failure_keeps_committed_checkpoint() -> None:
+    checkpoint = RedisCleanupCheckpointStore(fakeredis.aioredis.FakeRedis())
+    session = _FakeSession(list(range(1, 31)), fail_on_batch=2)
+
+    with pytest.raises(RuntimeError):
+        await run_chunked_cleanup(
+            session, _TARGET, batch_size=10, max_batches=100, checkpoint=checkpoint
+        )
+
+    assert session.rollbacks == 1
+    assert session.commits == 1
+    assert await checkpoint.load("comments") == "10"
+
+
+@pytest.mark.asyncio
+async def test_redis_checkpoint_store_degrades_when_redis_is_down() -> None:
+    class _BrokenRedis:
+        async def get(self, *_args: Any, **_kwargs: Any) -> Any:
+            raise ConnectionError("redis down")
+
+        async def set(self, *_args: Any, **_kwargs: Any) -> Any:
+            raise ConnectionError("redis down")
+
+        async def delete(self, *_args: Any, **_kwargs: Any) -> Any:
+            raise ConnectionError("redis down")
+
+    checkpoint = RedisCleanupCheckpointStore(_BrokenRedis())
+    session = _FakeSession([1, 2, 3])
+
+    progress = await run_chunked_cleanup(
+        session, _TARGET, batch_size=10, max_batches=10, checkpoint=checkpoint
+    )
+
+    assert progress.resumed_from == 0
+    assert progress.deleted["comments"] == 3
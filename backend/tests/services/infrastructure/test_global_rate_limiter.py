@@ -9,7 +9,11 @@ try:
 except Exception:  # pragma: no cover - CI fallback if fakeredis not available
     fakeredis = None  # type: ignore
 
-from app.services.infrastructure.global_rate_limiter import GlobalRateLimiter
+from app.services.infrastructure.global_rate_limiter import (
+    GlobalRateLimiter,
+    TokenBucketRateLimiter,
+    create_reddit_rate_limiter,
+)
 
 
 @pytest.mark.asyncio
@@ -33,3 +37,56 @@ async def test_global_rate_limiter_simple_window() -> None:
     await asyncio.sleep(2)
     assert await limiter.acquire() == 0
 
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_reserves_evenly_spaced_slots() -> None:
+    if fakeredis is None:
+        pytest.skip("fakeredis not available")
+
+    r = fakeredis.FakeRedis()
+    limiter = TokenBucketRateLimiter(
+        r, limit=10, window_seconds=1.0, burst=2, client_id="tb-spacing"
+    )
+
+    waits = [(await limiter.reserve()).wait_seconds for _ in range(5)]
+
+    # burst of 2 goes immediately, then one slot every 0.1s
+    assert waits[0] == 0 and waits[1] == 0
+    for previous, current in zip(waits[1:], waits[2:]):
+        assert current - previous == pytest.approx(0.1, abs=0.02)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_batch_reservation_and_rejection_is_free() -> None:
+    if fakeredis is None:
+        pytest.skip("fakeredis not available")
+
+    r = fakeredis.FakeRedis()
+    limiter = TokenBucketRateLimiter(
+        r, limit=10, window_seconds=1.0, burst=1, client_id="tb-batch"
+    )
+
+    assert (await limiter.reserve(cost=5)).wait_seconds == pytest.approx(0.4, abs=0.02)
+
+    rejected = await limiter.reserve(max_wait_seconds=0.1)
+    assert rejected.granted is False
+    assert rejected.wait_seconds == pytest.approx(0.5, abs=0.02)
+
+    # the rejected call booked nothing: the next slot is still 0.5s out
+    granted = await limiter.reserve()
+    assert granted.granted is True
+    assert granted.wait_seconds == pytest.approx(0.5, abs=0.02)
+
+
+def test_create_reddit_rate_limiter_honours_mode(monkeypatch) -> None:
+    monkeypatch.delenv("REDDIT_RATE_LIMITER_MODE", raising=False)
+    assert isinstance(
+        create_reddit_rate_limiter(object(), limit=58, window_seconds=60),
+        TokenBucketRateLimiter,
+    )
+    monkeypatch.setenv("REDDIT_RATE_LIMITER_MODE", "fixed_window")
+    assert isinstance(
+        create_reddit_rate_limiter(object(), limit=58, window_seconds=60),
+        GlobalRateLimiter,
+    )
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import pickle
+from datetime import datetime, timedelta, timezone
+
+import fakeredis.aioredis as fakeredis
+from fakeredis import FakeServer
+import pytest
+
+from app.services.infrastructure.cache_manager import CacheManager
+from app.services.infrastructure.post_cache_codec import (
+    CODEC_MAGIC,
+    COMPRESSION_NONE,
+    COMPRESSION_ZLIB,
+    SCHEMA_VERSION,
+    LazyRedditPost,
+    PostCacheCodecError,
+    decode_post_payload,
+    encode_post_payload,
+    read_payload_meta,
+)
+from app.services.infrastructure.reddit_client import RedditPost
+
+
+def _post(index: int, *, selftext: str = "body") -> RedditPost:
+    return RedditPost(
+        id=f"p{index}",
+        title=f"Title {index} – 标题",
+        selftext=selftext,
+        score=index,
+        num_comments=index * 2,
+        created_utc=1700000000.0 + index,
+        subreddit="python",
+        author=f"user{index}",
+        url=f"https://reddit.com/{index}",
+        permalink=f"/r/python/comments/p{index}",
+    )
+
+
+@pytest.mark.parametrize("compression", [COMPRESSION_NONE, COMPRESSION_ZLIB])
+def test_binary_round_trip_decodes_selftext_lazily(compression: int) -> None:
+    posts = [_post(0, selftext=""), _post(1, selftext="héllo 世界"), _post(2)]
+    raw = encode_post_payload(posts, cached_at="2024-01-01T00:00:00+00:00", compression=compression)
+
+    assert raw[:3] == CODEC_MAGIC
+    assert raw[3] == SCHEMA_VERSION
+    decoded = decode_post_payload(raw, legacy_post_factory=CacheManager._deserialize_post)
+    assert decoded is not None
+    assert decoded.cached_at == "2024-01-01T00:00:00+00:00"
+    assert all(isinstance(post, LazyRedditPost) for post in decoded.posts)
+    assert not any(post.selftext_loaded for post in decoded.posts)
+
+    assert decoded.posts[1].selftext == "héllo 世界"
+    assert decoded.posts[1].selftext_loaded
+    assert not decoded.posts[2].selftext_loaded
+    assert decoded.posts == posts
+    assert posts == decoded.posts
+
+
+def test_lazy_post_pickles_as_plain_reddit_post() -> None:
+    raw = encode_post_payload([_post(1, selftext="text")], cached_at="2024-01-01T00:00:00")
+    decoded = decode_post_payload(raw, legacy_post_factory=CacheManager._deserialize_post)
+    assert decoded is not None
+
+    restored = pickle.loads(pickle.dumps(decoded.posts[0]))
+
+    assert type(restored) is RedditPost
+    assert restored == _post(1, selftext="text")
+
+
+def test_read_payload_meta_reads_header_only() -> None:
+    raw = encode_post_payload([_post(1), _post(2)], cached_at="2024-01-01T00:00:00")
+
+    meta = read_payload_meta(raw[:40])  # body 截断也不影响 header
+
+    assert meta is not None
+    assert (meta.cached_at, meta.post_count) == ("2024-01-01T00:00:00", 2)
+    with pytest.raises(PostCacheCodecError):
+        decode_post_payload(raw[:40], legacy_post_factory=CacheManager._deserialize_post)
+
+
+@pytest.mark.asyncio
+async def test_cache_manager_reads_legacy_json_and_writes_binary() -> None:
+    client = fakeredis.FakeRedis(server=FakeServer())
+    legacy = {
+        "cached_at": datetime.now(timezone.utc).isoformat(),
+        "posts": [{"id": "old", "title": "legacy", "selftext": "x"}],
+    }
+    await client.set("reddit:posts:legacy", json.dumps(legacy))
+    manager = CacheManager(client, codec="binary")
+
+    await manager.set_cached_posts("python", [_post(1)])
+    raw = await client.get("reddit:posts:python")
+    cached = await manager.get_many_cached_posts(["legacy", "python"])
+
+    assert raw[:3] == CODEC_MAGIC
+    assert [post.id for post in cached["legacy"] or []] == ["old"]
+    assert (cached["python"] or [])[0].selftext == "body"
+
+
+@pytest.mark.asyncio
+async def test_cache_manager_skips_stale_binary_without_decoding_body() -> None:
+    client = fakeredis.FakeRedis(server=FakeServer())
+    manager = CacheManager(client)
+    stale_at = (datetime.now(timezone.utc) - timedelta(hours=48)).isoformat()
+    raw = encode_post_payload([_post(1)], cached_at=stale_at)
+    # body 损坏：若先解压会抛错，过期判断必须只看 header
+    await client.set("reddit:posts:python", raw[:-4] + b"\x00\x00\x00\x00")
+
+    assert await manager.get_cached_posts("python") is None
+
+
+@pytest.mark.asyncio
+async def test_cache_manager_writes_json_by_default() -> None:
+    # 默认 json：滚动升级期间未升级的 worker 仍能读新写入的条目
+    client = fakeredis.FakeRedis(server=FakeServer())
+    manager = CacheManager(client)
+
+    await manager.set_cached_posts("python", [_post(1)])
+    raw = await client.get("reddit:posts:python")
+
+    assert raw[:3] != CODEC_MAGIC
+    assert json.loads(raw)["posts"][0]["selftext"] == "body"
@@ -324,3 +324,121 @@ async def test_fetch_post_comments_accepts_comment_timeout_override() -> None:
 
     assert comments == []
     await client.close()
+
+
+async def test_iter_multiple_subreddits_yields_in_completion_order_and_keeps_successes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = RedditAPIClient("id", "secret", "testsuite", session=_StubSession([]))
+    delays = {"slow": 0.05, "fast": 0.0, "broken": 0.01, "hung": 5.0}
+    # broken 第一次 503 → 退避 0.5s 后重试成功，晚于 slow；hung 超过截止时间
+    calls: Dict[str, int] = {}
+
+    async def _noop() -> None:
+        return None
+
+    async def _fetch(name: str, **_kwargs: Any) -> tuple[List[RedditPost], None]:
+        calls[name] = calls.get(name, 0) + 1
+        await asyncio.sleep(delays[name])
+        if name == "broken" and calls[name] == 1:
+            raise RedditAPIError("Reddit API temporarily unavailable (status=503)")
+        return [RedditPost(name, "t", "", 1, 0, 0.0, name, "a", "", "")], None
+
+    monkeypatch.setattr(client, "authenticate", _noop)
+    monkeypatch.setattr(client, "fetch_subreddit_posts", _fetch)
+
+    outcomes = [
+        outcome
+        async for outcome in client.iter_multiple_subreddits(
+            ["slow", "fast", "broken", "hung"], deadline_seconds=1.0
+        )
+    ]
+
+    assert [o.subreddit for o in outcomes] == ["fast", "slow", "broken", "hung"]
+    broken = outcomes[2]
+    assert broken.ok and broken.attempts == 2
+    hung = outcomes[-1]
+    assert not hung.ok and hung.reason == "deadline"
+    await client.close()
+
+
+async def test_subreddit_deadline_excludes_rate_limiter_wait(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # 每 0.3s 只放行 1 个请求：第 4 个社区要排队约 0.9s，但自身只跑 0.05s
+    client = RedditAPIClient(
+        "id", "secret", "testsuite", session=_StubSession([]), rate_limit=1, rate_limit_window=0.3
+    )
+
+    async def _noop() -> None:
+        return None
+
+    async def _fetch(name: str, **_kwargs: Any) -> tuple[List[RedditPost], None]:
+        await client._throttle()
+        await asyncio.sleep(0.05 if name != "hung" else 1.0)
+        return [RedditPost(name, "t", "", 1, 0, 0.0, name, "a", "", "")], None
+
+    monkeypatch.setattr(client, "authenticate", _noop)
+    monkeypatch.setattr(client, "fetch_subreddit_posts", _fetch)
+
+    outcomes = {
+        outcome.subreddit: outcome
+        async for outcome in client.iter_multiple_subreddits(
+            ["a", "b", "c", "hung"], deadline_seconds=0.2
+        )
+    }
+
+    assert all(outcomes[name].ok for name in ("a", "b", "c"))
+    assert max(outcomes[name].elapsed_seconds for name in ("a", "b", "c")) > 0.2
+    assert outcomes["hung"].reason == "deadline"
+    await client.close()
+
+
+async def test_subreddit_deadline_excludes_concurrency_slot_wait(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # 并发 1：第 3 个社区要排队约 0.2s 才拿到槽位，但自身只跑 0.1s，不应判超时
+    client = RedditAPIClient("id", "secret", "testsuite", session=_StubSession([]), max_concurrency=1)
+
+    async def _noop() -> None:
+        return None
+
+    async def _fetch(name: str, **_kwargs: Any) -> tuple[List[RedditPost], None]:
+        await asyncio.sleep(0.1)
+        return [RedditPost(name, "t", "", 1, 0, 0.0, name, "a", "", "")], None
+
+    monkeypatch.setattr(client, "authenticate", _noop)
+    monkeypatch.setattr(client, "fetch_subreddit_posts", _fetch)
+
+    outcomes = [
+        outcome
+        async for outcome in client.iter_multiple_subreddits(["a", "b", "c"], deadline_seconds=0.15)
+    ]
+
+    assert [outcome.ok for outcome in outcomes] == [True, True, True]
+    assert max(outcome.elapsed_seconds for outcome in outcomes) > 0.15
+    await client.close()
+
+
+async def test_fetch_multiple_subreddits_allow_partial_returns_successes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = RedditAPIClient("id", "secret", "testsuite", session=_StubSession([]))
+
+    async def _noop() -> None:
+        return None
+
+    async def _fetch(name: str, **_kwargs: Any) -> tuple[List[RedditPost], None]:
+        if name == "private":
+            raise RedditAPIError("Reddit API request failed (status=451)")
+        return [RedditPost(name, "t", "", 1, 0, 0.0, name, "a", "", "")], None
+
+    monkeypatch.setattr(client, "authenticate", _noop)
+    monkeypatch.setattr(client, "fetch_subreddit_posts", _fetch)
+
+    partial = await client.fetch_multiple_subreddits(["python", "private"], allow_partial=True)
+    assert set(partial) == {"python"}
+
+    with pytest.raises(RedditAPIError):
+        await client.fetch_multiple_subreddits(["python", "private"])
+    await client.close()
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import pytest
 
+from app.services.infrastructure.global_rate_limiter import RateLimitReservation
 from app.services.infrastructure.reddit_client import RedditAPIClient, RedditGlobalRateLimitExceeded
 
 
@@ -22,3 +23,45 @@ async def test_reddit_client_fail_fast_global_limiter_raises() -> None:
         await client._throttle()
     assert exc.value.wait_seconds == 10
 
+
+
+@pytest.mark.asyncio
+async def test_reddit_client_reserving_limiter_sleeps_exact_wait(monkeypatch) -> None:
+    calls: list[dict[str, object]] = []
+    sleeps: list[float] = []
+
+    class ReservingLimiter:
+        async def reserve(self, *, cost: int = 1, max_wait_seconds=None):
+            calls.append({"cost": cost, "max_wait_seconds": max_wait_seconds})
+            return RateLimitReservation(granted=True, wait_seconds=90.25)
+
+    async def _fake_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    monkeypatch.setattr("app.services.infrastructure.reddit_client.asyncio.sleep", _fake_sleep)
+    client = RedditAPIClient("cid", "secret", global_rate_limiter=ReservingLimiter())
+
+    await client._throttle()
+
+    assert calls == [{"cost": 1, "max_wait_seconds": None}]
+    # booked slot: no 60s clamp, no re-acquire
+    assert sleeps == [90.25]
+
+
+@pytest.mark.asyncio
+async def test_reddit_client_fail_fast_reserving_limiter_does_not_book() -> None:
+    class ReservingLimiter:
+        async def reserve(self, *, cost: int = 1, max_wait_seconds=None):
+            assert max_wait_seconds == 0.0
+            return RateLimitReservation(granted=False, wait_seconds=2.2)
+
+    client = RedditAPIClient(
+        "cid",
+        "secret",
+        global_rate_limiter=ReservingLimiter(),
+        fail_fast_on_global_rate_limit=True,
+    )
+
+    with pytest.raises(RedditGlobalRateLimitExceeded) as exc:
+        await client._throttle()
+    assert exc.value.wait_seconds == 3
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from app.services.infrastructure.reddit_client import (
+    MORECHILDREN_BATCH_SIZE,
+    RedditAPIClient,
+    RedditAPIError,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def _t1(cid: str, *, depth: int, parent: str, replies: Any = "") -> Dict[str, Any]:
+    return {
+        "kind": "t1",
+        "data": {
+            "id": cid,
+            "body": f"body {cid}",
+            "author": "u",
+            "parent_id": parent,
+            "depth": depth,
+            "replies": replies,
+        },
+    }
+
+
+def _more(ids: List[str], *, depth: int) -> Dict[str, Any]:
+    return {"kind": "more", "data": {"children": ids, "depth": depth}}
+
+
+def _listing(children: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"data": {"children": children}}
+
+
+class _TreeClient(RedditAPIClient):
+    """Serves a synthetic comment tree; each morechildren id resolves to one comment."""
+
+    def __init__(
+        self,
+        listing: Dict[str, Any],
+        *,
+        nested: Dict[str, List[Dict[str, Any]]] | None = None,
+        delay: float = 0.01,
+        fail_ids: set[str] | None = None,
+    ) -> None:
+        super().__init__("id", "secret", "testsuite", session=object())
+        self._listing = listing
+        self._nested = nested or {}
+        self._delay = delay
+        self._fail_ids = fail_ids or set()
+        self.batches: List[List[str]] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def authenticate(self) -> None:  # type: ignore[override]
+        self.access_token = "token"
+
+    async def _request_json(self, method: str, url: str, **kwargs: Any) -> Any:  # type: ignore[override]
+        if method == "GET":
+            return [{}, self._listing]
+        ids = kwargs["data"]["children"].split(",")
+        self.batches.append(ids)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._delay)
+        finally:
+            self.in_flight -= 1
+        if self._fail_ids.intersection(ids):
+            raise RedditAPIError("boom")
+        things: List[Dict[str, Any]] = []
+        for cid in ids:
+            things.append(_t1(cid, depth=1, parent="t1_root"))
+            things.extend(self._nested.get(cid, []))
+        return {"json": {"data": {"things": things}}}
+
+
+async def test_full_mode_fans_out_morechildren_and_streams_pages() -> None:
+    hidden = [f"h{i}" for i in range(250)]
+    listing = _listing(
+        [
+            _t1(
+                "root",
+                depth=0,
+                parent="t3_p",
+                replies=_listing([_t1("r1", depth=1, parent="t1_root"), _more(hidden, depth=1)]),
+            ),
+            _more(["root", "top2"], depth=0),
+        ]
+    )
+    client = _TreeClient(
+        listing,
+        nested={"h0": [_more(["deep1", "deep2"], depth=2)]},
+    )
+    pages: List[List[str]] = []
+
+    async def _on_page(page: List[Dict[str, Any]]) -> None:
+        pages.append([c["id"] for c in page])
+
+    comments = await client.fetch_post_comments(
+        "p",
+        mode="full",
+        depth=8,
+        smart_config={"full_concurrency": 3},
+        on_page=_on_page,
+    )
+
+    ids = [c["id"] for c in comments]
+    assert len(ids) == len(set(ids))
+    assert {"root", "r1", "top2", "deep1", "deep2"}.issubset(ids)
+    assert set(hidden).issubset(ids)
+    assert all(len(batch) <= MORECHILDREN_BATCH_SIZE for batch in client.batches)
+    assert client.peak_in_flight > 1
+    assert client.peak_in_flight <= 3
+    # 第一页是初始 listing，其余按 morechildren 到达顺序逐页回调
+    assert pages[0] == ["root", "r1"]
+    assert len(pages) > 2
+    assert [cid for page in pages for cid in page] == ids
+
+
+async def test_full_mode_applies_smart_config_caps() -> None:
+    listing = _listing(
+        [
+            _t1("a", depth=0, parent="t3_p"),
+            _more([f"m{i}" for i in range(300)], depth=0),
+            _more(["too-deep"], depth=5),
+        ]
+    )
+
+    capped = _TreeClient(listing)
+    comments = await capped.fetch_post_comments(
+        "p",
+        mode="full",
+        depth=8,
+        smart_config={"full_max_comments": 120, "full_max_depth": 3, "full_concurrency": 1},
+    )
+    assert len(comments) == 120
+    assert all("too-deep" not in batch for batch in capped.batches)
+    assert len(capped.batches) == 2
+
+    slow = _TreeClient(listing, delay=0.5)
+    started = asyncio.get_running_loop().time()
+    partial = await slow.fetch_post_comments(
+        "p",
+        mode="full",
+        smart_config={"full_time_budget_seconds": 0.1},
+    )
+    assert asyncio.get_running_loop().time() - started < 0.4
+    assert [c["id"] for c in partial] == ["a"]
+
+
+async def test_full_mode_honours_explicit_zero_depth() -> None:
+    listing = _listing(
+        [
+            _t1(
+                "root",
+                depth=0,
+                parent="t3_p",
+                replies=_listing([_t1("r1", depth=1, parent="t1_root")]),
+            ),
+            _more(["x"], depth=1),
+        ]
+    )
+    client = _TreeClient(listing)
+
+    comments = await client.fetch_post_comments(
+        "p",
+        mode="full",
+        depth=8,
+        smart_config={"full_max_depth": 0},
+    )
+
+    # full_max_depth=0 是显式上限（只留顶层），不能被当成“未设置”回落到 depth=8
+    assert [c["id"] for c in comments] == ["root"]
+    assert client.batches == []
+
+
+async def test_full_mode_skips_failed_batches() -> None:
+    listing = _listing(
+        [
+            _t1("a", depth=0, parent="t3_p"),
+            _more([f"m{i}" for i in range(150)], depth=0),
+        ]
+    )
+    client = _TreeClient(listing, fail_ids={"m0"})
+
+    comments = await client.fetch_post_comments("p", mode="full")
+
+    ids = {c["id"] for c in comments}
+    assert "m0" not in ids
+    assert {f"m{i}" for i in range(100, 150)}.issubset(ids)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+
+from app.services.infrastructure.stage_timing import (
+    StageTimer,
+    activate_stage_timer,
+    capture_profile,
+    note_stage_call,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_calls_are_attributed_to_the_active_stage() -> None:
+    clock = _Clock()
+    timer = StageTimer(clock=clock)
+
+    async def _reddit_request() -> None:
+        await asyncio.sleep(0)
+        note_stage_call("reddit")
+
+    note_stage_call("reddit")  # 未激活：no-op
+    with activate_stage_timer(timer):
+        timer.enter("collection")
+        # 子任务继承 context，调用计入创建它们时的 timer
+        await asyncio.gather(*(asyncio.create_task(_reddit_request()) for _ in range(3)))
+        clock.now = 2.0
+        timer.enter("rendering")
+        await asyncio.to_thread(note_stage_call, "llm")
+        clock.now = 2.5
+        timer.enter("collection")  # 同名阶段累加
+        note_stage_call("reddit")
+        clock.now = 3.0
+    timer.finish()
+    note_stage_call("reddit")
+
+    summary = timer.as_dict()
+    assert [stage["name"] for stage in summary["stages"]] == ["collection", "rendering"]
+    collection, rendering = summary["stages"]
+    assert collection["reddit_calls"] == 4
+    assert collection["wall_ms"] == 2500.0
+    assert rendering["llm_calls"] == 1
+    assert rendering["wall_ms"] == 500.0
+    assert summary["total_ms"] == 3000.0
+    assert summary["slowest_stage"] == "collection"
+    assert summary["reddit_calls"] == 4 and summary["llm_calls"] == 1
+
+
+def test_db_queries_and_rows_are_counted_per_stage() -> None:
+    engine = create_engine("sqlite://")
+    timer = StageTimer()
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER)"))  # 未激活，不计入
+        with activate_stage_timer(timer), timer.stage("load"):
+            conn.execute(text("INSERT INTO t VALUES (1), (2), (3)"))
+            conn.execute(text("SELECT id FROM t")).fetchall()
+
+    (load,) = timer.as_dict()["stages"]
+    assert load["db_queries"] == 2
+    assert load["db_rows"] == 3
+
+
+def test_capture_profile_writes_cprofile_summary(tmp_path: Path) -> None:
+    with capture_profile("analysis-t1", output_dir=str(tmp_path)) as info:
+        sum(i * i for i in range(10_000))
+
+    assert info["engine"] in {"cprofile", "pyinstrument"}
+    assert Path(info["path"]).exists()
+    if info["engine"] == "cprofile":
+        assert info["top_cumulative"]
+        assert {"function", "calls", "self_ms", "cumulative_ms"} <= set(info["top_cumulative"][0])
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+
+import pytest
+from aiohttp import web
+
+from app.services.llm.clients.async_openai_client import (
+    AsyncOpenAIChatClient,
+    close_llm_http_pools,
+)
+from app.services.llm.interfaces import LLMClientError
+from app.services.llm.response_cache import LLMResponseCache
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+def _completion(content: str) -> web.Response:
+    return web.json_response({"choices": [{"message": {"role": "assistant", "content": content}}]})
+
+
+@asynccontextmanager
+async def _mock_openai(handler: Handler) -> AsyncIterator[str]:
+    """本地 OpenAI 兼容服务（127.0.0.1 随机端口），返回 base_url。"""
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    try:
+        yield f"http://127.0.0.1:{port}/v1"
+    finally:
+        await close_llm_http_pools()
+        await runner.cleanup()
+
+
+def _client(base_url: str, **kwargs: Any) -> AsyncOpenAIChatClient:
+    kwargs.setdefault("max_retries", 3)
+    return AsyncOpenAIChatClient(
+        "gpt-test",
+        api_key="test-key",
+        base_url=base_url,
+        backoff_base_seconds=0.0,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_generate_posts_chat_completion_and_reuses_connection() -> None:
+    peers: set[Any] = set()
+    bodies: list[dict[str, Any]] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        assert request.headers["Authorization"] == "Bearer test-key"
+        peers.add(request.transport.get_extra_info("peername"))  # type: ignore[union-attr]
+        bodies.append(await request.json())
+        return _completion("ok")
+
+    async with _mock_openai(handler) as base_url:
+        client = _client(base_url)
+        results = [
+            await client.generate("hi", response_format={"type": "json_object"}, max_tokens=16)
+            for _ in range(3)
+        ]
+
+    assert results == ["ok", "ok", "ok"]
+    assert bodies[0]["model"] == "gpt-test"
+    assert bodies[0]["messages"] == [{"role": "user", "content": "hi"}]
+    assert bodies[0]["response_format"] == {"type": "json_object"}
+    # 串行请求走同一条 keep-alive 连接
+    assert len(peers) == 1
+
+
+@pytest.mark.asyncio
+async def test_generate_retries_rate_limit_then_succeeds() -> None:
+    calls = 0
+
+    async def handler(_request: web.Request) -> web.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            return web.json_response({"error": "slow down"}, status=429, headers={"Retry-After": "0"})
+        if calls == 2:
+            return web.json_response({"error": "overloaded"}, status=503)
+        return _completion("done")
+
+    async with _mock_openai(handler) as base_url:
+        assert await _client(base_url).generate("hi") == "done"
+
+    assert calls == 3
+
+
+@pytest.mark.asyncio
+async def test_generate_raises_after_exhausting_retries() -> None:
+    calls = 0
+
+    async def handler(_request: web.Request) -> web.Response:
+        nonlocal calls
+        calls += 1
+        return web.json_response({"error": "boom"}, status=500)
+
+    async with _mock_openai(handler) as base_url:
+        with pytest.raises(LLMClientError) as excinfo:
+            await _client(base_url, max_retries=2).generate("hi")
+
+    assert calls == 3
+    assert excinfo.value.status_code == 500
+
+
+@pytest.mark.asyncio
+async def test_generate_does_not_retry_client_errors() -> None:
+    calls = 0
+
+    async def handler(_request: web.Request) -> web.Response:
+        nonlocal calls
+        calls += 1
+        return web.json_response({"error": "bad key"}, status=401)
+
+    async with _mock_openai(handler) as base_url:
+        with pytest.raises(LLMClientError) as excinfo:
+            await _client(base_url).generate("hi")
+
+    assert calls == 1
+    assert excinfo.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_generate_requires_api_key() -> None:
+    client = AsyncOpenAIChatClient("gpt-test", api_key="", base_url="http://127.0.0.1:9/v1")
+
+    with pytest.raises(LLMClientError):
+        await client.generate("hi")
+
+
+@pytest.mark.asyncio
+async def test_summarize_many_runs_concurrently_and_keeps_order(tmp_path: Path) -> None:
+    in_flight = 0
+    peak = 0
+    calls = 0
+
+    async def handler(request: web.Request) -> web.Response:
+        nonlocal in_flight, peak, calls
+        calls += 1
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        body = await request.json()
+        text = json.dumps(body["messages"], ensure_ascii=False)
+        marker = next(token for token in ("alpha", "beta", "gamma", "delta") if token in text)
+        return _completion(f"sum-{marker}")
+
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", ttl_seconds=3600, max_bytes=1_000_000)
+    texts = ["alpha fees", "beta payouts", "gamma refunds", "delta chargebacks"]
+    async with _mock_openai(handler) as base_url:
+        client = _client(base_url, response_cache=cache)
+        first = await client.summarize_many(texts, max_chars=20, max_concurrency=2)
+        second = await client.summarize_many(texts, max_chars=20, max_concurrency=2)
+
+    assert first == ["sum-alpha", "sum-beta", "sum-gamma", "sum-delta"]
+    assert second == first
+    assert peak == 2
+    assert calls == 4
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from app.services.llm.interfaces import LLMClientError
+from app.services.llm.label_batch_support import (
+    LLMLabelRunStats,
+    TokenBudget,
+    label_pipeline_limits,
+    process_label_batches,
+)
+
+
+class _NestedSession:
+    def __init__(self, owner: "_RecordingSession") -> None:
+        self._owner = owner
+
+    async def __aenter__(self) -> "_NestedSession":
+        self._owner.savepoints += 1
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        return False
+
+
+class _RecordingSession:
+    def __init__(self) -> None:
+        self.savepoints = 0
+        self.commits = 0
+        self.rollbacks = 0
+
+    def begin_nested(self) -> _NestedSession:
+        return _NestedSession(self)
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+    async def rollback(self) -> None:
+        self.rollbacks += 1
+
+
+def _items(count: int) -> list[dict[str, Any]]:
+    return [{"id": idx, "title": f"post {idx}", "body": "fees are too high"} for idx in range(count)]
+
+
+def _batch_result(item: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": item["id"],
+        "analysis": {"sentiment": 0.1},
+        "score": SimpleNamespace(value_score=8.0),
+        "input_chars": 100,
+        "output_chars": 50,
+    }
+
+
+@pytest.mark.asyncio
+async def test_process_label_batches_keeps_at_most_max_in_flight_llm_calls() -> None:
+    session = _RecordingSession()
+    stats = LLMLabelRunStats(attempted=10)
+    in_flight = 0
+    peak = 0
+    persisted: list[int] = []
+
+    async def _batch_label(batch: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [_batch_result(item) for item in batch]
+
+    async def _persist_batch(result: dict[str, Any]) -> None:
+        persisted.append(int(result["id"]))
+
+    async def _unused_single(*_args: Any) -> Any:
+        raise AssertionError("single path should not run")
+
+    await process_label_batches(
+        session=session,
+        items=_items(10),
+        batch_size=2,
+        label_kind="test",
+        stats=stats,
+        batch_label=_batch_label,
+        single_label=_unused_single,
+        persist_batch=_persist_batch,
+        persist_single=_unused_single,
+        max_in_flight=3,
+    )
+
+    assert peak == 3
+    assert sorted(persisted) == list(range(10))
+    assert session.commits == 5
+    assert stats.to_result()["status"] == "completed"
+    assert stats.processed == 10
+
+
+@pytest.mark.asyncio
+async def test_process_label_batches_bulk_persists_one_savepoint_per_batch() -> None:
+    session = _RecordingSession()
+    stats = LLMLabelRunStats(attempted=5)
+    bulk_calls: list[list[int]] = []
+
+    async def _batch_label(batch: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+        return [_batch_result(item) for item in batch]
+
+    async def _persist_many(results: list[dict[str, Any]]) -> int:
+        bulk_calls.append([int(result["id"]) for result in results])
+        return len(results)
+
+    async def _unused(*_args: Any) -> Any:
+        raise AssertionError("row-by-row path should not run")
+
+    await process_label_batches(
+        session=session,
+        items=_items(5),
+        batch_size=2,
+        label_kind="test",
+        stats=stats,
+        batch_label=_batch_label,
+        single_label=_unused,
+        persist_batch=_unused,
+        persist_single=_unused,
+        persist_many=_persist_many,
+        max_in_flight=2,
+    )
+
+    assert sorted(bulk_calls) == [[0, 1], [2, 3], [4]]
+    assert session.savepoints == 3
+    assert session.commits == 3
+    assert stats.processed == 5
+
+
+@pytest.mark.asyncio
+async def test_process_label_batches_retries_failed_bulk_row_by_row() -> None:
+    session = _RecordingSession()
+    stats = LLMLabelRunStats(attempted=3)
+    persisted: list[int] = []
+
+    async def _batch_label(batch: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+        return [_batch_result(item) for item in batch]
+
+    async def _persist_many(results: list[dict[str, Any]]) -> int:
+        raise RuntimeError("bulk upsert rejected")
+
+    async def _persist_batch(result: dict[str, Any]) -> None:
+        if result["id"] == 1:
+            raise RuntimeError("bad row")
+        persisted.append(int(result["id"]))
+
+    async def _unused(*_args: Any) -> Any:
+        raise AssertionError("single path should not run")
+
+    await process_label_batches(
+        session=session,
+        items=_items(3),
+        batch_size=3,
+        label_kind="test",
+        stats=stats,
+        batch_label=_batch_label,
+        single_label=_unused,
+        persist_batch=_persist_batch,
+        persist_single=_unused,
+        persist_many=_persist_many,
+        max_in_flight=2,
+    )
+
+    assert persisted == [0, 2]
+    assert stats.processed == 2
+    assert stats.persist_failures == 1
+    assert stats.degraded_reasons == ["persist_failed"]
+
+
+@pytest.mark.asyncio
+async def test_process_label_batches_single_fallback_goes_through_bulk_persist() -> None:
+    session = _RecordingSession()
+    stats = LLMLabelRunStats(attempted=2)
+    bulk_calls: list[list[dict[str, Any]]] = []
+
+    async def _batch_label(batch: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+        raise LLMClientError("gemini", "upstream 503")
+
+    async def _single_label(item: dict[str, Any]) -> tuple[dict[str, Any], Any, int, int]:
+        if item["id"] == 1:
+            raise LLMClientError("gemini", "still failing")
+        return ({"sentiment": 0.2}, SimpleNamespace(value_score=7.0), 80, 40)
+
+    async def _persist_many(results: list[dict[str, Any]]) -> int:
+        bulk_calls.append(results)
+        return len(results)
+
+    async def _unused(*_args: Any) -> Any:
+        raise AssertionError("row-by-row path should not run")
+
+    await process_label_batches(
+        session=session,
+        items=_items(2),
+        batch_size=2,
+        label_kind="test",
+        stats=stats,
+        batch_label=_batch_label,
+        single_label=_single_label,
+        persist_batch=_unused,
+        persist_single=_unused,
+        persist_many=_persist_many,
+        max_in_flight=4,
+    )
+
+    assert len(bulk_calls) == 1
+    assert [row["id"] for row in bulk_calls[0]] == [0]
+    assert bulk_calls[0][0]["input_chars"] == 80
+    assert stats.processed == 1
+    assert stats.fallback_batches == 1
+    assert stats.llm_failures == 3
+    assert stats.degraded_reasons == ["batch_llm_request_failed", "single_llm_request_failed"]
+
+
+@pytest.mark.asyncio
+async def test_token_budget_waits_for_refill() -> None:
+    now = 0.0
+    sleeps: list[float] = []
+
+    async def _fake_sleep(seconds: float) -> None:
+        nonlocal now
+        sleeps.append(seconds)
+        now += seconds
+
+    budget = TokenBudget(600, clock=lambda: now, sleep=_fake_sleep)
+
+    await budget.acquire(600)
+    assert sleeps == []
+    await budget.acquire(100)
+    assert sleeps == [pytest.approx(10.0)]
+    # 超过一分钟额度的请求按桶容量计，不会永远等待
+    await budget.acquire(10_000)
+    assert sum(sleeps) == pytest.approx(70.0)
+
+
+def test_label_pipeline_limits_reads_settings() -> None:
+    max_in_flight, budget = label_pipeline_limits(
+        SimpleNamespace(llm_label_concurrency=6, llm_label_tokens_per_minute=0)
+    )
+    assert max_in_flight == 6
+    assert budget is None
+
+    max_in_flight, budget = label_pipeline_limits(
+        SimpleNamespace(llm_label_concurrency=0, llm_label_tokens_per_minute=120_000)
+    )
+    assert max_in_flight == 1
+    assert isinstance(budget, TokenBudget)
+
+    assert label_pipeline_limits(SimpleNamespace()) == (1, None)
@@ -7,7 +7,9 @@ import pytest
 
 from app.services.llm.label_result_persistence import (
     LabelResultPersistenceDeps,
+    persist_incremental_comment_analyses,
     persist_incremental_comment_analysis,
+    persist_incremental_post_analyses,
     persist_incremental_post_analysis,
 )
 
@@ -102,3 +104,116 @@ async def test_persist_incremental_comment_analysis_upserts_row_and_syncs_terms(
         llm_version="llm-v1",
         prompt_version="v-test",
     )
+
+
+@pytest.mark.asyncio
+async def test_persist_incremental_post_analyses_upserts_batch_once_and_merges_terms() -> None:
+    upsert_post_rows = AsyncMock(return_value=2)
+    sync_terms = AsyncMock(return_value={"pain_point": 1, "feature": 1, "brand": 2})
+    session = AsyncMock()
+    labeler = SimpleNamespace(model_name="gemini-test", prompt_version="v-test")
+
+    written = await persist_incremental_post_analyses(
+        session=session,
+        row_by_id={101: {"text_norm_hash": "hash-101"}, 102: {"text_norm_hash": "hash-102"}},
+        labeler=labeler,
+        prompt_version="llm-v1",
+        results=[
+            {
+                "id": 101,
+                "analysis": {"pain_tags": ["high fees"], "entities": {"known": ["shopify"], "new": []}},
+                "score": SimpleNamespace(value_score=8.5, opportunity_score=6.0, business_pool="core"),
+                "input_chars": 120,
+                "output_chars": 60,
+            },
+            {
+                "id": 102,
+                "analysis": {"aspect_tags": ["checkout"], "entities": {"known": [], "new": ["paddle"]}},
+                "score": {"value_score": 6.0, "opportunity_score": 4.0, "business_pool": "lab"},
+                "input_chars": 90,
+                "output_chars": 40,
+            },
+        ],
+        deps=LabelResultPersistenceDeps(
+            upsert_post_label_rows=upsert_post_rows,
+            upsert_comment_label_rows=AsyncMock(),
+            sync_llm_terms=sync_terms,
+        ),
+    )
+
+    assert written == 2
+    upsert_post_rows.assert_awaited_once()
+    rows = upsert_post_rows.await_args.kwargs["rows"]
+    assert [row["post_id"] for row in rows] == [101, 102]
+    assert [row["text_norm_hash"] for row in rows] == ["hash-101", "hash-102"]
+    assert [row["business_pool"] for row in rows] == ["core", "lab"]
+    sync_terms.assert_awaited_once_with(
+        session,
+        analysis={
+            "pain_tags": ["high fees"],
+            "aspect_tags": ["checkout"],
+            "entities": {"known": ["shopify", "paddle"], "new": []},
+        },
+        llm_version="llm-v1",
+        prompt_version="v-test",
+    )
+
+
+@pytest.mark.asyncio
+async def test_persist_incremental_post_analyses_requires_existing_rows() -> None:
+    upsert_post_rows = AsyncMock(return_value=0)
+    with pytest.raises(KeyError, match="post row not found"):
+        await persist_incremental_post_analyses(
+            session=AsyncMock(),
+            row_by_id={},
+            labeler=SimpleNamespace(model_name="gemini-test", prompt_version="v-test"),
+            prompt_version="llm-v1",
+            results=[
+                {
+                    "id": 101,
+                    "analysis": {},
+                    "score": {"value_score": 8.5, "opportunity_score": 6.0, "business_pool": "core"},
+                    "input_chars": 1,
+                    "output_chars": 1,
+                }
+            ],
+            deps=LabelResultPersistenceDeps(
+                upsert_post_label_rows=upsert_post_rows,
+                upsert_comment_label_rows=AsyncMock(),
+                sync_llm_terms=AsyncMock(),
+            ),
+        )
+    upsert_post_rows.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_persist_incremental_comment_analyses_upserts_batch_once() -> None:
+    upsert_comment_rows = AsyncMock(return_value=2)
+    sync_terms = AsyncMock()
+    session = AsyncMock()
+
+    written = await persist_incremental_comment_analyses(
+        session=session,
+        labeler=SimpleNamespace(model_name="gemini-test", prompt_version="v-test"),
+        prompt_version="llm-v1",
+        results=[
+            {
+                "id": comment_id,
+                "analysis": {"aspect_tags": ["pricing"]},
+                "score": {"value_score": 7.5, "opportunity_score": 5.0, "business_pool": "lab"},
+                "input_chars": 90,
+                "output_chars": 30,
+            }
+            for comment_id in (201, 202)
+        ],
+        deps=LabelResultPersistenceDeps(
+            upsert_post_label_rows=AsyncMock(),
+            upsert_comment_label_rows=upsert_comment_rows,
+            sync_llm_terms=sync_terms,
+        ),
+    )
+
+    assert written == 2
+    upsert_comment_rows.assert_awaited_once()
+    assert [row["comment_id"] for row in upsert_comment_rows.await_args.kwargs["rows"]] == [201, 202]
+    sync_terms.assert_awaited_once()
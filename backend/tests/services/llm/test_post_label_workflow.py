@@ -183,3 +183,55 @@ async def test_run_incremental_post_label_workflow_marks_failed_when_llm_request
     assert result["fallback_batches"] == 1
     assert "batch_llm_request_failed" in result["degraded_reasons"]
     assert "single_llm_request_failed" in result["degraded_reasons"]
+
+
+@pytest.mark.asyncio
+async def test_run_incremental_post_label_workflow_reports_cache_hits() -> None:
+    session = _FakeSession()
+
+    class _CachedLabeler:
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            self.model_name = str(kwargs.get("model") or "gemini-test")
+            self.prompt_version = str(kwargs.get("prompt_version") or "v-test")
+            self.cache_hits = 0
+
+        async def label_posts_batch(self, *, items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+            # 模拟整批命中响应缓存：不发起 LLM 请求
+            self.cache_hits += len(items)
+            return [
+                {
+                    "id": item["id"],
+                    "analysis": {"sentiment": 0.1},
+                    "score": _FakeScore(),
+                    "input_chars": 120,
+                    "output_chars": 60,
+                }
+                for item in items
+            ]
+
+        async def label_post(self, **_kwargs: Any) -> tuple[dict[str, Any], _FakeScore, int, int]:
+            raise AssertionError("single fallback should not run")
+
+    async def _fetch_post_candidates(**_kwargs: Any) -> list[dict[str, Any]]:
+        return [_candidate_row()]
+
+    async def _fetch_top_comments(*_args: Any, **_kwargs: Any) -> list[str]:
+        return []
+
+    async def _persist_post_analysis(**_kwargs: Any) -> None:
+        return None
+
+    result = await run_incremental_post_label_workflow(
+        workflow_input=_workflow_input(),
+        deps=IncrementalPostLabelWorkflowDeps(
+            session_factory=lambda: _FakeSessionContext(session),
+            labeler_factory=_CachedLabeler,
+            fetch_post_candidates=_fetch_post_candidates,
+            fetch_top_comments=_fetch_top_comments,
+            persist_post_analysis=_persist_post_analysis,
+        ),
+    )
+
+    assert result["status"] == "completed"
+    assert result["processed"] == 1
+    assert result["cache_hits"] == 1
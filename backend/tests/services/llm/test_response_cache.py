@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from app.services.llm.clients.openai_client import OpenAIChatClient
+from app.services.llm.labeling import LLMLabeler
+from app.services.llm.response_cache import LLMResponseCache, build_response_cache_key
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _post_payload(item_id: int, pain: str) -> dict[str, Any]:
+    return {
+        "id": item_id,
+        "content_type": "discussion",
+        "main_intent": "complain",
+        "sentiment": -0.3,
+        "pain_tags": [pain],
+        "aspect_tags": ["pricing"],
+        "entities": {"known": ["paypal"], "new": []},
+        "crossborder_signals": {"mentions_shipping": False, "mentions_tax": False},
+        "purchase_intent_score": 0.6,
+    }
+
+
+def _labeler(cache: LLMResponseCache | None, *, prompt_version: str = "v1") -> LLMLabeler:
+    return LLMLabeler(
+        model="gemini-test",
+        prompt_version=prompt_version,
+        max_body_chars=200,
+        max_comment_chars=80,
+        api_key="test",
+        response_cache=cache,
+    )
+
+
+def _post_item(item_id: int, body: str) -> dict[str, Any]:
+    return {"id": item_id, "title": "Fees", "body": body, "subreddit": "r/ecommerce", "comments": []}
+
+
+def test_response_cache_roundtrip_and_ttl(tmp_path: Path) -> None:
+    clock = _Clock()
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", ttl_seconds=60, max_bytes=1_000_000, clock=clock)
+
+    cache.set("a", {"analysis": {"sentiment": 0.1}})
+    assert cache.get("a") == {"analysis": {"sentiment": 0.1}}
+    assert cache.get_many(["a", "missing"]) == {"a": {"analysis": {"sentiment": 0.1}}}
+
+    clock.now += 61
+    assert cache.get("a") is None
+    metrics = cache.metrics()
+    assert metrics["hits"] == 2
+    assert metrics["misses"] == 2
+    assert metrics["expirations"] == 1
+    assert metrics["entries"] == 0
+
+
+def test_response_cache_is_shared_across_instances(tmp_path: Path) -> None:
+    path = tmp_path / "llm.sqlite3"
+    LLMResponseCache(path, ttl_seconds=60, max_bytes=1_000_000).set("k", "hello")
+
+    assert LLMResponseCache(path, ttl_seconds=60, max_bytes=1_000_000).get("k") == "hello"
+
+
+def test_response_cache_evicts_least_recently_used_over_budget(tmp_path: Path) -> None:
+    clock = _Clock()
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", ttl_seconds=3600, max_bytes=300, clock=clock)
+    for key in ("a", "b", "c"):
+        cache.set(key, "x" * 80)
+        clock.now += 1
+    cache.get("a")
+    clock.now += 1
+
+    cache.set("d", "x" * 80)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("d") is not None
+    assert cache.stats.evictions >= 1
+    assert cache.metrics()["bytes"] <= 300
+
+
+def test_build_response_cache_key_changes_with_model_and_template() -> None:
+    base = build_response_cache_key(kind="post_label", model="m1", template_version="v1", payload={"body": "x"})
+
+    assert base == build_response_cache_key(
+        kind="post_label", model="m1", template_version="v1", payload={"body": "x"}
+    )
+    assert base != build_response_cache_key(kind="post_label", model="m2", template_version="v1", payload={"body": "x"})
+    assert base != build_response_cache_key(kind="post_label", model="m1", template_version="v2", payload={"body": "x"})
+
+
+@pytest.mark.asyncio
+async def test_llm_labeler_batch_only_sends_uncached_items(tmp_path: Path) -> None:
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", ttl_seconds=3600, max_bytes=1_000_000)
+    requested_ids: list[list[int]] = []
+
+    async def fake_generate(prompt: list[dict[str, str]], **_kwargs: Any) -> str:
+        ids = [int(item_id) for item_id in _ids_in_prompt(prompt)]
+        requested_ids.append(ids)
+        return json.dumps([_post_payload(item_id, f"pain-{item_id}") for item_id in ids])
+
+    first = _labeler(cache)
+    first._client.generate = fake_generate  # type: ignore[attr-defined]
+    results = await first.label_posts_batch(items=[_post_item(1, "Fees are high"), _post_item(2, "Slow payouts")])
+    assert sorted(result["id"] for result in results) == [1, 2]
+    assert first.cache_hits == 0
+
+    # 重爬后正文只有空白 / 大小写差异的条目命中缓存，只有新内容送 LLM
+    second = _labeler(cache)
+    second._client.generate = fake_generate  # type: ignore[attr-defined]
+    results = await second.label_posts_batch(
+        items=[_post_item(11, "  fees are   HIGH "), _post_item(3, "Chargebacks everywhere")]
+    )
+
+    assert requested_ids[-1] == [3]
+    assert second.cache_hits == 1
+    by_id = {result["id"]: result for result in results}
+    assert by_id[11]["analysis"]["pain_tags"] == ["pain-1"]
+    assert by_id[11]["score"].business_pool
+    assert by_id[3]["analysis"]["pain_tags"] == ["pain-3"]
+
+
+@pytest.mark.asyncio
+async def test_llm_labeler_counts_batch_hits_once_when_falling_back(tmp_path: Path) -> None:
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", ttl_seconds=3600, max_bytes=1_000_000)
+
+    async def fake_generate(prompt: list[dict[str, str]], **_kwargs: Any) -> str:
+        return json.dumps([_post_payload(int(item_id), "pain") for item_id in _ids_in_prompt(prompt)])
+
+    warm = _labeler(cache)
+    warm._client.generate = fake_generate  # type: ignore[attr-defined]
+    await warm.label_posts_batch(items=[_post_item(1, "Fees are high")])
+
+    async def empty_generate(_prompt: list[dict[str, str]], **_kwargs: Any) -> str:
+        return "[]"
+
+    labeler = _labeler(cache)
+    labeler._client.generate = empty_generate  # type: ignore[attr-defined]
+    results = await labeler.label_posts_batch(
+        items=[_post_item(1, "Fees are high"), _post_item(2, "Chargebacks everywhere")]
+    )
+
+    # 整批无结果 → 上层逐条兜底，命中只在真正返回命中结果的路径上计数
+    assert results == []
+    assert labeler.cache_hits == 0
+
+
+@pytest.mark.asyncio
+async def test_llm_labeler_single_label_hits_cache_and_respects_prompt_version(tmp_path: Path) -> None:
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", ttl_seconds=3600, max_bytes=1_000_000)
+    calls = 0
+
+    async def fake_generate(*_args: Any, **_kwargs: Any) -> str:
+        nonlocal calls
+        calls += 1
+        payload = _post_payload(0, "fee")
+        payload.pop("id")
+        return json.dumps(payload)
+
+    kwargs = {"title": "Fees", "body": "Fees are high", "subreddit": "ecommerce", "comments": ["ouch"]}
+    labeler = _labeler(cache)
+    labeler._client.generate = fake_generate  # type: ignore[attr-defined]
+    first = await labeler.label_post(**kwargs)
+    second = await labeler.label_post(**kwargs)
+
+    assert calls == 1
+    assert labeler.cache_hits == 1
+    assert second[0] == first[0]
+    assert second[2:] == first[2:]
+
+    bumped = _labeler(cache, prompt_version="v2")
+    bumped._client.generate = fake_generate  # type: ignore[attr-defined]
+    await bumped.label_post(**kwargs)
+    assert calls == 2
+    assert bumped.cache_hits == 0
+
+
+def test_openai_client_summarize_reuses_cached_completion(tmp_path: Path) -> None:
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", ttl_seconds=3600, max_bytes=1_000_000)
+    client = OpenAIChatClient("gpt-test", api_key="", response_cache=cache)
+    calls: list[Any] = []
+
+    def fake_completion(messages: list[dict[str, str]], **_kwargs: Any) -> str:
+        calls.append(messages)
+        return "费用过高"
+
+    client._chat_completion = fake_completion  # type: ignore[method-assign]
+
+    assert client.summarize(["Fees are too high", "Fees  are too high"], max_chars=20) == ["费用过高", "费用过高"]
+    assert len(calls) == 1
+    assert client.normalize("paypal", candidates=["PayPal"]) is None
+    assert len(calls) == 2
+
+
+def _ids_in_prompt(prompt: list[dict[str, str]]) -> list[int]:
+    items = json.loads(prompt[-1]["content"].split("Items:\n", 1)[1])
+    return [int(item["id"]) for item in items]
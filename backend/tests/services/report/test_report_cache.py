@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import fakeredis.aioredis
+import pytest
+
+from app.schemas.report_payload import ReportPayload
+from app.services.report.report_cache import (
+    ENTRY_OVERHEAD_BYTES,
+    SerializedReport,
+    TwoTierReportCache,
+    build_report_cache_key,
+)
+
+
+def _payload(task_id: str | None = None, *, html: str = "<html></html>") -> ReportPayload:
+    return ReportPayload.model_validate(
+        {
+            "task_id": task_id or str(uuid4()),
+            "status": "completed",
+            "report": {
+                "executive_summary": {"total_communities": 1, "key_insights": 0, "top_opportunity": ""},
+                "pain_points": [],
+                "competitors": [],
+                "opportunities": [],
+                "action_items": [],
+                "entity_summary": {"brands": [], "features": [], "pain_points": []},
+            },
+            "report_html": html,
+            "metadata": {
+                "analysis_version": "1.0",
+                "confidence_score": 0.9,
+                "processing_time_seconds": 1.0,
+                "cache_hit_rate": 0.5,
+                "total_mentions": 3,
+            },
+            "overview": {"sentiment": {"positive": 0, "negative": 0, "neutral": 0}, "top_communities": []},
+            "stats": {"total_mentions": 3, "positive_mentions": 3, "negative_mentions": 0, "neutral_mentions": 0},
+            "generated_at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+            "data_source": "real",
+        }
+    )
+
+
+def _key(task_id: str, generated_at: datetime | None = None) -> str:
+    analysis = SimpleNamespace(
+        analysis_version=1,
+        report=SimpleNamespace(generated_at=generated_at or datetime(2026, 1, 1, tzinfo=timezone.utc)),
+    )
+    return build_report_cache_key(task_id, analysis)
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_serves_shared_bytes_and_fresh_payload_objects() -> None:
+    cache = TwoTierReportCache(3600, max_bytes=1 << 20)
+    payload = _payload()
+    key = _key(payload.task_id)
+    await cache.set(key, payload)
+
+    first = await cache.get_serialized(key)
+    second = await cache.get_serialized(key)
+    assert first is second  # 命中直接复用序列化字节，无深拷贝
+    assert ReportPayload.model_validate_json(first.body) == payload
+
+    parsed = await cache.get(key)
+    parsed.report_html = "<html>mutated</html>"
+    assert (await cache.get(key)).report_html == "<html></html>"
+    assert cache.metrics()["memory_hits"] == 4
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_least_recently_used_when_over_byte_budget() -> None:
+    entry_size = len(SerializedReport.from_payload(_payload()).body) + ENTRY_OVERHEAD_BYTES
+    cache = TwoTierReportCache(3600, max_bytes=entry_size * 2 + 10)
+    keys = [_key(str(uuid4())) for _ in range(3)]
+    await cache.set(keys[0], _payload())
+    await cache.set(keys[1], _payload())
+    await cache.get_serialized(keys[0])  # keys[0] 变成最近使用
+    await cache.set(keys[2], _payload())
+
+    assert await cache.get_serialized(keys[1]) is None
+    assert await cache.get_serialized(keys[0]) is not None
+    metrics = cache.metrics()
+    assert metrics["evictions"] == 1
+    assert metrics["entries"] == 2
+    assert metrics["bytes"] <= metrics["max_bytes"]
+
+    await cache.set(_key(str(uuid4())), _payload(html="x" * entry_size * 3))
+    assert cache.metrics()["oversized"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_is_shared_between_workers_and_invalidated_per_task() -> None:
+    server = fakeredis.FakeServer()
+    worker_a = TwoTierReportCache(3600, redis_client=fakeredis.aioredis.FakeRedis(server=server))
+    worker_b = TwoTierReportCache(3600, redis_client=fakeredis.aioredis.FakeRedis(server=server))
+    task_id = str(uuid4())
+    old_key = _key(task_id)
+    payload = _payload(task_id)
+
+    await worker_a.set(old_key, payload)
+    shared = await worker_b.get_serialized(old_key)
+    assert shared is not None and shared.generated_at == payload.generated_at
+    assert shared.data_source == "real"
+    assert worker_b.metrics()["redis_hits"] == 1
+
+    # 重新分析：新 generated_at → 新键；旧版本整体失效
+    new_key = _key(task_id, datetime(2026, 2, 1, tzinfo=timezone.utc))
+    assert new_key != old_key
+    assert await worker_a.invalidate_task(task_id) >= 1
+    worker_c = TwoTierReportCache(3600, redis_client=fakeredis.aioredis.FakeRedis(server=server))
+    assert await worker_c.get_serialized(old_key) is None
+    assert await worker_a.get_serialized(old_key) is None
+
+
+class _BrokenRedis:
+    async def get(self, name: str) -> bytes | None:
+        raise ConnectionError("redis down")
+
+    async def set(self, name: str, value: bytes, ex: int | None = None) -> None:
+        raise ConnectionError("redis down")
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_degrades_to_memory_tier() -> None:
+    cache = TwoTierReportCache(3600, redis_client=_BrokenRedis())  # type: ignore[arg-type]
+    payload = _payload()
+    key = _key(payload.task_id)
+
+    assert await cache.get_serialized(key) is None
+    await cache.set(key, payload)
+    assert await cache.get_serialized(key) is not None
+    assert cache.metrics()["redis_errors"] == 1  # 出错后暂停访问，不会每次请求都撞一次
@@ -8,6 +8,7 @@ import pytest
 
 from app.models.task import TaskStatus
 from app.models.user import MembershipLevel
+from app.services.report.report_cache import build_report_cache_key
 from app.services.report.report_context_loader import (
     ReportContextLoaderDeps,
     load_report_request_context,
@@ -73,7 +74,9 @@ async def test_load_report_request_context_returns_task_analysis_and_cache_key()
 
     assert context.task is task
     assert context.analysis is task.analysis
-    assert context.cache_key == f"report:{task_id}:{user_id}"
+    # 缓存键按任务 + 分析版本，不再带 user_id（鉴权在命中缓存之前完成）
+    assert context.cache_key == build_report_cache_key(task_id, task.analysis)
+    assert context.cache_key.startswith(f"report:{task_id}:")
 
 
 @pytest.mark.asyncio
@@ -769,3 +769,30 @@ async def test_report_html_falls_back_to_controlled_when_missing(monkeypatch: py
     payload = await service.get_report(task.id, task.user_id)
     assert payload.report_html
     assert "CONTROLLED" in payload.report_html
+
+
+@pytest.mark.asyncio
+async def test_report_service_serialized_path_reuses_cached_bytes() -> None:
+    task = _build_fake_task()
+    repo = FakeRepository(task)
+    cache = InMemoryReportCache(ttl_seconds=3600)
+    config = ReportServiceConfig(
+        community_members={"r/startups": 1200000},
+        cache_ttl_seconds=3600,
+        target_analysis_version="1.0",
+    )
+    service = InstrumentedReportService(
+        db=None,  # type: ignore[arg-type]
+        repository=repo,
+        cache=cache,
+        config=config,
+    )
+
+    first = await service.get_report_serialized(task.id, task.user_id)
+    second = await service.get_report_serialized(task.id, task.user_id)
+    assert service.validation_calls == 1
+    assert second is first
+    assert repo.call_count == 2, "auth checks still run on cache hits"
+
+    payload = await service.get_report(task.id, task.user_id)
+    assert payload.model_dump_json().encode("utf-8") == first.body
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import numpy as np
+import pytest
+
+from app.services.analysis import deduplicator as deduplicator_module
 from app.services.analysis.deduplicator import (
     DeduplicationStats,
     deduplicate_posts,
@@ -46,3 +50,62 @@ def test_deduplication_stats_limits_fallback_on_large_sets() -> None:
     deduplicate_posts(small_unique)
     stats_small = get_last_stats()
     assert stats_small.fallback_pairs > 0
+
+
+def test_large_batch_uses_band_candidates_and_exact_jaccard() -> None:
+    posts = [
+        _make_post(i, f"Unique content snippet {i} alpha{i} beta{i * 7} gamma{i * 13}")
+        for i in range(200)
+    ]
+    # 转帖：与 post-5 只差一个词
+    posts.append({**posts[5], "id": "post-repost", "summary": f"{posts[5]['summary']} thanks"})
+
+    result = deduplicate_posts(posts)
+    stats = get_last_stats()
+
+    assert len(result) == 200
+    kept = next(post for post in result if post["id"] in {"post-5", "post-repost"})
+    assert kept["duplicate_ids"] == ["post-repost"] or kept["duplicate_ids"] == ["post-5"]
+    assert stats.fallback_pairs == 0
+    assert stats.candidate_pairs < 200
+    assert stats.sequence_checks == 0
+
+
+def test_sequence_tiebreak_is_opt_in_for_large_batches() -> None:
+    near = [
+        _make_post(1, "Looking for automation workflows to speed reports."),
+        _make_post(2, "Looking for automation workflow to speed report."),
+    ]
+
+    deduplicate_posts(near, sequence_tiebreak=False)
+    assert get_last_stats().sequence_checks == 0
+
+    merged = deduplicate_posts(near, sequence_tiebreak=True)
+    assert get_last_stats().sequence_checks > 0
+    assert len(merged) == 1
+
+
+def test_oversized_bucket_survives_rejected_star_and_chain_edges(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # 所有帖子签名相同 → 落进同一个超大桶；两类模板交错排列，星形与相邻链上的
+    # A-B 边全部被拒，B 类只能靠窗口内的 B-B 边连起来
+    n_posts = 2 * deduplicator_module._MAX_BUCKET_ALL_PAIRS + 2
+    monkeypatch.setattr(
+        deduplicator_module,
+        "_minhash_signatures",
+        lambda flat_ids, offsets, *, num_perm: np.zeros(
+            (len(offsets), num_perm), dtype=np.uint32
+        ),
+    )
+    family_a = "weekly automation report template for leadership updates".split()
+    family_b = "selling vintage keyboards cheap local pickup only".split()
+    token_sets = [family_a if idx % 2 == 0 else family_b for idx in range(n_posts)]
+    texts = [" ".join(tokens) for tokens in token_sets]
+
+    clusters = deduplicator_module._cluster_posts(
+        token_sets, texts, threshold=0.85, num_perm=128
+    )
+
+    assert sorted(len(cluster) for cluster in clusters) == [n_posts // 2, n_posts // 2]
+    assert get_last_stats().candidate_pairs < n_posts * (n_posts - 1) // 2
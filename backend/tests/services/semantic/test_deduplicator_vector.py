@@ -1,3 +1,5 @@
+import numpy as np
+
 from app.services.analysis.deduplicator import deduplicate_posts_by_embeddings
 
 
@@ -39,3 +41,60 @@ def test_deduplicate_posts_by_embeddings_keeps_missing_vectors() -> None:
     deduped = deduplicate_posts_by_embeddings(posts, embeddings, threshold=0.95)
 
     assert len(deduped) == 2
+
+
+def test_deduplicate_posts_by_embeddings_missing_vector_does_not_shift_matches() -> None:
+    posts = [
+        {"id": "no-vec", "score": 100},
+        {"id": "a", "score": 50},
+        {"id": "b", "score": 40},
+        {"id": "a-dup", "score": 1},
+    ]
+    embeddings = {"a": [1.0, 0.0], "b": [0.0, 1.0], "a-dup": [0.98, 0.05]}
+
+    deduped = deduplicate_posts_by_embeddings(posts, embeddings, threshold=0.95)
+
+    assert [post["id"] for post in deduped] == ["no-vec", "a", "b"]
+    assert deduped[1]["duplicate_ids"] == ["a-dup"]
+    assert deduped[1]["evidence_post_ids"] == ["a", "a-dup"]
+    assert "duplicate_ids" not in deduped[0]
+
+
+def test_deduplicate_posts_by_embeddings_merges_into_first_kept_match() -> None:
+    posts = [
+        {"id": "x", "score": 30, "duplicate_ids": ["minhash-dup"]},
+        {"id": "y", "score": 20},
+        {"id": "z", "score": 10},
+    ]
+    # z 同时接近 x 与 y（x/y 彼此低于阈值），应并入先保留的 x
+    embeddings = {"x": [1.0, 0.0], "y": [0.6, 0.8], "z": [0.9, 0.44]}
+
+    deduped = deduplicate_posts_by_embeddings(posts, embeddings, threshold=0.85)
+
+    assert [post["id"] for post in deduped] == ["x", "y"]
+    assert deduped[0]["duplicate_ids"] == ["minhash-dup", "z"]
+    assert deduped[0]["evidence_count"] == 2
+
+
+def test_deduplicate_posts_by_embeddings_approximate_matches_exact() -> None:
+    rng = np.random.default_rng(3)
+    centers = rng.standard_normal((40, 64))
+    vectors = np.repeat(centers, 5, axis=0) + rng.standard_normal((200, 64)) * 0.05
+    posts = [{"id": f"p{i}", "score": int(rng.integers(0, 100))} for i in range(200)]
+    embeddings = {f"p{i}": vectors[i].tolist() for i in range(200)}
+
+    exact = deduplicate_posts_by_embeddings(posts, embeddings, approximate=False)
+    approx = deduplicate_posts_by_embeddings(posts, embeddings, approximate=True)
+
+    assert len(exact) == 40
+    assert [post["id"] for post in approx] == [post["id"] for post in exact]
+    assert [post["duplicate_ids"] for post in approx] == [post["duplicate_ids"] for post in exact]
+
+
+def test_deduplicate_posts_by_embeddings_ignores_dimension_mismatch() -> None:
+    posts = [{"id": "a", "score": 2}, {"id": "b", "score": 1}]
+    embeddings = {"a": [1.0, 0.0], "b": [1.0, 0.0, 0.0]}
+
+    deduped = deduplicate_posts_by_embeddings(posts, embeddings, threshold=0.9)
+
+    assert len(deduped) == 2
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from app.services.semantic import embedding_service as embedding_module
+from app.services.semantic.embedding_service import (
+    EmbeddingService,
+    QueryEmbeddingCache,
+    plan_length_buckets,
+)
+
+
+class _Vectors:
+    def __init__(self, rows: Any) -> None:
+        self._rows = rows
+
+    def tolist(self) -> Any:
+        return self._rows
+
+
+class _FakeModel:
+    """向量 = [文本长度, 1.0]，记录每次 encode 的批次。"""
+
+    def __init__(self, model_name: str) -> None:
+        self.model_name = model_name
+        self.max_seq_length = 512
+        self.batches: list[list[str]] = []
+
+    def encode(self, texts: Any, *, batch_size: int, **_kwargs: Any) -> _Vectors:
+        if isinstance(texts, str):
+            self.batches.append([texts])
+            return _Vectors([float(len(texts)), 1.0])
+        self.batches.append(list(texts))
+        return _Vectors([[float(len(text)), 1.0] for text in texts])
+
+
+@pytest.fixture
+def service(monkeypatch) -> EmbeddingService:
+    monkeypatch.setattr(embedding_module, "_sentence_transformer_factory", _FakeModel)
+    monkeypatch.setattr(EmbeddingService, "_instances", {})
+    return EmbeddingService("test/tiny-model")
+
+
+def test_encode_many_buckets_by_length_and_restores_order(service: EmbeddingService) -> None:
+    texts = ["x" * 400, "short", "y" * 40, "tiny", "z" * 1200, "mid " * 30]
+
+    vectors = service.encode_many(texts, max_tokens_per_batch=300, max_batch_size=3)
+
+    assert [vector[0] for vector in vectors] == [float(len(text)) for text in texts]
+    model = service._model
+    assert isinstance(model, _FakeModel)
+    # 最长的 1200 字符（~302 token）独占一批；其余按长度降序、padding 后不超过 300 token
+    assert model.batches[0] == ["z" * 1200]
+    assert all(len(batch) <= 3 for batch in model.batches)
+    assert sorted(text for batch in model.batches for text in batch) == sorted(texts)
+
+
+def test_plan_length_buckets_caps_padded_tokens() -> None:
+    lengths = [10, 200, 12, 190, 11, 9]
+
+    batches = plan_length_buckets(lengths, max_tokens_per_batch=400, max_batch_size=8)
+
+    assert batches == [[1, 3], [2, 4, 0, 5]]
+    for batch in batches:
+        assert len(batch) * max(lengths[index] for index in batch) <= 400
+
+
+def test_encode_query_hits_memory_then_disk_cache(service: EmbeddingService, tmp_path) -> None:
+    service.configure_query_cache(QueryEmbeddingCache(max_entries=1, cache_dir=tmp_path))
+
+    first = service.encode_query("robot vacuum")
+    second = service.encode_query("robot vacuum")
+    service.encode_query("pet hair")  # 挤出 LRU 中的 robot vacuum
+    third = service.encode_query("robot vacuum")
+
+    assert first == second == third == [12.0, 1.0]
+    model = service._model
+    assert isinstance(model, _FakeModel)
+    assert model.batches == [["robot vacuum"], ["pet hair"]]
+    assert service.query_cache.stats() == {"entries": 1, "hits": 1, "disk_hits": 1, "misses": 2}
+
+    # 新进程（新缓存实例）直接从磁盘读取；不同模型的同一文本不共用缓存键
+    restarted = QueryEmbeddingCache(max_entries=8, cache_dir=tmp_path)
+    assert restarted.get(restarted.key("test/tiny-model", "pet hair")) == [8.0, 1.0]
+    assert restarted.get(restarted.key("other/model", "pet hair")) is None
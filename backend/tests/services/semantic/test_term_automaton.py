@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import random
+import re
+
+from app.services.semantic.term_automaton import (
+    BOUNDARY_SUBSTRING,
+    BOUNDARY_WORD,
+    TermAutomaton,
+    TermPattern,
+    compile_term_automaton,
+)
+
+
+def _regex(pattern: TermPattern) -> re.Pattern[str]:
+    esc = re.escape(pattern.text)
+    word = pattern.boundary == BOUNDARY_WORD or (
+        pattern.boundary == "auto" and re.search(r"[A-Za-z]", pattern.text)
+    )
+    return re.compile(rf"\b{esc}\b" if word else esc, re.IGNORECASE)
+
+
+def test_latin_terms_keep_word_boundaries_and_cjk_terms_match_substrings() -> None:
+    automaton = TermAutomaton(["Amazon", "Amazon FBA", "亚马逊", "C++", "slow"])
+    # "C++" 末尾是非单词字符，\b 要求其后紧跟单词字符，与正则版一致地不命中
+    text = "Amazon FBA 在亚马逊平台很慢; Amazonian C++ code is SLOW"
+
+    assert automaton.find_all(text) == {0: [0], 1: [0], 2: [12], 4: [43]}
+    assert automaton.matched("Amazonian slowly") == set()
+
+
+def test_overlapping_hits_follow_finditer_semantics() -> None:
+    automaton = TermAutomaton(
+        [TermPattern("aa", BOUNDARY_SUBSTRING), TermPattern("a", BOUNDARY_SUBSTRING)]
+    )
+
+    assert automaton.find_all("aaaaa") == {0: [0, 2], 1: [0, 1, 2, 3, 4]}
+    assert automaton.count("aaaaa") == {0: 2, 1: 5}
+
+
+def test_results_match_per_pattern_regex_on_random_corpus() -> None:
+    rng = random.Random(3)
+    alphabet = "abAB _-.+中文é1"
+    patterns = [
+        TermPattern(
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))),
+            rng.choice(["auto", BOUNDARY_WORD, BOUNDARY_SUBSTRING]),
+        )
+        for _ in range(60)
+    ]
+    automaton = TermAutomaton(patterns)
+    regexes = [_regex(p) for p in patterns]
+
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        expected = {
+            i: starts
+            for i, rx in enumerate(regexes)
+            if (starts := [m.start() for m in rx.finditer(text)])
+        }
+        assert automaton.find_all(text) == expected, (text, expected)
+
+
+def test_compile_is_cached_per_lexicon_content() -> None:
+    first = compile_term_automaton(["Notion", "Slack"])
+    assert compile_term_automaton(["Notion", "Slack"]) is first
+    assert compile_term_automaton(["Notion", "Trello"]) is not first
@@ -135,3 +135,22 @@ def test_get_layer_definition_reads_yaml(tmp_path: Path, monkeypatch: pytest.Mon
     assert meta.get("name") == "决策层"
     assert float(meta.get("weight_in_scoring", 0.0)) == 0.4
 
+
+
+def test_get_automaton_for_matching_aligns_with_patterns(tmp_path: Path) -> None:
+    yml = """
+    themes:
+      demo:
+        brands: ["Amazon", "亚马逊"]
+        features: ["dropshipping"]
+    """
+    path = _write(tmp_path, "lex/automaton.yml", yml)
+    lx = UnifiedLexicon(path)
+    terms = lx.get_brands() + lx.get_features()
+    pats = lx.get_patterns_for_matching(terms)
+    automaton = lx.get_automaton_for_matching(terms)
+
+    assert [p.text for p in automaton.patterns] == [t for t, _ in pats]
+    assert automaton is lx.get_automaton_for_matching(terms)  # 同一词库只构建一次
+    text = "AMAZON dropshipping vs Amazonian，在亚马逊上开店"
+    assert automaton.matched(text) == {i for i, (_, p) in enumerate(pats) if p.search(text)}
@@ -48,6 +48,10 @@ class _FakeSession:
         self.rollbacks += 1
 
 
+async def _noop_many(*, results: list[dict[str, Any]], **_kwargs: Any) -> int:
+    return len(results)
+
+
 class _FakeSessionContext:
     def __init__(self, session: _FakeSession) -> None:
         self._session = session
@@ -129,6 +133,7 @@ async def test_label_posts_batch_marks_degraded_when_batch_falls_back(
         return None
 
     monkeypatch.setattr(task_mod, "persist_incremental_post_analysis", _noop)
+    monkeypatch.setattr(task_mod, "persist_incremental_post_analyses", _noop_many)
 
     result = await task_mod._label_posts_batch(limit=10, lookback_days=30)
 
@@ -177,6 +182,7 @@ async def test_label_posts_batch_marks_failed_when_llm_requests_keep_failing(
         return None
 
     monkeypatch.setattr(task_mod, "persist_incremental_post_analysis", _noop)
+    monkeypatch.setattr(task_mod, "persist_incremental_post_analyses", _noop_many)
 
     result = await task_mod._label_posts_batch(limit=10, lookback_days=30)
 
@@ -232,6 +238,7 @@ def _comment_noop_patches(monkeypatch: pytest.MonkeyPatch, fake_session: _FakeSe
         return None
 
     monkeypatch.setattr(task_mod, "persist_incremental_comment_analysis", _noop)
+    monkeypatch.setattr(task_mod, "persist_incremental_comment_analyses", _noop_many)
 
 
 @pytest.mark.asyncio
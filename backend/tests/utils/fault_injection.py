@@ -58,6 +58,12 @@ def simulate_redis_down(monkeypatch: Any):
         def delete(self, *args: Any, **kwargs: Any) -> int:  # noqa: D401
             raise RedisError("Simulated Redis outage")
 
+        def mget(self, *args: Any, **kwargs: Any) -> list[Any]:  # noqa: D401
+            raise RedisError("Simulated Redis outage")
+
+        def pipeline(self, *args: Any, **kwargs: Any) -> Any:  # noqa: D401
+            raise RedisError("Simulated Redis outage")
+
     def _from_url(_url: str) -> Any:
         return _DownRedis()
 
@@ -418,10 +418,13 @@ def main() -> int:
             writer = None
             progress_path = None
             if args.stream_write:
-                if out.exists() and args.force_fresh:
-                    out.unlink()
-                writer = JSONLWriter(out, stream=True)
                 progress_path = out.with_suffix(out.suffix + ".progress.json")
+                if args.force_fresh:
+                    out.unlink(missing_ok=True)
+                    progress_path.unlink(missing_ok=True)
+                # 有进度日志就续写输出；否则覆盖写（run_search_partition 会同时清空旧进度）
+                resume = out.exists() and progress_path.exists()
+                writer = JSONLWriter(out, stream=True, resume=resume)
             total, kpi_path = asyncio.run(
                 run_search_partition(
                     subreddit=subreddit,